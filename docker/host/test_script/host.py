@@ -1,6 +1,10 @@
-import subprocess
+import os
+import sys
 from typing import List, Tuple
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'router')))
+from class_net.docker_inventory import InventarioDocker
+
 class Host:
     """
     A class to manage host and router operations in a Docker network environment.
@@ -62,10 +66,7 @@ class Host:
         Returns:
             List[str]: List of router container names
         """
-        docker_command = "docker ps --filter name=roteador --format '{{.Names}}'"
-        command_result = subprocess.run(docker_command, shell=True, check=True, text=True, capture_output=True)
-        router_list = [router.strip("'") for router in command_result.stdout.split('\n') if router]
-        return router_list
+        return InventarioDocker.compartilhado().containers('roteador')
     
     @staticmethod
     def extrair_ip_roteadores(router_name: str) -> int:
@@ -127,10 +128,20 @@ class Host:
         Returns:
             List[str]: List of host container names
         """
-        docker_command = "docker ps --filter name=host --format '{{.Names}}'"
-        command_result = subprocess.run(docker_command, shell=True, check=True, text=True, capture_output=True)
-        host_list = [host.strip("'") for host in command_result.stdout.split('\n') if host]
-        return host_list
+        return InventarioDocker.compartilhado().containers('host')
+    
+    @staticmethod
+    def ip_container(container_name: str) -> str:
+        """
+        Look up the IP address of a host or router in the Docker inventory.
+        
+        Args:
+            container_name (str): Name of the container
+            
+        Returns:
+            str: Container IP address
+        """
+        return InventarioDocker.compartilhado().ip(container_name)
     
     @staticmethod
     def extrair_ip_hosts(host_name: str) -> str:
@@ -5,9 +5,9 @@ This module provides functionality to test network connectivity between hosts
 and routers in a Docker network environment using ICMP ping.
 """
 
-import subprocess
 from typing import List, Tuple
 from host import Host
+from class_net.docker_inventory import InventarioDocker
 
 def teste_de_ping_hosts() -> None:
     """
@@ -21,22 +21,15 @@ def teste_de_ping_hosts() -> None:
     
     for source_host in host_list:
         print(f"Testando {source_host}...")
-        for target_host in host_list:
-            try:
-                ping_command = (
-                    f"docker exec {source_host} ping -c 1 -W 0.1 "
-                    f"172.21.{Host.extrair_ip_hosts(target_host)}"
-                )
-                ping_result = subprocess.run(
-                    ping_command, 
-                    shell=True, 
-                    check=True, 
-                    text=True, 
-                    capture_output=True
-                )
-                if ping_result.returncode == 0:
-                    print(Host.formatar_sucesso(f"{source_host} -> {target_host} sucesso."))
-            except subprocess.CalledProcessError:
+        ping_jobs = [
+            (source_host, ["ping", "-c", "1", "-W", "0.1", Host.ip_container(target_host)])
+            for target_host in host_list
+        ]
+        ping_results = InventarioDocker.compartilhado().executar_em_lote(ping_jobs)
+        for target_host, (exit_code, _, _) in zip(host_list, ping_results):
+            if exit_code == 0:
+                print(Host.formatar_sucesso(f"{source_host} -> {target_host} sucesso."))
+            else:
                 print(Host.formatar_erro(f"{source_host} -> {target_host} falhou."))
                 failed_connections.append((source_host, target_host))
         print('\n')
@@ -60,22 +53,15 @@ def teste_de_ping_roteadores() -> None:
     
     for source_host in host_list:
         print(f"Testando {source_host}...")
-        for target_router in router_list:
-            try:
-                ping_command = (
-                    f"docker exec {source_host} ping -c 1 "
-                    f"172.21.{Host.extrair_ip_roteadores(target_router)}.2"
-                )
-                ping_result = subprocess.run(
-                    ping_command, 
-                    shell=True, 
-                    check=True, 
-                    text=True, 
-                    capture_output=True
-                )
-                if ping_result.returncode == 0:
-                    print(Host.formatar_sucesso(f"{source_host} -> {target_router} sucesso."))
-            except subprocess.CalledProcessError:
+        ping_jobs = [
+            (source_host, ["ping", "-c", "1", Host.ip_container(target_router)])
+            for target_router in router_list
+        ]
+        ping_results = InventarioDocker.compartilhado().executar_em_lote(ping_jobs)
+        for target_router, (exit_code, _, _) in zip(router_list, ping_results):
+            if exit_code == 0:
+                print(Host.formatar_sucesso(f"{source_host} -> {target_router} sucesso."))
+            else:
                 print(Host.formatar_erro(f"{source_host} -> {target_router} falhou."))
                 failed_connections.append((source_host, target_router))
         print('\n')
@@ -0,0 +1,199 @@
+"""
+Batch Receiver Module
+
+This module drains the LSA sockets in batches instead of one datagram per
+pass through the receive loop. A selector waits until a socket is readable,
+and then every datagram already queued on it, up to the batch size, is read
+at once: with a single recvmmsg() system call where the C library provides
+it (loaded through ctypes), otherwise with recvfrom_into() calls flagged
+MSG_DONTWAIT until the socket is empty. Either way the datagrams are read
+into buffers allocated once, and the sockets stay blocking for the senders
+that share them.
+
+The buffers are reused by the next batch, so the datagrams handed out are
+memoryviews valid only until then; whoever keeps one must copy it.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import selectors
+import socket
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+LOTE_PADRAO = 64
+TAMANHO_ENDERECO = 16
+
+class _Iovec(ctypes.Structure):
+    """struct iovec."""
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+class _Msghdr(ctypes.Structure):
+    """struct msghdr."""
+    _fields_ = [("msg_name", ctypes.c_void_p), ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(_Iovec)), ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p), ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+class _Mmsghdr(ctypes.Structure):
+    """struct mmsghdr, as taken by recvmmsg()."""
+    _fields_ = [("msg_hdr", _Msghdr), ("msg_len", ctypes.c_uint)]
+
+def _carregar_recvmmsg() -> Optional[Any]:
+    """
+    Load recvmmsg() from the C library.
+
+    Returns:
+        The ctypes function, or None where it is not available
+    """
+    library = ctypes.util.find_library("c")
+    if library is None:
+        return None
+    try:
+        function = ctypes.CDLL(library, use_errno=True).recvmmsg
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = [ctypes.c_int, ctypes.POINTER(_Mmsghdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    function.restype = ctypes.c_int
+    return function
+
+_RECVMMSG = _carregar_recvmmsg()
+
+Datagrama = Tuple[memoryview, Tuple[str, int], socket.socket]
+
+class ReceptorEmLote:
+    """
+    Reads the datagrams queued on some sockets in batches.
+
+    Attributes:
+        lote (int): Maximum datagrams read from a socket per readiness event
+        recvmmsg (bool): Whether batches are read with recvmmsg()
+        lotes (int): Batches read
+        datagramas (int): Datagrams read
+        maior_lote (int): Largest batch read
+    """
+
+    def __init__(self, sockets: Sequence[socket.socket], lote: int = LOTE_PADRAO,
+                 tamanho: int = 65535, recvmmsg: bool = True):
+        """
+        Initialize the receiver and allocate its buffers.
+
+        Args:
+            sockets: Blocking UDP sockets to read
+            lote: Maximum datagrams read from a socket per readiness event
+            tamanho: Size of each buffer, the largest datagram accepted
+            recvmmsg: Use recvmmsg() when available
+        """
+        self.lote = lote
+        self.recvmmsg = recvmmsg and _RECVMMSG is not None
+        self.lotes = 0
+        self.datagramas = 0
+        self.maior_lote = 0
+        self._seletor = selectors.DefaultSelector()
+        self._prontos: List[socket.socket] = []
+        for receiving_socket in sockets:
+            self._seletor.register(receiving_socket, selectors.EVENT_READ)
+
+        self._buffers = [bytearray(tamanho) for _ in range(lote)]
+        self._visoes = [memoryview(buffer) for buffer in self._buffers]
+        if self.recvmmsg:
+            self._enderecos = [ctypes.create_string_buffer(TAMANHO_ENDERECO) for _ in range(lote)]
+            self._iovecs = (_Iovec * lote)()
+            self._mensagens = (_Mmsghdr * lote)()
+            for index, buffer in enumerate(self._buffers):
+                self._iovecs[index].iov_base = ctypes.addressof((ctypes.c_char * tamanho).from_buffer(buffer))
+                self._iovecs[index].iov_len = tamanho
+                header = self._mensagens[index].msg_hdr
+                header.msg_name = ctypes.addressof(self._enderecos[index])
+                header.msg_iov = ctypes.pointer(self._iovecs[index])
+                header.msg_iovlen = 1
+
+    def _ler_recvmmsg(self, receiving_socket: socket.socket) -> List[Datagrama]:
+        """
+        Read the datagrams queued on a socket with one recvmmsg() call.
+
+        Args:
+            receiving_socket: Readable socket
+
+        Returns:
+            List of (datagram, sender address, socket)
+        """
+        for message in self._mensagens:
+            message.msg_hdr.msg_namelen = TAMANHO_ENDERECO
+        count = _RECVMMSG(receiving_socket.fileno(), self._mensagens, self.lote, socket.MSG_DONTWAIT, None)
+        if count < 0:
+            error = ctypes.get_errno()
+            if error in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(error, os.strerror(error))
+        batch = []
+        for index in range(count):
+            address = self._enderecos[index].raw
+            sender = (socket.inet_ntoa(address[4:8]), int.from_bytes(address[2:4], "big"))
+            batch.append((self._visoes[index][:self._mensagens[index].msg_len], sender, receiving_socket))
+        return batch
+
+    def _ler_recvfrom(self, receiving_socket: socket.socket) -> List[Datagrama]:
+        """
+        Read the datagrams queued on a socket with recvfrom_into() until it is empty.
+
+        Args:
+            receiving_socket: Readable socket
+
+        Returns:
+            List of (datagram, sender address, socket)
+        """
+        batch = []
+        for view in self._visoes:
+            try:
+                size, sender = receiving_socket.recvfrom_into(view, 0, socket.MSG_DONTWAIT)
+            except (BlockingIOError, InterruptedError):
+                break
+            batch.append((view[:size], sender, receiving_socket))
+        return batch
+
+    def receber(self, timeout: Optional[float] = None) -> List[Datagrama]:
+        """
+        Wait for a readable socket and read the datagrams queued on it.
+
+        With several sockets readable, the batch holds the datagrams of one
+        of them and the others are read by the next calls, before waiting
+        again, as all share the same buffers.
+
+        Args:
+            timeout: Seconds to wait, None to wait indefinitely
+
+        Returns:
+            List of (datagram, sender address, socket), empty on timeout
+        """
+        if not self._prontos:
+            self._prontos = [key.fileobj for key, _ in self._seletor.select(timeout)]
+        read = self._ler_recvmmsg if self.recvmmsg else self._ler_recvfrom
+        while self._prontos:
+            batch = read(self._prontos.pop(0))
+            if batch:
+                self.lotes += 1
+                self.datagramas += len(batch)
+                self.maior_lote = max(self.maior_lote, len(batch))
+                return batch
+        return []
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Return the batch counters.
+
+        Returns:
+            Dict with 'recvmmsg', 'lotes', 'datagramas', 'media' and 'maior_lote'
+        """
+        return {
+            "recvmmsg": self.recvmmsg,
+            "lotes": self.lotes,
+            "datagramas": self.datagramas,
+            "media": self.datagramas / self.lotes if self.lotes else 0.0,
+            "maior_lote": self.maior_lote,
+        }
+
+    def fechar(self) -> None:
+        """Stop watching the sockets."""
+        self._seletor.close()
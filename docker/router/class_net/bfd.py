@@ -0,0 +1,289 @@
+"""
+BFD Module
+
+This module implements a BFD-style (Bidirectional Forwarding Detection)
+failure detector. Every neighbor gets a session exchanging small UDP control
+packets at tens-of-milliseconds intervals; a session goes down when no packet
+arrives within the detection time (the neighbor's detect multiplier times the
+agreed interval). All sessions of a router run from a single thread driven by
+a selector, so the cost grows with packets, not with threads.
+
+Control packets follow the mandatory section of RFC 5880 (24 bytes). Routers
+reach each neighbor through an interface address that differs from the
+neighbor's main IP, so sessions are not matched by source address: each
+discriminator is derived from the (sender, receiver) router IDs, which lets
+both ends find the session of the very first packet.
+"""
+
+import random
+import selectors
+import socket
+import struct
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional
+
+PORTA_BFD = 3784
+VERSAO_BFD = 1
+PACOTE = struct.Struct("!BBBBIIIII")
+
+ADMIN_DOWN, DOWN, INIT, UP = range(4)
+NOMES_ESTADOS = {ADMIN_DOWN: "AdminDown", DOWN: "Down", INIT: "Init", UP: "Up"}
+
+def discriminador(origem: str, destino: str) -> int:
+    """
+    Derive the discriminator a router uses in its session with a neighbor.
+
+    Args:
+        origem: ID of the router owning the discriminator
+        destino: ID of the neighbor
+
+    Returns:
+        int: Non-zero 32-bit discriminator
+    """
+    return zlib.crc32(f"{origem}>{destino}".encode()) or 1
+
+class SessaoBFD:
+    """
+    State of the BFD session with one neighbor.
+
+    Attributes:
+        vizinho (str): Neighbor router ID
+        ip (str): Neighbor address packets are sent to
+        discriminador_local (int): Discriminator of this end
+        discriminador_remoto (int): Discriminator of the neighbor, 0 until learned
+        estado (int): Local session state
+        tempo_deteccao (float): Seconds without packets before the session goes down
+        proximo_envio (float): Monotonic time of the next transmission
+        limite_deteccao (float): Monotonic time the session expires at
+        reportado (Optional[bool]): Last state reported as up (True) or down (False)
+    """
+
+    def __init__(self, vizinho: str, ip: str, discriminador_local: int, tempo_deteccao: float):
+        """
+        Initialize a session in the Down state.
+
+        Args:
+            vizinho: Neighbor router ID
+            ip: Neighbor address
+            discriminador_local: Discriminator of this end
+            tempo_deteccao: Initial detection time
+        """
+        now = time.monotonic()
+        self.vizinho = vizinho
+        self.ip = ip
+        self.discriminador_local = discriminador_local
+        self.discriminador_remoto = 0
+        self.estado = DOWN
+        self.tempo_deteccao = tempo_deteccao
+        self.proximo_envio = now
+        self.limite_deteccao = now + tempo_deteccao
+        self.reportado: Optional[bool] = None
+
+class MotorBFD:
+    """
+    Runs the BFD sessions of a router from one thread.
+
+    Attributes:
+        roteador_id (str): ID of this router
+        endereco (str): Local address the control socket is bound to
+        porta (int): UDP port used by every router
+        intervalo (float): Desired transmit and required receive interval, in seconds
+        multiplicador (int): Detect multiplier announced to neighbors
+        ao_mudar_estado (Optional[Callable]): Called with (neighbor ID, is up) when a session goes up or down
+        sessoes (Dict[str, SessaoBFD]): Sessions by neighbor ID
+        pacotes_enviados (int): Control packets sent
+        pacotes_recebidos (int): Control packets accepted
+    """
+
+    def __init__(self, roteador_id: str, intervalo: float = 0.03, multiplicador: int = 3,
+                 endereco: str = "0.0.0.0", porta: int = PORTA_BFD,
+                 ao_mudar_estado: Optional[Callable[[str, bool], None]] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            roteador_id: ID of this router
+            intervalo: Desired transmit and required receive interval, in seconds
+            multiplicador: Detect multiplier
+            endereco: Local address to bind
+            porta: UDP port
+            ao_mudar_estado: Session up/down callback, run on the engine thread
+        """
+        self.roteador_id = roteador_id
+        self.endereco = endereco
+        self.porta = porta
+        self.intervalo = intervalo
+        self.multiplicador = multiplicador
+        self.ao_mudar_estado = ao_mudar_estado
+        self.sessoes: Dict[str, SessaoBFD] = {}
+        self.pacotes_enviados = 0
+        self.pacotes_recebidos = 0
+        self._por_discriminador_remoto: Dict[int, SessaoBFD] = {}
+        self._socket: Optional[socket.socket] = None
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def adicionar_sessao(self, vizinho: str, ip: str) -> None:
+        """
+        Create the session with a neighbor.
+
+        Args:
+            vizinho: Neighbor router ID
+            ip: Neighbor address
+        """
+        session = SessaoBFD(vizinho, ip, discriminador(self.roteador_id, vizinho),
+                            self.multiplicador * self.intervalo)
+        self.sessoes[vizinho] = session
+        self._por_discriminador_remoto[discriminador(vizinho, self.roteador_id)] = session
+
+    def sessoes_ativas(self) -> List[str]:
+        """
+        Return the neighbors whose session is up.
+
+        Returns:
+            List of neighbor router IDs
+        """
+        return [vizinho for vizinho, session in self.sessoes.items() if session.estado == UP]
+
+    def iniciar(self) -> "MotorBFD":
+        """Bind the control socket and start the engine thread."""
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.endereco, self.porta))
+        self._socket.setblocking(False)
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self) -> None:
+        """Stop the engine silently, as a failed router would."""
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+    def _executar(self) -> None:
+        """Event loop: wait for packets or the next timer, then serve both."""
+        selector = selectors.DefaultSelector()
+        selector.register(self._socket, selectors.EVENT_READ)
+        try:
+            while not self._parar.is_set():
+                deadline = min(
+                    (min(session.proximo_envio, session.limite_deteccao) for session in self.sessoes.values()),
+                    default=time.monotonic() + self.intervalo
+                )
+                if selector.select(max(0.0, min(deadline - time.monotonic(), self.intervalo))):
+                    self._receber()
+
+                now = time.monotonic()
+                for session in self.sessoes.values():
+                    if now >= session.limite_deteccao:
+                        self._expirar(session, now)
+                    if now >= session.proximo_envio:
+                        self._enviar(session, now)
+        finally:
+            selector.close()
+
+    def _enviar(self, session: SessaoBFD, now: float) -> None:
+        """
+        Send a control packet and schedule the next one with 0-25% jitter.
+
+        Args:
+            session: Session to send on
+            now: Current monotonic time
+        """
+        interval_us = int(self.intervalo * 1_000_000)
+        packet = PACOTE.pack(VERSAO_BFD << 5, session.estado << 6, self.multiplicador, PACOTE.size,
+                             session.discriminador_local, session.discriminador_remoto,
+                             interval_us, interval_us, 0)
+        try:
+            self._socket.sendto(packet, (session.ip, self.porta))
+            self.pacotes_enviados += 1
+        except OSError:
+            pass
+        session.proximo_envio = now + self.intervalo * random.uniform(0.75, 1.0)
+
+    def _receber(self) -> None:
+        """Drain the socket and run the state machine for every valid packet."""
+        while True:
+            try:
+                data = self._socket.recv(64)
+            except (BlockingIOError, InterruptedError):
+                return
+            if len(data) < PACOTE.size:
+                continue
+            (version_diag, state_flags, multiplier, length, remote_discr,
+             your_discr, desired_tx, required_rx, _) = PACOTE.unpack_from(data)
+            session = self._por_discriminador_remoto.get(remote_discr)
+            if (session is None or version_diag >> 5 != VERSAO_BFD or multiplier == 0
+                    or length < PACOTE.size or your_discr not in (0, session.discriminador_local)):
+                continue
+
+            self.pacotes_recebidos += 1
+            now = time.monotonic()
+            session.discriminador_remoto = remote_discr
+            session.tempo_deteccao = multiplier * max(self.intervalo, desired_tx / 1_000_000)
+            session.limite_deteccao = now + session.tempo_deteccao
+            self._transicao(session, state_flags >> 6, now)
+
+    def _transicao(self, session: SessaoBFD, remote_state: int, now: float) -> None:
+        """
+        Apply the RFC 5880 state machine to a received remote state.
+
+        Args:
+            session: Session the packet belongs to
+            remote_state: State announced by the neighbor
+            now: Current monotonic time
+        """
+        previous = session.estado
+        if remote_state == ADMIN_DOWN:
+            session.estado = DOWN
+        elif session.estado == DOWN:
+            if remote_state == DOWN:
+                session.estado = INIT
+            elif remote_state == INIT:
+                session.estado = UP
+        elif session.estado == INIT:
+            if remote_state in (INIT, UP):
+                session.estado = UP
+        elif remote_state == DOWN:
+            session.estado = DOWN
+
+        if session.estado != previous:
+            session.proximo_envio = now
+            self._notificar(session)
+
+    def _expirar(self, session: SessaoBFD, now: float) -> None:
+        """
+        Bring a session down when its detection time elapsed without packets.
+
+        Args:
+            session: Expired session
+            now: Current monotonic time
+        """
+        session.estado = DOWN
+        session.discriminador_remoto = 0
+        session.limite_deteccao = float("inf")
+        session.proximo_envio = now
+        self._notificar(session)
+
+    def _notificar(self, session: SessaoBFD) -> None:
+        """
+        Report a session going up or down, once per change.
+
+        Args:
+            session: Session whose state changed
+        """
+        is_up = session.estado == UP
+        if is_up == session.reportado or (not is_up and session.estado == INIT):
+            return
+        session.reportado = is_up
+        print(f"[{self.roteador_id}] Sessão BFD com {session.vizinho}: {NOMES_ESTADOS[session.estado]}")
+        if self.ao_mudar_estado:
+            self.ao_mudar_estado(session.vizinho, is_up)
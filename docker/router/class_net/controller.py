@@ -0,0 +1,397 @@
+"""
+Route Controller Module
+
+This module implements the optional centralised mode. A controller process
+receives the LSA of every router straight from it, together with the version
+of the FIB the router holds, computes the routing tables of all routers once
+per topology change and pushes to each router only the next hops that
+changed. Routers in this mode keep flooding LSAs and monitoring neighbors,
+but skip SPF: they install the tables they receive.
+
+A push carries the version it applies to. A router holding another version
+ignores it and keeps reporting its own, and the controller then sends the
+whole table, so lost datagrams only delay convergence. Routers not heard
+from for IDADE_MAXIMA seconds are dropped from the controller's LSDB.
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from class_net.lsa_database import BancoLSA
+from class_net.lsa_manager import TAMANHO_MAXIMO_DATAGRAMA
+from class_net.route_manager import GerenciadorDeRotas
+from class_net.route_update import AtualizadorDeRotas
+from class_net.router_config import ConfiguracaoRoteador
+
+PORTA_CONTROLADOR = 5002
+PORTA_FIB = 5003
+IDADE_MAXIMA = 3.0
+INTERVALO_REENVIO = 1.0
+
+_gerenciador_do_trabalhador: Optional[GerenciadorDeRotas] = None
+
+class Controlador:
+    """
+    Central route computation for every router of the network.
+
+    Attributes:
+        lsdb (BancoLSA): LSA of every router, as reported by the router itself
+        processos (int): Worker processes sharing the calculation of the tables
+        idade_maxima (float): Seconds without hearing from a router before dropping it
+        enderecos (Dict[str, str]): Address every router reports from
+        tabelas (Dict[str, Dict[str, str]]): Routing table of every router
+        versoes (Dict[str, int]): Version of the table pushed to every router
+        versoes_instaladas (Dict[str, int]): Version every router reported holding
+        calculos (int): All-router calculations run
+        tempo_de_calculo (float): Seconds spent in them
+        mensagens_enviadas (int): Pushes sent, diffs and full tables
+    """
+
+    def __init__(self, processes: int = 1, max_age: float = IDADE_MAXIMA):
+        """
+        Initialize the controller.
+
+        Args:
+            processes: Worker processes computing the tables, 1 to compute them in this process
+            max_age: Seconds without hearing from a router before dropping it
+        """
+        self.lsdb = BancoLSA()
+        self.processos = processes
+        self.idade_maxima = max_age
+        self.enderecos: Dict[str, str] = {}
+        self.tabelas: Dict[str, Dict[str, str]] = {}
+        self.versoes: Dict[str, int] = {}
+        self.versoes_instaladas: Dict[str, int] = {}
+        self.calculos = 0
+        self.tempo_de_calculo = 0.0
+        self.mensagens_enviadas = 0
+        self.mudou = threading.Event()
+        self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._ultimo_contato: Dict[str, float] = {}
+        self._enviado_em: Dict[str, float] = {}
+        self._copia = BancoLSA()
+        self._gerenciador = GerenciadorDeRotas(self._copia)
+        self._geracao_calculada: Optional[int] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def registrar(self, message: Dict[str, Any], sender_ip: str) -> None:
+        """
+        Store the LSA a router reported and the FIB version it holds.
+
+        The report comes straight from the router, so the latest one always
+        wins, even with a lower sequence number after a restart.
+
+        Args:
+            message: Decoded report
+            sender_ip: Address the report came from
+        """
+        router_id = message["id"]
+        with self._lock:
+            current = self.lsdb.get(router_id)
+            if current is None or current["seq"] != message["lsa"]["seq"]:
+                self.lsdb[router_id] = message["lsa"]
+            self.enderecos[router_id] = sender_ip
+            self.versoes_instaladas[router_id] = message["versao_fib"]
+            self._ultimo_contato[router_id] = time.monotonic()
+        self.mudou.set()
+
+    def receber(self, stop_event: threading.Event) -> None:
+        """
+        Receive router reports and FIB acknowledgements until stopped.
+
+        Args:
+            stop_event: Threading event to control the receiving loop
+        """
+        receiver_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver_socket.bind(("0.0.0.0", PORTA_CONTROLADOR))
+        receiver_socket.settimeout(0.5)
+        while not stop_event.is_set():
+            try:
+                data, address = receiver_socket.recvfrom(TAMANHO_MAXIMO_DATAGRAMA)
+            except socket.timeout:
+                continue
+            message = json.loads(data.decode())
+            if message.get("tipo") == "inscricao":
+                self.registrar(message, address[0])
+            elif message.get("tipo") == "confirmacao":
+                with self._lock:
+                    self.versoes_instaladas[message["id"]] = message["versao"]
+
+    def calcular(self, stop_event: threading.Event) -> None:
+        """
+        Recompute and push tables whenever reports arrive, until stopped.
+
+        Args:
+            stop_event: Threading event to control the loop
+        """
+        while not stop_event.is_set():
+            self.mudou.wait(self.idade_maxima / 2)
+            self.mudou.clear()
+            self.ciclo()
+
+    def _expirar(self) -> None:
+        """Drop the LSAs of routers not heard from for idade_maxima seconds."""
+        now = time.monotonic()
+        for router_id in [router_id for router_id, seen in self._ultimo_contato.items()
+                          if now - seen > self.idade_maxima]:
+            print(f"[controlador] {router_id} sem contato há {now - self._ultimo_contato[router_id]:.1f} s, "
+                  f"LSA removido")
+            del self._ultimo_contato[router_id]
+            self.lsdb.pop(router_id, None)
+            self.versoes_instaladas.pop(router_id, None)
+
+    def ciclo(self) -> None:
+        """
+        Recalculate every table if the topology changed and push what differs.
+
+        Routers still reporting an older FIB version INTERVALO_REENVIO seconds
+        after the last push receive their whole table again.
+        """
+        with self._lock:
+            self._expirar()
+            generation = self.lsdb.geracao
+            snapshot = dict(self.lsdb)
+            installed = dict(self.versoes_instaladas)
+
+        if generation != self._geracao_calculada:
+            start = time.perf_counter()
+            tables = self.calcular_tabelas(snapshot)
+            elapsed = time.perf_counter() - start
+            self.calculos += 1
+            self.tempo_de_calculo += elapsed
+            changed = 0
+            for router_id, routing_table in tables.items():
+                previous = self.tabelas.get(router_id)
+                if previous == routing_table:
+                    continue
+                changed += 1
+                base = self.versoes.get(router_id, 0)
+                self.versoes[router_id] = base + 1
+                if previous is not None and installed.get(router_id) == base:
+                    self._enviar(router_id, self._diferenca(previous, routing_table, base))
+                else:
+                    self._enviar(router_id, {"rotas": routing_table, "base": None})
+            self.tabelas = tables
+            self._geracao_calculada = generation
+            print(f"[controlador] Tabelas de {len(tables)} roteadores calculadas em {1000 * elapsed:.1f} ms, "
+                  f"{changed} alteradas")
+
+        now = time.monotonic()
+        for router_id, version in self.versoes.items():
+            if (router_id in installed and installed[router_id] != version
+                    and now - self._enviado_em.get(router_id, 0.0) > INTERVALO_REENVIO):
+                self._enviar(router_id, {"rotas": self.tabelas.get(router_id, {}), "base": None})
+
+    @staticmethod
+    def _diferenca(previous: Dict[str, str], routing_table: Dict[str, str], base: int) -> Dict[str, Any]:
+        """
+        Build the push turning one table into another.
+
+        Args:
+            previous: Table the router holds
+            routing_table: New table
+            base: Version of the table the router holds
+
+        Returns:
+            Dict with the changed next hops, the removed destinations and the base version
+        """
+        return {
+            "rotas": {destination: next_hop for destination, next_hop in routing_table.items()
+                      if previous.get(destination) != next_hop},
+            "remover": [destination for destination in previous if destination not in routing_table],
+            "base": base,
+        }
+
+    def _enviar(self, router_id: str, push: Dict[str, Any]) -> None:
+        """Send a push to a router, tagged with the version it produces."""
+        if router_id not in self.enderecos:
+            return
+        message = {"tipo": "fib", "id": router_id, "versao": self.versoes[router_id], **push}
+        self.udp_socket.sendto(json.dumps(message).encode(), (self.enderecos[router_id], PORTA_FIB))
+        self._enviado_em[router_id] = time.monotonic()
+        self.mensagens_enviadas += 1
+
+    def calcular_tabelas(self, lsdb: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+        """
+        Compute the routing table of every router.
+
+        In this process the graph is kept between calls and updated from the
+        LSAs that changed; with worker processes the routers are split
+        between them, each worker keeping its own graph.
+
+        Args:
+            lsdb: Snapshot of the LSDB
+
+        Returns:
+            Dict mapping every router to its routing table
+        """
+        if self.processos <= 1:
+            for router_id in [router_id for router_id in self._copia if router_id not in lsdb]:
+                del self._copia[router_id]
+            for router_id, lsa in lsdb.items():
+                if self._copia.get(router_id) is not lsa:
+                    self._copia[router_id] = lsa
+            return self._gerenciador.calcular_tabelas()
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.processos)
+        routers = sorted(lsdb)
+        batches = [routers[index::self.processos] for index in range(self.processos)]
+        tables: Dict[str, Dict[str, str]] = {}
+        for partial in self._executor.map(_calcular_lote, [(lsdb, batch) for batch in batches]):
+            tables.update(partial)
+        return tables
+
+    def parar(self) -> None:
+        """Shut the worker processes down."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+def _calcular_lote(job: Tuple[Dict[str, Any], List[str]]) -> Dict[str, Dict[str, str]]:
+    """Compute the tables of some routers in a worker process, keeping its graph between calls."""
+    global _gerenciador_do_trabalhador
+    lsdb, routers = job
+    if _gerenciador_do_trabalhador is None:
+        _gerenciador_do_trabalhador = GerenciadorDeRotas(BancoLSA())
+    database = _gerenciador_do_trabalhador.lsdb
+    for router_id in [router_id for router_id in database if router_id not in lsdb]:
+        del database[router_id]
+    database.update(lsdb)
+    return _gerenciador_do_trabalhador.calcular_tabelas(routers)
+
+class ClienteControlador:
+    """
+    Router side of the centralised mode.
+
+    Attributes:
+        ROTEADOR_ID (str): Unique identifier for the router
+        controlador (str): Address of the controller
+        atualizador (AtualizadorDeRotas): Installs the received tables
+        tabela (Dict[str, str]): Routing table received so far
+        versao (int): Version of that table, 0 before the first push
+    """
+
+    def __init__(self, config: ConfiguracaoRoteador, atualizador: AtualizadorDeRotas):
+        """
+        Initialize the client.
+
+        Args:
+            config: Router configuration, with the controller address
+            atualizador: Route updater installing the tables
+        """
+        self.ROTEADOR_ID = config.roteador_id
+        self.controlador = config.controlador
+        self.atualizador = atualizador
+        self.tabela: Dict[str, str] = {}
+        self.versao = 0
+        self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._aplicada: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    def inscrever(self, own_lsa: Dict[str, Any]) -> None:
+        """
+        Report this router's LSA and FIB version to the controller.
+
+        Args:
+            own_lsa: LSA just originated
+        """
+        message = {"tipo": "inscricao", "id": self.ROTEADOR_ID, "lsa": own_lsa, "versao_fib": self.versao}
+        try:
+            self.udp_socket.sendto(json.dumps(message).encode(), (self.controlador, PORTA_CONTROLADOR))
+        except OSError as error:
+            print(f"[{self.ROTEADOR_ID}] Controlador inalcançável: {error}")
+
+    def tratar_fib(self, message: Dict[str, Any]) -> bool:
+        """
+        Apply a push to the table held.
+
+        Args:
+            message: Decoded push
+
+        Returns:
+            bool: True if it applied to the version held
+        """
+        with self._lock:
+            if message["base"] is None:
+                self.tabela = dict(message["rotas"])
+            elif message["base"] == self.versao:
+                self.tabela.update(message["rotas"])
+                for destination in message["remover"]:
+                    self.tabela.pop(destination, None)
+            else:
+                return False
+            self.versao = message["versao"]
+            return True
+
+    def receber_fib(self, stop_event: threading.Event) -> None:
+        """
+        Receive pushes from the controller, acknowledge and install them.
+
+        Args:
+            stop_event: Threading event to control the receiving loop
+        """
+        receiver_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver_socket.bind(("0.0.0.0", PORTA_FIB))
+        receiver_socket.settimeout(0.5)
+        while not stop_event.is_set():
+            try:
+                data, address = receiver_socket.recvfrom(TAMANHO_MAXIMO_DATAGRAMA)
+            except socket.timeout:
+                continue
+            message = json.loads(data.decode())
+            if message.get("tipo") != "fib" or not self.tratar_fib(message):
+                continue
+            self.udp_socket.sendto(
+                json.dumps({"tipo": "confirmacao", "id": self.ROTEADOR_ID, "versao": self.versao}).encode(),
+                (address[0], PORTA_CONTROLADOR)
+            )
+            self.aplicar()
+
+    def aplicar(self) -> None:
+        """
+        Install the table held, if it or the LSDB changed since the last time.
+
+        Destinations and next hops whose address is not known yet, because
+        their LSA has not been flooded here, wait for the next call.
+        """
+        manager = self.atualizador.gerenciador_de_rotas
+        with self._lock:
+            state = (self.versao, manager.geracao())
+            if state == self._aplicada and state[1] is not None:
+                return
+            routing_table = {destination: next_hop for destination, next_hop in self.tabela.items()
+                             if manager.ip_de(destination) and manager.ip_de(next_hop)}
+            self._aplicada = state
+            # Installed under the lock, or a slower call could put back an older table
+            self.atualizador.instalar_tabela(routing_table)
+
+def main() -> None:
+    """Run the controller until interrupted."""
+    parser = argparse.ArgumentParser(description="Controlador central de rotas")
+    parser.add_argument("--processos", type=int, default=1, help="Processos que calculam as tabelas")
+    parser.add_argument("--idade-maxima", type=float, default=IDADE_MAXIMA,
+                        help="Segundos sem notícias de um roteador antes de descartá-lo")
+    args = parser.parse_args()
+
+    controller = Controlador(args.processos, args.idade_maxima)
+    stop_event = threading.Event()
+    threads = [threading.Thread(target=controller.receber, args=(stop_event,), daemon=True),
+               threading.Thread(target=controller.calcular, args=(stop_event,), daemon=True)]
+    for thread in threads:
+        thread.start()
+    print("[controlador] Iniciado...", flush=True)
+    try:
+        stop_event.wait()
+    except KeyboardInterrupt:
+        stop_event.set()
+    finally:
+        controller.parar()
+
+if __name__ == "__main__":
+    main()
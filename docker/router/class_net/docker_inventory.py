@@ -0,0 +1,349 @@
+"""
+Docker Inventory Module
+
+This module talks to the Docker Engine API over its Unix socket to discover the
+lab containers, their networks and addresses, and to run commands inside them.
+Connections are kept alive and reused, container data is cached until it expires
+or is invalidated, and commands can be executed on many containers in parallel.
+"""
+
+import http.client
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional
+from urllib.parse import quote
+
+DOCKER_SOCKET = "/var/run/docker.sock"
+CACHE_TTL = 5.0
+EXEC_WORKERS = 16
+
+class ConexaoUnix(http.client.HTTPConnection):
+    """
+    HTTP connection carried over a Unix domain socket.
+
+    Attributes:
+        socket_path (str): Filesystem path of the Unix socket
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        """
+        Initialize the connection.
+
+        Args:
+            socket_path: Filesystem path of the Unix socket
+            timeout: Socket timeout in seconds
+        """
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        """Open the Unix socket instead of a TCP connection."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class ClienteDocker:
+    """
+    Minimal Docker Engine API client.
+
+    Each thread keeps its own persistent connection, so repeated and parallel
+    calls avoid both process spawns and new socket handshakes.
+
+    Attributes:
+        socket_path (str): Filesystem path of the Docker socket
+    """
+
+    def __init__(self, socket_path: Optional[str] = None):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Docker socket path, taken from DOCKER_HOST when omitted
+        """
+        docker_host = os.getenv("DOCKER_HOST", "")
+        if socket_path is None and docker_host.startswith("unix://"):
+            socket_path = docker_host[len("unix://"):]
+        self.socket_path = socket_path or DOCKER_SOCKET
+        self._local = threading.local()
+
+    def _conexao(self) -> ConexaoUnix:
+        """Return the persistent connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = ConexaoUnix(self.socket_path)
+            self._local.connection = connection
+        return connection
+
+    def requisicao(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Tuple[int, bytes]:
+        """
+        Perform an API request, reconnecting once if the connection was dropped.
+
+        Args:
+            method: HTTP method
+            path: Request path including query string
+            body: Optional JSON body
+
+        Returns:
+            Tuple with (HTTP status, response body)
+        """
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+
+        for attempt in range(2):
+            connection = self._conexao()
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                connection.close()
+                if attempt:
+                    raise
+        return 0, b""
+
+    def _json(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+        """Perform a request and decode its JSON answer, raising on API errors."""
+        status, data = self.requisicao(method, path, body)
+        if status >= 400:
+            raise RuntimeError(f"Docker API {method} {path}: {status} {data.decode(errors='replace').strip()}")
+        return json.loads(data) if data else None
+
+    def listar_containers(self, name_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List running containers, optionally filtered by name.
+
+        Args:
+            name_filter: Substring filter with 'docker ps --filter name=' semantics
+
+        Returns:
+            List of container summaries as returned by the API
+        """
+        path = "/containers/json"
+        if name_filter:
+            path += "?filters=" + quote(json.dumps({"name": [name_filter]}))
+        return self._json("GET", path)
+
+    def inspecionar(self, container: str) -> Dict[str, Any]:
+        """
+        Inspect a container.
+
+        Args:
+            container: Container name or ID
+
+        Returns:
+            Full container description
+        """
+        return self._json("GET", f"/containers/{quote(container)}/json")
+
+    def executar(self, container: str, command: List[str]) -> Tuple[int, str, str]:
+        """
+        Run a command inside a container and wait for it to finish.
+
+        Args:
+            container: Container name or ID
+            command: Command and arguments
+
+        Returns:
+            Tuple with (exit code, stdout, stderr)
+        """
+        exec_info = self._json("POST", f"/containers/{quote(container)}/exec", {
+            "Cmd": command,
+            "AttachStdout": True,
+            "AttachStderr": True,
+        })
+        status, stream = self.requisicao("POST", f"/exec/{exec_info['Id']}/start", {"Detach": False, "Tty": False})
+        if status >= 400:
+            raise RuntimeError(f"Docker API exec start: {status} {stream.decode(errors='replace').strip()}")
+        stdout, stderr = ClienteDocker.separar_fluxos(stream)
+        exit_code = self._json("GET", f"/exec/{exec_info['Id']}/json")["ExitCode"]
+        return exit_code, stdout, stderr
+
+    @staticmethod
+    def separar_fluxos(stream: bytes) -> Tuple[str, str]:
+        """
+        Demultiplex an attached exec stream into stdout and stderr.
+
+        Args:
+            stream: Raw stream with 8-byte frame headers
+
+        Returns:
+            Tuple with decoded (stdout, stderr)
+        """
+        outputs = {1: bytearray(), 2: bytearray()}
+        offset = 0
+        while offset + 8 <= len(stream):
+            stream_type, size = struct.unpack(">BxxxI", stream[offset:offset + 8])
+            offset += 8
+            outputs.setdefault(stream_type, bytearray()).extend(stream[offset:offset + size])
+            offset += size
+        return outputs[1].decode(errors="replace"), outputs[2].decode(errors="replace")
+
+class InventarioDocker:
+    """
+    Cached inventory of lab containers.
+
+    Container names, networks, addresses and environment are fetched once and
+    served from memory until the TTL expires or invalidar() is called.
+
+    Attributes:
+        cliente (ClienteDocker): API client used for lookups and execs
+        ttl (float): Cache lifetime in seconds
+    """
+
+    _compartilhado: Optional["InventarioDocker"] = None
+
+    def __init__(self, cliente: Optional[ClienteDocker] = None, ttl: float = CACHE_TTL,
+                 workers: int = EXEC_WORKERS):
+        """
+        Initialize the inventory.
+
+        Args:
+            cliente: API client, a default socket client when omitted
+            ttl: Cache lifetime in seconds
+            workers: Number of threads used by executar_em_lote
+        """
+        self.cliente = cliente or ClienteDocker()
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._containers: Dict[str, Dict[str, Any]] = {}
+        self._detalhes: Dict[str, Dict[str, Any]] = {}
+        self._atualizado_em = 0.0
+
+    @classmethod
+    def compartilhado(cls) -> "InventarioDocker":
+        """Return the process-wide inventory instance."""
+        if cls._compartilhado is None:
+            cls._compartilhado = cls()
+        return cls._compartilhado
+
+    def invalidar(self) -> None:
+        """Drop every cached entry so the next lookup queries the engine."""
+        with self._lock:
+            self._containers = {}
+            self._detalhes = {}
+            self._atualizado_em = 0.0
+
+    def _carregar(self) -> Dict[str, Dict[str, Any]]:
+        """Return the cached container summaries, refreshing them when stale."""
+        with self._lock:
+            if time.monotonic() - self._atualizado_em > self.ttl:
+                self._containers = {
+                    container["Names"][0].lstrip("/"): container
+                    for container in self.cliente.listar_containers()
+                }
+                self._detalhes = {}
+                self._atualizado_em = time.monotonic()
+            return self._containers
+
+    def containers(self, prefix: str = "") -> List[str]:
+        """
+        List running container names containing a given text.
+
+        Args:
+            prefix: Text that must appear in the container name
+
+        Returns:
+            List[str]: Names sorted by their numeric suffix
+        """
+        names = [name for name in self._carregar() if prefix in name]
+        return sorted(names, key=lambda name: (len(name), name))
+
+    def redes(self, container: str) -> Dict[str, Dict[str, str]]:
+        """
+        Return the networks a container is attached to.
+
+        Args:
+            container: Container name
+
+        Returns:
+            Dict mapping network name to its 'ip' and 'gateway'
+        """
+        networks = self._carregar()[container]["NetworkSettings"]["Networks"]
+        return {
+            name: {"ip": info.get("IPAddress", ""), "gateway": info.get("Gateway", "")}
+            for name, info in networks.items()
+        }
+
+    def ambiente(self, container: str) -> Dict[str, str]:
+        """
+        Return the environment variables of a container.
+
+        Args:
+            container: Container name
+
+        Returns:
+            Dict mapping variable names to values
+        """
+        self._carregar()
+        with self._lock:
+            if container not in self._detalhes:
+                self._detalhes[container] = self.cliente.inspecionar(container)
+            env_list = self._detalhes[container]["Config"].get("Env") or []
+        return dict(entry.split("=", 1) for entry in env_list if "=" in entry)
+
+    def ip(self, container: str) -> str:
+        """
+        Return the main address of a container.
+
+        Routers announce ENDERECO_IP; other containers use their first network.
+
+        Args:
+            container: Container name
+
+        Returns:
+            str: IPv4 address
+        """
+        announced = self.ambiente(container).get("ENDERECO_IP")
+        if announced:
+            return announced
+        return next(iter(self.redes(container).values()))["ip"]
+
+    def gateway(self, container: str) -> str:
+        """
+        Return the bridge gateway of the network holding the container's main address.
+
+        Args:
+            container: Container name
+
+        Returns:
+            str: Gateway IPv4 address
+        """
+        main_ip = self.ip(container)
+        for network in self.redes(container).values():
+            if network["ip"] == main_ip:
+                return network["gateway"]
+        return next(iter(self.redes(container).values()))["gateway"]
+
+    def executar(self, container: str, command: List[str]) -> Tuple[int, str, str]:
+        """
+        Run one command inside a container.
+
+        Args:
+            container: Container name
+            command: Command and arguments
+
+        Returns:
+            Tuple with (exit code, stdout, stderr)
+        """
+        return self.cliente.executar(container, command)
+
+    def executar_em_lote(self, jobs: List[Tuple[str, List[str]]]) -> List[Tuple[int, str, str]]:
+        """
+        Run many commands in parallel on the inventory's worker threads.
+
+        Workers live as long as the inventory, so each keeps its API connection
+        open across batches.
+
+        Args:
+            jobs: List of (container, command) pairs
+
+        Returns:
+            List of (exit code, stdout, stderr) in the same order as jobs
+        """
+        return list(self._executor.map(lambda job: self.cliente.executar(*job), jobs))
@@ -0,0 +1,435 @@
+"""
+Failure Analysis Module
+
+This module answers what-if questions about the topology for capacity
+planning: the k shortest loopless paths between two routers (Yen's
+algorithm) and the effect of failing each router or link, alone or in pairs,
+on every source-destination pair.
+
+The analysis runs over a frozen copy of the CSR graph, with routers renumbered
+in ID order so that SPF ties are broken as in the routing tables. One SPF tree
+per source is computed up front and kept in flat arrays, in preorder, so the
+routers below any router form a contiguous range. A failure only moves the
+paths of the pairs whose tree goes through the failed element. Detached
+routers that still have an equal-cost parent keep their cost, with their
+whole subtree when no failure lies inside it; the others are recomputed by a
+Dijkstra restricted to the detached routers, seeded from the attached ones.
+The copy holds only arrays and lists, so scenarios can be split across
+worker processes.
+"""
+
+import heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from class_net.spf_graph import GrafoCSR, INFINITO
+
+Elemento = Union[str, Tuple[str, str]]
+
+CENARIOS_POR_LOTE = 64
+
+_analisador: Optional["AnalisadorDeFalhas"] = None
+
+class AnalisadorDeFalhas:
+    """
+    What-if engine over a frozen copy of the link state graph.
+
+    Attributes:
+        nomes (List[str]): Router ID of every index, in ID order
+        indices (Dict[str, int]): Index of every router ID
+        inicio (array): Row offsets of the forward graph, one extra at the end
+        destinos (array): Target of every forward link
+        custos (array): Cost of every forward link
+        inicio_reverso (array): Row offsets of the reverse graph
+        origens (array): Source of every reverse link
+        custos_reversos (array): Cost of every reverse link
+        distancias (array): Baseline cost of every (source, destination), flattened
+        predecessores (array): Baseline parent of every (source, destination), -1 for none
+        ordem (array): Routers of every baseline tree in preorder, flattened
+        posicao (array): Position of every router in the preorder of each tree
+        tamanho (array): Size of the subtree below every router in each tree
+    """
+
+    def __init__(self, grafo: GrafoCSR):
+        """
+        Freeze a graph and compute the baseline SPF tree of every router.
+
+        Routers without an LSA and inactive routers are left out, with their links.
+
+        Args:
+            grafo: CSR graph, already in sync with the LSDB
+        """
+        usable = sorted((index for index in range(len(grafo)) if not grafo.excluido[index]),
+                        key=grafo.nomes.__getitem__)
+        renumber = {old: new for new, old in enumerate(usable)}
+        self.nomes = [grafo.nomes[old] for old in usable]
+        self.indices = {name: index for index, name in enumerate(self.nomes)}
+
+        rows: List[List[Tuple[int, int]]] = []
+        for old in usable:
+            offset = grafo.inicio[old]
+            end = offset + grafo.grau[old]
+            rows.append(sorted((renumber[target], cost)
+                               for target, cost in zip(grafo.destinos[offset:end], grafo.custos[offset:end])
+                               if target in renumber))
+        self.inicio, self.destinos, self.custos = self._csr(rows)
+        reverse_rows: List[List[Tuple[int, int]]] = [[] for _ in rows]
+        for origin, row in enumerate(rows):
+            for target, cost in row:
+                reverse_rows[target].append((origin, cost))
+        self.inicio_reverso, self.origens, self.custos_reversos = self._csr(reverse_rows)
+
+        size = len(self.nomes)
+        self.distancias = array('q')
+        self.predecessores = array('i')
+        self.ordem = array('i')
+        self.posicao = array('i', [0]) * (size * size)
+        self.tamanho = array('i', [0]) * (size * size)
+        for source in range(size):
+            distances, predecessors = self._spf(source)
+            self.distancias.extend(distances)
+            self.predecessores.extend(predecessors)
+            self._preordem(source, predecessors)
+
+    @staticmethod
+    def _csr(rows: List[List[Tuple[int, int]]]) -> Tuple[array, array, array]:
+        """Pack rows of (neighbor, cost) into CSR arrays."""
+        offsets = array('i', [0])
+        targets, costs = array('i'), array('i')
+        for row in rows:
+            targets.extend(target for target, _ in row)
+            costs.extend(cost for _, cost in row)
+            offsets.append(len(targets))
+        return offsets, targets, costs
+
+    def _spf(self, source: int) -> Tuple[array, array]:
+        """
+        Run Dijkstra from a router, breaking ties by router ID.
+
+        Args:
+            source: Router index
+
+        Returns:
+            Tuple with (distances, parents), INFINITO and -1 when unreachable
+        """
+        size = len(self.nomes)
+        start, targets, costs = self.inicio, self.destinos, self.custos
+        distances = array('q', [INFINITO]) * size
+        predecessors = array('i', [-1]) * size
+        distances[source] = 0
+        queue = [source]
+        while queue:
+            current_cost, current = divmod(heapq.heappop(queue), size)
+            if current_cost > distances[current]:
+                continue
+            for neighbor, cost in zip(targets[start[current]:start[current + 1]],
+                                      costs[start[current]:start[current + 1]]):
+                path_cost = current_cost + cost
+                if path_cost < distances[neighbor]:
+                    distances[neighbor] = path_cost
+                    predecessors[neighbor] = current
+                    heapq.heappush(queue, path_cost * size + neighbor)
+        return distances, predecessors
+
+    def _preordem(self, source: int, predecessors: array) -> None:
+        """Append the preorder of a tree and record positions and subtree sizes."""
+        size = len(self.nomes)
+        base = source * size
+        children: List[List[int]] = [[] for _ in range(size)]
+        for node, parent in enumerate(predecessors):
+            if parent >= 0:
+                children[parent].append(node)
+        order = array('i')
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            self.posicao[base + node] = len(order)
+            order.append(node)
+            stack.extend(reversed(children[node]))
+        for node in reversed(order):
+            self.tamanho[base + node] = 1 + sum(self.tamanho[base + child] for child in children[node])
+        order.extend([-1] * (size - len(order)))
+        self.ordem.extend(order)
+
+    def _custo(self, origin: int, target: int) -> int:
+        """Return the cost of a link, INFINITO when there is none."""
+        for neighbor, cost in zip(self.destinos[self.inicio[origin]:self.inicio[origin + 1]],
+                                  self.custos[self.inicio[origin]:self.inicio[origin + 1]]):
+            if neighbor == target:
+                return cost
+        return INFINITO
+
+    def _caminho_restrito(self, source: int, target: int, banned_nodes: Set[int],
+                          banned_links: Set[Tuple[int, int]]) -> Optional[Tuple[int, List[int]]]:
+        """
+        Find a shortest path that avoids some routers and links.
+
+        Args:
+            source: Source index
+            target: Destination index
+            banned_nodes: Routers the path may not cross
+            banned_links: Directed links the path may not use
+
+        Returns:
+            Tuple with (cost, indices from source to destination), or None
+        """
+        size = len(self.nomes)
+        start, targets, costs = self.inicio, self.destinos, self.custos
+        distances = {source: 0}
+        predecessors = {source: -1}
+        queue = [source]
+        while queue:
+            current_cost, current = divmod(heapq.heappop(queue), size)
+            if current_cost > distances[current]:
+                continue
+            if current == target:
+                path = []
+                while current >= 0:
+                    path.append(current)
+                    current = predecessors[current]
+                return current_cost, path[::-1]
+            for neighbor, cost in zip(targets[start[current]:start[current + 1]],
+                                      costs[start[current]:start[current + 1]]):
+                if neighbor in banned_nodes or (current, neighbor) in banned_links:
+                    continue
+                path_cost = current_cost + cost
+                if path_cost < distances.get(neighbor, INFINITO):
+                    distances[neighbor] = path_cost
+                    predecessors[neighbor] = current
+                    heapq.heappush(queue, path_cost * size + neighbor)
+        return None
+
+    def k_caminhos(self, source_id: str, target_id: str, k: int) -> List[Tuple[int, List[str]]]:
+        """
+        Find the k shortest loopless paths between two routers (Yen's algorithm).
+
+        Args:
+            source_id: Source router ID
+            target_id: Destination router ID
+            k: Number of paths wanted
+
+        Returns:
+            Up to k tuples of (cost, router IDs), cheapest first
+        """
+        source, target = self.indices.get(source_id), self.indices.get(target_id)
+        if source is None or target is None or k <= 0:
+            return []
+        first = self._caminho_restrito(source, target, set(), set())
+        if first is None:
+            return []
+        found = [first]
+        candidates: List[Tuple[int, List[int]]] = []
+        seen = {tuple(first[1])}
+        while len(found) < k:
+            _, previous = found[-1]
+            root_cost = 0
+            for position in range(len(previous) - 1):
+                spur, root = previous[position], previous[:position + 1]
+                banned_links = {(path[position], path[position + 1])
+                                for _, path in found if path[:position + 1] == root}
+                spur_path = self._caminho_restrito(spur, target, set(root[:-1]), banned_links)
+                if spur_path is not None:
+                    path = root[:-1] + spur_path[1]
+                    if tuple(path) not in seen:
+                        seen.add(tuple(path))
+                        heapq.heappush(candidates, (root_cost + spur_path[0], path))
+                root_cost += self._custo(spur, previous[position + 1])
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates))
+        return [(cost, [self.nomes[node] for node in path]) for cost, path in found]
+
+    def elementos(self) -> List[Elemento]:
+        """Return every router and every link (as a sorted pair of IDs) of the graph."""
+        links = set()
+        for origin in range(len(self.nomes)):
+            for target in self.destinos[self.inicio[origin]:self.inicio[origin + 1]]:
+                links.add((min(origin, target), max(origin, target)))
+        return list(self.nomes) + [(self.nomes[a], self.nomes[b]) for a, b in sorted(links)]
+
+    def simular(self, failures: Sequence[Elemento]) -> Dict[str, Any]:
+        """
+        Measure the effect of failing some routers and links together.
+
+        Pairs involving a failed router are not counted.
+
+        Args:
+            failures: Router IDs and links, given as pairs of router IDs
+
+        Returns:
+            Dict with 'falhas', 'pares_afetados' (pairs whose path went
+            through a failed element), 'pares_inalcancaveis', 'estiramento_medio'
+            and 'estiramento_maximo' (new cost over old cost of the affected
+            pairs still reachable, 1.0 when there are none)
+        """
+        size = len(self.nomes)
+        failed_nodes: Set[int] = set()
+        failed_links: Set[Tuple[int, int]] = set()
+        for element in failures:
+            if isinstance(element, str):
+                if element in self.indices:
+                    failed_nodes.add(self.indices[element])
+            elif element[0] in self.indices and element[1] in self.indices:
+                a, b = self.indices[element[0]], self.indices[element[1]]
+                failed_links.update({(a, b), (b, a)})
+
+        distances, parents, order = self.distancias, self.predecessores, self.ordem
+        positions, sizes = self.posicao, self.tamanho
+        start, targets, costs = self.inicio, self.destinos, self.custos
+        reverse_start, origins, reverse_costs = self.inicio_reverso, self.origens, self.custos_reversos
+        detached = bytearray(size)
+        affected = unreachable = 0
+        stretch_sum, stretch_max = 0.0, 1.0
+        for source in range(size):
+            if source in failed_nodes:
+                continue
+            base = source * size
+            roots = [positions[base + node] for node in failed_nodes if distances[base + node] < INFINITO]
+            for a, b in failed_links:
+                if parents[base + b] == a:
+                    roots.append(positions[base + b])
+            if not roots:
+                continue
+
+            # Detached routers are flagged by preorder position, so whole
+            # subtrees are flagged and cleared with one slice assignment.
+            roots.sort()
+            ranges: List[Tuple[int, int]] = []
+            for first in roots:
+                if not ranges or first >= ranges[-1][1]:
+                    ranges.append((first, first + sizes[base + order[base + first]]))
+            for first, end in ranges:
+                detached[first:end] = b'\x01' * (end - first)
+                affected += end - first
+
+            # Detached routers are taken by old cost, an order in which every
+            # equal-cost parent comes first. One with an equal-cost link from
+            # an attached router keeps its cost, and so does its subtree
+            # unless a failure lies inside it; the others need a search, and
+            # only below them are the children looked at.
+            frontier = [distances[base + order[base + first]] * size + order[base + first]
+                        for first, _ in ranges]
+            heapq.heapify(frontier)
+            changed = []
+            while frontier:
+                old, node = divmod(heapq.heappop(frontier), size)
+                position = positions[base + node]
+                span = sizes[base + node]
+                if node in failed_nodes:
+                    affected -= 1
+                else:
+                    for origin, cost in zip(origins[reverse_start[node]:reverse_start[node + 1]],
+                                            reverse_costs[reverse_start[node]:reverse_start[node + 1]]):
+                        if (distances[base + origin] + cost == old and not detached[positions[base + origin]]
+                                and origin not in failed_nodes and (origin, node) not in failed_links):
+                            break
+                    else:
+                        changed.append(node)
+                        origin = -1
+                    if origin >= 0:
+                        if not any(position < root < position + span for root in roots):
+                            detached[position:position + span] = bytes(span)
+                            stretch_sum += span
+                            continue
+                        detached[position] = 0
+                        stretch_sum += 1
+                child = position + 1
+                while child < position + span:
+                    descendant = order[base + child]
+                    heapq.heappush(frontier, distances[base + descendant] * size + descendant)
+                    child += sizes[base + descendant]
+
+            repaired: Dict[int, int] = {}
+            queue = []
+            for node in changed:
+                best = INFINITO
+                for origin, cost in zip(origins[reverse_start[node]:reverse_start[node + 1]],
+                                        reverse_costs[reverse_start[node]:reverse_start[node + 1]]):
+                    if (distances[base + origin] + cost < best and not detached[positions[base + origin]]
+                            and origin not in failed_nodes and (origin, node) not in failed_links):
+                        best = distances[base + origin] + cost
+                if best < INFINITO:
+                    repaired[node] = best
+                    queue.append(best * size + node)
+            heapq.heapify(queue)
+            while queue:
+                current_cost, current = divmod(heapq.heappop(queue), size)
+                if current_cost > repaired[current]:
+                    continue
+                for neighbor, cost in zip(targets[start[current]:start[current + 1]],
+                                          costs[start[current]:start[current + 1]]):
+                    path_cost = current_cost + cost
+                    if (path_cost < repaired.get(neighbor, INFINITO) and detached[positions[base + neighbor]]
+                            and neighbor not in failed_nodes and (current, neighbor) not in failed_links):
+                        repaired[neighbor] = path_cost
+                        heapq.heappush(queue, path_cost * size + neighbor)
+
+            for first, end in ranges:
+                detached[first:end] = bytes(end - first)
+            for node in changed:
+                if node not in repaired:
+                    unreachable += 1
+                    continue
+                old = distances[base + node]
+                stretch = repaired[node] / old if old else 1.0
+                stretch_sum += stretch
+                stretch_max = max(stretch_max, stretch)
+
+        reachable = affected - unreachable
+        return {
+            'falhas': list(failures),
+            'pares_afetados': affected,
+            'pares_inalcancaveis': unreachable,
+            'estiramento_medio': stretch_sum / reachable if reachable else 1.0,
+            'estiramento_maximo': stretch_max,
+        }
+
+    def varrer(self, scenarios: Iterable[Sequence[Elemento]], processes: int = 1) -> List[Dict[str, Any]]:
+        """
+        Simulate many failure scenarios, optionally across worker processes.
+
+        Args:
+            scenarios: Each scenario is a sequence of elements failed together
+            processes: Worker processes, 1 to run in this process
+
+        Returns:
+            The result of simular for every scenario, in order
+        """
+        scenarios = list(scenarios)
+        if processes <= 1 or len(scenarios) <= CENARIOS_POR_LOTE:
+            return [self.simular(failures) for failures in scenarios]
+        batches = [scenarios[index:index + CENARIOS_POR_LOTE]
+                   for index in range(0, len(scenarios), CENARIOS_POR_LOTE)]
+        with ProcessPoolExecutor(processes, initializer=_iniciar_trabalhador, initargs=(self,)) as executor:
+            return [result for batch in executor.map(_simular_lote, batches) for result in batch]
+
+    def falhas_simples(self, processes: int = 1) -> List[Dict[str, Any]]:
+        """Simulate the failure of every router and every link, one at a time."""
+        return self.varrer(([element] for element in self.elementos()), processes)
+
+    def falhas_duplas(self, elements: Optional[Sequence[Elemento]] = None,
+                      processes: int = 1) -> List[Dict[str, Any]]:
+        """
+        Simulate the failure of every pair of elements.
+
+        Args:
+            elements: Elements to combine, every router and link when None
+            processes: Worker processes
+
+        Returns:
+            The result of simular for every pair
+        """
+        if elements is None:
+            elements = self.elementos()
+        return self.varrer((list(pair) for pair in combinations(elements, 2)), processes)
+
+def _iniciar_trabalhador(analyser: AnalisadorDeFalhas) -> None:
+    """Keep the analyser received by a worker process."""
+    global _analisador
+    _analisador = analyser
+
+def _simular_lote(batch: List[Sequence[Elemento]]) -> List[Dict[str, Any]]:
+    """Simulate a batch of scenarios in a worker process."""
+    return [_analisador.simular(failures) for failures in batch]
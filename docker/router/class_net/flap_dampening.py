@@ -0,0 +1,149 @@
+"""
+Flap Dampening Module
+
+This module implements penalty-based dampening of neighbor state, in the
+spirit of BGP route flap dampening (RFC 2439). Every time a neighbor goes
+down its penalty grows by a fixed amount, and the penalty decays
+exponentially with a configurable half-life. A neighbor whose penalty
+exceeds the suppress threshold is kept down, even while it answers, until
+the penalty decays below the reuse threshold. A flapping neighbor therefore
+stops changing the router's LSA, and with it the network-wide floods and
+SPF runs, while a single failure is not delayed at all.
+"""
+
+import time
+from typing import Callable, Dict, List
+
+PENALIDADE_OSCILACAO = 1000.0
+SUPRESSAO_MAXIMA = 4
+
+class EstadoAmortecimento:
+    """
+    Dampening state of one neighbor.
+
+    Attributes:
+        penalidade (float): Penalty at the time of the last update
+        atualizado_em (float): Time of the last penalty update
+        ativo (Optional[bool]): Last state observed by the detector
+        suprimido (bool): Whether the neighbor is being held down
+        oscilacoes (int): Times the neighbor went down
+        supressoes (int): Times the neighbor was suppressed
+        reusos (int): Times a suppressed neighbor was released
+    """
+
+    def __init__(self, now: float):
+        """
+        Initialize a neighbor with no penalty.
+
+        Args:
+            now: Current time
+        """
+        self.penalidade = 0.0
+        self.atualizado_em = now
+        self.ativo = None
+        self.suprimido = False
+        self.oscilacoes = 0
+        self.supressoes = 0
+        self.reusos = 0
+
+class AmortecedorDeOscilacao:
+    """
+    Penalty-based dampening of the state reported for each neighbor.
+
+    Attributes:
+        meia_vida (float): Seconds for the penalty to halve
+        limiar_supressao (float): Penalty above which a neighbor is suppressed
+        limiar_reuso (float): Penalty below which a suppressed neighbor is released
+        penalidade_maxima (float): Penalty ceiling, bounding suppression to SUPRESSAO_MAXIMA half-lives
+        relogio (Callable[[], float]): Time source
+        estados (Dict[str, EstadoAmortecimento]): State by neighbor ID
+    """
+
+    def __init__(self, meia_vida: float, limiar_supressao: float = 2000.0,
+                 limiar_reuso: float = 750.0, relogio: Callable[[], float] = time.monotonic):
+        """
+        Initialize the dampener.
+
+        Args:
+            meia_vida: Seconds for the penalty to halve
+            limiar_supressao: Penalty above which a neighbor is suppressed
+            limiar_reuso: Penalty below which a suppressed neighbor is released
+            relogio: Time source
+
+        Raises:
+            ValueError: If the thresholds or the half-life are inconsistent
+        """
+        if meia_vida <= 0 or not 0 < limiar_reuso < limiar_supressao:
+            raise ValueError("É preciso meia-vida > 0 e 0 < reuso < supressão.")
+        self.meia_vida = meia_vida
+        self.limiar_supressao = limiar_supressao
+        self.limiar_reuso = limiar_reuso
+        self.penalidade_maxima = limiar_reuso * 2 ** SUPRESSAO_MAXIMA
+        self.relogio = relogio
+        self.estados: Dict[str, EstadoAmortecimento] = {}
+
+    def _atualizar(self, neighbor: str) -> EstadoAmortecimento:
+        """
+        Decay the penalty of a neighbor up to now and release it if due.
+
+        Args:
+            neighbor: Neighbor router ID
+
+        Returns:
+            EstadoAmortecimento: Updated state
+        """
+        now = self.relogio()
+        state = self.estados.get(neighbor)
+        if state is None:
+            state = self.estados[neighbor] = EstadoAmortecimento(now)
+        state.penalidade *= 2 ** (-(now - state.atualizado_em) / self.meia_vida)
+        state.atualizado_em = now
+        if state.suprimido and state.penalidade < self.limiar_reuso:
+            state.suprimido = False
+            state.reusos += 1
+        return state
+
+    def registrar(self, neighbor: str, ativo: bool) -> bool:
+        """
+        Record the state observed for a neighbor and return the state to use.
+
+        Args:
+            neighbor: Neighbor router ID
+            ativo: Whether the detector sees the neighbor up
+
+        Returns:
+            bool: True if the neighbor is up and not suppressed
+        """
+        state = self._atualizar(neighbor)
+        if not ativo and state.ativo:
+            state.oscilacoes += 1
+            state.penalidade = min(self.penalidade_maxima, state.penalidade + PENALIDADE_OSCILACAO)
+            if not state.suprimido and state.penalidade > self.limiar_supressao:
+                state.suprimido = True
+                state.supressoes += 1
+        state.ativo = ativo
+        return ativo and not state.suprimido
+
+    def suprimido(self, neighbor: str) -> bool:
+        """
+        Tell whether a neighbor is being held down.
+
+        Args:
+            neighbor: Neighbor router ID
+
+        Returns:
+            bool: True if suppressed
+        """
+        return self._atualizar(neighbor).suprimido
+
+    def liberados(self) -> List[str]:
+        """
+        Return the neighbors that are up and whose suppression has ended.
+
+        Returns:
+            List of neighbor router IDs that can be brought back up
+        """
+        return [
+            neighbor for neighbor, state in self.estados.items()
+            if state.suprimido and state.ativo and not self._atualizar(neighbor).suprimido
+        ]
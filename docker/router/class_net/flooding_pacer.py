@@ -0,0 +1,260 @@
+"""
+Flooding Pacer Module
+
+This module queues the LSAs a router floods per destination (a neighbor
+address or a multicast segment) instead of sending each one at once. A
+sender thread bundles the queued LSAs of a destination into packed updates
+('lsu' messages) of at most TAMANHO_PACOTE bytes, so they fit the path MTU,
+and a token bucket per destination limits how many datagrams per second it
+receives. After a large failure, when many LSAs are flooded together, the
+receivers then get a few full datagrams at a steady rate instead of a burst
+of small ones that overruns their socket buffers.
+
+A newer copy of an LSA replaces the one still queued, so only the latest
+goes out. Queues hold at most capacidade LSAs; beyond that new ones are
+dropped and counted, and periodic re-origination makes up for them.
+The queue depths and counters can be read from a running router by sending
+an 'estatisticas' message to its LSA port, as done by running this module.
+"""
+
+import argparse
+import json
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Path MTU of an Ethernet link minus the IP and UDP headers
+TAMANHO_PACOTE = 1472
+CAPACIDADE_FILA = 1000
+INTERVALO_CONSULTA = 0.2
+
+class BaldeDeFichas:
+    """
+    Token bucket allowing taxa datagrams per second with bursts of up to rajada.
+
+    Attributes:
+        taxa (float): Tokens added per second
+        rajada (float): Maximum tokens held
+        fichas (float): Tokens currently held
+    """
+
+    def __init__(self, taxa: float, rajada: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            taxa: Tokens added per second
+            rajada: Maximum tokens held
+        """
+        self.taxa = taxa
+        self.rajada = rajada
+        self.fichas = rajada
+        self._atualizado = time.monotonic()
+
+    def retirar(self, now: float) -> float:
+        """
+        Take one token if available.
+
+        Args:
+            now: Current time.monotonic()
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds until one is available
+        """
+        self.fichas = min(self.rajada, self.fichas + (now - self._atualizado) * self.taxa)
+        self._atualizado = now
+        if self.fichas >= 1:
+            self.fichas -= 1
+            return 0.0
+        return (1 - self.fichas) / self.taxa
+
+class RitmadorDeInundacao:
+    """
+    Per-destination LSA queues drained as paced, bundled datagrams.
+
+    Attributes:
+        ROTEADOR_ID (str): Unique identifier for the router
+        taxa (float): Datagrams per second allowed to each destination
+        rajada (float): Datagrams a destination may receive back to back
+        capacidade (int): Maximum LSAs queued per destination
+        enviar (Callable): Sends an encoded datagram to a destination
+        filas (Dict[Hashable, OrderedDict]): LSA ID to encoded LSA, per destination
+        descartes (int): LSAs dropped because their queue was full
+        substituidos (int): Queued LSAs replaced by a newer copy
+        datagramas (int): Datagrams sent
+        lsas_enviados (int): LSAs sent in them
+        profundidade_maxima (int): Largest queue depth seen
+    """
+
+    def __init__(self, roteador_id: str, taxa: float, rajada: float,
+                 enviar: Callable[[bytes, Hashable], None], capacidade: int = CAPACIDADE_FILA):
+        """
+        Initialize the pacer.
+
+        Args:
+            roteador_id: Unique identifier for the router
+            taxa: Datagrams per second allowed to each destination
+            rajada: Datagrams a destination may receive back to back
+            enviar: Sends an encoded datagram to a destination
+            capacidade: Maximum LSAs queued per destination
+        """
+        self.ROTEADOR_ID = roteador_id
+        self.taxa = taxa
+        self.rajada = rajada
+        self.capacidade = capacidade
+        self.enviar = enviar
+        self.filas: Dict[Hashable, "OrderedDict[str, bytes]"] = {}
+        self._baldes: Dict[Hashable, BaldeDeFichas] = {}
+        self._condicao = threading.Condition()
+        self.descartes = 0
+        self.substituidos = 0
+        self.datagramas = 0
+        self.lsas_enviados = 0
+        self.profundidade_maxima = 0
+
+    def enfileirar(self, destination: Hashable, lsa_id: str, data: bytes) -> None:
+        """
+        Queue an LSA for a destination.
+
+        Args:
+            destination: Neighbor address or segment network
+            lsa_id: ID of the LSA, a queued copy of which is replaced
+            data: Encoded LSA
+        """
+        with self._condicao:
+            queue = self.filas.setdefault(destination, OrderedDict())
+            if lsa_id in queue:
+                self.substituidos += 1
+            elif len(queue) >= self.capacidade:
+                self.descartes += 1
+                return
+            queue[lsa_id] = data
+            self.profundidade_maxima = max(self.profundidade_maxima, len(queue))
+            self._condicao.notify()
+
+    def _empacotar(self, queue: "OrderedDict[str, bytes]") -> Tuple[bytes, int]:
+        """
+        Take the oldest queued LSAs that fit one datagram and encode them as a packed update.
+
+        A single LSA goes out as is, and one larger than TAMANHO_PACOTE on
+        its own still goes out, alone.
+
+        Args:
+            queue: Queue of one destination, non-empty
+
+        Returns:
+            Tuple with the datagram and the number of LSAs in it
+        """
+        prefix = f'{{"tipo": "lsu", "id": {json.dumps(self.ROTEADOR_ID)}, "lsas": ['.encode()
+        parts: List[bytes] = []
+        size = len(prefix) + 2
+        while queue:
+            data = next(iter(queue.values()))
+            if parts and size + len(data) + 2 > TAMANHO_PACOTE:
+                break
+            queue.popitem(last=False)
+            parts.append(data)
+            size += len(data) + 2
+        if len(parts) == 1:
+            return parts[0], 1
+        return prefix + b", ".join(parts) + b"]}", len(parts)
+
+    def executar(self, stop_event: threading.Event) -> None:
+        """
+        Send the queued LSAs until stopped.
+
+        Each round sends one datagram to every destination with LSAs queued
+        and a token available, then sleeps until new LSAs arrive or the next
+        token is due.
+
+        Args:
+            stop_event: Threading event to control the sending loop
+        """
+        while not stop_event.is_set():
+            batches = []
+            with self._condicao:
+                now = time.monotonic()
+                delay = 0.5
+                for destination, queue in self.filas.items():
+                    if not queue:
+                        continue
+                    bucket = self._baldes.setdefault(destination, BaldeDeFichas(self.taxa, self.rajada))
+                    wait = bucket.retirar(now)
+                    if wait:
+                        delay = min(delay, wait)
+                    else:
+                        batches.append((destination, *self._empacotar(queue)))
+                if not batches:
+                    self._condicao.wait(delay)
+                    continue
+
+            for destination, data, count in batches:
+                try:
+                    self.enviar(data, destination)
+                except OSError:
+                    continue
+                self.datagramas += 1
+                self.lsas_enviados += count
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Return the queue depths and counters.
+
+        Returns:
+            Dict with 'filas' (depth per destination), 'profundidade_maxima',
+            'descartes', 'substituidos', 'datagramas' and 'lsas_enviados'
+        """
+        with self._condicao:
+            return {
+                "filas": {str(destination): len(queue) for destination, queue in self.filas.items()},
+                "profundidade_maxima": self.profundidade_maxima,
+                "descartes": self.descartes,
+                "substituidos": self.substituidos,
+                "datagramas": self.datagramas,
+                "lsas_enviados": self.lsas_enviados,
+            }
+
+def consultar_estatisticas(ip: str, port: int, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    """
+    Ask a running router for its flooding statistics.
+
+    The query is sent again every INTERVALO_CONSULTA seconds, as a router
+    whose receive buffer is full drops it like any other datagram.
+
+    Args:
+        ip: Router address
+        port: Router LSA port
+        timeout: Seconds to wait for the answer
+
+    Returns:
+        Dict answered by the router, or None if it did not answer
+    """
+    deadline = time.monotonic() + timeout
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as query_socket:
+        while (remaining := deadline - time.monotonic()) > 0:
+            query_socket.settimeout(min(INTERVALO_CONSULTA, remaining))
+            query_socket.sendto(json.dumps({"tipo": "estatisticas"}).encode(), (ip, port))
+            try:
+                return json.loads(query_socket.recv(65535).decode())
+            except socket.timeout:
+                continue
+    return None
+
+def main() -> None:
+    """Print the flooding statistics of a router."""
+    # Imported here because lsa_manager imports this module
+    from class_net.lsa_manager import LSA_PORT
+
+    parser = argparse.ArgumentParser(description="Estatísticas de inundação de um roteador")
+    parser.add_argument("ip", nargs="?", default="127.0.0.1", help="Endereço do roteador")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Segundos de espera pela resposta")
+    args = parser.parse_args()
+    statistics = consultar_estatisticas(args.ip, LSA_PORT, args.timeout)
+    if statistics is None:
+        raise SystemExit(f"{args.ip} não respondeu")
+    print(json.dumps(statistics, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Flooding Topology Module
+
+This module computes and applies a dynamic flooding topology: a subgraph of
+the network over which LSAs are flooded instead of over every link. The
+leader, the router with the lowest ID among those it can reach, builds it
+from its LSDB and advertises it in its own LSA (field 'inundacao'), so every
+router floods over the same subgraph.
+
+The subgraph is a breadth-first spanning tree from the leader, which keeps
+the flooding depth low, where routers adopt at most GRAU_MAXIMO - 1 children
+while others can, so no router (the leader of a full mesh, for instance)
+forwards every LSA to everyone. Links are then added until every router has
+two of them (or all it has, if fewer), so a single link failure rarely
+disconnects it.
+A router floods over the whole network instead when the advertised subgraph
+no longer connects every router it can reach, when areas are in use, or
+before any subgraph is known.
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+REDUNDANCIA = 2
+GRAU_MAXIMO = 4
+
+Aresta = Tuple[str, str]
+
+def enlaces_ativos(lsdb: Dict[str, Any]) -> Dict[str, Set[str]]:
+    """
+    Build the links both ends advertise.
+
+    Args:
+        lsdb: Link state database
+
+    Returns:
+        Dict mapping each router to its neighbors over two-way links
+    """
+    return {
+        router: {neighbor for neighbor in lsa['vizinhos']
+                 if neighbor in lsdb and router in lsdb[neighbor]['vizinhos']}
+        for router, lsa in lsdb.items()
+    }
+
+def alcancaveis(links: Dict[str, Set[str]], origin: str) -> Set[str]:
+    """
+    Return the routers reachable from one router.
+
+    Args:
+        links: Adjacency of the graph
+        origin: Starting router
+
+    Returns:
+        Set of router IDs, origin included
+    """
+    seen = {origin}
+    queue = deque([origin])
+    while queue:
+        for neighbor in links.get(queue.popleft(), ()):
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return seen
+
+def calcular_topologia(links: Dict[str, Set[str]], leader: str) -> List[Aresta]:
+    """
+    Build the flooding subgraph of the routers reachable from the leader.
+
+    Args:
+        links: Adjacency over two-way links
+        leader: Root of the spanning tree
+
+    Returns:
+        List of (router, router) edges, each with the lower ID first, sorted
+    """
+    edges: Set[Aresta] = set()
+    degree = {leader: 0}
+    order = [leader]
+    for limit in (GRAU_MAXIMO, None):
+        # Routers only reachable through saturated ones are adopted in the unbounded pass
+        queue = deque(order)
+        while queue:
+            router = queue.popleft()
+            for neighbor in sorted(links[router]):
+                if limit is not None and degree[router] >= limit - (router != leader):
+                    break
+                if neighbor not in degree:
+                    degree[neighbor] = 1
+                    degree[router] += 1
+                    edges.add((min(router, neighbor), max(router, neighbor)))
+                    order.append(neighbor)
+                    queue.append(neighbor)
+
+    for router in sorted(degree):
+        candidates = sorted(links[router], key=lambda neighbor: (degree[neighbor], neighbor))
+        for neighbor in candidates:
+            if degree[router] >= REDUNDANCIA:
+                break
+            edge = (min(router, neighbor), max(router, neighbor))
+            if edge not in edges:
+                edges.add(edge)
+                degree[router] += 1
+                degree[neighbor] += 1
+    return sorted(edges)
+
+class TopologiaDeInundacao:
+    """
+    Dynamic flooding state of one router.
+
+    Attributes:
+        ROTEADOR_ID (str): Unique identifier for the router
+        recalculos (int): Subgraphs computed as leader
+        recuos (int): Flooding decisions that fell back to every link
+    """
+
+    def __init__(self, roteador_id: str):
+        """
+        Initialize the state.
+
+        Args:
+            roteador_id: Unique identifier for the router
+        """
+        self.ROTEADOR_ID = roteador_id
+        self.recalculos = 0
+        self.recuos = 0
+        self._anuncio: Tuple[Any, Optional[List[List[str]]]] = (None, None)
+        self._decisao: Tuple[Any, Optional[str], Any, Optional[Set[str]]] = (None, None, None, None)
+
+    def _enlaces(self, lsdb: Dict[str, Any], inactive: List[str]) -> Optional[Dict[str, Set[str]]]:
+        """
+        Return the two-way links of the LSDB, without those to inactive neighbors.
+
+        Args:
+            lsdb: Link state database
+            inactive: Currently inactive neighbors
+
+        Returns:
+            Adjacency, or None when areas are in use
+        """
+        if len({lsa.get('area') for lsa in lsdb.values()}) > 1:
+            return None
+        links = enlaces_ativos(lsdb)
+        for neighbor in inactive:
+            links.get(self.ROTEADOR_ID, set()).discard(neighbor)
+            links.get(neighbor, set()).discard(self.ROTEADOR_ID)
+        return links
+
+    def anuncio(self, lsdb: Dict[str, Any], inactive: List[str]) -> Optional[List[List[str]]]:
+        """
+        Return the subgraph to advertise, if this router is the leader.
+
+        The subgraph is computed again only when the LSDB generation or the
+        inactive neighbors change.
+
+        Args:
+            lsdb: Link state database
+            inactive: Currently inactive neighbors
+
+        Returns:
+            List of [router, router] edges, or None when this router is not the leader
+        """
+        key = (getattr(lsdb, 'geracao', None), frozenset(inactive))
+        if key[0] is not None and key == self._anuncio[0]:
+            return self._anuncio[1]
+        links = self._enlaces(lsdb, inactive)
+        edges = None
+        if links is not None and self.ROTEADOR_ID in links:
+            reachable = alcancaveis(links, self.ROTEADOR_ID)
+            if min(reachable) == self.ROTEADOR_ID:
+                edges = [list(edge) for edge in calcular_topologia(links, self.ROTEADOR_ID)]
+                self.recalculos += 1
+        self._anuncio = (key, edges)
+        return edges
+
+    def vizinhos(self, lsdb: Dict[str, Any], inactive: List[str]) -> Optional[Set[str]]:
+        """
+        Return the neighbors to flood to over the advertised subgraph.
+
+        Only subgraph links that are still up count. If they do not connect
+        every router reachable from this one, flooding falls back to every
+        link until the leader advertises a new subgraph. The decision is kept
+        while the LSDB generation, the inactive neighbors and the advertised
+        subgraph stay the same.
+
+        Args:
+            lsdb: Link state database
+            inactive: Currently inactive neighbors
+
+        Returns:
+            Set of neighbor IDs, or None to flood to every neighbor
+        """
+        key = (getattr(lsdb, 'geracao', None), frozenset(inactive))
+        cached_key, leader, advertised, decision = self._decisao
+        if key[0] is not None and key == cached_key and leader in lsdb \
+                and lsdb[leader].get('inundacao') == advertised:
+            return decision
+
+        links = self._enlaces(lsdb, inactive)
+        leader, advertised, decision = None, None, None
+        if links is not None and self.ROTEADOR_ID in links:
+            reachable = alcancaveis(links, self.ROTEADOR_ID)
+            leader = min(reachable)
+            advertised = lsdb[leader].get('inundacao')
+            flooding: Dict[str, Set[str]] = {}
+            for first, second in advertised or ():
+                if second in links.get(first, ()):
+                    flooding.setdefault(first, set()).add(second)
+                    flooding.setdefault(second, set()).add(first)
+            if advertised and alcancaveis(flooding, self.ROTEADOR_ID) == reachable:
+                decision = flooding.get(self.ROTEADOR_ID, set())
+        if decision is None:
+            self.recuos += 1
+        self._decisao = (key, leader, advertised, decision)
+        return decision
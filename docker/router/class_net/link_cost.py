@@ -0,0 +1,156 @@
+"""
+Link Cost Module
+
+This module turns the round-trip times and losses measured towards each
+neighbor into the link cost announced in the router's LSA. Samples are
+smoothed with exponentially weighted moving averages, and a new cost is only
+announced when it moves far enough from the current one (relative and
+absolute thresholds) and the link has kept its cost for a hold-down period.
+A noisy or oscillating link therefore does not originate a new LSA, with its
+network-wide flood and SPF, on every sample.
+"""
+
+import time
+from typing import Dict, Optional
+
+RTT_REFERENCIA = 0.010
+PESO_RTT = 0.125
+PESO_PERDA = 0.1
+FATOR_PERDA = 4.0
+LIMIAR_RELATIVO = 0.3
+LIMIAR_ABSOLUTO = 2
+RETENCAO = 10.0
+CUSTO_MAXIMO = 0xFFFF
+
+class EstadoEnlace:
+    """
+    Measurements and announced cost of the link to one neighbor.
+
+    Attributes:
+        custo_base (int): Configured cost, the cost of an idle link
+        srtt (Optional[float]): Smoothed round-trip time in seconds, None before the first sample
+        perda (float): Smoothed loss ratio
+        custo (int): Cost currently announced
+        alterado_em (float): Monotonic time of the last announced change
+        amostras (int): Samples received
+    """
+
+    def __init__(self, custo_base: int):
+        """
+        Initialize a link announcing its configured cost.
+
+        Args:
+            custo_base: Configured cost
+        """
+        self.custo_base = custo_base
+        self.srtt: Optional[float] = None
+        self.perda = 0.0
+        self.custo = custo_base
+        self.alterado_em = float("-inf")
+        self.amostras = 0
+
+class CustoDinamico:
+    """
+    Maps per-neighbor RTT and loss measurements to link costs.
+
+    The cost is custo_base * (1 + srtt / rtt_referencia) * (1 + fator_perda * perda),
+    so an idle LAN link keeps its configured cost and a link with
+    rtt_referencia of delay costs twice as much.
+
+    Attributes:
+        enlaces (Dict[str, EstadoEnlace]): Link state by neighbor ID
+        rtt_referencia (float): RTT that doubles the cost, in seconds
+        peso_rtt (float): EWMA weight of a new RTT sample
+        peso_perda (float): EWMA weight of a new loss sample
+        fator_perda (float): Cost multiplier per unit of loss ratio
+        limiar_relativo (float): Minimum relative change announced
+        limiar_absoluto (int): Minimum absolute change announced
+        retencao (float): Minimum seconds between changes of the same link
+        mudancas (int): Cost changes announced so far
+    """
+
+    def __init__(self, custos_base: Dict[str, int], rtt_referencia: float = RTT_REFERENCIA,
+                 peso_rtt: float = PESO_RTT, peso_perda: float = PESO_PERDA,
+                 fator_perda: float = FATOR_PERDA, limiar_relativo: float = LIMIAR_RELATIVO,
+                 limiar_absoluto: int = LIMIAR_ABSOLUTO, retencao: float = RETENCAO):
+        """
+        Initialize the estimator.
+
+        Args:
+            custos_base: Configured cost of every neighbor link
+            rtt_referencia: RTT that doubles the cost, in seconds
+            peso_rtt: EWMA weight of a new RTT sample
+            peso_perda: EWMA weight of a new loss sample
+            fator_perda: Cost multiplier per unit of loss ratio
+            limiar_relativo: Minimum relative change announced
+            limiar_absoluto: Minimum absolute change announced
+            retencao: Minimum seconds between changes of the same link
+        """
+        self.enlaces = {neighbor: EstadoEnlace(cost) for neighbor, cost in custos_base.items()}
+        self.rtt_referencia = rtt_referencia
+        self.peso_rtt = peso_rtt
+        self.peso_perda = peso_perda
+        self.fator_perda = fator_perda
+        self.limiar_relativo = limiar_relativo
+        self.limiar_absoluto = limiar_absoluto
+        self.retencao = retencao
+        self.mudancas = 0
+
+    def custo(self, neighbor: str) -> Optional[int]:
+        """
+        Return the cost announced for the link to a neighbor.
+
+        Args:
+            neighbor: Neighbor router ID
+
+        Returns:
+            Announced cost, or None for an unknown neighbor
+        """
+        link = self.enlaces.get(neighbor)
+        return link.custo if link else None
+
+    def custo_estimado(self, neighbor: str) -> int:
+        """
+        Return the cost the current estimates map to, before hysteresis.
+
+        Args:
+            neighbor: Neighbor router ID
+
+        Returns:
+            int: Candidate cost
+        """
+        link = self.enlaces[neighbor]
+        delay_factor = 1 + (link.srtt or 0.0) / self.rtt_referencia
+        loss_factor = 1 + self.fator_perda * link.perda
+        return max(1, min(CUSTO_MAXIMO, round(link.custo_base * delay_factor * loss_factor)))
+
+    def registrar(self, neighbor: str, rtt: Optional[float], now: Optional[float] = None) -> bool:
+        """
+        Add a probe result and decide whether the announced cost changes.
+
+        Args:
+            neighbor: Neighbor router ID
+            rtt: Measured round-trip time in seconds, None for a lost probe
+            now: Current monotonic time, time.monotonic() when omitted
+
+        Returns:
+            bool: True if the announced cost changed
+        """
+        link = self.enlaces.get(neighbor)
+        if link is None:
+            return False
+        now = time.monotonic() if now is None else now
+        link.amostras += 1
+        link.perda += self.peso_perda * ((rtt is None) - link.perda)
+        if rtt is not None:
+            link.srtt = rtt if link.srtt is None else link.srtt + self.peso_rtt * (rtt - link.srtt)
+
+        candidate = self.custo_estimado(neighbor)
+        difference = abs(candidate - link.custo)
+        if (difference == 0 or difference < max(self.limiar_absoluto, self.limiar_relativo * link.custo)
+                or now - link.alterado_em < self.retencao):
+            return False
+        link.custo = candidate
+        link.alterado_em = now
+        self.mudancas += 1
+        return True
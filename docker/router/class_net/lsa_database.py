@@ -0,0 +1,142 @@
+"""
+LSA Database Module
+
+This module provides the dictionary holding the LSDB (and the summary LSAs),
+extended with a generation number. The generation grows whenever an LSA is
+added, removed or replaced by one whose topology differs; periodic
+re-originations that only carry a new sequence number leave it unchanged.
+Consumers can then tell that the topology is the same as in an earlier
+calculation without comparing the databases.
+
+Every LSA stored is also classified against the copy it replaces: a new
+router, a refresh, a prefix-only change (address or area data, same links)
+or a change of links, the only kind that can move shortest paths.
+
+Changes made inside transacao() raise the generation once, when it ends, so
+a batch of received LSAs is seen by the route calculation as a single
+change instead of one per LSA.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+CAMPOS_TOPOLOGIA = ('ip', 'vizinhos', 'area', 'areas', 'destinos')
+TIPOS_MUDANCA = ('novo', 'refresco', 'prefixo', 'enlaces')
+
+class BancoLSA(dict):
+    """
+    LSA dictionary keyed by router ID (or summary ID) with a generation number.
+
+    Attributes:
+        geracao (int): Incremented after every change of topology content
+        mudancas (Dict[str, int]): LSAs stored so far by kind of change
+        transacoes (int): Transactions that changed the topology
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the database, like dict()."""
+        super().__init__(*args, **kwargs)
+        self.geracao = 0
+        self.mudancas = {kind: 0 for kind in TIPOS_MUDANCA}
+        self.transacoes = 0
+        self._profundidade = 0
+        self._pendente = False
+
+    @staticmethod
+    def mesma_topologia(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+        """
+        Tell whether two copies of an LSA describe the same topology.
+
+        Args:
+            old: Stored LSA
+            new: Incoming LSA
+
+        Returns:
+            bool: True if only fields such as the sequence number differ
+        """
+        return all(old.get(field) == new.get(field) for field in CAMPOS_TOPOLOGIA)
+
+    @staticmethod
+    def classificar(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> str:
+        """
+        Classify the replacement of an LSA.
+
+        Args:
+            old: Stored LSA, None when there is none
+            new: Incoming LSA
+
+        Returns:
+            str: 'novo' (no previous copy), 'refresco' (same topology),
+            'prefixo' (same links, other data changed) or 'enlaces'
+        """
+        if old is None:
+            return 'novo'
+        if old.get('vizinhos') != new.get('vizinhos'):
+            return 'enlaces'
+        return 'refresco' if BancoLSA.mesma_topologia(old, new) else 'prefixo'
+
+    def _mudou(self) -> None:
+        """Raise the generation, or leave it for the end of the open transaction."""
+        if self._profundidade:
+            self._pendente = True
+        else:
+            self.geracao += 1
+
+    @contextmanager
+    def transacao(self) -> Iterator["BancoLSA"]:
+        """
+        Group changes so that they raise the generation only once, at the end.
+
+        Transactions may be nested; only the outermost one raises it.
+
+        Yields:
+            BancoLSA: This database
+        """
+        self._profundidade += 1
+        try:
+            yield self
+        finally:
+            self._profundidade -= 1
+            if not self._profundidade and self._pendente:
+                self._pendente = False
+                self.transacoes += 1
+                self.geracao += 1
+
+    def __setitem__(self, lsa_id: str, lsa: Dict[str, Any]) -> None:
+        kind = BancoLSA.classificar(self.get(lsa_id), lsa)
+        super().__setitem__(lsa_id, lsa)
+        self.mudancas[kind] += 1
+        if kind != 'refresco':
+            self._mudou()
+
+    def __delitem__(self, lsa_id: str) -> None:
+        super().__delitem__(lsa_id)
+        self._mudou()
+
+    def pop(self, lsa_id: str, *default: Any) -> Any:
+        if lsa_id not in self:
+            return super().pop(lsa_id, *default)
+        lsa = super().pop(lsa_id)
+        self._mudou()
+        return lsa
+
+    def popitem(self) -> Tuple[str, Any]:
+        item = super().popitem()
+        self._mudou()
+        return item
+
+    def setdefault(self, lsa_id: str, default: Any = None) -> Any:
+        if lsa_id not in self:
+            self[lsa_id] = default
+        return self[lsa_id]
+
+    def update(self, other: Union[Dict[str, Any], Iterable[Tuple[str, Any]]] = (), **kwargs: Any) -> None:
+        items = other.items() if isinstance(other, dict) else other
+        for lsa_id, lsa in items:
+            self[lsa_id] = lsa
+        for lsa_id, lsa in kwargs.items():
+            self[lsa_id] = lsa
+
+    def clear(self) -> None:
+        super().clear()
+        self._mudou()
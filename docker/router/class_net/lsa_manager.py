@@ -6,77 +6,708 @@ in a network routing environment. It manages the flooding of network topology in
 between routers.
 """
 
+import queue
+import re
+import select
 import socket
 import json
-import os
-from threading import Event
-from typing import Dict, Tuple, Any
+from contextlib import nullcontext
+from threading import Event, Thread
+from typing import Callable, Dict, Hashable, List, Tuple, Any, Optional
+from class_net.batch_receiver import ReceptorEmLote
+from class_net.flooding_pacer import RitmadorDeInundacao
+from class_net.flooding_topology import TopologiaDeInundacao
+from class_net.lsa_database import BancoLSA
 from class_net.neighbor_manager import VizinhosManager
+from class_net.router_config import ConfiguracaoRoteador
+from class_net.segments import Rede, SegmentosDeRede
 
 LSA_PORT = 5000
+TAMANHO_MAXIMO_DATAGRAMA = 65535
+TAMANHO_LOTE = 8192
+TAMANHO_FILA_ESTAGIO = 1024
+# LSAs are encoded with their ID and sequence number first, so both can be read without decoding the rest
+CABECALHO_LSA = re.compile(rb'\{"id": "([^"\\]*)", "seq": (\d+)[,}]')
 
 class LSAManager:
     """
     Manages Link State Advertisements (LSAs) for network routing.
     
     This class handles the creation, transmission, and reception of LSAs,
-    maintaining network topology information and sequence numbers.
+    maintaining network topology information and sequence numbers. When areas
+    are configured, flooding is scoped to the areas of each LSA and area border
+    routers also originate summary LSAs.
+    
+    When an adjacency comes up, both routers exchange database descriptions
+    (LSA headers), request only the LSAs they miss or hold older copies of,
+    and receive them in packed updates, without waiting for re-origination.
+    
+    With multicast flooding, neighbors sharing a network segment receive
+    each LSA in a single datagram, and an LSA that arrived by multicast is
+    not sent again to the neighbors on its segment, which all got it.
+    
+    With dynamic flooding, LSAs only travel over the flooding subgraph the
+    leader advertises, falling back to every link when it is partitioned.
+    
+    With flooding pacing, LSAs are queued per neighbor (or segment) and sent
+    bundled in packed updates at a limited rate by the pacer's own thread.
+    
+    With stages, receiving, installing and flooding run in separate threads
+    joined by bounded queues, so slow sends do not stop the socket from
+    being read; a full queue blocks the stage feeding it.
+    
+    Received LSAs go through a pre-filter first: their ID and sequence
+    number are read from the start of the datagram and copies not newer
+    than the stored one, most of them in steady state, are dropped without
+    decoding the JSON. Anything else is decoded as usual.
+    
+    With batched receive, each time a socket becomes readable every datagram
+    queued on it, up to the batch size, is read at once into preallocated
+    buffers, and the batch is installed as one database transaction, so the
+    route calculation sees a single change per batch.
     
     Attributes:
         ROTEADOR_ID (str): Unique identifier for the router
         ENDERECO_IP (str): IP address of the router
         vizinhos_manager (VizinhosManager): Manager for neighbor relationships
         sequence_number (int): Sequence number for LSA messages
+        intervalo_lsa (float): Seconds between LSA originations
+        resumos (Dict): Summary LSAs received from area border routers
+        gerador_de_resumos (Optional[Callable]): Builds this router's summaries per area
+        originar_agora (Event): Set to originate the next LSA without waiting for the interval
+        ao_originar (Optional[Callable]): Called with every LSA this router originates
+        segmentos (Optional[SegmentosDeRede]): Shared segments for multicast flooding, None to unicast only
+        topologia (Optional[TopologiaDeInundacao]): Dynamic flooding subgraph, None to flood over every link
+        ritmador (Optional[RitmadorDeInundacao]): Paced flooding queues, None to send each LSA at once
+        estagios (bool): Whether receiving, installing and flooding run as separate stages
+        buffer_recepcao (Optional[int]): SO_RCVBUF of the receiving sockets in bytes, None for the system default
+        fila_recepcao (Optional[queue.Queue]): Batches of datagrams waiting to be installed, with stages
+        fila_envio (Optional[queue.Queue]): Installed LSAs waiting to be flooded, with stages
+        lsas_instalados (int): LSAs stored because they were newer than the current copy
+        bloqueios (Dict[str, int]): Times a stage waited on a full queue, per queue
+        pre_filtro (bool): Whether stale LSAs are dropped from their header, before decoding
+        duplicados_filtrados (int): LSAs dropped by the pre-filter
+        lote_recepcao (Optional[int]): Datagrams read per batch, None to read one at a time
+        receptor (Optional[ReceptorEmLote]): Batched reader of the receiving sockets, while receiving in batches
+        datagramas_recebidos (int): Datagrams read from the receiving sockets
+        estatisticas_de_rotas (Optional[Callable]): Returns the LSDB and route calculation state for 'estatisticas'
     """
     
-    def __init__(self, vizinhos_manager: VizinhosManager):
+    def __init__(self, vizinhos_manager: VizinhosManager,
+                 config: Optional[ConfiguracaoRoteador] = None):
         """
         Initialize the LSA Manager.
         
         Args:
             vizinhos_manager: Manager instance for handling neighbor relationships
+            config: Router configuration, read from the environment when omitted
         """
-        self.ROTEADOR_ID = os.getenv("ROTEADOR_ID")
-        self.ENDERECO_IP = os.getenv("ENDERECO_IP")
+        config = config or ConfiguracaoRoteador.de_ambiente()
+        self.ROTEADOR_ID = config.roteador_id
+        self.ENDERECO_IP = config.endereco_ip
         self.vizinhos_manager = vizinhos_manager
         self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sequence_number = 0
+        self.intervalo_lsa = config.intervalo_lsa
+        self.resumos: Dict[str, Any] = BancoLSA()
+        self.gerador_de_resumos: Optional[Callable[[], Dict[int, Dict[str, Any]]]] = None
+        self.originar_agora = Event()
+        self.ao_originar: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.segmentos: Optional[SegmentosDeRede] = None
+        if config.multicast:
+            addresses = [self.ENDERECO_IP] + [neighbor_data[0] for neighbor_data in config.vizinhos.values()]
+            self.segmentos = SegmentosDeRede(self.ROTEADOR_ID, addresses)
+        self.topologia = TopologiaDeInundacao(self.ROTEADOR_ID) if config.inundacao_dinamica else None
+        self.ritmador: Optional[RitmadorDeInundacao] = None
+        if config.taxa_inundacao:
+            self.ritmador = RitmadorDeInundacao(self.ROTEADOR_ID, config.taxa_inundacao,
+                                                config.rajada_inundacao, self._enviar_para)
+        self.estagios = config.estagios
+        self.buffer_recepcao = config.buffer_recepcao
+        self.fila_recepcao: Optional["queue.Queue[List[Tuple[bytes, Tuple[str, int], bool]]]"] = None
+        self.fila_envio: Optional["queue.Queue[Tuple[Any, ...]]"] = None
+        self.lsas_instalados = 0
+        self.bloqueios = {"recepcao": 0, "envio": 0}
+        self._parada: Optional[Event] = None
+        self.pre_filtro = config.pre_filtro
+        self.duplicados_filtrados = 0
+        self.lote_recepcao = config.lote_recepcao
+        self.receptor: Optional[ReceptorEmLote] = None
+        self.datagramas_recebidos = 0
+        self.estatisticas_de_rotas: Optional[Callable[[], Dict[str, Any]]] = None
 
-    def enviar_lsa(self, stop_event: Event) -> None:
+    def _vizinhos_para_inundar(self, areas: Optional[List[int]] = None,
+                               sender_ip: Optional[str] = None,
+                               lsa_database: Optional[Dict[str, Any]] = None) -> List[Tuple[str, str]]:
+        """
+        Select the active neighbors an LSA must be sent to.
+        
+        Args:
+            areas: Flooding scope of the LSA, every neighbor when None
+            sender_ip: Address the LSA came from, which is skipped
+            lsa_database: Database the dynamic flooding subgraph is checked against
+            
+        Returns:
+            List of (neighbor ID, neighbor IP)
+        """
+        flooding = None
+        if self.topologia is not None and lsa_database is not None:
+            flooding = self.topologia.vizinhos(lsa_database, self.vizinhos_manager.vizinhos_inativos)
+        return [
+            (neighbor, neighbor_data[0])
+            for neighbor, neighbor_data in self.vizinhos_manager.VIZINHOS.items()
+            if neighbor not in self.vizinhos_manager.vizinhos_inativos
+            and neighbor_data[0] != sender_ip
+            and (areas is None or self.vizinhos_manager.area_do_enlace(neighbor) in areas)
+            and (flooding is None or neighbor in flooding)
+        ]
+
+    def _enviar_para(self, data: bytes, destination: Hashable) -> None:
+        """
+        Send a datagram of the pacer to a neighbor address or a segment.
+        
+        Args:
+            data: Encoded message
+            destination: Neighbor IP, or segment network for multicast
+        """
+        if isinstance(destination, str):
+            self.udp_socket.sendto(data, (destination, LSA_PORT))
+        else:
+            self.segmentos.enviar(data, destination)
+
+    def _inundar(self, lsa_id: str, data: bytes, targets: List[Tuple[str, str]],
+                 flooding_socket: socket.socket, segment: Optional[Rede] = None) -> List[str]:
+        """
+        Send an LSA to some neighbors, once per shared segment where possible.
+        
+        With pacing, the LSA is queued for each destination instead.
+        
+        Args:
+            lsa_id: ID of the LSA
+            data: Encoded LSA
+            targets: (neighbor ID, neighbor IP) that must receive it
+            flooding_socket: Socket used for unicast copies
+            segment: Segment the LSA arrived on by multicast, whose routers already have it
+            
+        Returns:
+            List naming where each datagram went, for logging
+        """
+        if self.segmentos is None:
+            for _, ip in targets:
+                if self.ritmador:
+                    self.ritmador.enfileirar(ip, lsa_id, data)
+                else:
+                    flooding_socket.sendto(data, (ip, LSA_PORT))
+            return [f"{neighbor} ({ip})" for neighbor, ip in targets]
+
+        received = self.segmentos.membros_de(segment)
+        segments, unicast = self.segmentos.cobrir([(neighbor, ip) for neighbor, ip in targets
+                                                   if neighbor not in received])
+        sent = []
+        for network, neighbors in segments:
+            if self.ritmador:
+                self.ritmador.enfileirar(network, lsa_id, data)
+            else:
+                self.segmentos.enviar(data, network)
+            sent.append(f"segmento {network} ({', '.join(neighbors)})")
+        for neighbor, ip in unicast:
+            if self.ritmador:
+                self.ritmador.enfileirar(ip, lsa_id, data)
+            else:
+                flooding_socket.sendto(data, (ip, LSA_PORT))
+            sent.append(f"{neighbor} ({ip})")
+        return sent
+
+    def criar_lsa(self) -> Dict[str, Any]:
+        """
+        Build this router's LSA with its currently active links.
+        
+        Returns:
+            Dict with the LSA fields
+        """
+        lsa_data = {
+            "id": self.ROTEADOR_ID,
+            "seq": self.sequence_number,
+            "ip": self.ENDERECO_IP,
+            "vizinhos": {
+                neighbor: {"ip": neighbor_data[0], "custo": self.vizinhos_manager.custo_do_enlace(neighbor)}
+                for neighbor, neighbor_data in self.vizinhos_manager.VIZINHOS.items()
+                if neighbor not in self.vizinhos_manager.vizinhos_inativos
+            }
+        }
+        if self.vizinhos_manager.AREA is not None:
+            for neighbor, link in lsa_data["vizinhos"].items():
+                link["area"] = self.vizinhos_manager.area_do_enlace(neighbor)
+            lsa_data["area"] = self.vizinhos_manager.AREA
+            lsa_data["areas"] = self.vizinhos_manager.areas_conectadas()
+        return lsa_data
+
+    def criar_resumos(self) -> List[Dict[str, Any]]:
+        """
+        Build the summary LSAs of an area border router, one per attached area.
+        
+        Returns:
+            List of summary LSAs, empty for internal routers
+        """
+        if self.gerador_de_resumos is None or len(self.vizinhos_manager.areas_conectadas()) < 2:
+            return []
+        return [
+            {
+                "id": f"{self.ROTEADOR_ID}:{area}",
+                "seq": self.sequence_number,
+                "tipo": "resumo",
+                "origem": self.ROTEADOR_ID,
+                "area": area,
+                "destinos": destinations
+            }
+            for area, destinations in self.gerador_de_resumos().items()
+        ]
+
+    @staticmethod
+    def escopo(lsa_message: Dict[str, Any]) -> Optional[List[int]]:
+        """
+        Return the areas an LSA may be flooded into.
+        
+        Args:
+            lsa_message: Decoded LSA
+            
+        Returns:
+            List of area IDs, or None when the LSA is not area scoped
+        """
+        if lsa_message.get("tipo") == "resumo":
+            return [lsa_message["area"]]
+        return lsa_message.get("areas")
+
+    def enviar_lsa(self, stop_event: Event, lsa_database: Optional[Dict[str, Any]] = None) -> None:
         """
         Send Link State Advertisements to neighbors.
         
         Continuously sends LSA updates to all active neighbors until stopped.
+        The router's own LSA is also stored in its database, so routes do not
+        depend on neighbors flooding it back. Setting originar_agora (after a
+        link cost change, for instance) sends the next LSA right away, and
+        ao_originar, when set, is given every LSA originated. With multicast
+        flooding, segment hellos go out from this loop too, and with dynamic
+        flooding the leader adds the flooding subgraph to its LSA.
         
         Args:
             stop_event: Threading event to control the sending loop
+            lsa_database: Database receiving this router's own LSA
         """
         while not stop_event.is_set():
             self.sequence_number += 1
-            lsa_data = {
-                "id": self.ROTEADOR_ID,
-                "ip": self.ENDERECO_IP,
-                "vizinhos": {
-                    neighbor: {"ip": ip, "custo": cost} 
-                    for neighbor, (ip, cost) in self.vizinhos_manager.VIZINHOS.items() 
-                    if neighbor not in self.vizinhos_manager.vizinhos_inativos
-                },
-                "seq": self.sequence_number
-            }
-            
-            encoded_message = json.dumps(lsa_data).encode()
+            own_lsa = self.criar_lsa()
+            if self.topologia is not None and lsa_database is not None:
+                flooding_edges = self.topologia.anuncio(lsa_database, self.vizinhos_manager.vizinhos_inativos)
+                if flooding_edges:
+                    own_lsa["inundacao"] = flooding_edges
+            if lsa_database is not None:
+                lsa_database[self.ROTEADOR_ID] = own_lsa
+            if self.ao_originar:
+                self.ao_originar(own_lsa)
+            if self.segmentos:
+                self.segmentos.anunciar()
             
-            for neighbor, (ip, _) in self.vizinhos_manager.VIZINHOS.items():
-                if neighbor not in self.vizinhos_manager.vizinhos_inativos:
-                    self.udp_socket.sendto(encoded_message, (ip, LSA_PORT))
+            for lsa_data in [own_lsa] + self.criar_resumos():
+                self._inundar(lsa_data["id"], json.dumps(lsa_data).encode(),
+                              self._vizinhos_para_inundar(LSAManager.escopo(lsa_data), lsa_database=lsa_database),
+                              self.udp_socket)
                     
-            stop_event.wait(0.5)
+            self.originar_agora.wait(self.intervalo_lsa)
+            self.originar_agora.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Return the flooding statistics answered to 'estatisticas' queries.
+        
+        Returns:
+            Dict with the router ID, its sequence number, the datagrams
+            received, the LSAs installed and dropped by the pre-filter, the
+            pacer statistics under 'ritmo', the stage queues under
+            'estagios', the batched receive under 'lotes' and the LSDB and
+            route calculation state under 'rotas', each None when not in use
+        """
+        return {
+            "id": self.ROTEADOR_ID,
+            "seq": self.sequence_number,
+            "datagramas_recebidos": self.datagramas_recebidos,
+            "lsas_instalados": self.lsas_instalados,
+            "duplicados_filtrados": self.duplicados_filtrados,
+            "ritmo": self.ritmador.estatisticas() if self.ritmador else None,
+            "estagios": {
+                "fila_recepcao": self.fila_recepcao.qsize(),
+                "fila_envio": self.fila_envio.qsize(),
+                "bloqueios_recepcao": self.bloqueios["recepcao"],
+                "bloqueios_envio": self.bloqueios["envio"],
+            } if self.fila_recepcao is not None else None,
+            "lotes": self.receptor.estatisticas() if self.receptor else None,
+            "rotas": self.estatisticas_de_rotas() if self.estatisticas_de_rotas else None,
+        }
+
+    def _obsoleto(self, data: bytes, lsa_database: Dict[str, Any]) -> bool:
+        """
+        Tell from its header whether a datagram holds an LSA not newer than the stored copy.
+        
+        Only the ID and sequence number at the start of the datagram are
+        parsed. Router and summary IDs never clash, so both databases are
+        looked up. Equal sequence numbers count as stale, as when installing.
+        
+        Args:
+            data: Received datagram
+            lsa_database: Database storing router LSAs
+            
+        Returns:
+            bool: True if it can be dropped, False if it must be decoded
+        """
+        header = CABECALHO_LSA.match(data)
+        if header is None:
+            return False
+        lsa_id = header.group(1).decode()
+        current = lsa_database.get(lsa_id) or self.resumos.get(lsa_id)
+        return current is not None and int(header.group(2)) <= current["seq"]
+
+    def _ajustar_sequencia(self, lsa_id: str, sequence: int) -> bool:
+        """
+        Resume own numbering past a copy of an own LSA seen in the network.
+        
+        After a restart, neighbors may still hold this router's LSAs with a
+        higher sequence number and would drop the new ones as old. Numbering
+        moves past such a copy and the next LSA is originated right away, so
+        it replaces the copy everywhere.
+        
+        Args:
+            lsa_id: ID of the LSA seen
+            sequence: Its sequence number
+            
+        Returns:
+            bool: True if the LSA was originated by this router
+        """
+        if lsa_id.split(":")[0] != self.ROTEADOR_ID:
+            return False
+        if sequence > self.sequence_number:
+            self.sequence_number = sequence
+            self.originar_agora.set()
+        return True
+
+    def _cabecalhos(self, lsa_database: Dict[str, Any], neighbor_id: str) -> List[List[Any]]:
+        """
+        List the headers (id, seq) of the LSAs that may be sent to a neighbor.
+        
+        Args:
+            lsa_database: Database storing LSA information
+            neighbor_id: Neighbor router ID
+            
+        Returns:
+            List of [LSA ID, sequence number]
+        """
+        link_area = self.vizinhos_manager.area_do_enlace(neighbor_id)
+        headers = []
+        for database in (lsa_database, self.resumos):
+            for lsa_id, lsa_message in list(database.items()):
+                scope = LSAManager.escopo(lsa_message)
+                if scope is None or link_area in scope:
+                    headers.append([lsa_id, lsa_message["seq"]])
+        return headers
+
+    def _enviar_em_lotes(self, message: Dict[str, Any], field: str, items: List[Any], ip: str) -> None:
+        """
+        Send a message whose item list is split across datagrams of at most TAMANHO_LOTE bytes.
+        
+        At least one datagram is always sent, even with no items.
+        
+        Args:
+            message: Fixed fields of every datagram
+            field: Name of the field holding the items
+            items: Items to send
+            ip: Destination address
+        """
+        batch: List[Any] = []
+        batch_size = 0
+        part = 0
+        for item in items:
+            item_size = len(json.dumps(item)) + 2
+            if batch and batch_size + item_size > TAMANHO_LOTE:
+                self.udp_socket.sendto(json.dumps({**message, field: batch, "parte": part}).encode(), (ip, LSA_PORT))
+                batch, batch_size, part = [], 0, part + 1
+            batch.append(item)
+            batch_size += item_size
+        if batch or part == 0:
+            self.udp_socket.sendto(json.dumps({**message, field: batch, "parte": part}).encode(), (ip, LSA_PORT))
+
+    def iniciar_troca(self, neighbor_id: str, lsa_database: Dict[str, Any], resposta: bool = False) -> None:
+        """
+        Send this router's database description to a neighbor.
+        
+        Called when the adjacency with the neighbor comes up; the neighbor
+        answers with its own description.
+        
+        Args:
+            neighbor_id: Neighbor router ID
+            lsa_database: Database storing LSA information
+            resposta: True when answering the neighbor's description
+        """
+        if neighbor_id not in self.vizinhos_manager.VIZINHOS:
+            return
+        headers = self._cabecalhos(lsa_database, neighbor_id)
+        print(f"[{self.ROTEADOR_ID}] Enviando descrição da base ({len(headers)} LSAs) para {neighbor_id}")
+        self._enviar_em_lotes(
+            {"tipo": "dd", "id": self.ROTEADOR_ID, "resposta": resposta},
+            "cabecalhos", headers, self.vizinhos_manager.VIZINHOS[neighbor_id][0]
+        )
+
+    def _tratar_dd(self, message: Dict[str, Any], sender_ip: str, lsa_database: Dict[str, Any]) -> None:
+        """
+        Compare a neighbor's database description and request what is missing or older.
+        
+        Only LSAs with a higher sequence number are requested, the ones
+        _instalar_lsa would install.
+        
+        Args:
+            message: Decoded database description
+            sender_ip: Address the description came from
+            lsa_database: Database storing LSA information
+        """
+        neighbor_id = message["id"]
+        if neighbor_id not in self.vizinhos_manager.VIZINHOS:
+            return
+        if not message["resposta"] and message["parte"] == 0:
+            self.iniciar_troca(neighbor_id, lsa_database, resposta=True)
+
+        requests = []
+        for lsa_id, sequence in message["cabecalhos"]:
+            if self._ajustar_sequencia(lsa_id, sequence):
+                continue
+            current = lsa_database.get(lsa_id) or self.resumos.get(lsa_id)
+            if current is None or sequence > current["seq"]:
+                requests.append(lsa_id)
+
+        if requests:
+            print(f"[{self.ROTEADOR_ID}] Pedindo {len(requests)} LSAs a {neighbor_id}")
+            self._enviar_em_lotes({"tipo": "lsr", "id": self.ROTEADOR_ID}, "pedidos", requests, sender_ip)
+
+    def _tratar_lsr(self, message: Dict[str, Any], sender_ip: str, lsa_database: Dict[str, Any]) -> None:
+        """
+        Answer a neighbor's LSA request with packed updates.
+        
+        Args:
+            message: Decoded LSA request
+            sender_ip: Address the request came from
+            lsa_database: Database storing LSA information
+        """
+        lsas = [
+            lsa_database.get(lsa_id) or self.resumos.get(lsa_id)
+            for lsa_id in message["pedidos"]
+            if lsa_id in lsa_database or lsa_id in self.resumos
+        ]
+        self._enviar_em_lotes({"tipo": "lsu", "id": self.ROTEADOR_ID}, "lsas", lsas, sender_ip)
+
+    def _instalar_lsa(self, lsa_message: Dict[str, Any], data: bytes, sender_ip: str,
+                      lsa_database: Dict[str, Any], flooding_socket: socket.socket,
+                      segment: Optional[Rede] = None) -> bool:
+        """
+        Store an LSA if it is newer than the current copy and flood it further.
+        
+        Copies of this router's own LSAs are never stored: a newer one only
+        moves the sequence number past it.
+        
+        Args:
+            lsa_message: Decoded LSA
+            data: Encoded LSA, as forwarded to neighbors
+            sender_ip: Address the LSA came from, which is not flooded back
+            lsa_database: Database storing router LSAs
+            flooding_socket: Socket used to forward the LSA
+            segment: Segment the LSA arrived on by multicast, None for unicast
+            
+        Returns:
+            bool: True if the LSA was stored
+        """
+        source_router = lsa_message["id"]
+        if self._ajustar_sequencia(source_router, lsa_message["seq"]):
+            return False
+        database = self.resumos if lsa_message.get("tipo") == "resumo" else lsa_database
+        
+        if (source_router not in database or 
+            lsa_message["seq"] > database[source_router]["seq"]):
+            database[source_router] = lsa_message
+            self.lsas_instalados += 1
+            
+            # Forward LSA to other neighbors
+            targets = self._vizinhos_para_inundar(LSAManager.escopo(lsa_message), sender_ip, lsa_database)
+            flooding = (source_router, data, targets, flooding_socket, segment)
+            if self.fila_envio is not None:
+                self._entregar(self.fila_envio, flooding, "envio")
+            else:
+                self._encaminhar(*flooding)
+            return True
+        return False
+
+    def _encaminhar(self, lsa_id: str, data: bytes, targets: List[Tuple[str, str]],
+                    flooding_socket: socket.socket, segment: Optional[Rede]) -> None:
+        """
+        Flood an installed LSA to the neighbors chosen for it and log where it went.
+        
+        Args:
+            lsa_id: ID of the LSA
+            data: Encoded LSA
+            targets: (neighbor ID, neighbor IP) that must receive it
+            flooding_socket: Socket used for unicast copies
+            segment: Segment the LSA arrived on by multicast, None for unicast
+        """
+        for destination in self._inundar(lsa_id, data, targets, flooding_socket, segment):
+            print(f"[{self.ROTEADOR_ID}] Encaminhando LSA para {destination}")
+
+    def _entregar(self, stage_queue: queue.Queue, item: Any, name: str) -> None:
+        """
+        Put an item on a stage queue, waiting while it is full.
+        
+        Waiting is what pushes back on the previous stage, down to the socket
+        buffer, instead of queueing without bound. Each wait is counted in
+        bloqueios, and it gives up once the router stops.
+        
+        Args:
+            stage_queue: Queue feeding the next stage
+            item: Item to queue
+            name: Key of the queue in bloqueios
+        """
+        try:
+            stage_queue.put_nowait(item)
+            return
+        except queue.Full:
+            self.bloqueios[name] += 1
+        while not self._parada.is_set():
+            try:
+                stage_queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _tratar_multicast(self, data: bytes, sender_ip: str, lsa_database: Dict[str, Any],
+                          flooding_socket: socket.socket) -> None:
+        """
+        Handle a datagram received on a segment's multicast group.
+        
+        Hellos record their sender as a member of the segment. LSAs are
+        installed like unicast ones, bundled or not, except that the
+        segment's routers are not sent them again; LSAs whose scope leaves
+        out every area of this router are dropped, as they only reached it
+        by sharing the segment.
+        
+        Args:
+            data: Received datagram
+            sender_ip: Address it came from
+            lsa_database: Database storing LSA information
+            flooding_socket: Socket used to forward LSAs
+        """
+        message = json.loads(data.decode())
+        if message.get("tipo") == "segmento":
+            self.segmentos.registrar(message["id"], sender_ip)
+            return
+        bundled = message.get("tipo") == "lsu"
+        for lsa_message in message["lsas"] if bundled else [message]:
+            scope = LSAManager.escopo(lsa_message)
+            if scope is not None and not set(scope) & set(self.vizinhos_manager.areas_conectadas()):
+                continue
+            self._instalar_lsa(lsa_message, json.dumps(lsa_message).encode() if bundled else data,
+                               sender_ip, lsa_database, flooding_socket, self.segmentos.segmento_de(sender_ip))
+
+    def _processar(self, data: bytes, address: Tuple[str, int], multicast: bool,
+                   lsa_database: Dict[str, Any], receiver_socket: socket.socket) -> None:
+        """
+        Handle one received datagram according to its type.
+        
+        Args:
+            data: Received datagram
+            address: Address and port it came from
+            multicast: Whether it arrived on the segments' group socket
+            lsa_database: Database storing LSA information
+            receiver_socket: Unicast socket, used for answers and forwarding
+        """
+        if multicast:
+            self._tratar_multicast(data, address[0], lsa_database, receiver_socket)
+            return
+        sender_ip = address[0]
+        lsa_message = json.loads(data.decode())
+        message_type = lsa_message.get("tipo")
+        
+        if message_type == "dd":
+            self._tratar_dd(lsa_message, sender_ip, lsa_database)
+        elif message_type == "lsr":
+            self._tratar_lsr(lsa_message, sender_ip, lsa_database)
+        elif message_type == "lsu":
+            stored = sum(
+                self._instalar_lsa(lsa, json.dumps(lsa).encode(), sender_ip,
+                                   lsa_database, receiver_socket)
+                for lsa in lsa_message["lsas"]
+            )
+            # Bundles from a pacer carry no part number
+            if "parte" in lsa_message:
+                print(f"[{self.ROTEADOR_ID}] {stored} LSAs recebidos de {lsa_message['id']} na sincronização")
+        elif message_type == "estatisticas":
+            receiver_socket.sendto(json.dumps(self.estatisticas()).encode(), address)
+        else:
+            self._instalar_lsa(lsa_message, data, sender_ip, lsa_database, receiver_socket)
+
+    def _processar_lote(self, batch: List[Tuple[bytes, Tuple[str, int], bool]],
+                        lsa_database: Dict[str, Any], receiver_socket: socket.socket) -> None:
+        """
+        Handle a batch of received datagrams as one database transaction.
+        
+        Args:
+            batch: Datagrams with the address they came from and whether they arrived by multicast
+            lsa_database: Database storing LSA information
+            receiver_socket: Unicast socket, used for answers and forwarding
+        """
+        transaction = lsa_database.transacao() if isinstance(lsa_database, BancoLSA) else nullcontext()
+        with transaction, self.resumos.transacao():
+            for data, address, multicast in batch:
+                self._processar(data, address, multicast, lsa_database, receiver_socket)
+
+    def _estagio_instalacao(self, lsa_database: Dict[str, Any], receiver_socket: socket.socket,
+                            stop_event: Event) -> None:
+        """
+        Install stage: handle the batches queued by the receive loop.
+        
+        Args:
+            lsa_database: Database storing LSA information
+            receiver_socket: Unicast socket, used for answers and forwarding
+            stop_event: Threading event to control the stage
+        """
+        while not stop_event.is_set():
+            try:
+                batch = self.fila_recepcao.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._processar_lote(batch, lsa_database, receiver_socket)
+
+    def _estagio_envio(self, stop_event: Event) -> None:
+        """
+        Flood stage: send the LSAs queued by the install stage.
+        
+        Args:
+            stop_event: Threading event to control the stage
+        """
+        while not stop_event.is_set():
+            try:
+                flooding = self.fila_envio.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._encaminhar(*flooding)
 
     def receber_lsa(self, lsa_database: Dict[str, Any], stop_event: Event) -> None:
         """
         Receive and process Link State Advertisements.
         
         Listens for incoming LSAs, updates the database, and forwards to other neighbors.
+        Summary LSAs are kept apart from router LSAs, in resumos. Database
+        descriptions, LSA requests and packed updates, from the database
+        exchange or from a neighbor's pacer, arrive on the same socket, as do
+        statistics queries. With multicast flooding, the segments' group
+        socket is read as well. Stale LSAs are dropped here by the pre-filter.
+        With batched receive, the datagrams queued on a readable socket are
+        read together and handled as one batch; otherwise each batch holds
+        the datagrams of one pass through the loop. With stages, this loop
+        only reads the sockets and the install and flood stages run in
+        threads of their own.
         
         Args:
             lsa_database: Database storing LSA information
@@ -84,24 +715,45 @@ class LSAManager:
         """
         receiver_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         receiver_socket.bind(("0.0.0.0", LSA_PORT))
+        sockets = [receiver_socket] + ([self.segmentos.receptor] if self.segmentos else [])
+        if self.buffer_recepcao:
+            for listening_socket in sockets:
+                listening_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.buffer_recepcao)
+        
+        self._parada = stop_event
+        if self.estagios:
+            self.fila_recepcao = queue.Queue(TAMANHO_FILA_ESTAGIO)
+            self.fila_envio = queue.Queue(TAMANHO_FILA_ESTAGIO)
+            for stage in (Thread(target=self._estagio_instalacao, args=(lsa_database, receiver_socket, stop_event)),
+                          Thread(target=self._estagio_envio, args=(stop_event,))):
+                stage.daemon = True
+                stage.start()
+        
+        if self.lote_recepcao:
+            self.receptor = ReceptorEmLote(sockets, self.lote_recepcao, TAMANHO_MAXIMO_DATAGRAMA)
         
         while not stop_event.is_set():
             try:
-                data, address = receiver_socket.recvfrom(4096)
-                sender_ip = address[0]
-                lsa_message = json.loads(data.decode())
-                source_router = lsa_message["id"]
-                
-                if (source_router not in lsa_database or 
-                    lsa_message["seq"] > lsa_database[source_router]["seq"]):
-                    lsa_database[source_router] = lsa_message
-                    
-                    # Forward LSA to other neighbors
-                    for neighbor, (ip, _) in self.vizinhos_manager.VIZINHOS.items():
-                        if (ip != sender_ip and 
-                            neighbor not in self.vizinhos_manager.vizinhos_inativos):
-                            receiver_socket.sendto(data, (ip, LSA_PORT))
-                            print(f"[{self.ROTEADOR_ID}] Encaminhando LSA para {neighbor} ({ip})")
+                if self.receptor:
+                    received = self.receptor.receber(0.5)
+                else:
+                    ready = select.select(sockets, [], [], 0.5)[0] if self.segmentos else sockets
+                    received = [(*ready_socket.recvfrom(TAMANHO_MAXIMO_DATAGRAMA), ready_socket)
+                                for ready_socket in ready]
+                self.datagramas_recebidos += len(received)
+                batch = []
+                for data, address, ready_socket in received:
+                    if self.pre_filtro and self._obsoleto(data, lsa_database):
+                        self.duplicados_filtrados += 1
+                        continue
+                    # Batched datagrams are views of buffers the next batch reuses
+                    batch.append((bytes(data), address, ready_socket is not receiver_socket))
+                if not batch:
+                    continue
+                if self.fila_recepcao is not None:
+                    self._entregar(self.fila_recepcao, batch, "recepcao")
+                else:
+                    self._processar_lote(batch, lsa_database, receiver_socket)
                             
             except socket.timeout:
                 continue
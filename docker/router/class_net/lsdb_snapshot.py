@@ -0,0 +1,179 @@
+"""
+LSDB Snapshot Module
+
+This module persists a router's Link State Database, summaries, own sequence
+number and installed FIB to a compact memory-mapped file, so that a restarted
+router can install routes immediately instead of waiting for every LSA to be
+flooded again.
+
+The file holds two slots written alternately. Each slot has a fixed header
+(magic, version, CRC32, generation, timestamp and payload length) followed by
+the zlib-compressed JSON payload, and the header is written last. A crash in
+the middle of a checkpoint therefore leaves the previous slot intact, and a
+damaged slot is detected by its CRC. When a payload outgrows the slots, the
+latest snapshot is carried over to a new, larger file before it replaces the
+old one.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Dict, Any, Optional, Tuple
+
+MAGIC = b"LSDB"
+VERSAO = 1
+CABECALHO = struct.Struct("!4sHIQdI")
+CAPACIDADE_INICIAL = 64 * 1024
+
+class SnapshotLSDB:
+    """
+    Two-slot memory-mapped snapshot file.
+
+    Attributes:
+        caminho (str): Path of the snapshot file
+        geracao (int): Generation of the last snapshot written or read
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Initialize the snapshot file handler.
+
+        Args:
+            caminho: Path of the snapshot file, created on the first save
+        """
+        self.caminho = caminho
+        self.geracao = 0
+        self._ultimo_payload: Optional[bytes] = None
+
+    def _ler_slot(self, buffer: mmap.mmap, offset: int,
+                  capacity: int) -> Optional[Tuple[int, float, memoryview]]:
+        """
+        Validate one slot of a mapped snapshot.
+
+        Args:
+            buffer: Mapped file
+            offset: Slot offset
+            capacity: Slot size
+
+        Returns:
+            Tuple with (generation, timestamp, payload), or None if the slot is invalid
+        """
+        if offset + CABECALHO.size > len(buffer):
+            return None
+        magic, version, crc, generation, timestamp, length = CABECALHO.unpack_from(buffer, offset)
+        start = offset + CABECALHO.size
+        if magic != MAGIC or version != VERSAO or CABECALHO.size + length > capacity:
+            return None
+        payload = memoryview(buffer)[start:start + length]
+        if zlib.crc32(payload) != crc:
+            payload.release()
+            return None
+        return generation, timestamp, payload
+
+    def carregar(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the most recent valid snapshot.
+
+        Returns:
+            Dict with the saved state plus its 'timestamp', or None if there is
+            no usable snapshot
+        """
+        try:
+            with open(self.caminho, "rb") as snapshot_file:
+                size = os.fstat(snapshot_file.fileno()).st_size
+                if size < 2 * CABECALHO.size:
+                    return None
+                with mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    capacity = size // 2
+                    slots = [self._ler_slot(buffer, offset, capacity) for offset in (0, capacity)]
+                    valid = [slot for slot in slots if slot is not None]
+                    try:
+                        if not valid:
+                            return None
+                        generation, timestamp, payload = max(valid, key=lambda slot: slot[0])
+                        state = json.loads(zlib.decompress(payload))
+                    finally:
+                        for slot in valid:
+                            slot[2].release()
+        except (OSError, ValueError, zlib.error):
+            return None
+
+        self.geracao = generation
+        state["timestamp"] = timestamp
+        return state
+
+    def _crescer(self, fd: int, capacity: int, new_capacity: int) -> int:
+        """
+        Move the snapshot to a file with larger slots, keeping the latest one valid.
+
+        The second slot starts at half the file size, so resizing the file in
+        place would move it. The slot of the latest snapshot is copied instead
+        to where it lies with the new slot size, in a temporary file that then
+        replaces the current one: a crash at any point leaves one of the two
+        files on disk with that snapshot intact.
+
+        Args:
+            fd: Descriptor of the current file, closed here
+            capacity: Current slot size, 0 for a new file
+            new_capacity: Slot size of the new file
+
+        Returns:
+            int: Descriptor of the new file
+        """
+        temporary = f"{self.caminho}.tmp"
+        new_fd = os.open(temporary, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(new_fd, 2 * new_capacity)
+            if capacity:
+                slot = self.geracao % 2
+                os.pwrite(new_fd, os.pread(fd, capacity, slot * capacity), slot * new_capacity)
+            os.fsync(new_fd)
+            os.replace(temporary, self.caminho)
+        except OSError:
+            os.close(new_fd)
+            raise
+        os.close(fd)
+        return new_fd
+
+    def salvar(self, state: Dict[str, Any]) -> int:
+        """
+        Write a new snapshot into the slot not holding the latest one.
+
+        Nothing is written when the state is unchanged since the last save.
+
+        Args:
+            state: JSON-serialisable state to persist
+
+        Returns:
+            int: Bytes written, 0 when the state was unchanged
+        """
+        payload = zlib.compress(json.dumps(state, separators=(",", ":")).encode(), 6)
+        if payload == self._ultimo_payload:
+            return 0
+        if self._ultimo_payload is None and self.geracao == 0:
+            self.carregar()
+
+        needed = CABECALHO.size + len(payload)
+        fd = os.open(self.caminho, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            capacity = os.fstat(fd).st_size // 2
+            if capacity < needed:
+                new_capacity = max(CAPACIDADE_INICIAL, 1 << (2 * needed - 1).bit_length())
+                fd = self._crescer(fd, capacity, new_capacity)
+                capacity = new_capacity
+            self.geracao += 1
+            offset = (self.geracao % 2) * capacity
+            with mmap.mmap(fd, 2 * capacity) as buffer:
+                buffer[offset + CABECALHO.size:offset + needed] = payload
+                buffer.flush()
+                CABECALHO.pack_into(buffer, offset, MAGIC, VERSAO, zlib.crc32(payload),
+                                    self.geracao, time.time(), len(payload))
+                buffer.flush()
+        finally:
+            os.close(fd)
+
+        self._ultimo_payload = payload
+        return needed
@@ -5,9 +5,9 @@ This module provides utilities for manipulating and extracting network addresses
 and router information in a Docker network environment.
 """
 
-import subprocess
 import re
 from typing import List
+from class_net.docker_inventory import InventarioDocker
 
 class Manipulacao:
     """
@@ -25,10 +25,33 @@ class Manipulacao:
         Returns:
             List[str]: List of router container names
         """
-        docker_command = "docker ps --filter name=roteador --format '{{.Names}}'"
-        command_result = subprocess.run(docker_command, shell=True, check=True, text=True, capture_output=True)
-        router_list = [router.strip("'") for router in command_result.stdout.split('\n') if router]
-        return router_list
+        return InventarioDocker.compartilhado().containers('roteador')
+
+    @staticmethod
+    def ip_roteador(router_name: str) -> str:
+        """
+        Look up the announced IP of a router container in the Docker inventory.
+
+        Args:
+            router_name: Name of the router container
+
+        Returns:
+            str: Router IP address
+        """
+        return InventarioDocker.compartilhado().ip(router_name)
+
+    @staticmethod
+    def ip_gateway_roteador(router_name: str) -> str:
+        """
+        Look up the gateway of a router's own network in the Docker inventory.
+
+        Args:
+            router_name: Name of the router container
+
+        Returns:
+            str: Gateway IP address
+        """
+        return InventarioDocker.compartilhado().gateway(router_name)
 
     @staticmethod
     def extrair_numero_roteador(router_name: str) -> str:
@@ -5,10 +5,14 @@ This module handles the management and monitoring of neighboring routers in the
 including status verification and connectivity checks.
 """
 
+import re
 import subprocess
-import json
-import os
-from typing import Dict, List, Tuple, Any
+from typing import Callable, Dict, List, Tuple, Any, Optional
+from class_net.flap_dampening import AmortecedorDeOscilacao
+from class_net.link_cost import CustoDinamico
+from class_net.router_config import ConfiguracaoRoteador
+
+RTT_PING = re.compile(r"time[=<]([\d.]+) ms")
 
 class VizinhosManager:
     """
@@ -19,25 +23,53 @@ class VizinhosManager:
     
     Attributes:
         ROTEADOR_ID (str): Unique identifier for this router
-        VIZINHOS (Dict): Dictionary of neighbor routers with their IPs and costs
+        VIZINHOS (Dict): Dictionary of neighbor routers with their IPs, costs and optional areas
+        AREA (Optional[int]): Area of this router, None when areas are not used
         vizinhos_inativos (List[str]): List of currently inactive neighbors
+        adjacencias (set): Neighbors found active on the last check
+        ao_ativar_vizinho (Optional[Callable]): Called with a neighbor ID when its adjacency comes up
+        ao_desativar_vizinho (Optional[Callable]): Called with a neighbor ID when its adjacency goes down
+        custos (Optional[CustoDinamico]): Link costs measured from probe RTTs, None for fixed costs
+        ao_mudar_custo (Optional[Callable]): Called with a neighbor ID when its announced cost changes
+        amortecedor (Optional[AmortecedorDeOscilacao]): Flap dampening of neighbor state, None when disabled
     """
     
-    def __init__(self):
-        """Initialize the neighbor manager with router configuration from environment."""
-        self.ROTEADOR_ID = os.getenv("ROTEADOR_ID")
-        self.VIZINHOS = json.loads(os.getenv("VIZINHOS"))
+    def __init__(self, config: Optional[ConfiguracaoRoteador] = None):
+        """
+        Initialize the neighbor manager.
+        
+        Args:
+            config: Router configuration, read from the environment when omitted
+        """
+        config = config or ConfiguracaoRoteador.de_ambiente()
+        self.ROTEADOR_ID = config.roteador_id
+        self.VIZINHOS = config.vizinhos
+        self.AREA = config.area
         self.vizinhos_inativos = []
+        self.adjacencias = set()
+        self.ao_ativar_vizinho: Optional[Callable[[str], None]] = None
+        self.ao_desativar_vizinho: Optional[Callable[[str], None]] = None
+        self.custos = None
+        if config.custo_dinamico:
+            self.custos = CustoDinamico({neighbor: data[1] for neighbor, data in self.VIZINHOS.items()})
+        self.ao_mudar_custo: Optional[Callable[[str], None]] = None
+        self.amortecedor = None
+        if config.amortecimento_meia_vida:
+            self.amortecedor = AmortecedorDeOscilacao(
+                config.amortecimento_meia_vida,
+                config.amortecimento_supressao,
+                config.amortecimento_reuso
+            )
         
-    def verifica_tcp(self, target_ip: str) -> bool:
+    def sondar(self, target_ip: str) -> Tuple[bool, Optional[float]]:
         """
-        Verify TCP connectivity to a target IP address.
+        Ping a target IP address once.
         
         Args:
-            target_ip: IP address to check connectivity
+            target_ip: IP address to probe
             
         Returns:
-            bool: True if connection successful, False otherwise
+            Tuple with (reachable, round-trip time in seconds or None if not reported)
         """
         try:
             ping_result = subprocess.run(
@@ -47,9 +79,61 @@ class VizinhosManager:
                 text=True,
                 capture_output=True
             )
-            return ping_result.returncode == 0
         except subprocess.CalledProcessError:
-            return False
+            return False, None
+        rtt = RTT_PING.search(ping_result.stdout)
+        return ping_result.returncode == 0, float(rtt.group(1)) / 1000 if rtt else None
+
+    def verifica_tcp(self, target_ip: str) -> bool:
+        """
+        Verify TCP connectivity to a target IP address.
+        
+        Args:
+            target_ip: IP address to check connectivity
+            
+        Returns:
+            bool: True if connection successful, False otherwise
+        """
+        return self.sondar(target_ip)[0]
+
+    def custo_do_enlace(self, neighbor_id: str) -> int:
+        """
+        Return the cost announced for the link to a neighbor.
+        
+        Args:
+            neighbor_id: Neighbor router ID
+            
+        Returns:
+            int: Measured cost when dynamic costs are on, the configured one otherwise
+        """
+        if self.custos is not None:
+            return self.custos.custo(neighbor_id)
+        return self.VIZINHOS[neighbor_id][1]
+
+    def _registrar_sonda(self, router_id: str, reachable: bool, rtt: Optional[float]) -> None:
+        """
+        Feed a probe result to the link cost estimator.
+        
+        Args:
+            router_id: Neighbor router ID
+            reachable: Whether the probe was answered
+            rtt: Round-trip time in seconds, None if not reported
+        """
+        if self.custos is None or (reachable and rtt is None):
+            return
+        if self.custos.registrar(router_id, rtt if reachable else None):
+            print(f"[{self.ROTEADOR_ID}] Custo do enlace com {router_id}: {self.custos.custo(router_id)}")
+            if self.ao_mudar_custo:
+                self.ao_mudar_custo(router_id)
+
+    def medir_custos(self) -> None:
+        """
+        Probe every neighbor only to measure link costs.
+        
+        Used when liveness comes from another detector such as BFD.
+        """
+        for router_id, (router_ip, *_) in self.VIZINHOS.items():
+            self._registrar_sonda(router_id, *self.sondar(router_ip))
 
     def verifica_roteadores_ativos(self, lsa_database: Dict[str, Any]) -> bool:
         """
@@ -75,13 +159,118 @@ class VizinhosManager:
         Update status of all neighboring routers.
         
         Checks connectivity to all neighbors and updates the inactive neighbors list.
+        Neighbors that were not active on the previous check are reported to
+        ao_ativar_vizinho, so the databases can be synchronised, and neighbors
+        that stopped answering are reported to ao_desativar_vizinho. With
+        dynamic costs, the probe RTTs also feed the link cost estimator.
         """
         self.vizinhos_inativos = []
         
-        for router_id, (router_ip, _) in self.VIZINHOS.items():
-            router_status = self.verifica_tcp(router_ip)
-            status_msg = "ativo" if router_status else "inativo"
+        for router_id, (router_ip, *_) in self.VIZINHOS.items():
+            reachable, rtt = self.sondar(router_ip)
+            self._registrar_sonda(router_id, reachable, rtt)
+            router_status = self._amortecer(router_id, reachable)
+            status_msg = "ativo" if router_status else "suprimido" if reachable else "inativo"
             print(f"[{self.ROTEADOR_ID}] Roteador vizinho {router_id} {status_msg}.")
             
             if not router_status:
-                self.vizinhos_inativos.append(router_id)
\ No newline at end of file
+                self.vizinhos_inativos.append(router_id)
+                self._desativar(router_id)
+            elif router_id not in self.adjacencias:
+                self.adjacencias.add(router_id)
+                if self.ao_ativar_vizinho:
+                    self.ao_ativar_vizinho(router_id)
+
+    def definir_estado_vizinho(self, router_id: str, ativo: bool) -> None:
+        """
+        Record a neighbor state reported by an external detector such as BFD.
+        
+        Args:
+            router_id: Neighbor router ID
+            ativo: True if the neighbor is reachable
+        """
+        ativo = self._amortecer(router_id, ativo)
+        if ativo:
+            self.vizinhos_inativos = [neighbor for neighbor in self.vizinhos_inativos if neighbor != router_id]
+            if router_id not in self.adjacencias:
+                self.adjacencias.add(router_id)
+                if self.ao_ativar_vizinho:
+                    self.ao_ativar_vizinho(router_id)
+        else:
+            if router_id not in self.vizinhos_inativos:
+                self.vizinhos_inativos = self.vizinhos_inativos + [router_id]
+            self._desativar(router_id)
+
+    def _amortecer(self, router_id: str, ativo: bool) -> bool:
+        """
+        Pass an observed neighbor state through flap dampening.
+        
+        Args:
+            router_id: Neighbor router ID
+            ativo: Whether the detector sees the neighbor up
+            
+        Returns:
+            bool: State to use, False while the neighbor is suppressed
+        """
+        if self.amortecedor is None:
+            return ativo
+        was_suppressed = self.amortecedor.suprimido(router_id)
+        effective = self.amortecedor.registrar(router_id, ativo)
+        if self.amortecedor.suprimido(router_id) and not was_suppressed:
+            state = self.amortecedor.estados[router_id]
+            print(f"[{self.ROTEADOR_ID}] Vizinho {router_id} suprimido após {state.oscilacoes} oscilações "
+                  f"(penalidade {state.penalidade:.0f})")
+        return effective
+
+    def reavaliar_amortecimento(self) -> None:
+        """
+        Bring back up the suppressed neighbors whose penalty has decayed.
+        
+        Needed when state changes come from an event-driven detector such as
+        BFD, which reports nothing while a suppressed neighbor stays up.
+        """
+        if self.amortecedor is None:
+            return
+        for router_id in self.amortecedor.liberados():
+            print(f"[{self.ROTEADOR_ID}] Vizinho {router_id} liberado do amortecimento")
+            self.definir_estado_vizinho(router_id, True)
+
+    def _desativar(self, router_id: str) -> None:
+        """
+        Drop the adjacency with a neighbor, reporting it if it was up.
+        
+        Args:
+            router_id: Neighbor router ID
+        """
+        if router_id in self.adjacencias:
+            self.adjacencias.discard(router_id)
+            if self.ao_desativar_vizinho:
+                self.ao_desativar_vizinho(router_id)
+
+    def area_do_enlace(self, neighbor_id: str) -> Optional[int]:
+        """
+        Return the area of the link to a neighbor.
+        
+        A link between routers of different areas belongs to the lower area ID.
+        
+        Args:
+            neighbor_id: Neighbor router ID
+            
+        Returns:
+            Optional[int]: Link area, None when areas are not used
+        """
+        neighbor_data = self.VIZINHOS[neighbor_id]
+        if self.AREA is None or len(neighbor_data) < 3:
+            return self.AREA
+        return min(self.AREA, neighbor_data[2])
+
+    def areas_conectadas(self) -> List[int]:
+        """
+        Return every area this router is attached to.
+        
+        Returns:
+            List[int]: Sorted area IDs, more than one for area border routers
+        """
+        if self.AREA is None:
+            return []
+        return sorted({self.AREA} | {self.area_do_enlace(neighbor) for neighbor in self.VIZINHOS})
@@ -0,0 +1,126 @@
+"""
+Route Aggregation Module
+
+This module reduces the number of prefixes installed in the kernel. Destination
+subnets that share a gateway are collapsed into the smallest set of covering
+prefixes between the SPF output and route installation.
+"""
+
+import ipaddress
+from typing import Dict, Iterable, List, Tuple, Optional
+
+MODOS_AGREGACAO = ("desligado", "exato", "agressivo")
+
+Rede = ipaddress.IPv4Network
+
+class AgregadorDeRotas:
+    """
+    Collapses per-destination routes into covering prefixes.
+
+    Three modes are available:
+    - 'desligado': one prefix per destination, as installed before aggregation
+    - 'exato': prefixes are merged only when their union is exactly the set of
+      destination subnets, so forwarding is identical for every address
+    - 'agressivo': prefixes may also cover address space not assigned to any
+      known router, as long as no known subnet with another gateway (or that
+      must not be routed) falls inside them
+
+    Attributes:
+        modo (str): Aggregation mode
+        prefixo_minimo (int): Shortest prefix length produced in aggressive mode
+    """
+
+    def __init__(self, modo: str = "exato", prefixo_minimo: int = 16):
+        """
+        Initialize the aggregator.
+
+        Args:
+            modo: One of MODOS_AGREGACAO
+            prefixo_minimo: Shortest prefix length produced in aggressive mode
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if modo not in MODOS_AGREGACAO:
+            raise ValueError(f"Modo de agregação inválido: {modo}")
+        self.modo = modo
+        self.prefixo_minimo = prefixo_minimo
+
+    def agregar(self, routes: Dict[str, str], blocked: Iterable[str] = ()) -> Dict[str, str]:
+        """
+        Compute the prefixes to install for a set of routes.
+
+        Args:
+            routes: Destination subnet to gateway IP
+            blocked: Known subnets that must not be covered, such as the router's
+                own, directly connected or unreachable ones (aggressive mode only)
+
+        Returns:
+            Dict mapping prefixes to gateway IPs
+        """
+        if self.modo == "desligado":
+            return dict(routes)
+
+        if self.modo == "exato":
+            by_gateway: Dict[str, List[Rede]] = {}
+            for subnet, gateway in routes.items():
+                by_gateway.setdefault(gateway, []).append(ipaddress.ip_network(subnet))
+            return {
+                str(prefix): gateway
+                for gateway, subnets in by_gateway.items()
+                for prefix in ipaddress.collapse_addresses(subnets)
+            }
+
+        return self._agregar_agressivo(routes, blocked)
+
+    def _agregar_agressivo(self, routes: Dict[str, str], blocked: Iterable[str]) -> Dict[str, str]:
+        """
+        Cover destinations with the shortest prefixes free of conflicting subnets.
+
+        Args:
+            routes: Destination subnet to gateway IP
+            blocked: Known subnets that must not be covered
+
+        Returns:
+            Dict mapping prefixes to gateway IPs
+        """
+        owners: Dict[Rede, Optional[str]] = {ipaddress.ip_network(subnet): gateway
+                                             for subnet, gateway in routes.items()}
+        for subnet in blocked:
+            owners.setdefault(ipaddress.ip_network(subnet), None)
+
+        result: Dict[str, str] = {}
+        by_root: Dict[Rede, List[Tuple[Rede, Optional[str]]]] = {}
+        for network, gateway in owners.items():
+            if network.prefixlen <= self.prefixo_minimo:
+                if gateway is not None:
+                    result[str(network)] = gateway
+                continue
+            root = network.supernet(new_prefix=self.prefixo_minimo)
+            by_root.setdefault(root, []).append((network, gateway))
+
+        for root, members in by_root.items():
+            self._cobrir(root, members, result)
+        return result
+
+    def _cobrir(self, network: Rede, members: List[Tuple[Rede, Optional[str]]],
+                result: Dict[str, str]) -> None:
+        """
+        Recursively cover the members of a prefix, splitting it on conflicts.
+
+        Args:
+            network: Prefix being covered
+            members: Known subnets inside the prefix with their gateway (None if blocked)
+            result: Output mapping updated in place
+        """
+        gateways = {gateway for _, gateway in members}
+        if len(gateways) == 1:
+            gateway = gateways.pop()
+            if gateway is not None:
+                result[str(network)] = gateway
+            return
+
+        for half in network.subnets():
+            inside = [member for member in members if member[0].subnet_of(half)]
+            if inside:
+                self._cobrir(half, inside, result)
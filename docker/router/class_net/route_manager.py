@@ -6,41 +6,126 @@ including Dijkstra's shortest path algorithm and route table management.
 """
 
 import heapq
-from typing import Dict, List, Set, Optional, Any
+from array import array
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Set, Optional, Tuple, Any
+
+from class_net.failure_analysis import AnalisadorDeFalhas, Elemento
+from class_net.lsa_database import BancoLSA
+from class_net.spf_graph import GrafoCSR, INFINITO
+from class_net.spf_worker import TrabalhadorSPF
+
+INFINITO_RESUMO = 2 ** 16
+AREA_BACKBONE = 0
+MAXIMO_VIZINHOS_LFA = 8
+TAMANHO_CACHE_SPF = 64
 
 class GerenciadorDeRotas:
     """
     Manager for network routing and path calculations.
     
     This class handles route calculations, path finding, and maintains routing tables
-    using Dijkstra's algorithm for shortest path computation.
+    using Dijkstra's algorithm for shortest path computation. When areas are in use,
+    SPF runs separately inside each attached area and destinations in other areas
+    are reached through the summary LSAs of area border routers. As in OSPF,
+    area 0 is the backbone and other areas only reach each other through it.
+    
+    When the databases are BancoLSA instances, routing tables are memoised
+    by source, database generations and inactive set, in a small LRU cache:
+    the same inputs, common when several threads recalculate routes in the
+    same cycle, skip SPF altogether. On a miss, flat SPF still reuses the
+    previous tree when the LSAs that changed only touched prefixes, links off
+    the tree or leaves (see GrafoCSR).
+    
+    With an SPF worker, routing tables and backup next hops are computed in
+    its process instead (see TrabalhadorSPF), falling back to this one if
+    the worker is gone.
     
     Attributes:
         lsdb (Dict): Link State Database containing network topology
         inativos (List[str]): List of inactive routers to exclude from calculations
         tabela_de_rotas (Dict): Routing table for all network paths
+        resumos (Dict): Summary LSAs received from area border routers
+        area (Optional[int]): Area of this router, None when areas are not used
+        grafo (GrafoCSR): Array-backed graph kept in sync with the LSDB, used by flat SPF
+        acertos_cache (int): dijkstra calls answered from the cache
+        falhas_cache (int): dijkstra calls not answered from the cache
+        trabalhador (Optional[TrabalhadorSPF]): Process computing the routes, None to compute them here
     """
     
-    def __init__(self, link_state_db: Dict[str, Any], inactive_routers: List[str] = None):
+    def __init__(self, link_state_db: Dict[str, Any], inactive_routers: List[str] = None,
+                 summary_db: Optional[Dict[str, Any]] = None, area: Optional[int] = None):
         """
         Initialize the route manager.
         
         Args:
             link_state_db: Link State Database with network topology
             inactive_routers: List of inactive router IDs
+            summary_db: Summary LSAs keyed by '<border router>:<area>'
+            area: Area of this router, None to ignore areas
         """
         self.lsdb = link_state_db
         self.inativos = inactive_routers or []
         self.tabela_de_rotas = {}
+        self.resumos = summary_db if summary_db is not None else BancoLSA()
+        self.area = area
+        self.grafo = GrafoCSR()
+        self._lsas_no_grafo: Dict[str, Any] = {}
+        self._geracao_no_grafo: Optional[int] = None
+        self._cache_spf: "OrderedDict[Tuple[str, Tuple[int, int], FrozenSet[str]], Dict[str, str]]" = OrderedDict()
+        self.acertos_cache = 0
+        self.falhas_cache = 0
+        self._analisador: Optional[Tuple[Any, AnalisadorDeFalhas]] = None
+        self.trabalhador: Optional[TrabalhadorSPF] = None
 
     def set_inativos(self, inactive_routers: List[str]) -> None:
         """Update the list of inactive routers."""
         self.inativos = inactive_routers
 
-    def _gerar_grafo(self) -> Dict[str, Dict[str, int]]:
+    def geracao(self) -> Optional[Tuple[int, int]]:
+        """
+        Return the generations of the LSDB and of the summary database.
+        
+        Returns:
+            Tuple with (LSDB generation, summary generation), or None when
+            either database does not track generations
+        """
+        lsdb_generation = getattr(self.lsdb, 'geracao', None)
+        summary_generation = getattr(self.resumos, 'geracao', None)
+        if lsdb_generation is None or summary_generation is None:
+            return None
+        return lsdb_generation, summary_generation
+
+    def taxa_de_acertos(self) -> float:
+        """Return the share of dijkstra calls answered from the cache."""
+        return self.acertos_cache / max(1, self.acertos_cache + self.falhas_cache)
+
+    def _delegar(self, method: str, *args: Any) -> Any:
+        """
+        Run a calculation in the SPF worker, or in this process when there is none.
+        
+        Args:
+            method: Name of the method to run
+            *args: Its arguments
+            
+        Returns:
+            What the method returned
+        """
+        if self.trabalhador is not None:
+            try:
+                return self.trabalhador.executar(self.lsdb, self.resumos, self.inativos, method, *args)
+            except (EOFError, OSError) as error:
+                print(f"[Dijkstra] Processo de SPF indisponível ({error}), calculando localmente")
+                self.trabalhador = None
+        return getattr(self, method)(*args)
+
+    def _gerar_grafo(self, area: Optional[int] = None) -> Dict[str, Dict[str, int]]:
         """
         Generate a graph representation from the LSDB.
         
+        Args:
+            area: Restrict the graph to the links of this area, all links when None
+        
         Returns:
             Dict containing network graph with costs
         """
@@ -48,34 +133,60 @@ class GerenciadorDeRotas:
         for router_id, router_data in self.lsdb.items():
             if router_id in self.inativos:
                 continue
+            if area is not None and area not in router_data.get('areas', [area]):
+                continue
             active_neighbors = {
                 neighbor_id: info['custo']
                 for neighbor_id, info in router_data['vizinhos'].items()
                 if neighbor_id not in self.inativos
+                and (area is None or info.get('area', area) == area)
             }
             network_graph[router_id] = active_neighbors
         return network_graph
 
-    def dijkstra(self, source: str) -> Dict[str, str]:
+    def _sincronizar_grafo(self) -> None:
         """
-        Implement Dijkstra's shortest path algorithm.
+        Bring the CSR graph up to date with the LSDB.
+
+        LSAs are replaced, never changed in place, when a newer one arrives,
+        so only routers whose LSA object changed are looked at, and only
+        those whose links changed have their row rewritten: refreshes and
+        prefix-only changes leave the graph, and the SPF tree, untouched.
+        The LSDB is not scanned at all while its generation stays the same.
+        """
+        generation = getattr(self.lsdb, 'geracao', None)
+        if generation is None or generation != self._geracao_no_grafo:
+            installed = self._lsas_no_grafo
+            for router_id, router_data in list(self.lsdb.items()):
+                old = installed.get(router_id)
+                if old is router_data:
+                    continue
+                if BancoLSA.classificar(old, router_data) in ('novo', 'enlaces'):
+                    self.grafo.atualizar_roteador(router_id, {
+                        neighbor_id: info['custo'] for neighbor_id, info in router_data['vizinhos'].items()
+                    })
+                installed[router_id] = router_data
+            if len(installed) != len(self.lsdb):
+                for router_id in [router_id for router_id in installed if router_id not in self.lsdb]:
+                    self.grafo.remover_roteador(router_id)
+                    del installed[router_id]
+            self._geracao_no_grafo = generation
+        self.grafo.definir_inativos(self.inativos)
+
+    def _spf(self, network_graph: Dict[str, Dict[str, int]],
+             source: str) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """
+        Run Dijkstra over a graph, tracking the first hop of every path.
         
         Args:
+            network_graph: Graph produced by _gerar_grafo
             source: Source router ID
             
         Returns:
-            Dict mapping destinations to next hops
+            Tuple with (cost to each reachable router, first hop to each reachable router)
         """
-        network_graph = self._gerar_grafo()
-        
-        print(f"[Dijkstra] Inativos: {self.inativos}")
-        
-        if source not in network_graph:
-            print(f"[Dijkstra] Origem {source} não encontrada no grafo.")
-            return {}
-
         distances = {router: float('inf') for router in network_graph}
-        previous = {router: None for router in network_graph}
+        first_hops = {}
         distances[source] = 0
         priority_queue = [(0, source)]
 
@@ -89,24 +200,557 @@ class GerenciadorDeRotas:
                 path_cost = distances[current_router] + weight
                 if neighbor in distances and path_cost < distances[neighbor]:
                     distances[neighbor] = path_cost
-                    previous[neighbor] = current_router
+                    first_hops[neighbor] = neighbor if current_router == source else first_hops[current_router]
                     heapq.heappush(priority_queue, (path_cost, neighbor))
 
-        routing_table = {}
-        for destination in network_graph:
-            if destination == source or distances[destination] == float('inf'):
-                continue
-            current = destination
-            while previous[current] != source:
-                current = previous[current]
-                if current is None:
-                    break
-            if current:
-                routing_table[destination] = current
+        reachable = {router: cost for router, cost in distances.items() if cost != float('inf')}
+        return reachable, first_hops
+
+    def dijkstra(self, source: str) -> Dict[str, str]:
+        """
+        Implement Dijkstra's shortest path algorithm.
+        
+        Tables are served from the cache when the source, the database
+        generations and the inactive routers match an earlier call.
+        
+        Args:
+            source: Source router ID
+            
+        Returns:
+            Dict mapping destinations to next hops
+        """
+        print(f"[Dijkstra] Inativos: {self.inativos}")
+
+        generation = self.geracao()
+        cache_key = (source, generation, frozenset(self.inativos)) if generation is not None else None
+        if cache_key in self._cache_spf:
+            self._cache_spf.move_to_end(cache_key)
+            self.acertos_cache += 1
+            return dict(self._cache_spf[cache_key])
+        self.falhas_cache += 1
+
+        routing_table = self._delegar('_calcular_tabela', source)
+        if routing_table is None:
+            return {}
+        if cache_key is not None:
+            self._cache_spf[cache_key] = dict(routing_table)
+            if len(self._cache_spf) > TAMANHO_CACHE_SPF:
+                self._cache_spf.popitem(last=False)
+        return routing_table
+
+    def _calcular_tabela(self, source: str) -> Optional[Dict[str, str]]:
+        """
+        Run SPF from a source, without the cache.
+        
+        Args:
+            source: Source router ID
+            
+        Returns:
+            Dict mapping destinations to next hops, or None when the source is not in the graph
+        """
+        if self.area is None:
+            self._sincronizar_grafo()
+            routing_table = self.grafo.primeiros_saltos(source)
+            if routing_table is None:
+                print(f"[Dijkstra] Origem {source} não encontrada no grafo.")
+                return None
+        else:
+            routing_table = {
+                destination: next_hop
+                for destination, (_, next_hop) in self._rotas_por_area(source).items()
+            }
 
         return {dest: next_hop for dest, next_hop in routing_table.items() 
                 if next_hop != dest}
 
+    def calcular_alternativas(self, source: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Precompute a backup next hop for every destination, in the SPF worker when there is one.
+        
+        Args:
+            source: Source router ID
+            
+        Returns:
+            Dict in the format of _alternativas
+        """
+        return self._delegar('_alternativas', source)
+
+    def calcular_alternativas_remotas(self, source: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Report the protection of every destination, remote LFAs included, in
+        the SPF worker when there is one. Remote LFAs are never installed, so
+        this is only meant for reports.
+        
+        Args:
+            source: Source router ID
+            
+        Returns:
+            Dict in the format of _alternativas_remotas
+        """
+        return self._delegar('_alternativas_remotas', source)
+
+    def _distancias_dos_vizinhos(self, source: str) -> Optional[Tuple[Dict[str, str], array,
+                                                                       List[Tuple[int, str]], Dict[str, array]]]:
+        """
+        Run the SPFs loop-free alternates are checked against, on the CSR graph.
+
+        Only the MAXIMO_VIZINHOS_LFA neighbors with the cheapest links are
+        candidates, so the cost is bounded by that many SPFs plus the
+        source's own, however many neighbors the source has.
+
+        Args:
+            source: Source router ID
+
+        Returns:
+            Tuple with (first hops of the source, its distances, candidate
+            neighbors as (link cost, ID), distances from each candidate), or
+            None when the source is not in the graph
+        """
+        self._sincronizar_grafo()
+        first_hops = self.grafo.primeiros_saltos(source)
+        if first_hops is None:
+            return None
+        candidates = []
+        from_neighbors = {}
+        for link_cost, neighbor in sorted((info['custo'], neighbor)
+                                          for neighbor, info in self.lsdb[source]['vizinhos'].items()):
+            if len(candidates) == MAXIMO_VIZINHOS_LFA:
+                break
+            neighbor_distances = self.grafo.distancias(neighbor)
+            if neighbor_distances is not None:
+                candidates.append((link_cost, neighbor))
+                from_neighbors[neighbor] = neighbor_distances
+        return first_hops, self.grafo.distancias(source), candidates, from_neighbors
+
+    def _alternativas(self, source: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Precompute a backup next hop for every destination, to be used when
+        the primary next hop fails.
+
+        A neighbor N is a loop-free alternate (LFA, RFC 5286) for destination D
+        when its own shortest path to D does not come back through the source:
+        dist(N, D) < dist(N, S) + dist(S, D). It also protects against the
+        failure of the primary neighbor P (node protection) when
+        dist(N, D) < dist(N, P) + dist(P, D); node-protecting LFAs are
+        preferred, since a neighbor failure cannot be told apart from a link
+        failure. Every distance comes from the SPFs of the candidate neighbors
+        (see _distancias_dos_vizinhos); when the primary is not a candidate,
+        node protection is not checked and alternates count as link-protecting.
+
+        The whole LSDB is used, so destinations learned from summary LSAs of
+        other areas are left out.
+
+        Args:
+            source: Source router ID
+
+        Returns:
+            Dict mapping each destination to a dict with 'primario' (primary
+            next hop), 'reserva' (backup neighbor or None) and 'tipo'
+            ('lfa_no', 'lfa_enlace' or None)
+        """
+        spf_results = self._distancias_dos_vizinhos(source)
+        if spf_results is None:
+            return {}
+        return self._escolher_lfas(source, *spf_results)
+
+    def _escolher_lfas(self, source: str, first_hops: Dict[str, str], own_distances: array,
+                       candidates: List[Tuple[int, str]], from_neighbors: Dict[str, array]) -> Dict[str, Dict[str, Any]]:
+        """
+        Pick the best loop-free alternate of every destination.
+
+        Args:
+            source: Source router ID
+            first_hops: First hop of the source towards every destination
+            own_distances: Distances from the source
+            candidates: Candidate neighbors as (link cost, ID)
+            from_neighbors: Distances from each candidate
+
+        Returns:
+            Dict in the format of _alternativas
+        """
+        index = self.grafo.indices
+        source_index = index[source]
+        alternatives = {}
+        for destination, primary in first_hops.items():
+            target = index[destination]
+            primary_distances = from_neighbors.get(primary)
+            best = None
+            for link_cost, neighbor in candidates:
+                if neighbor == primary:
+                    continue
+                neighbor_distances = from_neighbors[neighbor]
+                to_destination = neighbor_distances[target]
+                if to_destination == INFINITO or \
+                        not to_destination < neighbor_distances[source_index] + own_distances[target]:
+                    continue
+                node_protecting = destination == primary or (primary_distances is not None and to_destination < (
+                    neighbor_distances[index[primary]] + primary_distances[target]
+                ))
+                candidate = (not node_protecting, link_cost + to_destination, neighbor)
+                if best is None or candidate < best:
+                    best = candidate
+
+            if best is None:
+                alternatives[destination] = {'primario': primary, 'reserva': None, 'tipo': None}
+            else:
+                alternatives[destination] = {
+                    'primario': primary, 'reserva': best[2],
+                    'tipo': 'lfa_enlace' if best[0] else 'lfa_no'
+                }
+        return alternatives
+
+    def _alternativas_remotas(self, source: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute the loop-free alternates of every destination and a remote
+        LFA (RFC 7490) for those without one.
+
+        A remote LFA is a PQ node reached from a candidate neighbor without
+        going back through the source S or the primary P (extended P-space),
+        whose own path to the destination D avoids both as well (Q-space), to
+        which traffic would be tunnelled. Distances towards D, S and P come
+        from reverse SPFs, so this costs one more SPF per unprotected
+        destination.
+
+        Args:
+            source: Source router ID
+
+        Returns:
+            Dict in the format of _alternativas, where 'tipo' may also be
+            'rlfa', with the PQ node in 'pq'
+        """
+        spf_results = self._distancias_dos_vizinhos(source)
+        if spf_results is None:
+            return {}
+        first_hops, own_distances, candidates, from_neighbors = spf_results
+        alternatives = self._escolher_lfas(source, *spf_results)
+        unprotected = [destination for destination, alternative in alternatives.items()
+                       if alternative['tipo'] is None]
+        if not unprotected:
+            return alternatives
+
+        graph = self.grafo
+        index = graph.indices
+        source_index = index[source]
+        to_source = graph.distancias(source, reverse=True)
+        from_primary: Dict[str, array] = {}
+        to_primary: Dict[str, array] = {}
+        p_spaces: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for destination in unprotected:
+            primary = first_hops[destination]
+            primary_index = index[primary]
+            target = index[destination]
+            if primary not in from_primary:
+                from_primary[primary] = from_neighbors.get(primary) or graph.distancias(primary)
+                to_primary[primary] = graph.distancias(primary, reverse=True)
+            primary_from, primary_to = from_primary[primary], to_primary[primary]
+            to_destination = graph.distancias(destination, reverse=True)
+
+            best = None
+            for link_cost, neighbor in candidates:
+                if neighbor == primary:
+                    continue
+                if (neighbor, primary) not in p_spaces:
+                    neighbor_distances = from_neighbors[neighbor]
+                    p_spaces[neighbor, primary] = [
+                        (to_pq, pq_node) for pq_node, to_pq in enumerate(neighbor_distances)
+                        if pq_node not in (source_index, primary_index) and to_pq != INFINITO
+                        and to_pq < neighbor_distances[source_index] + own_distances[pq_node]
+                        and to_pq < neighbor_distances[primary_index] + primary_from[pq_node]
+                    ]
+                for to_pq, pq_node in p_spaces[neighbor, primary]:
+                    remaining = to_destination[pq_node]
+                    if pq_node == target or remaining == INFINITO:
+                        continue
+                    if not (remaining < to_source[pq_node] + own_distances[target] and
+                            remaining < primary_to[pq_node] + primary_from[target]):
+                        continue
+                    candidate = (link_cost + to_pq + remaining, neighbor, graph.nomes[pq_node])
+                    if best is None or candidate < best:
+                        best = candidate
+
+            if best is not None:
+                alternatives[destination] = {'primario': primary, 'reserva': best[1], 'tipo': 'rlfa', 'pq': best[2]}
+        return alternatives
+
+    def _areas_de(self, router_id: str) -> List[int]:
+        """Return the areas a router is attached to, according to its LSA."""
+        if router_id in self.lsdb:
+            return self.lsdb[router_id].get('areas', [self.area])
+        return [self.area]
+
+    def _spf_por_area(self, source: str) -> Dict[int, Tuple[Dict[str, float], Dict[str, str]]]:
+        """
+        Run one intra-area SPF for every area the source is attached to.
+        
+        Args:
+            source: Source router ID
+            
+        Returns:
+            Dict mapping each area to its (distances, first hops)
+        """
+        results = {}
+        for area in self._areas_de(source):
+            network_graph = self._gerar_grafo(area)
+            if source in network_graph:
+                results[area] = self._spf(network_graph, source)
+        return results
+
+    def _alcance_por_resumos(self, source: str, area: int,
+                             distances: Dict[str, float]) -> Dict[str, Tuple[float, str]]:
+        """
+        Collect the destinations announced by the border routers of an area.
+        
+        Args:
+            source: Source router ID
+            area: Area whose summary LSAs are considered
+            distances: Intra-area costs from the source
+            
+        Returns:
+            Dict mapping each destination to (total cost, border router used)
+        """
+        reachable = {}
+        for summary in self.resumos.values():
+            border_router = summary['origem']
+            if (summary['area'] != area or border_router == source or
+                    border_router in self.inativos or border_router not in distances):
+                continue
+            for destination, info in summary['destinos'].items():
+                total_cost = distances[border_router] + info['custo']
+                if (destination != source and total_cost < INFINITO_RESUMO and
+                        (destination not in reachable or total_cost < reachable[destination][0])):
+                    reachable[destination] = (total_cost, border_router)
+        return reachable
+
+    @staticmethod
+    def _areas_de_resumos(spf_results: Dict[int, Any]) -> List[int]:
+        """
+        Return the areas whose summary LSAs a router may use for its own routes.
+        
+        Internal routers use the summaries of their area. Border routers only
+        use those of the backbone: a summary flooded into a non-backbone area
+        may come from another border router of the same area, and following
+        it could lead back through this router.
+        
+        Args:
+            spf_results: Intra-area SPF results, by attached area
+            
+        Returns:
+            List of area IDs
+        """
+        if len(spf_results) < 2:
+            return list(spf_results)
+        return [AREA_BACKBONE] if AREA_BACKBONE in spf_results else []
+
+    def _rotas_por_area(self, source: str) -> Dict[str, Tuple[float, str]]:
+        """
+        Compute routes with intra-area SPF plus inter-area summaries.
+        
+        Intra-area routes are always preferred over inter-area ones, and
+        border routers only follow backbone summaries.
+        
+        Args:
+            source: Source router ID
+            
+        Returns:
+            Dict mapping destinations to (cost, next hop)
+        """
+        spf_results = self._spf_por_area(source)
+        routes = {}
+        for distances, first_hops in spf_results.values():
+            for destination, next_hop in first_hops.items():
+                if destination not in routes or distances[destination] < routes[destination][0]:
+                    routes[destination] = (distances[destination], next_hop)
+
+        inter_area = {}
+        for area in GerenciadorDeRotas._areas_de_resumos(spf_results):
+            distances, first_hops = spf_results[area]
+            for destination, (cost, border_router) in self._alcance_por_resumos(source, area, distances).items():
+                if destination in routes:
+                    continue
+                if destination not in inter_area or cost < inter_area[destination][0]:
+                    inter_area[destination] = (cost, first_hops[border_router])
+        routes.update(inter_area)
+        return routes
+
+    def gerar_resumos(self, source: str) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """
+        Build the summary LSAs an area border router originates.
+        
+        The OSPF inter-area rules keep summaries from looping between border
+        routers: the backbone receives only the intra-area routes of the
+        other attached areas, and every other area receives those plus the
+        destinations learned from backbone summaries. Summaries learned in a
+        non-backbone area are never passed on, so a destination that fails
+        is withdrawn everywhere instead of being announced back with growing
+        costs. Returns nothing for internal routers.
+        
+        Args:
+            source: ID of this router
+            
+        Returns:
+            Dict mapping area to destinations with their 'ip' and 'custo'
+        """
+        spf_results = self._spf_por_area(source)
+        if len(spf_results) < 2:
+            return {}
+
+        intra_area = {
+            area: {destination: cost for destination, cost in distances.items() if destination != source}
+            for area, (distances, _) in spf_results.items()
+        }
+        backbone_summaries = {}
+        if AREA_BACKBONE in spf_results:
+            backbone_summaries = {
+                destination: cost
+                for destination, (cost, _) in self._alcance_por_resumos(
+                    source, AREA_BACKBONE, spf_results[AREA_BACKBONE][0]
+                ).items()
+                if not any(destination in reachable for reachable in intra_area.values())
+            }
+
+        summaries = {}
+        for target_area in spf_results:
+            sources = [reachable for area, reachable in intra_area.items() if area != target_area]
+            if target_area != AREA_BACKBONE:
+                sources.append(backbone_summaries)
+            announced = {}
+            for reachable in sources:
+                for destination, cost in reachable.items():
+                    if destination in intra_area[target_area]:
+                        continue
+                    if destination not in announced or cost < announced[destination]:
+                        announced[destination] = cost
+            summaries[target_area] = {
+                destination: {'ip': self.ip_de(destination), 'custo': cost}
+                for destination, cost in announced.items()
+            }
+        return summaries
+
+    def ip_de(self, router_id: str) -> Optional[str]:
+        """
+        Return the address of a router, looking at summaries for other areas.
+        
+        Args:
+            router_id: Router ID
+            
+        Returns:
+            Router IP address, or None when unknown
+        """
+        if router_id in self.lsdb:
+            return self.lsdb[router_id]['ip']
+        for summary in self.resumos.values():
+            if router_id in summary['destinos']:
+                return summary['destinos'][router_id]['ip']
+        return None
+
+    def destinos_conhecidos(self) -> List[str]:
+        """
+        Return every router known from the LSDB or from summaries.
+
+        Returns:
+            List of router IDs
+        """
+        known = set(self.lsdb)
+        for summary in self.resumos.values():
+            known.update(summary['destinos'])
+        return sorted(known)
+
+    def consultar_caminho(self, source: str, destination: str,
+                          landmarks: bool = False) -> Optional[Tuple[int, List[str]]]:
+        """
+        Answer a point-to-point query without computing full SPF trees.
+        
+        Runs over the LSDB graph with the current inactive routers; summary
+        LSAs are not considered. On ties the path may differ from the one the
+        routing tables follow, but its cost is always the shortest.
+        
+        Args:
+            source: Source router ID
+            destination: Destination router ID
+            landmarks: Use A* with ALT landmarks instead of bidirectional Dijkstra
+            
+        Returns:
+            Tuple with (cost, list of router IDs from source to destination),
+            or None if there is no path
+        """
+        self._sincronizar_grafo()
+        return self.grafo.caminho(source, destination, landmarks)
+
+    def analisador_de_falhas(self) -> AnalisadorDeFalhas:
+        """
+        Return the what-if engine for the current topology and inactive routers.
+        
+        Building it runs one SPF per router, so it is kept while the LSDB
+        generation and the inactive set stay the same.
+        
+        Returns:
+            AnalisadorDeFalhas over a frozen copy of the graph
+        """
+        self._sincronizar_grafo()
+        generation = getattr(self.lsdb, 'geracao', None)
+        key = (generation, frozenset(self.inativos)) if generation is not None else None
+        if self._analisador is None or key is None or self._analisador[0] != key:
+            self._analisador = (key, AnalisadorDeFalhas(self.grafo))
+        return self._analisador[1]
+
+    def k_caminhos(self, source: str, destination: str, k: int) -> List[Tuple[int, List[str]]]:
+        """
+        Find the k shortest loopless paths between two routers.
+        
+        Args:
+            source: Source router ID
+            destination: Destination router ID
+            k: Number of paths wanted
+            
+        Returns:
+            Up to k tuples of (cost, list of router IDs), cheapest first
+        """
+        return self.analisador_de_falhas().k_caminhos(source, destination, k)
+
+    def analisar_falhas(self, elements: Optional[List[Elemento]] = None, double: bool = False,
+                        processes: int = 1) -> List[Dict[str, Any]]:
+        """
+        Simulate router and link failures and report their effect on every pair.
+        
+        Args:
+            elements: Routers (IDs) and links (pairs of IDs) to fail, all of them when None
+            double: Fail every pair of elements instead of each one alone
+            processes: Worker processes sharing the scenarios
+            
+        Returns:
+            One dict per scenario, as returned by AnalisadorDeFalhas.simular
+        """
+        analyser = self.analisador_de_falhas()
+        if double:
+            return analyser.falhas_duplas(elements, processes)
+        if elements is None:
+            return analyser.falhas_simples(processes)
+        return analyser.varrer(([element] for element in elements), processes)
+
+    def calcular_tabelas(self, sources: Optional[List[str]] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Compute the routing tables of several routers in one pass over the graph.
+        
+        Unlike dijkstra, nothing is printed or cached. With areas, each table
+        still comes from dijkstra.
+        
+        Args:
+            sources: Router IDs, every router in the LSDB when None
+            
+        Returns:
+            Dict mapping each source to its routing table
+        """
+        if sources is None:
+            sources = list(self.lsdb)
+        if self.area is not None:
+            return {source: self.dijkstra(source) for source in sources}
+        self._sincronizar_grafo()
+        tables = {}
+        for source in sources:
+            routing_table = self.grafo.primeiros_saltos(source) or {}
+            tables[source] = {dest: next_hop for dest, next_hop in routing_table.items() if next_hop != dest}
+        return tables
+
     def calcular_todas_rotas(self) -> None:
         """Calculate routes for all routers in the network."""
         self.tabela_de_rotas = {
@@ -214,3 +858,6 @@ if __name__ == "__main__":
     roteador = GerenciadorDeRotas(lsdb,inativos)
 
     print(roteador.dijkstra('roteador4'))
+    print(roteador.k_caminhos('roteador1', 'roteador4', 2))
+    for cenario in roteador.analisar_falhas():
+        print(cenario)
@@ -6,10 +6,12 @@ for network routers. It manages route calculations and system-level route update
 """
 
 import subprocess
-import os
-from typing import Dict
+import threading
+from typing import Dict, List, Optional
 from class_net.manipulation import Manipulacao
+from class_net.route_aggregation import AgregadorDeRotas
 from class_net.route_manager import GerenciadorDeRotas
+from class_net.router_config import ConfiguracaoRoteador
 
 class AtualizadorDeRotas:
     """
@@ -21,56 +23,281 @@ class AtualizadorDeRotas:
     Attributes:
         ROTEADOR_ID (str): Unique identifier for this router
         gerenciador_de_rotas (GerenciadorDeRotas): Route calculation manager
+        agregador (AgregadorDeRotas): Prefix aggregation stage before installation
+        rotas_instaladas (Dict): Prefixes installed by this router mapped to their gateway
+        lfa (bool): Whether backup tables are prepared for fast reroute
+        reservas (Dict): Prefixes to install when each neighbor fails, by neighbor ID
+        ultima_tabela (Dict): Routing table of the last recalculation
+        recalculos (int): Recalculations run
+        geracao_calculada (Optional[tuple]): Database generations of the last recalculation
+        comutacoes (int): Switches to a backup table
     """
     
-    def __init__(self, gerenciador_de_rotas: GerenciadorDeRotas):
+    def __init__(self, gerenciador_de_rotas: GerenciadorDeRotas,
+                 config: Optional[ConfiguracaoRoteador] = None):
         """
         Initialize the route updater.
         
         Args:
             gerenciador_de_rotas: Route calculation manager instance
+            config: Router configuration, read from the environment when omitted
         """
-        self.ROTEADOR_ID = os.getenv("ROTEADOR_ID")
+        config = config or ConfiguracaoRoteador.de_ambiente()
+        self.ROTEADOR_ID = config.roteador_id
         self.gerenciador_de_rotas = gerenciador_de_rotas
+        self.agregador = AgregadorDeRotas(config.agregacao)
+        self.rotas_instaladas: Dict[str, str] = {}
+        self.lfa = config.lfa
+        self.reservas: Dict[str, Dict[str, str]] = {}
+        self.ultima_tabela: Dict[str, str] = {}
+        self._ultima_entrada: Optional[tuple] = None
+        self.recalculos = 0
+        self.geracao_calculada: Optional[tuple] = None
+        self.comutacoes = 0
+        # _lock serialises route calculations; _lock_rotas only guards the
+        # installed routes and the backups, so a failover never waits for SPF.
+        self._lock = threading.Lock()
+        self._lock_rotas = threading.Lock()
 
-    def atualizar_rota(self, routing_table: Dict[str, str]) -> None:
+    def atualizar_rota(self, routing_table: Dict[str, str], switches: Optional[int] = None) -> bool:
         """
         Update system routing table with new routes.
         
+        Destination subnets are aggregated per gateway first. Only prefixes
+        that changed are replaced, and prefixes this router installed earlier
+        that are no longer needed are deleted. The backup tables used for
+        fast reroute are prepared beforehand, without holding the installed
+        routes, and replace the old ones together with the installation. A
+        table computed while a failover happened is dropped, since it may
+        still use the failed neighbor.
+        
+        Args:
+            routing_table: Dictionary mapping destinations to next hops
+            switches: Value of comutacoes when the table was computed, the current one when omitted
+            
+        Returns:
+            bool: False if the table was dropped
+        """
+        if switches is None:
+            switches = self.comutacoes
+        prefixes = self._prefixos(routing_table)
+        backups = self._preparar_reservas(routing_table) if self.lfa else {}
+        with self._lock_rotas:
+            if self.comutacoes != switches:
+                print(f"[{self.ROTEADOR_ID}] Tabela descartada: houve uma comutação durante o cálculo")
+                return False
+            self._aplicar(prefixes)
+            self.reservas = backups
+        return True
+
+    def _prefixos(self, routing_table: Dict[str, str]) -> Dict[str, str]:
+        """
+        Turn a routing table into the aggregated prefixes to install.
+        
         Args:
             routing_table: Dictionary mapping destinations to next hops
+            
+        Returns:
+            Dict mapping prefixes to gateway addresses
         """
+        routes = {}
         for destination, next_hop in routing_table.items():
-            destination_ip = self.gerenciador_de_rotas.lsdb[destination]['ip']
-            next_hop_ip = self.gerenciador_de_rotas.lsdb[next_hop]['ip']
+            destination_ip = self.gerenciador_de_rotas.ip_de(destination)
+            next_hop_ip = self.gerenciador_de_rotas.ip_de(next_hop)
             
             destination_subnet = Manipulacao.extrair_subnet_roteador_ip(destination_ip)
-            gateway_ip = Manipulacao.extrair_ip_roteadores_ip(next_hop_ip)
-            
-            route_command = f"ip route replace {destination_subnet} via {gateway_ip}"
-            print(f"[{self.ROTEADOR_ID}] Executando: {route_command}")
+            routes[destination_subnet] = Manipulacao.extrair_ip_roteadores_ip(next_hop_ip)
+
+        blocked = []
+        if self.agregador.modo == "agressivo":
+            blocked = [
+                Manipulacao.extrair_subnet_roteador_ip(self.gerenciador_de_rotas.ip_de(router))
+                for router in self.gerenciador_de_rotas.destinos_conhecidos()
+                if router not in routing_table and self.gerenciador_de_rotas.ip_de(router)
+            ]
+        return self.agregador.agregar(routes, blocked)
+
+    def _aplicar(self, prefixes: Dict[str, str]) -> None:
+        """
+        Make the installed routes match a set of prefixes, one command per change.
+        
+        Args:
+            prefixes: Prefixes mapped to their gateway
+        """
+        for prefix, gateway_ip in prefixes.items():
+            if self.rotas_instaladas.get(prefix) == gateway_ip:
+                continue
+            if self._executar(f"ip route replace {prefix} via {gateway_ip}"):
+                self.rotas_instaladas[prefix] = gateway_ip
+
+        for prefix in [prefix for prefix in self.rotas_instaladas if prefix not in prefixes]:
+            self._executar(f"ip route del {prefix}")
+            del self.rotas_instaladas[prefix]
+
+    def _preparar_reservas(self, routing_table: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+        """
+        Build, for every neighbor, the prefixes to install if it fails.
+        
+        Destinations whose primary next hop is the failed neighbor move to
+        their loop-free alternate. Destinations without one keep their route
+        until the next SPF.
+        
+        Args:
+            routing_table: Dictionary mapping destinations to next hops
             
-            command_result = subprocess.run(route_command, shell=True, capture_output=True, text=True)
+        Returns:
+            Dict mapping neighbor IDs to the prefixes of their backup table
+        """
+        backups_by_neighbor: Dict[str, Dict[str, str]] = {}
+        for destination, alternative in self.gerenciador_de_rotas.calcular_alternativas(self.ROTEADOR_ID).items():
+            if (alternative['tipo'] in ('lfa_no', 'lfa_enlace') and destination in routing_table
+                    and routing_table[destination] == alternative['primario']):
+                backups_by_neighbor.setdefault(alternative['primario'], {})[destination] = alternative['reserva']
+
+        backups = {}
+        for neighbor, moved in backups_by_neighbor.items():
+            backups[neighbor] = self._prefixos({**routing_table, **moved})
+        return backups
+
+    def comutar_para_reserva(self, neighbor: str) -> bool:
+        """
+        Switch the routes through a failed neighbor to their backups at once.
+        
+        The backup table was prepared with the last SPF, so no route
+        calculation happens here, nor is a running one waited for: the
+        differences are sent to the kernel in a single 'ip -batch' call. The
+        backups of other neighbors are dropped, as they were computed for the
+        previous table.
+        
+        Args:
+            neighbor: ID of the neighbor that failed
             
-            if command_result.returncode != 0:
-                print(f"[{self.ROTEADOR_ID}] Erro: {command_result.stderr.strip()}")
+        Returns:
+            bool: True if a backup table was installed
+        """
+        with self._lock_rotas:
+            prefixes = self.reservas.get(neighbor)
+            self.reservas = {}
+            if prefixes is None:
+                return False
+            self.comutacoes += 1
+            print(f"[{self.ROTEADOR_ID}] Comutando para as rotas de reserva sem {neighbor}")
+            commands = [f"route replace {prefix} via {gateway_ip}"
+                        for prefix, gateway_ip in prefixes.items()
+                        if self.rotas_instaladas.get(prefix) != gateway_ip]
+            commands += [f"route del {prefix}" for prefix in self.rotas_instaladas if prefix not in prefixes]
+            if self._executar_lote(commands):
+                self.rotas_instaladas = dict(prefixes)
             else:
-                print(f"[{self.ROTEADOR_ID}] Rota atualizada: {command_result.stdout.strip()}")
+                self._aplicar(prefixes)
+            return True
+
+    def _executar_lote(self, commands: List[str]) -> bool:
+        """
+        Run several ip commands in one process with 'ip -batch'.
+        
+        Args:
+            commands: ip commands without the leading 'ip'
+            
+        Returns:
+            bool: True if every command succeeded
+        """
+        if not commands:
+            return True
+        print(f"[{self.ROTEADOR_ID}] Executando em lote: {'; '.join(commands)}")
+        command_result = subprocess.run(["ip", "-force", "-batch", "-"], input="\n".join(commands) + "\n",
+                                        capture_output=True, text=True)
+        if command_result.returncode != 0:
+            print(f"[{self.ROTEADOR_ID}] Erro: {command_result.stderr.strip()}")
+            return False
+        return True
+
+    def restaurar_rotas(self, prefixes: Dict[str, str]) -> None:
+        """
+        Install previously saved prefixes without waiting for route calculation.
+        
+        They are recorded as installed, so the next calculation only changes
+        what differs from them.
+        
+        Args:
+            prefixes: Prefixes mapped to their gateway
+        """
+        print(f"[{self.ROTEADOR_ID}] Restaurando {len(prefixes)} rotas do snapshot")
+        with self._lock_rotas:
+            for prefix, gateway_ip in prefixes.items():
+                if self._executar(f"ip route replace {prefix} via {gateway_ip}"):
+                    self.rotas_instaladas[prefix] = gateway_ip
+
+    def _executar(self, route_command: str) -> bool:
+        """
+        Run a route command and report its result.
+        
+        Args:
+            route_command: Shell command to run
+            
+        Returns:
+            bool: True if the command succeeded
+        """
+        print(f"[{self.ROTEADOR_ID}] Executando: {route_command}")
+        
+        command_result = subprocess.run(route_command, shell=True, capture_output=True, text=True)
+        
+        if command_result.returncode != 0:
+            print(f"[{self.ROTEADOR_ID}] Erro: {command_result.stderr.strip()}")
+            return False
+        print(f"[{self.ROTEADOR_ID}] Rota atualizada: {command_result.stdout.strip()}")
+        return True
+
+    def instalar_tabela(self, routing_table: Dict[str, str]) -> None:
+        """
+        Install a routing table computed elsewhere, by the route controller.
+        
+        Args:
+            routing_table: Dictionary mapping destinations to next hops
+        """
+        with self._lock:
+            if routing_table != self.ultima_tabela:
+                print(f"[{self.ROTEADOR_ID}] Nova tabela de rotas do controlador:")
+                for destination, next_hop in routing_table.items():
+                    print(f"  {destination} → via {next_hop}")
+            if self.atualizar_rota(routing_table):
+                self.ultima_tabela = routing_table
 
     def recalcular_rotas(self, inactive_routers: list) -> None:
         """
         Recalculate and update routes based on network changes.
         
+        Calls may come from several threads (periodic checks and failure
+        detection events), so they are serialised. When the databases, the
+        inactive routers and the resulting table are all the same as in the
+        previous call, the installed routes and backups are already right and
+        nothing else is done. Failovers do not wait for these calls; one that
+        happens meanwhile makes the result be dropped and the next call
+        install again.
+        
         Args:
             inactive_routers: List of currently inactive routers
         """
-        self.gerenciador_de_rotas.set_inativos(inactive_routers)
-        
-        routing_table = self.gerenciador_de_rotas.dijkstra(self.ROTEADOR_ID)
-        if routing_table:
-            print(f"[{self.ROTEADOR_ID}] Nova tabela de rotas:")
-            for destination, next_hop in routing_table.items():
-                print(f"  {destination} → via {next_hop}")
-            self.atualizar_rota(routing_table)
-        else:
-            print(f"[{self.ROTEADOR_ID}] Nenhuma rota encontrada.")
\ No newline at end of file
+        with self._lock:
+            self.gerenciador_de_rotas.set_inativos(inactive_routers)
+            generation = self.gerenciador_de_rotas.geracao()
+            switches = self.comutacoes
+            inputs = (generation, frozenset(inactive_routers), switches) if generation is not None else None
+            
+            routing_table = self.gerenciador_de_rotas.dijkstra(self.ROTEADOR_ID)
+            unchanged = inputs is not None and inputs == self._ultima_entrada and routing_table == self.ultima_tabela
+            if routing_table and unchanged:
+                print(f"[{self.ROTEADOR_ID}] Tabela de rotas inalterada (cache de SPF com "
+                      f"{100 * self.gerenciador_de_rotas.taxa_de_acertos():.0f}% de acertos)")
+            elif routing_table:
+                if routing_table != self.ultima_tabela:
+                    print(f"[{self.ROTEADOR_ID}] Nova tabela de rotas:")
+                    for destination, next_hop in routing_table.items():
+                        print(f"  {destination} → via {next_hop}")
+                if self.atualizar_rota(routing_table, switches):
+                    self.ultima_tabela = routing_table
+                    self._ultima_entrada = inputs
+            else:
+                print(f"[{self.ROTEADOR_ID}] Nenhuma rota encontrada.")
+            self.recalculos += 1
+            self.geracao_calculada = generation
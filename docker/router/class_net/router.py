@@ -5,13 +5,23 @@ This module implements the main router application that coordinates all routing
 including LSA management, neighbor monitoring, and route updates.
 """
 
+import queue
 import threading
-import os
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
 from class_net.neighbor_manager import VizinhosManager
+from class_net.lsa_database import BancoLSA
 from class_net.lsa_manager import LSAManager
 from class_net.route_update import AtualizadorDeRotas
 from class_net.route_manager import GerenciadorDeRotas
+from class_net.router_config import ConfiguracaoRoteador
+from class_net.lsdb_snapshot import SnapshotLSDB
+from class_net.bfd import MotorBFD
+from class_net.controller import ClienteControlador
+from class_net.spf_worker import TrabalhadorSPF
+
+INTERVALO_SNAPSHOT = 2.0
+MARGEM_SEQUENCIA = 1000
 
 class RoteadorApp:
     """
@@ -21,30 +31,105 @@ class RoteadorApp:
     for network operations, and handles threading for concurrent operations.
     
     Attributes:
+        config (ConfiguracaoRoteador): Settings of this router instance
         lsdb (Dict): Link State Database storing network topology
         stop_event (threading.Event): Event to control thread execution
         vizinhos_manager (VizinhosManager): Manager for neighbor operations
         lsa_manager (LSAManager): Manager for LSA operations
         gerenciador_de_rotas (GerenciadorDeRotas): Manager for route calculations
         rota_manager (AtualizadorDeRotas): Manager for route updates
+        snapshot (Optional[SnapshotLSDB]): Snapshot file used for warm restarts
+        bfd (Optional[MotorBFD]): BFD engine detecting neighbor failures, None when ping is used
+        eventos_bfd (queue.Queue): BFD session changes waiting to be applied
+        cliente_controlador (Optional[ClienteControlador]): Receives the routes from the
+            controller in centralised mode, None when routes are computed locally
         active_threads (List[threading.Thread]): List of running threads
     """
     
-    def __init__(self):
-        """Initialize router application components and managers."""
-        self.lsdb: Dict[str, Any] = {}
+    def __init__(self, config: Optional[ConfiguracaoRoteador] = None):
+        """
+        Initialize router application components and managers.
+        
+        Args:
+            config: Router configuration, read from the environment when omitted
+        """
+        self.config = config or ConfiguracaoRoteador.de_ambiente()
+        self.lsdb: Dict[str, Any] = BancoLSA()
         self.stop_event = threading.Event()
 
         # Initialize component managers
-        self.vizinhos_manager = VizinhosManager()
-        self.lsa_manager = LSAManager(self.vizinhos_manager)
+        self.vizinhos_manager = VizinhosManager(self.config)
+        self.lsa_manager = LSAManager(self.vizinhos_manager, self.config)
         self.gerenciador_de_rotas = GerenciadorDeRotas(
             self.lsdb, 
-            self.vizinhos_manager.vizinhos_inativos
+            self.vizinhos_manager.vizinhos_inativos,
+            self.lsa_manager.resumos,
+            self.config.area
+        )
+        self.lsa_manager.gerador_de_resumos = lambda: self.gerenciador_de_rotas.gerar_resumos(
+            self.config.roteador_id
         )
-        self.rota_manager = AtualizadorDeRotas(self.gerenciador_de_rotas)
+        self.rota_manager = AtualizadorDeRotas(self.gerenciador_de_rotas, self.config)
+        self.lsa_manager.estatisticas_de_rotas = self.estatisticas_de_rotas
+        if self.config.troca_de_base:
+            self.vizinhos_manager.ao_ativar_vizinho = lambda neighbor: self.lsa_manager.iniciar_troca(
+                neighbor, self.lsdb
+            )
+        self.vizinhos_manager.ao_mudar_custo = lambda neighbor: self.lsa_manager.originar_agora.set()
+        if self.config.lfa:
+            self.vizinhos_manager.ao_desativar_vizinho = self.rota_manager.comutar_para_reserva
+        self.cliente_controlador = None
+        if self.config.controlador:
+            # Centralised mode: no local SPF, so no backups either; a neighbor
+            # going down is reported to the controller at once instead.
+            self.rota_manager.lfa = False
+            self.cliente_controlador = ClienteControlador(self.config, self.rota_manager)
+            self.lsa_manager.ao_originar = self.cliente_controlador.inscrever
+            self.vizinhos_manager.ao_desativar_vizinho = lambda neighbor: self.lsa_manager.originar_agora.set()
+        elif self.config.spf_processo:
+            self.gerenciador_de_rotas.trabalhador = TrabalhadorSPF(self.config.area)
+        self.snapshot = SnapshotLSDB(self.config.snapshot) if self.config.snapshot else None
+        self.eventos_bfd: "queue.Queue[tuple]" = queue.Queue()
+        self.bfd = None
+        if self.config.bfd_intervalo:
+            self.bfd = MotorBFD(
+                self.config.roteador_id,
+                self.config.bfd_intervalo,
+                self.config.bfd_multiplicador,
+                ao_mudar_estado=lambda neighbor, is_up: self.eventos_bfd.put((neighbor, is_up))
+            )
+            for neighbor, (neighbor_ip, *_) in self.config.vizinhos.items():
+                self.bfd.adicionar_sessao(neighbor, neighbor_ip)
         self.active_threads: List[threading.Thread] = []
 
+    def estatisticas_de_rotas(self) -> Dict[str, Any]:
+        """
+        Return the LSDB size and how far route calculation has caught up with it.
+        
+        Returns:
+            Dict with 'lsdb' (LSAs stored), 'geracao' (current database
+            generations), 'geracao_calculada' (generations of the last
+            recalculation) and 'recalculos'
+        """
+        return {
+            "lsdb": len(self.lsdb),
+            "geracao": self.gerenciador_de_rotas.geracao(),
+            "geracao_calculada": self.rota_manager.geracao_calculada,
+            "recalculos": self.rota_manager.recalculos,
+        }
+
+    def recalcular_rotas(self) -> None:
+        """
+        Recalculate routes for the current inactive neighbors.
+        
+        In centralised mode no SPF runs: the table last received from the
+        controller is installed if it, or the LSDB, changed.
+        """
+        if self.cliente_controlador:
+            self.cliente_controlador.aplicar()
+        else:
+            self.rota_manager.recalcular_rotas(self.vizinhos_manager.vizinhos_inativos)
+
     def atualizar_tabela(self) -> None:
         """
         Monitor and update routing table based on network changes.
@@ -53,9 +138,7 @@ class RoteadorApp:
         """
         while not self.stop_event.is_set():
             if not self.vizinhos_manager.verifica_roteadores_ativos(self.lsdb):
-                self.rota_manager.recalcular_rotas(
-                    self.vizinhos_manager.vizinhos_inativos
-                )
+                self.recalcular_rotas()
             self.stop_event.wait(0.1)
 
     def monitorar_vizinhos(self) -> None:
@@ -63,29 +146,116 @@ class RoteadorApp:
         Monitor neighbor router status and update routes accordingly.
         
         Continuously checks neighbor status and triggers route recalculation.
+        With BFD, neighbor status comes from the sessions instead of ping, which
+        then only measures link costs when they are dynamic, and this loop
+        releases neighbors whose dampening has expired.
         """
         while not self.stop_event.is_set():
-            self.vizinhos_manager.atualiza_status_vizinhos()
-            self.rota_manager.recalcular_rotas(
-                self.vizinhos_manager.vizinhos_inativos
-            )
+            if not self.bfd:
+                self.vizinhos_manager.atualiza_status_vizinhos()
+            else:
+                self.vizinhos_manager.reavaliar_amortecimento()
+                if self.vizinhos_manager.custos:
+                    self.vizinhos_manager.medir_custos()
+            self.recalcular_rotas()
             self.stop_event.wait(0.5)
 
+    def tratar_eventos_bfd(self) -> None:
+        """
+        Apply BFD session changes as soon as they happen.
+        
+        A session going down marks the neighbor inactive, which switches to the
+        backup routes when they are ready, and recalculates routes at once,
+        without waiting for the periodic check. The work runs here rather than
+        on the BFD thread, which must keep its timers.
+        """
+        while not self.stop_event.is_set():
+            try:
+                neighbor, is_up = self.eventos_bfd.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self.vizinhos_manager.definir_estado_vizinho(neighbor, is_up)
+            if self.cliente_controlador:
+                self.lsa_manager.originar_agora.set()
+            self.recalcular_rotas()
+
+    def restaurar_snapshot(self) -> bool:
+        """
+        Reload the LSDB and FIB saved before a restart and install the routes.
+        
+        The own sequence number resumes past the saved one, with a margin for
+        LSAs sent after the last checkpoint, so neighbors accept new LSAs at
+        once. Fresh LSAs then replace the restored ones as they arrive.
+        
+        Returns:
+            bool: True if a snapshot of this router was restored
+        """
+        state = self.snapshot.carregar() if self.snapshot else None
+        if not state or state.get("roteador") != self.config.roteador_id:
+            return False
+
+        self.lsdb.update(state["lsdb"])
+        self.lsa_manager.resumos.update(state["resumos"])
+        own_lsa = state["lsdb"].get(self.config.roteador_id, {})
+        self.lsa_manager.sequence_number = max(state["seq"], own_lsa.get("seq", 0)) + MARGEM_SEQUENCIA
+        print(f"[{self.config.roteador_id}] Snapshot de {time.time() - state['timestamp']:.1f} s "
+              f"restaurado: {len(state['lsdb'])} LSAs")
+        self.rota_manager.restaurar_rotas(state["rotas"])
+        return True
+
+    def salvar_snapshot(self) -> int:
+        """
+        Checkpoint the LSDB, summaries, sequence number and installed FIB.
+        
+        Returns:
+            int: Bytes written, 0 when nothing changed
+        """
+        return self.snapshot.salvar({
+            "roteador": self.config.roteador_id,
+            "seq": self.lsa_manager.sequence_number,
+            "lsdb": dict(self.lsdb),
+            "resumos": dict(self.lsa_manager.resumos),
+            "rotas": dict(self.rota_manager.rotas_instaladas),
+        })
+
+    def checkpoint_periodico(self) -> None:
+        """Save a snapshot every INTERVALO_SNAPSHOT seconds while running."""
+        while not self.stop_event.wait(INTERVALO_SNAPSHOT):
+            self.salvar_snapshot()
+
     def iniciar_threads(self) -> None:
         """
         Initialize and start all router operation threads.
         
         Creates and starts threads for LSA operations, table updates,
-        and neighbor monitoring.
+        and neighbor monitoring. When a snapshot is configured, it is restored
+        first and checkpointed periodically afterwards. With BFD, its engine
+        and the thread applying its events are started too, and in centralised
+        mode the thread receiving routes from the controller. With flooding
+        pacing, the pacer's sender thread runs as well.
         """
+        if self.snapshot:
+            self.restaurar_snapshot()
+
         self.active_threads = [
             threading.Thread(target=self.lsa_manager.enviar_lsa, 
-                           args=(self.stop_event,)),
+                           args=(self.stop_event, self.lsdb)),
             threading.Thread(target=self.lsa_manager.receber_lsa, 
                            args=(self.lsdb, self.stop_event)),
             threading.Thread(target=self.atualizar_tabela),
             threading.Thread(target=(self.monitorar_vizinhos))
         ]
+        if self.snapshot:
+            self.active_threads.append(threading.Thread(target=self.checkpoint_periodico))
+        if self.bfd:
+            self.bfd.iniciar()
+            self.active_threads.append(threading.Thread(target=self.tratar_eventos_bfd))
+        if self.lsa_manager.ritmador:
+            self.active_threads.append(threading.Thread(target=self.lsa_manager.ritmador.executar,
+                                                        args=(self.stop_event,)))
+        if self.cliente_controlador:
+            self.active_threads.append(threading.Thread(target=self.cliente_controlador.receber_fib,
+                                                        args=(self.stop_event,)))
 
         for thread in self.active_threads:
             thread.daemon = True
@@ -97,11 +267,19 @@ class RoteadorApp:
         """
         Stop all router operations and threads gracefully.
         
-        Sets the stop event and waits for all threads to complete.
+        Sets the stop event and waits for all threads to complete, then
+        stops the SPF worker process, if any.
         """
         self.stop_event.set()
+        self.lsa_manager.originar_agora.set()
+        if self.bfd:
+            self.bfd.parar()
         for thread in self.active_threads:
             thread.join()
+        if self.gerenciador_de_rotas.trabalhador:
+            self.gerenciador_de_rotas.trabalhador.parar()
+        if self.snapshot:
+            self.salvar_snapshot()
             
 if __name__ == "__main__":
     router_application = RoteadorApp()
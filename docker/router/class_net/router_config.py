@@ -0,0 +1,334 @@
+"""
+Router Configuration Module
+
+This module groups the per-router settings (identity, address and neighbors) in a
+single object. It can be built from the container environment, as done by
+docker-compose, or from explicit command line arguments, as done when several
+routers share one container.
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, List, Any, Optional
+
+from class_net.route_aggregation import MODOS_AGREGACAO
+
+VARIAVEIS_AMBIENTE = ("ROTEADOR_ID", "ENDERECO_IP", "VIZINHOS", "AREA", "AGREGACAO",
+                      "SNAPSHOT", "INTERVALO_LSA", "TROCA_DE_BASE", "BFD_INTERVALO",
+                      "BFD_MULTIPLICADOR", "LFA", "CUSTO_DINAMICO", "AMORTECIMENTO_MEIA_VIDA",
+                      "AMORTECIMENTO_SUPRESSAO", "AMORTECIMENTO_REUSO", "CONTROLADOR",
+                      "MULTICAST", "INUNDACAO_DINAMICA", "TAXA_INUNDACAO", "RAJADA_INUNDACAO",
+                      "ESTAGIOS", "BUFFER_RECEPCAO", "PRE_FILTRO", "LOTE_RECEPCAO",
+                      "SPF_PROCESSO")
+
+class ConfiguracaoRoteador:
+    """
+    Settings of a single router instance.
+
+    Attributes:
+        roteador_id (str): Unique identifier for the router
+        endereco_ip (str): Main IP address of the router
+        vizinhos (Dict): Neighbor router IDs mapped to [ip, cost] or [ip, cost, area]
+        area (Optional[int]): Area of the router, None when areas are not used
+        agregacao (str): Route aggregation mode, one of MODOS_AGREGACAO
+        snapshot (Optional[str]): Path of the LSDB snapshot file, None to disable warm restart
+        intervalo_lsa (float): Seconds between LSA originations
+        troca_de_base (bool): Whether databases are exchanged when an adjacency comes up
+        bfd_intervalo (Optional[float]): BFD control packet interval in seconds, None to detect failures by ping
+        bfd_multiplicador (int): BFD detect multiplier
+        lfa (bool): Whether loop-free alternate backups are kept ready for fast reroute
+        custo_dinamico (bool): Whether link costs follow the measured RTT and loss
+        amortecimento_meia_vida (Optional[float]): Half-life in seconds of the flap penalty, None to disable dampening
+        amortecimento_supressao (float): Penalty above which a flapping neighbor is suppressed
+        amortecimento_reuso (float): Penalty below which a suppressed neighbor is used again
+        controlador (Optional[str]): Address of the route controller, None to compute routes locally
+        multicast (bool): Whether LSAs are flooded once per shared segment by multicast
+        inundacao_dinamica (bool): Whether LSAs are flooded over the leader's flooding subgraph only
+        taxa_inundacao (Optional[float]): Flooding datagrams per second to each neighbor, None to send LSAs unpaced
+        rajada_inundacao (float): Flooding datagrams a neighbor may receive back to back
+        estagios (bool): Whether receiving, installing and flooding LSAs run as separate stages
+        buffer_recepcao (Optional[int]): SO_RCVBUF of the LSA sockets in bytes, None for the system default
+        pre_filtro (bool): Whether stale LSAs are dropped from their header, before decoding
+        lote_recepcao (Optional[int]): Datagrams read per batch from the LSA sockets, None to read one at a time
+        spf_processo (bool): Whether routes are computed in a worker process
+    """
+
+    def __init__(self, roteador_id: str, endereco_ip: str, vizinhos: Dict[str, List[Any]], *,
+                 area: Optional[int] = None, agregacao: str = "exato",
+                 snapshot: Optional[str] = None, intervalo_lsa: float = 0.5,
+                 troca_de_base: bool = True, bfd_intervalo: Optional[float] = None,
+                 bfd_multiplicador: int = 3, lfa: bool = True, custo_dinamico: bool = False,
+                 amortecimento_meia_vida: Optional[float] = None, amortecimento_supressao: float = 2000.0,
+                 amortecimento_reuso: float = 750.0, controlador: Optional[str] = None,
+                 multicast: bool = False, inundacao_dinamica: bool = False,
+                 taxa_inundacao: Optional[float] = None, rajada_inundacao: float = 10.0,
+                 estagios: bool = False, buffer_recepcao: Optional[int] = None, pre_filtro: bool = True,
+                 lote_recepcao: Optional[int] = None, spf_processo: bool = False):
+        """
+        Initialize the configuration.
+
+        Args:
+            roteador_id: Unique identifier for the router
+            endereco_ip: Main IP address of the router
+            vizinhos: Neighbor router IDs mapped to [ip, cost] or [ip, cost, area]
+            area: Area of the router, None when areas are not used
+            agregacao: Route aggregation mode, one of MODOS_AGREGACAO
+            snapshot: Path of the LSDB snapshot file, None to disable warm restart
+            intervalo_lsa: Seconds between LSA originations
+            troca_de_base: Whether databases are exchanged when an adjacency comes up
+            bfd_intervalo: BFD control packet interval in seconds, None to detect failures by ping
+            bfd_multiplicador: BFD detect multiplier
+            lfa: Whether loop-free alternate backups are kept ready for fast reroute
+            custo_dinamico: Whether link costs follow the measured RTT and loss
+            amortecimento_meia_vida: Half-life in seconds of the flap penalty, None to disable dampening
+            amortecimento_supressao: Penalty above which a flapping neighbor is suppressed
+            amortecimento_reuso: Penalty below which a suppressed neighbor is used again
+            controlador: Address of the route controller, None to compute routes locally
+            multicast: Whether LSAs are flooded once per shared segment by multicast
+            inundacao_dinamica: Whether LSAs are flooded over the leader's flooding subgraph only
+            taxa_inundacao: Flooding datagrams per second to each neighbor, None to send LSAs unpaced
+            rajada_inundacao: Flooding datagrams a neighbor may receive back to back
+            estagios: Whether receiving, installing and flooding LSAs run as separate stages
+            buffer_recepcao: SO_RCVBUF of the LSA sockets in bytes, None for the system default
+            pre_filtro: Whether stale LSAs are dropped from their header, before decoding
+            lote_recepcao: Datagrams read per batch from the LSA sockets, None to read one at a time
+            spf_processo: Whether routes are computed in a worker process
+        """
+        self.roteador_id = roteador_id
+        self.endereco_ip = endereco_ip
+        self.vizinhos = vizinhos
+        self.area = area
+        self.agregacao = agregacao
+        self.snapshot = snapshot
+        self.intervalo_lsa = intervalo_lsa
+        self.troca_de_base = troca_de_base
+        self.bfd_intervalo = bfd_intervalo
+        self.bfd_multiplicador = bfd_multiplicador
+        self.lfa = lfa
+        self.custo_dinamico = custo_dinamico
+        self.amortecimento_meia_vida = amortecimento_meia_vida
+        self.amortecimento_supressao = amortecimento_supressao
+        self.amortecimento_reuso = amortecimento_reuso
+        self.controlador = controlador
+        self.multicast = multicast
+        self.inundacao_dinamica = inundacao_dinamica
+        self.taxa_inundacao = taxa_inundacao
+        self.rajada_inundacao = rajada_inundacao
+        self.estagios = estagios
+        self.buffer_recepcao = buffer_recepcao
+        self.pre_filtro = pre_filtro
+        self.lote_recepcao = lote_recepcao
+        self.spf_processo = spf_processo
+
+    @staticmethod
+    def de_ambiente() -> "ConfiguracaoRoteador":
+        """
+        Build the configuration from ROTEADOR_ID, ENDERECO_IP, VIZINHOS, AREA, AGREGACAO,
+        SNAPSHOT, INTERVALO_LSA, TROCA_DE_BASE, BFD_INTERVALO, BFD_MULTIPLICADOR, LFA,
+        CUSTO_DINAMICO, AMORTECIMENTO_MEIA_VIDA, AMORTECIMENTO_SUPRESSAO,
+        AMORTECIMENTO_REUSO, CONTROLADOR, MULTICAST, INUNDACAO_DINAMICA, TAXA_INUNDACAO,
+        RAJADA_INUNDACAO, ESTAGIOS, BUFFER_RECEPCAO, PRE_FILTRO, LOTE_RECEPCAO and
+        SPF_PROCESSO.
+
+        Returns:
+            ConfiguracaoRoteador: Configuration read from the environment
+        """
+        area = os.getenv("AREA")
+        bfd_interval = os.getenv("BFD_INTERVALO")
+        half_life = os.getenv("AMORTECIMENTO_MEIA_VIDA")
+        flooding_rate = os.getenv("TAXA_INUNDACAO")
+        receive_buffer = os.getenv("BUFFER_RECEPCAO")
+        receive_batch = os.getenv("LOTE_RECEPCAO")
+        return ConfiguracaoRoteador(
+            roteador_id=os.getenv("ROTEADOR_ID"),
+            endereco_ip=os.getenv("ENDERECO_IP"),
+            vizinhos=json.loads(os.getenv("VIZINHOS") or "{}"),
+            area=int(area) if area else None,
+            agregacao=os.getenv("AGREGACAO") or "exato",
+            snapshot=os.getenv("SNAPSHOT") or None,
+            intervalo_lsa=float(os.getenv("INTERVALO_LSA") or 0.5),
+            troca_de_base=os.getenv("TROCA_DE_BASE", "1") != "0",
+            bfd_intervalo=float(bfd_interval) if bfd_interval else None,
+            bfd_multiplicador=int(os.getenv("BFD_MULTIPLICADOR") or 3),
+            lfa=os.getenv("LFA", "1") != "0",
+            custo_dinamico=os.getenv("CUSTO_DINAMICO", "0") == "1",
+            amortecimento_meia_vida=float(half_life) if half_life else None,
+            amortecimento_supressao=float(os.getenv("AMORTECIMENTO_SUPRESSAO") or 2000.0),
+            amortecimento_reuso=float(os.getenv("AMORTECIMENTO_REUSO") or 750.0),
+            controlador=os.getenv("CONTROLADOR") or None,
+            multicast=os.getenv("MULTICAST", "0") == "1",
+            inundacao_dinamica=os.getenv("INUNDACAO_DINAMICA", "0") == "1",
+            taxa_inundacao=float(flooding_rate) if flooding_rate else None,
+            rajada_inundacao=float(os.getenv("RAJADA_INUNDACAO") or 10.0),
+            estagios=os.getenv("ESTAGIOS", "0") == "1",
+            buffer_recepcao=int(receive_buffer) if receive_buffer else None,
+            pre_filtro=os.getenv("PRE_FILTRO", "1") != "0",
+            lote_recepcao=int(receive_batch) if receive_batch else None,
+            spf_processo=os.getenv("SPF_PROCESSO", "0") == "1"
+        )
+
+    @staticmethod
+    def de_argumentos(argv: Optional[List[str]] = None) -> "ConfiguracaoRoteador":
+        """
+        Build the configuration from command line arguments.
+
+        Values missing from the command line fall back to the environment.
+
+        Args:
+            argv: Argument list, sys.argv when omitted
+
+        Returns:
+            ConfiguracaoRoteador: Configuration read from the arguments
+        """
+        parser = argparse.ArgumentParser(description="Roteador de estado de enlace")
+        parser.add_argument("--id", dest="roteador_id", help="Identificador do roteador")
+        parser.add_argument("--ip", dest="endereco_ip", help="Endereço IP principal")
+        parser.add_argument("--vizinhos", help="Vizinhos em JSON: {\"id\": [ip, custo, área opcional]}")
+        parser.add_argument("--area", type=int, help="Área do roteador")
+        parser.add_argument("--agregacao", choices=MODOS_AGREGACAO, help="Modo de agregação de rotas")
+        parser.add_argument("--snapshot", help="Arquivo de snapshot da LSDB para reinício rápido")
+        parser.add_argument("--intervalo-lsa", type=float, help="Segundos entre originações de LSA")
+        parser.add_argument("--sem-troca-de-base", action="store_true",
+                            help="Não sincroniza as bases quando uma adjacência sobe")
+        parser.add_argument("--bfd-intervalo", type=float,
+                            help="Intervalo em segundos dos pacotes BFD; sem ele as falhas são detectadas por ping")
+        parser.add_argument("--bfd-multiplicador", type=int, help="Multiplicador de detecção do BFD")
+        parser.add_argument("--sem-lfa", action="store_true",
+                            help="Não mantém próximos saltos de reserva para a troca rápida após falhas")
+        parser.add_argument("--custo-dinamico", action="store_true",
+                            help="Ajusta o custo dos enlaces pelo RTT e pela perda medidos")
+        parser.add_argument("--amortecimento-meia-vida", type=float,
+                            help="Meia-vida em segundos da penalidade por oscilação; sem ela não há amortecimento")
+        parser.add_argument("--amortecimento-supressao", type=float,
+                            help="Penalidade acima da qual um vizinho oscilante é suprimido")
+        parser.add_argument("--amortecimento-reuso", type=float,
+                            help="Penalidade abaixo da qual um vizinho suprimido volta a ser usado")
+        parser.add_argument("--controlador",
+                            help="Endereço do controlador de rotas; sem ele as rotas são calculadas localmente")
+        parser.add_argument("--multicast", action="store_true",
+                            help="Inunda os LSAs uma vez por segmento de rede compartilhado, por multicast")
+        parser.add_argument("--inundacao-dinamica", action="store_true",
+                            help="Inunda os LSAs só pelo subgrafo de inundação anunciado pelo líder")
+        parser.add_argument("--taxa-inundacao", type=float,
+                            help="Datagramas de inundação por segundo para cada vizinho, com os LSAs agrupados; "
+                                 "sem ela cada LSA é enviado na hora")
+        parser.add_argument("--rajada-inundacao", type=float,
+                            help="Datagramas de inundação que um vizinho pode receber em sequência")
+        parser.add_argument("--estagios", action="store_true",
+                            help="Recebe, instala e inunda os LSAs em estágios separados, ligados por filas")
+        parser.add_argument("--buffer-recepcao", type=int,
+                            help="SO_RCVBUF em bytes dos sockets de LSA; sem ele vale o padrão do sistema")
+        parser.add_argument("--sem-pre-filtro", action="store_true",
+                            help="Decodifica todo LSA recebido, mesmo os não mais novos que a cópia guardada")
+        parser.add_argument("--lote-recepcao", type=int,
+                            help="Datagramas lidos de uma vez dos sockets de LSA a cada evento de leitura; "
+                                 "sem ele cada datagrama é lido numa volta do laço")
+        parser.add_argument("--spf-processo", action="store_true",
+                            help="Calcula as rotas num processo separado, sem disputar o GIL com a recepção")
+        args = parser.parse_args(argv)
+
+        config = ConfiguracaoRoteador.de_ambiente()
+        if args.roteador_id:
+            config.roteador_id = args.roteador_id
+        if args.endereco_ip:
+            config.endereco_ip = args.endereco_ip
+        if args.vizinhos:
+            config.vizinhos = json.loads(args.vizinhos)
+        if args.area is not None:
+            config.area = args.area
+        if args.agregacao:
+            config.agregacao = args.agregacao
+        if args.snapshot:
+            config.snapshot = args.snapshot
+        if args.intervalo_lsa:
+            config.intervalo_lsa = args.intervalo_lsa
+        if args.sem_troca_de_base:
+            config.troca_de_base = False
+        if args.bfd_intervalo:
+            config.bfd_intervalo = args.bfd_intervalo
+        if args.bfd_multiplicador:
+            config.bfd_multiplicador = args.bfd_multiplicador
+        if args.sem_lfa:
+            config.lfa = False
+        if args.custo_dinamico:
+            config.custo_dinamico = True
+        if args.amortecimento_meia_vida:
+            config.amortecimento_meia_vida = args.amortecimento_meia_vida
+        if args.amortecimento_supressao:
+            config.amortecimento_supressao = args.amortecimento_supressao
+        if args.amortecimento_reuso:
+            config.amortecimento_reuso = args.amortecimento_reuso
+        if args.controlador:
+            config.controlador = args.controlador
+        if args.multicast:
+            config.multicast = True
+        if args.inundacao_dinamica:
+            config.inundacao_dinamica = True
+        if args.taxa_inundacao:
+            config.taxa_inundacao = args.taxa_inundacao
+        if args.rajada_inundacao:
+            config.rajada_inundacao = args.rajada_inundacao
+        if args.estagios:
+            config.estagios = True
+        if args.buffer_recepcao:
+            config.buffer_recepcao = args.buffer_recepcao
+        if args.sem_pre_filtro:
+            config.pre_filtro = False
+        if args.lote_recepcao:
+            config.lote_recepcao = args.lote_recepcao
+        if args.spf_processo:
+            config.spf_processo = True
+        return config
+
+    def para_argumentos(self) -> List[str]:
+        """
+        Serialise the configuration as command line arguments for main.py.
+
+        Returns:
+            List[str]: Arguments accepted by de_argumentos
+        """
+        arguments = [
+            "--id", self.roteador_id,
+            "--ip", self.endereco_ip,
+            "--vizinhos", json.dumps(self.vizinhos),
+        ]
+        if self.area is not None:
+            arguments += ["--area", str(self.area)]
+        arguments += ["--agregacao", self.agregacao]
+        if self.snapshot:
+            arguments += ["--snapshot", self.snapshot]
+        arguments += ["--intervalo-lsa", str(self.intervalo_lsa)]
+        if not self.troca_de_base:
+            arguments.append("--sem-troca-de-base")
+        if self.bfd_intervalo:
+            arguments += ["--bfd-intervalo", str(self.bfd_intervalo),
+                          "--bfd-multiplicador", str(self.bfd_multiplicador)]
+        if not self.lfa:
+            arguments.append("--sem-lfa")
+        if self.custo_dinamico:
+            arguments.append("--custo-dinamico")
+        if self.amortecimento_meia_vida:
+            arguments += ["--amortecimento-meia-vida", str(self.amortecimento_meia_vida),
+                          "--amortecimento-supressao", str(self.amortecimento_supressao),
+                          "--amortecimento-reuso", str(self.amortecimento_reuso)]
+        if self.controlador:
+            arguments += ["--controlador", self.controlador]
+        if self.multicast:
+            arguments.append("--multicast")
+        if self.inundacao_dinamica:
+            arguments.append("--inundacao-dinamica")
+        if self.taxa_inundacao:
+            arguments += ["--taxa-inundacao", str(self.taxa_inundacao),
+                          "--rajada-inundacao", str(self.rajada_inundacao)]
+        if self.estagios:
+            arguments.append("--estagios")
+        if self.buffer_recepcao:
+            arguments += ["--buffer-recepcao", str(self.buffer_recepcao)]
+        if not self.pre_filtro:
+            arguments.append("--sem-pre-filtro")
+        if self.lote_recepcao:
+            arguments += ["--lote-recepcao", str(self.lote_recepcao)]
+        if self.spf_processo:
+            arguments.append("--spf-processo")
+        return arguments
@@ -0,0 +1,185 @@
+"""
+Segments Module
+
+This module lets LSAs be flooded once per shared network segment instead of
+once per neighbor. Each network ('rede') a router is attached to is a
+segment; routers join a multicast group on every segment and send a small
+hello there, so each one learns which neighbors share which segment. An LSA
+for several neighbors on the same segment then goes out as a single
+multicast datagram (TTL 1, so it never leaves the segment).
+
+Segments are the local networks holding the router's own address or a
+configured neighbor address, which leaves out interfaces such as the
+controller's management network. Neighbors heard on no segment yet are
+reached by unicast, as before.
+"""
+
+import ipaddress
+import json
+import socket
+import struct
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import psutil
+
+GRUPO_LSA = "224.0.0.5"
+PORTA_MULTICAST = 5004
+INTERVALO_HELLO = 2.0
+VALIDADE_HELLO = 3
+
+Rede = ipaddress.IPv4Network
+
+class SegmentosDeRede:
+    """
+    Multicast sockets and neighbor membership of the segments of one router.
+
+    Attributes:
+        ROTEADOR_ID (str): Unique identifier for the router
+        intervalo (float): Minimum seconds between hellos
+        segmentos (Dict[Rede, str]): Segment networks mapped to the local address on them
+        membros (Dict[Rede, Dict[str, float]]): Routers heard on each segment, with the time of their last hello
+        receptor (socket.socket): Socket receiving the group traffic of every segment
+    """
+
+    def __init__(self, roteador_id: str, addresses: Iterable[str], intervalo: float = INTERVALO_HELLO,
+                 interfaces: Optional[Dict[str, List[Tuple[str, str]]]] = None):
+        """
+        Find the segments and join the LSA group on each of them.
+
+        Args:
+            roteador_id: Unique identifier for the router
+            addresses: Own main address and configured neighbor addresses
+            intervalo: Minimum seconds between hellos
+            interfaces: Interface names mapped to (address, netmask), read from the system when omitted
+        """
+        self.ROTEADOR_ID = roteador_id
+        self.intervalo = intervalo
+        if interfaces is None:
+            interfaces = {
+                name: [(entry.address, entry.netmask) for entry in entries
+                       if entry.family == socket.AF_INET and entry.netmask]
+                for name, entries in psutil.net_if_addrs().items()
+            }
+        wanted = [ipaddress.ip_address(address) for address in addresses]
+        self.segmentos: Dict[Rede, str] = {}
+        for entries in interfaces.values():
+            for address, netmask in entries:
+                network = ipaddress.ip_interface(f"{address}/{netmask}").network
+                if not network.is_loopback and any(known in network for known in wanted):
+                    self.segmentos[network] = address
+        self.membros: Dict[Rede, Dict[str, float]] = {network: {} for network in self.segmentos}
+        self._ultimo_hello = float("-inf")
+        self._lock = threading.Lock()
+
+        self.receptor = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receptor.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.receptor.bind((GRUPO_LSA, PORTA_MULTICAST))
+        self._emissores: Dict[Rede, socket.socket] = {}
+        for network, address in self.segmentos.items():
+            self.receptor.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                                     socket.inet_aton(GRUPO_LSA) + socket.inet_aton(address))
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(address))
+            sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, struct.pack("b", 1))
+            sender.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 0)
+            self._emissores[network] = sender
+
+    def segmento_de(self, ip: str) -> Optional[Rede]:
+        """
+        Return the segment an address belongs to.
+
+        Args:
+            ip: Address of a router on a shared network
+
+        Returns:
+            The segment network, or None if no segment holds the address
+        """
+        address = ipaddress.ip_address(ip)
+        for network in self.segmentos:
+            if address in network:
+                return network
+        return None
+
+    def anunciar(self) -> None:
+        """
+        Send a hello on every segment, unless one went out less than intervalo seconds ago.
+
+        Membership only changes when routers join or leave a network, so
+        hellos are much rarer than LSAs; a neighbor going down is already
+        left out by failure detection.
+        """
+        now = time.monotonic()
+        if now - self._ultimo_hello < self.intervalo:
+            return
+        self._ultimo_hello = now
+        hello = json.dumps({"tipo": "segmento", "id": self.ROTEADOR_ID}).encode()
+        for network in self.segmentos:
+            self.enviar(hello, network)
+
+    def registrar(self, router_id: str, sender_ip: str) -> None:
+        """
+        Record that a router was heard on the segment of an address.
+
+        Args:
+            router_id: ID of the router sending the hello
+            sender_ip: Address the hello came from
+        """
+        network = self.segmento_de(sender_ip)
+        if network is not None:
+            with self._lock:
+                self.membros[network][router_id] = time.monotonic()
+
+    def membros_de(self, network: Optional[Rede]) -> Set[str]:
+        """
+        Return the routers currently heard on a segment.
+
+        Args:
+            network: Segment network, None for no segment
+
+        Returns:
+            Set of router IDs whose last hello is recent enough
+        """
+        if network is None:
+            return set()
+        deadline = time.monotonic() - VALIDADE_HELLO * self.intervalo
+        with self._lock:
+            return {router_id for router_id, seen in self.membros[network].items() if seen >= deadline}
+
+    def cobrir(self, targets: List[Tuple[str, str]]) -> Tuple[List[Tuple[Rede, List[str]]], List[Tuple[str, str]]]:
+        """
+        Choose the segments reaching a set of neighbors with the fewest datagrams.
+
+        Segments are picked greedily, the one holding most of the remaining
+        neighbors first. A segment with a single remaining neighbor is not
+        worth a multicast, so that neighbor is left to unicast.
+
+        Args:
+            targets: (neighbor ID, neighbor IP) that must receive a message
+
+        Returns:
+            Tuple with the chosen (segment, neighbor IDs) and the (neighbor ID, IP) left to unicast
+        """
+        remaining = {neighbor: ip for neighbor, ip in targets}
+        members = {network: self.membros_de(network) for network in self.segmentos}
+        chosen = []
+        while remaining:
+            network, covered = max(((network, members[network] & remaining.keys()) for network in members),
+                                   key=lambda item: len(item[1]), default=(None, set()))
+            if len(covered) < 2:
+                break
+            chosen.append((network, sorted(covered)))
+            for neighbor in covered:
+                del remaining[neighbor]
+        return chosen, list(remaining.items())
+
+    def enviar(self, data: bytes, network: Rede) -> None:
+        """
+        Send a datagram to every router on a segment.
+
+        Args:
+            data: Encoded message
+            network: Segment network
+        """
+        self._emissores[network].sendto(data, (GRUPO_LSA, PORTA_MULTICAST))
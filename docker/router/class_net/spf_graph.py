@@ -0,0 +1,627 @@
+"""
+SPF Graph Module
+
+This module keeps the topology used by SPF in a compact form that survives
+between runs. Router IDs are interned to dense integers once, and adjacency
+is stored in compressed sparse row (CSR) layout in typed arrays: the links of
+router i are destinos[inicio[i]:inicio[i] + grau[i]] with their costs in
+custos. Each row has a little spare capacity, so a changed LSA is written over
+its own row; only rows that outgrow their capacity move to the end of the
+buffers, which are compacted once half of them is garbage.
+
+SPF runs over preallocated distance and first hop arrays. Heap entries are
+plain integers, cost * n + rank, where rank orders routers by ID; popping
+them follows the same (cost, router ID) order as the dict-based Dijkstra of
+GerenciadorDeRotas, so both produce the same next hops, ties included.
+
+The tree of the last SPF is kept and checked against every changed row, as
+in the partial route calculation of IS-IS and OSPF. A change that neither
+removes nor lengthens a tree link, nor offers a path at least as short as
+the current one, leaves the tree as it is. A change that only moves a leaf
+(a router reached through a single link and through which no path goes) is
+applied by recomputing that leaf alone. Anything else invalidates the tree
+and the next calculation runs a full SPF.
+
+Point-to-point queries do not build trees at all. Bidirectional Dijkstra
+searches forward from the source over the rows and backward from the
+destination over a reverse CSR, stopping once the two frontiers cannot
+improve the best meeting point. A* with ALT landmarks (A*, landmarks and the
+triangle inequality) uses distances from and to a few far-apart routers,
+computed once per version of the links, as lower bounds. Both respect
+inactive routers; the landmark bounds stay valid for any set of them, since
+excluding routers only lengthens paths.
+"""
+
+import heapq
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+INFINITO = 2 ** 62
+FOLGA = 2
+MARCOS = 8
+
+class GrafoCSR:
+    """
+    Interned, array-backed link state graph.
+
+    Attributes:
+        indices (Dict[str, int]): Dense index of every router ID seen
+        nomes (List[str]): Router ID of every index
+        inicio (array): Offset of each router's row in destinos/custos
+        grau (array): Number of links in each row
+        capacidade (array): Slots reserved for each row
+        destinos (array): Neighbor index of every link
+        custos (array): Cost of every link
+        entrada (array): Number of rows listing each router
+        com_lsa (array): 1 for routers whose LSA is in the graph
+        inativo (array): 1 for routers marked inactive
+        excluido (array): 1 for routers SPF must skip, without an LSA or inactive
+        desperdicio (int): Slots of destinos/custos left behind by moved rows
+        origem (int): Source of the SPF tree kept, -1 when there is none
+        arvore_valida (bool): Whether the kept tree matches the current graph
+        spfs_completos (int): Calculations that ran a full SPF
+        spfs_evitados (int): Calculations answered from the kept tree
+        folhas_remendadas (int): Leaves recomputed alone after a change
+        versao (int): Incremented whenever a row changes
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self.indices: Dict[str, int] = {}
+        self.nomes: List[str] = []
+        self.inicio = array('i')
+        self.grau = array('i')
+        self.capacidade = array('i')
+        self.destinos = array('i')
+        self.custos = array('i')
+        self.entrada = array('i')
+        self.com_lsa = array('b')
+        self.inativo = array('b')
+        self.excluido = array('b')
+        self.desperdicio = 0
+        self.origem = -1
+        self.arvore_valida = False
+        self.spfs_completos = 0
+        self.spfs_evitados = 0
+        self.folhas_remendadas = 0
+        self.versao = 0
+        self._reverso: Optional[Tuple[array, array, array]] = None
+        self._reverso_versao = -1
+        self._marcos: List[Tuple[array, array]] = []
+        self._marcos_versao = -1
+        self._inativos: Set[int] = set()
+        self._rank = array('i')
+        self._por_rank = array('i')
+        self._ranks_validos = True
+        self._distancias = array('q')
+        self._primeiro_salto = array('i')
+        self._predecessor = array('i')
+        self._tabela: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        """Return the number of interned routers."""
+        return len(self.nomes)
+
+    def indice(self, router_id: str) -> int:
+        """
+        Return the index of a router, interning it on first sight.
+
+        Args:
+            router_id: Router ID
+
+        Returns:
+            int: Dense index
+        """
+        index = self.indices.get(router_id)
+        if index is None:
+            index = self.indices[router_id] = len(self.nomes)
+            self.nomes.append(router_id)
+            self.inicio.append(len(self.destinos))
+            self.grau.append(0)
+            self.capacidade.append(0)
+            self.entrada.append(0)
+            self.com_lsa.append(0)
+            self.inativo.append(0)
+            self.excluido.append(1)
+            self._rank.append(0)
+            self._por_rank.append(0)
+            self._distancias.append(INFINITO)
+            self._primeiro_salto.append(-1)
+            self._predecessor.append(-1)
+            self._ranks_validos = False
+        return index
+
+    def _linha(self, index: int) -> Dict[int, int]:
+        """Return the links of a row as neighbor index mapped to cost."""
+        start = self.inicio[index]
+        end = start + self.grau[index]
+        return dict(zip(self.destinos[start:end], self.custos[start:end]))
+
+    def atualizar_roteador(self, router_id: str, links: Dict[str, int]) -> None:
+        """
+        Write the links of a router's LSA into its row, keeping the SPF tree
+        when the change does not move it.
+
+        Args:
+            router_id: Router whose LSA changed
+            links: Neighbor IDs mapped to link costs
+        """
+        index = self.indice(router_id)
+        targets = [self.indice(neighbor) for neighbor in links]
+        costs = [int(cost) for cost in links.values()]
+        affected = self._afetados(index, dict(zip(targets, costs))) if self.arvore_valida else None
+
+        for target in self._linha(index):
+            self.entrada[target] -= 1
+        for target in targets:
+            self.entrada[target] += 1
+        degree = len(targets)
+        if degree > self.capacidade[index]:
+            self.desperdicio += self.capacidade[index]
+            capacity = degree + FOLGA
+            self.inicio[index] = len(self.destinos)
+            self.capacidade[index] = capacity
+            self.destinos.extend([0] * capacity)
+            self.custos.extend([0] * capacity)
+        start = self.inicio[index]
+        self.destinos[start:start + degree] = array('i', targets)
+        self.custos[start:start + degree] = array('i', costs)
+        self.grau[index] = degree
+        self.com_lsa[index] = 1
+        self.excluido[index] = self.inativo[index]
+        self.versao += 1
+        if self.desperdicio > len(self.destinos) // 2:
+            self.compactar()
+
+        if affected is None or not all(self._remendar_folha(leaf, parent) for leaf, parent in affected):
+            self.arvore_valida = False
+
+    def _afetados(self, index: int, new_links: Dict[int, int]) -> Optional[List[Tuple[int, Optional[int]]]]:
+        """
+        Find the routers whose path may change when a row is replaced.
+
+        Must run before the row is written, against the kept SPF tree.
+
+        Args:
+            index: Router whose row changes
+            new_links: New row as neighbor index mapped to cost
+
+        Returns:
+            List of (router, parent) pairs to recompute as leaves, the parent
+            being None when it must be looked up, or None when the change
+            needs a full SPF
+        """
+        distances, predecessors, excluded = self._distancias, self._predecessor, self.excluido
+        if self.inativo[index]:
+            return []
+        if not self.com_lsa[index]:
+            return [(index, None)] if self.entrada[index] else []
+        if distances[index] >= INFINITO:
+            return []
+
+        old_links = self._linha(index)
+        base = distances[index]
+        affected = []
+        for target in old_links.keys() | new_links.keys():
+            old_cost, new_cost = old_links.get(target), new_links.get(target)
+            if old_cost == new_cost or excluded[target]:
+                continue
+            shorter = (new_cost is not None and (old_cost is None or new_cost < old_cost)
+                       and base + new_cost <= distances[target])
+            if predecessors[target] == index or shorter:
+                affected.append((target, index))
+        return affected
+
+    def _remendar_folha(self, leaf: int, parent: Optional[int]) -> bool:
+        """
+        Recompute the path to a router reached only through one link.
+
+        The router qualifies as a leaf when no row but the parent's lists it
+        and no shortest path goes on through it, before or after the change.
+
+        Args:
+            leaf: Router to recompute
+            parent: Only router linking to it, None to find it from the leaf's own links
+
+        Returns:
+            bool: True if the leaf was recomputed, False if a full SPF is needed
+        """
+        if leaf == self.origem:
+            return False
+        if parent is None:
+            parents = [target for target in self._linha(leaf) if leaf in self._linha(target)]
+            if len(parents) != 1:
+                return False
+            parent = parents[0]
+
+        cost = self._linha(parent).get(leaf)
+        if self.entrada[leaf] != (cost is not None):
+            return False
+        distances, predecessors, first_hops = self._distancias, self._predecessor, self._primeiro_salto
+        if cost is None or self.excluido[parent] or self.excluido[leaf] or distances[parent] >= INFINITO:
+            new_distance = INFINITO
+        else:
+            new_distance = distances[parent] + cost
+        for target, link_cost in self._linha(leaf).items():
+            if self.excluido[target]:
+                continue
+            if predecessors[target] == leaf or new_distance + link_cost <= distances[target]:
+                return False
+
+        name = self.nomes[leaf]
+        distances[leaf] = new_distance
+        if new_distance >= INFINITO:
+            predecessors[leaf] = first_hops[leaf] = -1
+            self._tabela.pop(name, None)
+        else:
+            predecessors[leaf] = parent
+            first_hops[leaf] = leaf if parent == self.origem else first_hops[parent]
+            self._tabela[name] = self.nomes[first_hops[leaf]]
+        self.folhas_remendadas += 1
+        return True
+
+    def remover_roteador(self, router_id: str) -> None:
+        """
+        Drop the LSA of a router, keeping its index.
+
+        Args:
+            router_id: Router whose LSA was removed
+        """
+        index = self.indices.get(router_id)
+        if index is not None:
+            for target in self._linha(index):
+                self.entrada[target] -= 1
+            self.grau[index] = 0
+            self.com_lsa[index] = 0
+            self.excluido[index] = 1
+            self.arvore_valida = False
+            self.versao += 1
+
+    def compactar(self) -> None:
+        """Rewrite the link buffers without the slots left by moved rows."""
+        targets, costs = array('i'), array('i')
+        for index in range(len(self.nomes)):
+            start, degree = self.inicio[index], self.grau[index]
+            capacity = degree + FOLGA if degree else 0
+            self.inicio[index] = len(targets)
+            self.capacidade[index] = capacity
+            targets.extend(self.destinos[start:start + degree])
+            costs.extend(self.custos[start:start + degree])
+            targets.extend([0] * (capacity - degree))
+            costs.extend([0] * (capacity - degree))
+        self.destinos, self.custos = targets, costs
+        self.desperdicio = 0
+
+    def definir_inativos(self, inactive_routers: Iterable[str]) -> None:
+        """
+        Set the routers excluded from SPF, as well as the links towards them.
+
+        Args:
+            inactive_routers: Inactive router IDs
+        """
+        wanted = {self.indices[router_id] for router_id in inactive_routers if router_id in self.indices}
+        if wanted == self._inativos:
+            return
+        for index in self._inativos - wanted:
+            self.inativo[index] = 0
+            self.excluido[index] = not self.com_lsa[index]
+        for index in wanted - self._inativos:
+            self.inativo[index] = 1
+            self.excluido[index] = 1
+        self._inativos = wanted
+        self.arvore_valida = False
+
+    def _ordenar(self) -> None:
+        """Recompute the rank of every router in ID order."""
+        for rank, index in enumerate(sorted(range(len(self.nomes)), key=self.nomes.__getitem__)):
+            self._rank[index] = rank
+            self._por_rank[rank] = index
+        self._ranks_validos = True
+
+    def spf(self, source: int) -> None:
+        """
+        Run Dijkstra from a router into the preallocated arrays.
+
+        Afterwards self._distancias holds the cost to every router (INFINITO
+        when unreachable), self._predecessor the previous router on each path
+        and self._primeiro_salto the index of the first hop (-1 for the
+        source and unreachable routers).
+
+        Args:
+            source: Index of the source router
+        """
+        if not self._ranks_validos:
+            self._ordenar()
+        size = len(self.nomes)
+        distances = self._distancias
+        first_hops = self._primeiro_salto
+        predecessors = self._predecessor
+        distances[:] = array('q', [INFINITO]) * size
+        first_hops[:] = array('i', [-1]) * size
+        predecessors[:] = array('i', [-1]) * size
+
+        start, degree, targets, costs = self.inicio, self.grau, self.destinos, self.custos
+        excluded = self.excluido
+        rank, by_rank = self._rank, self._por_rank
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        distances[source] = 0
+        queue = [rank[source]]
+        while queue:
+            current_cost, current_rank = divmod(heappop(queue), size)
+            current = by_rank[current_rank]
+            if current_cost > distances[current]:
+                continue
+            hop = first_hops[current]
+            offset = start[current]
+            end = offset + degree[current]
+            for neighbor, cost in zip(targets[offset:end], costs[offset:end]):
+                if excluded[neighbor]:
+                    continue
+                path_cost = current_cost + cost
+                if path_cost < distances[neighbor]:
+                    distances[neighbor] = path_cost
+                    predecessors[neighbor] = current
+                    first_hops[neighbor] = neighbor if current == source else hop
+                    heappush(queue, path_cost * size + rank[neighbor])
+
+        self.origem = source
+        self.arvore_valida = True
+
+    def primeiros_saltos(self, source_id: str) -> Optional[Dict[str, str]]:
+        """
+        Compute the first hop towards every router reachable from a source.
+
+        The kept SPF tree is reused when it still matches the graph.
+
+        Args:
+            source_id: Source router ID
+
+        Returns:
+            Dict mapping destinations to first hops, or None when the source
+            is not in the graph
+        """
+        source = self.indices.get(source_id)
+        if source is None or self.excluido[source]:
+            return None
+        if self.arvore_valida and self.origem == source:
+            self.spfs_evitados += 1
+        else:
+            self.spf(source)
+            self.spfs_completos += 1
+            names = self.nomes
+            self._tabela = {
+                names[index]: names[hop]
+                for index, hop in enumerate(self._primeiro_salto)
+                if hop >= 0
+            }
+        return dict(self._tabela)
+
+    def reverso(self) -> Tuple[array, array, array]:
+        """
+        Return the reverse graph in CSR layout, rebuilt when the rows changed.
+
+        Returns:
+            Tuple with (row offsets, source of every link, cost of every link),
+            row i holding the links that end at router i
+        """
+        if self._reverso_versao != self.versao:
+            size = len(self.nomes)
+            offsets = array('i', [0]) * (size + 1)
+            for index in range(size):
+                offsets[index + 1] = offsets[index] + self.entrada[index]
+            fill = array('i', offsets[:size])
+            origins = array('i', [0]) * offsets[size]
+            costs = array('i', [0]) * offsets[size]
+            for index in range(size):
+                for target, cost in self._linha(index).items():
+                    origins[fill[target]] = index
+                    costs[fill[target]] = cost
+                    fill[target] += 1
+            self._reverso = (offsets, origins, costs)
+            self._reverso_versao = self.versao
+        return self._reverso
+
+    def distancias(self, router_id: str, reverse: bool = False) -> Optional[array]:
+        """
+        Compute the distances from (or, with reverse, to) a router over the
+        active routers, leaving the kept SPF tree untouched.
+
+        Args:
+            router_id: Router ID
+            reverse: Follow links backwards
+
+        Returns:
+            array indexed like nomes, INFINITO when unreachable, or None when
+            the router is not in the graph
+        """
+        index = self.indices.get(router_id)
+        if index is None or self.excluido[index]:
+            return None
+        return self._distancias_de(index, reverse, active_only=True)
+
+    def _distancias_de(self, source: int, reverse: bool, active_only: bool = False) -> array:
+        """
+        Compute the distances from (or, over the reverse graph, to) a router,
+        over every router with an LSA, inactive ones included unless asked.
+
+        Args:
+            source: Router index
+            reverse: Follow links backwards
+            active_only: Skip inactive routers as well
+
+        Returns:
+            array: Distance of every router, INFINITO when unreachable
+        """
+        size = len(self.nomes)
+        if reverse:
+            offsets, targets, costs = self.reverso()
+            start = offsets
+            end_of = offsets[1:]
+        else:
+            start, targets, costs = self.inicio, self.destinos, self.custos
+            end_of = array('i', (offset + degree for offset, degree in zip(self.inicio, self.grau)))
+        usable = array('b', (not excluded for excluded in self.excluido)) if active_only else self.com_lsa
+        distances = array('q', [INFINITO]) * size
+        distances[source] = 0
+        queue = [source]
+        while queue:
+            current_cost, current = divmod(heapq.heappop(queue), size)
+            if current_cost > distances[current]:
+                continue
+            for neighbor, cost in zip(targets[start[current]:end_of[current]], costs[start[current]:end_of[current]]):
+                path_cost = current_cost + cost
+                if usable[neighbor] and path_cost < distances[neighbor]:
+                    distances[neighbor] = path_cost
+                    heapq.heappush(queue, path_cost * size + neighbor)
+        return distances
+
+    def marcos(self, count: int = MARCOS) -> List[Tuple[array, array]]:
+        """
+        Return the ALT landmarks, chosen again when the rows changed.
+
+        Landmarks are picked farthest-first: each new one is the router
+        farthest from those already chosen.
+
+        Args:
+            count: Number of landmarks
+
+        Returns:
+            List of (distances from the landmark, distances to the landmark)
+        """
+        if self._marcos_versao != self.versao or len(self._marcos) != count:
+            candidates = [index for index in range(len(self.nomes)) if self.com_lsa[index]]
+            landmarks: List[Tuple[array, array]] = []
+            nearest = None
+            landmark = min(candidates, key=self.nomes.__getitem__) if candidates else None
+            while landmark is not None and len(landmarks) < count:
+                forward = self._distancias_de(landmark, False)
+                landmarks.append((forward, self._distancias_de(landmark, True)))
+                if nearest is None:
+                    nearest = array('q', forward)
+                else:
+                    nearest = array('q', map(min, nearest, forward))
+                reachable = [index for index in candidates if nearest[index] < INFINITO]
+                landmark = max(reachable, key=nearest.__getitem__) if reachable else None
+                if landmark is not None and nearest[landmark] == 0:
+                    landmark = None
+            self._marcos = landmarks
+            self._marcos_versao = self.versao
+        return self._marcos
+
+    def _montar_caminho(self, meeting: int, forward: Dict[int, int], backward: Dict[int, int]) -> List[str]:
+        """Join the two halves of a path at the router where they meet."""
+        path = []
+        node = meeting
+        while node >= 0:
+            path.append(self.nomes[node])
+            node = forward[node]
+        path.reverse()
+        node = backward.get(meeting, -1)
+        while node >= 0:
+            path.append(self.nomes[node])
+            node = backward[node]
+        return path
+
+    def caminho(self, source_id: str, target_id: str,
+                landmarks: bool = False) -> Optional[Tuple[int, List[str]]]:
+        """
+        Find one shortest path between two routers without building a tree.
+
+        On ties the path found may differ from the one the routing tables
+        follow; its cost is always the shortest.
+
+        Args:
+            source_id: Source router ID
+            target_id: Destination router ID
+            landmarks: Use A* with ALT landmarks instead of bidirectional Dijkstra
+
+        Returns:
+            Tuple with (cost, router IDs from source to destination), or None
+            when there is no path
+        """
+        source, target = self.indices.get(source_id), self.indices.get(target_id)
+        if source is None or target is None or self.excluido[source] or self.excluido[target]:
+            return None
+        if source == target:
+            return 0, [source_id]
+        if landmarks:
+            return self._caminho_alt(source, target)
+        return self._caminho_bidirecional(source, target)
+
+    def _caminho_bidirecional(self, source: int, target: int) -> Optional[Tuple[int, List[str]]]:
+        """Bidirectional Dijkstra between two usable routers."""
+        size = len(self.nomes)
+        offsets, origins, reverse_costs = self.reverso()
+        start, degree, targets, costs = self.inicio, self.grau, self.destinos, self.custos
+        excluded = self.excluido
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        distances = ({source: 0}, {target: 0})
+        predecessors = ({source: -1}, {target: -1})
+        queues = ([source], [target])
+        best, meeting = INFINITO, -1
+        while queues[0] and queues[1]:
+            if queues[0][0] // size + queues[1][0] // size >= best:
+                break
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+            current_cost, current = divmod(heappop(queues[side]), size)
+            own, other, parents, queue = distances[side], distances[1 - side], predecessors[side], queues[side]
+            if current_cost > own[current]:
+                continue
+            if side == 0:
+                offset = start[current]
+                end = offset + degree[current]
+                links = zip(targets[offset:end], costs[offset:end])
+            else:
+                links = zip(origins[offsets[current]:offsets[current + 1]],
+                            reverse_costs[offsets[current]:offsets[current + 1]])
+            for neighbor, cost in links:
+                if excluded[neighbor]:
+                    continue
+                path_cost = current_cost + cost
+                if path_cost < own.get(neighbor, INFINITO):
+                    own[neighbor] = path_cost
+                    parents[neighbor] = current
+                    heappush(queue, path_cost * size + neighbor)
+                    if neighbor in other and path_cost + other[neighbor] < best:
+                        best, meeting = path_cost + other[neighbor], neighbor
+        if meeting < 0:
+            return None
+        return best, self._montar_caminho(meeting, predecessors[0], predecessors[1])
+
+    def _caminho_alt(self, source: int, target: int) -> Optional[Tuple[int, List[str]]]:
+        """A* with ALT landmark lower bounds between two usable routers."""
+        bounds = [(forward, backward, forward[target], backward[target])
+                  for forward, backward in self.marcos()]
+        start, degree, targets, costs = self.inicio, self.grau, self.destinos, self.custos
+        excluded = self.excluido
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        def estimate(node: int) -> int:
+            return max([0] + [max(from_target - forward[node], backward[node] - to_target)
+                              for forward, backward, from_target, to_target in bounds])
+
+        distances = {source: 0}
+        predecessors = {source: -1}
+        closed = set()
+        queue = [(estimate(source), source)]
+        while queue:
+            _, current = heappop(queue)
+            if current == target:
+                return distances[target], self._montar_caminho(target, predecessors, {})
+            if current in closed:
+                continue
+            closed.add(current)
+            current_cost = distances[current]
+            offset = start[current]
+            end = offset + degree[current]
+            for neighbor, cost in zip(targets[offset:end], costs[offset:end]):
+                if excluded[neighbor]:
+                    continue
+                path_cost = current_cost + cost
+                if path_cost < distances.get(neighbor, INFINITO):
+                    distances[neighbor] = path_cost
+                    predecessors[neighbor] = current
+                    heappush(queue, (path_cost + estimate(neighbor), neighbor))
+        return None
@@ -0,0 +1,166 @@
+"""
+SPF Worker Module
+
+This module runs the route calculation of a router in a process of its own.
+SPF is pure Python, so in the router process it holds the GIL for as long
+as it runs and the threads receiving and flooding LSAs stall meanwhile; in a
+separate process it only competes with them for the CPU. The worker keeps
+its own copy of the LSDB and of the summary LSAs in a GerenciadorDeRotas,
+so its graph, tree and cache survive between calculations as in the router.
+
+Each call sends the worker, over a pipe, only the LSAs whose topology
+changed since the previous call (refreshes that just carry a new sequence
+number are left out, and a database whose generation did not change is not
+even scanned), the inactive routers and the method to run, and waits
+for the result: a routing table, or the backup next hops for fast reroute.
+The router thread waiting on the pipe does not hold the GIL.
+"""
+
+import multiprocessing
+import threading
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple
+
+from class_net.lsa_database import BancoLSA
+
+Delta = Dict[str, Optional[Dict[str, Any]]]
+
+def _diferenca(database: Dict[str, Any], sent: Dict[str, Any]) -> Delta:
+    """
+    List the LSAs of a database the worker does not have yet, and update what it has.
+
+    Args:
+        database: Database in the router process
+        sent: Copy of each LSA last sent to the worker, updated in place
+
+    Returns:
+        Dict mapping the changed LSA IDs to their LSA, or to None when removed
+    """
+    delta: Delta = {}
+    for lsa_id, lsa in list(database.items()):
+        old = sent.get(lsa_id)
+        if old is not lsa and BancoLSA.classificar(old, lsa) != 'refresco':
+            delta[lsa_id] = sent[lsa_id] = lsa
+    if len(sent) != len(database):
+        for lsa_id in [lsa_id for lsa_id in sent if lsa_id not in database]:
+            delta[lsa_id] = None
+            del sent[lsa_id]
+    return delta
+
+def _aplicar(database: BancoLSA, delta: Delta) -> None:
+    """Apply a delta to the worker's copy of a database."""
+    for lsa_id, lsa in delta.items():
+        if lsa is None:
+            database.pop(lsa_id, None)
+        else:
+            database[lsa_id] = lsa
+
+def _executar(connection: Connection, area: Optional[int]) -> None:
+    """
+    Worker process: apply the deltas received and answer each calculation.
+
+    Args:
+        connection: Worker end of the pipe
+        area: Area of the router, None when areas are not used
+    """
+    # Imported here because route_manager imports this module
+    from class_net.route_manager import GerenciadorDeRotas
+
+    manager = GerenciadorDeRotas(BancoLSA(), summary_db=BancoLSA(), area=area)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        lsdb_delta, summary_delta, inactive_routers, method, args = request
+        _aplicar(manager.lsdb, lsdb_delta)
+        _aplicar(manager.resumos, summary_delta)
+        manager.set_inativos(inactive_routers)
+        connection.send(getattr(manager, method)(*args))
+
+class TrabalhadorSPF:
+    """
+    Route calculations of a router run in a separate process.
+
+    Attributes:
+        area (Optional[int]): Area of the router, None when areas are not used
+        processo (multiprocessing.Process): Worker process
+        calculos (int): Calculations answered by the worker
+        lsas_enviados (int): LSAs sent to the worker in deltas
+    """
+
+    def __init__(self, area: Optional[int] = None):
+        """
+        Start the worker process.
+
+        Args:
+            area: Area of the router, None when areas are not used
+        """
+        self.area = area
+        # Forking a process with running threads may copy locks held by them
+        context = multiprocessing.get_context("spawn")
+        self._conexao, worker_end = context.Pipe()
+        self.processo = context.Process(target=_executar, args=(worker_end, area), daemon=True)
+        self.processo.start()
+        worker_end.close()
+        self._enviados: Tuple[Dict[str, Any], Dict[str, Any]] = ({}, {})
+        self._geracoes: List[Optional[int]] = [None, None]
+        self._lock = threading.Lock()
+        self.calculos = 0
+        self.lsas_enviados = 0
+
+    def executar(self, lsdb: Dict[str, Any], summaries: Dict[str, Any], inactive_routers: List[str],
+                 method: str, *args: Any) -> Any:
+        """
+        Bring the worker's databases up to date and run a route manager method there.
+
+        Args:
+            lsdb: LSDB of the router
+            summaries: Summary LSAs of the router
+            inactive_routers: Routers to leave out of the calculation
+            method: Name of the GerenciadorDeRotas method to run
+            *args: Its arguments
+
+        Returns:
+            What the method returned in the worker
+
+        Raises:
+            EOFError, OSError: When the worker is gone
+        """
+        with self._lock:
+            lsdb_delta, summary_delta = (self._delta(index, database)
+                                         for index, database in enumerate((lsdb, summaries)))
+            self._conexao.send((lsdb_delta, summary_delta, list(inactive_routers), method, args))
+            result = self._conexao.recv()
+            self.calculos += 1
+            self.lsas_enviados += len(lsdb_delta) + len(summary_delta)
+            return result
+
+    def _delta(self, index: int, database: Dict[str, Any]) -> Delta:
+        """
+        Return the delta of one database, empty without a scan when its generation is the one last sent.
+
+        Args:
+            index: 0 for the LSDB, 1 for the summaries
+            database: Database in the router process
+
+        Returns:
+            Dict mapping the changed LSA IDs to their LSA, or to None when removed
+        """
+        generation = getattr(database, 'geracao', None)
+        if generation is not None and generation == self._geracoes[index]:
+            return {}
+        self._geracoes[index] = generation
+        return _diferenca(database, self._enviados[index])
+
+    def parar(self) -> None:
+        """Stop the worker process."""
+        with self._lock:
+            try:
+                self._conexao.send(None)
+            except OSError:
+                pass
+            self._conexao.close()
+        self.processo.join(timeout=1.0)
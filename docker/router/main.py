@@ -3,13 +3,14 @@ Router Application Entry Point
 
 This module serves as the main entry point for the router application.
 It initializes and starts the router instance with its network operations.
+Settings come from command line arguments, falling back to the environment.
 """
 
-import os
 from class_net.router import RoteadorApp
+from class_net.router_config import ConfiguracaoRoteador
 
 if __name__ == "__main__":
-    router_instance = RoteadorApp()
-    router_id = os.getenv('ROTEADOR_ID')
-    print(f"[{router_id}] Iniciado...")
+    router_config = ConfiguracaoRoteador.de_argumentos()
+    router_instance = RoteadorApp(router_config)
+    print(f"[{router_config.roteador_id}] Iniciado...", flush=True)
     router_instance.iniciar_threads()
\ No newline at end of file
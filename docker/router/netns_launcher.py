@@ -0,0 +1,342 @@
+"""
+Network Namespace Launcher
+
+This module runs every router of a config.yaml topology inside a single
+container. Each router gets its own Linux network namespace, each network
+('rede') becomes a Linux bridge, and routers are attached to their networks
+through veth pairs. Router processes receive their settings as explicit
+arguments, and bring-up time and memory usage per router are reported.
+With a route controller, an extra management bridge reaches every namespace
+and the controller runs in the root namespace.
+"""
+
+import argparse
+import ipaddress
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+import psutil
+import yaml
+
+from class_net.route_aggregation import MODOS_AGREGACAO
+from class_net.router_config import ConfiguracaoRoteador, VARIAVEIS_AMBIENTE
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+PONTE_GERENCIA = "brger"
+ENDERECO_CONTROLADOR = "10.255.255.254"
+
+def ler_configuracao(config_path: str) -> Dict[str, Any]:
+    """
+    Read a topology generated by yaml_generator.
+
+    Args:
+        config_path: Path to config.yaml
+
+    Returns:
+        Dict containing networks and routers
+    """
+    with open(config_path, 'r') as config_file:
+        return yaml.safe_load(config_file)
+
+def configuracoes_roteadores(network_config: Dict[str, Any], agregacao: str = "exato",
+                             snapshot_dir: Optional[str] = None) -> List[ConfiguracaoRoteador]:
+    """
+    Build the explicit configuration of every router in the topology.
+
+    Args:
+        network_config: Parsed config.yaml
+        agregacao: Route aggregation mode of every router
+        snapshot_dir: Directory holding one LSDB snapshot per router, None to disable
+
+    Returns:
+        List of router configurations in file order
+    """
+    router_ips = {router['id']: router['networks'][0]['ip'] for router in network_config['routers']}
+    router_areas = {router['id']: router.get('area') for router in network_config['routers']}
+    return [
+        ConfiguracaoRoteador(
+            roteador_id=router['id'],
+            endereco_ip=router['ip'],
+            vizinhos={
+                neighbor['id']: [router_ips[neighbor['id']], neighbor['cost']]
+                + ([router_areas[neighbor['id']]] if router_areas[neighbor['id']] is not None else [])
+                for neighbor in router['neighbors']
+            },
+            area=router.get('area'),
+            agregacao=agregacao,
+            snapshot=os.path.join(snapshot_dir, f"{router['id']}.snap") if snapshot_dir else None
+        )
+        for router in network_config['routers']
+    ]
+
+def executar_lote(commands: List[str], namespace: str = "") -> None:
+    """
+    Run several 'ip' commands in a single process through 'ip -batch'.
+
+    Args:
+        commands: Commands without the leading 'ip'
+        namespace: Network namespace to run them in, the current one when empty
+    """
+    ip_command = ["ip", "-n", namespace, "-batch", "-"] if namespace else ["ip", "-batch", "-"]
+    subprocess.run(ip_command, input="\n".join(commands) + "\n", text=True, check=True)
+
+def criar_topologia(network_config: Dict[str, Any]) -> None:
+    """
+    Create bridges, namespaces and veth pairs for the whole topology.
+
+    Args:
+        network_config: Parsed config.yaml
+    """
+    bridges = {network['name']: f"br{index}" for index, network in enumerate(network_config['networks'])}
+    prefix_length = {network['name']: ipaddress.ip_network(network['subnet']).prefixlen
+                     for network in network_config['networks']}
+
+    root_commands = []
+    for bridge in bridges.values():
+        root_commands += [f"link add {bridge} type bridge", f"link set {bridge} up"]
+    for router_index, router in enumerate(network_config['routers']):
+        root_commands.append(f"netns add {router['id']}")
+        for interface_index, network in enumerate(router['networks']):
+            host_side = f"v{router_index}n{interface_index}"
+            root_commands += [
+                f"link add {host_side} type veth peer name eth{interface_index} netns {router['id']}",
+                f"link set {host_side} master {bridges[network['name']]}",
+                f"link set {host_side} up",
+            ]
+    executar_lote(root_commands)
+
+    for router in network_config['routers']:
+        namespace_commands = ["link set lo up"]
+        for interface_index, network in enumerate(router['networks']):
+            namespace_commands += [
+                f"addr add {network['ip']}/{prefix_length[network['name']]} dev eth{interface_index}",
+                f"link set eth{interface_index} up",
+            ]
+        executar_lote(namespace_commands, router['id'])
+        subprocess.run(
+            ["ip", "netns", "exec", router['id'], "sysctl", "-q", "-w", "net.ipv4.ip_forward=1"],
+            check=True
+        )
+
+def criar_rede_gerencia(network_config: Dict[str, Any]) -> None:
+    """
+    Connect every namespace to the route controller through a management bridge.
+
+    The bridge holds the controller address in the root namespace and each
+    router gets a 'ger0' interface in 10.255.0.0/16, apart from the links
+    carrying the routing protocol.
+
+    Args:
+        network_config: Parsed config.yaml, after criar_topologia
+    """
+    root_commands = [f"link add {PONTE_GERENCIA} type bridge",
+                     f"addr add {ENDERECO_CONTROLADOR}/16 dev {PONTE_GERENCIA}",
+                     f"link set {PONTE_GERENCIA} up"]
+    for router_index, router in enumerate(network_config['routers']):
+        host_side = f"v{router_index}g"
+        root_commands += [
+            f"link add {host_side} type veth peer name ger0 netns {router['id']}",
+            f"link set {host_side} master {PONTE_GERENCIA}",
+            f"link set {host_side} up",
+        ]
+    executar_lote(root_commands)
+
+    for router_index, router in enumerate(network_config['routers']):
+        executar_lote([f"addr add 10.255.{router_index // 250}.{router_index % 250 + 1}/16 dev ger0",
+                       "link set ger0 up"], router['id'])
+
+def iniciar_controlador(processes: int = 1) -> subprocess.Popen:
+    """
+    Start the route controller in the root namespace, relaying its output.
+
+    Args:
+        processes: Worker processes computing the routing tables
+
+    Returns:
+        The controller process, once it has started
+    """
+    ready_event = threading.Event()
+    process = subprocess.Popen(
+        [sys.executable, "-u", "-m", "class_net.controller", "--processos", str(processes)],
+        cwd=os.path.dirname(MAIN_SCRIPT),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    )
+    threading.Thread(target=repassar_saida, args=(process, ready_event), daemon=True).start()
+    ready_event.wait()
+    return process
+
+def remover_topologia(network_config: Dict[str, Any]) -> None:
+    """
+    Delete the namespaces and bridges created by criar_topologia and criar_rede_gerencia.
+
+    Args:
+        network_config: Parsed config.yaml
+    """
+    # Veths are deleted first: a namespace deletion frees them asynchronously,
+    # which would break a topology created right after
+    commands = [f"link del v{router_index}n{interface_index}"
+                for router_index, router in enumerate(network_config['routers'])
+                for interface_index in range(len(router['networks']))]
+    commands += [f"link del v{router_index}g" for router_index in range(len(network_config['routers']))]
+    commands += [f"netns del {router['id']}" for router in network_config['routers']]
+    commands += [f"link del br{index}" for index in range(len(network_config['networks']))]
+    commands.append(f"link del {PONTE_GERENCIA}")
+    subprocess.run(["ip", "-force", "-batch", "-"], input="\n".join(commands) + "\n",
+                   text=True, capture_output=True)
+
+def iniciar_roteadores(configs: List[ConfiguracaoRoteador],
+                       ready_events: Dict[str, threading.Event]) -> List[subprocess.Popen]:
+    """
+    Start one router process inside each namespace.
+
+    Output of every router is relayed to stdout, and its ready event is set
+    when the router announces it has started.
+
+    Args:
+        configs: Router configurations
+        ready_events: Router ID to event set once the router is up
+
+    Returns:
+        List of started processes
+    """
+    processes = []
+    for config in configs:
+        process = subprocess.Popen(
+            ["ip", "netns", "exec", config.roteador_id, sys.executable, "-u", MAIN_SCRIPT]
+            + config.para_argumentos(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env={key: value for key, value in os.environ.items()
+                 if key not in VARIAVEIS_AMBIENTE}
+        )
+        threading.Thread(
+            target=repassar_saida,
+            args=(process, ready_events[config.roteador_id]),
+            daemon=True
+        ).start()
+        processes.append(process)
+    return processes
+
+def repassar_saida(process: subprocess.Popen, ready_event: threading.Event) -> None:
+    """
+    Relay a router's output and flag it as ready on its start message.
+
+    Args:
+        process: Router process
+        ready_event: Event set when the start message is seen
+    """
+    for line in process.stdout:
+        if not ready_event.is_set() and "Iniciado" in line:
+            ready_event.set()
+        sys.stdout.write(line)
+
+def medir_memoria(processes: List[subprocess.Popen]) -> List[int]:
+    """
+    Measure the resident memory of each router's Python interpreter.
+
+    Args:
+        processes: Router processes started through 'ip netns exec'
+
+    Returns:
+        List of RSS values in bytes, one per router
+    """
+    memory = []
+    for process in processes:
+        try:
+            launcher = psutil.Process(process.pid)
+            tree = [launcher] + launcher.children(recursive=True)
+            memory.append(sum(member.memory_info().rss for member in tree))
+        except psutil.NoSuchProcess:
+            memory.append(0)
+    return memory
+
+def main() -> None:
+    """Bring up the topology, report its cost and keep routers running."""
+    parser = argparse.ArgumentParser(description="Executa vários roteadores em namespaces de rede")
+    parser.add_argument("config", help="Caminho para o config.yaml")
+    parser.add_argument("--espera", type=float, default=5.0,
+                        help="Segundos após a subida antes de medir a memória")
+    parser.add_argument("--agregacao", choices=MODOS_AGREGACAO, default=os.getenv("AGREGACAO") or "exato",
+                        help="Modo de agregação de rotas dos roteadores")
+    parser.add_argument("--snapshots", help="Diretório dos snapshots da LSDB de cada roteador")
+    parser.add_argument("--bfd", type=float, help="Intervalo BFD em segundos; sem ele as falhas são detectadas por ping")
+    parser.add_argument("--custo-dinamico", action="store_true", help="Custos dos enlaces pelo RTT e pela perda medidos")
+    parser.add_argument("--amortecimento", type=float, help="Meia-vida em segundos do amortecimento de oscilações")
+    parser.add_argument("--controlador", action="store_true",
+                        help="Rotas calculadas por um controlador central em vez de SPF em cada roteador")
+    parser.add_argument("--processos-controlador", type=int, default=1, help="Processos de cálculo do controlador")
+    parser.add_argument("--multicast", action="store_true", help="LSAs inundados uma vez por segmento, por multicast")
+    parser.add_argument("--inundacao-dinamica", action="store_true",
+                        help="LSAs inundados só pelo subgrafo de inundação do líder")
+    parser.add_argument("--taxa-inundacao", type=float,
+                        help="Datagramas de inundação por segundo para cada vizinho, com os LSAs agrupados")
+    parser.add_argument("--estagios", action="store_true",
+                        help="Recepção, instalação e inundação dos LSAs em estágios ligados por filas")
+    parser.add_argument("--buffer-recepcao", type=int, help="SO_RCVBUF em bytes dos sockets de LSA")
+    parser.add_argument("--lote-recepcao", type=int, help="Datagramas lidos de uma vez dos sockets de LSA")
+    parser.add_argument("--spf-processo", action="store_true", help="Rotas calculadas num processo separado")
+    args = parser.parse_args()
+
+    network_config = ler_configuracao(args.config)
+    if args.snapshots:
+        os.makedirs(args.snapshots, exist_ok=True)
+    configs = configuracoes_roteadores(network_config, args.agregacao, args.snapshots)
+    for config in configs:
+        config.bfd_intervalo = args.bfd
+        config.custo_dinamico = args.custo_dinamico
+        config.amortecimento_meia_vida = args.amortecimento
+        config.controlador = ENDERECO_CONTROLADOR if args.controlador else None
+        config.multicast = args.multicast
+        config.inundacao_dinamica = args.inundacao_dinamica
+        config.taxa_inundacao = args.taxa_inundacao
+        config.estagios = args.estagios
+        config.buffer_recepcao = args.buffer_recepcao
+        config.lote_recepcao = args.lote_recepcao
+        config.spf_processo = args.spf_processo
+    ready_events = {config.roteador_id: threading.Event() for config in configs}
+
+    remover_topologia(network_config)
+    start = time.perf_counter()
+    criar_topologia(network_config)
+    topology_time = time.perf_counter() - start
+
+    processes = []
+    if args.controlador:
+        criar_rede_gerencia(network_config)
+        processes.append(iniciar_controlador(args.processos_controlador))
+    processes += iniciar_roteadores(configs, ready_events)
+    for event in ready_events.values():
+        event.wait()
+    bring_up_time = time.perf_counter() - start
+
+    def encerrar(signum: int, frame: Any) -> None:
+        for process in processes:
+            process.terminate()
+        remover_topologia(network_config)
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, encerrar)
+    signal.signal(signal.SIGINT, encerrar)
+
+    time.sleep(args.espera)
+    memory = medir_memoria(processes[-len(configs):])
+    router_count = len(configs)
+    print(f"\nRoteadores: {router_count}")
+    print(f"Criação de namespaces e enlaces: {topology_time:.2f} s")
+    print(f"Subida completa: {bring_up_time:.2f} s ({bring_up_time / router_count * 1000:.1f} ms por roteador)")
+    print(f"Memória média por roteador: {sum(memory) / router_count / 2**20:.1f} MiB")
+    print(f"Memória máxima por roteador: {max(memory) / 2**20:.1f} MiB", flush=True)
+
+    for process in processes:
+        process.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Route Aggregation Benchmark Module
+
+This module measures how many prefixes each aggregation mode installs, and how
+long AtualizadorDeRotas takes to install them, on large line and tree
+topologies. Installation runs for real inside a throwaway network namespace
+(root required); otherwise only prefix counts are reported.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, Tuple, Any
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.manipulation import Manipulacao
+from class_net.route_aggregation import MODOS_AGREGACAO
+from class_net.route_manager import GerenciadorDeRotas
+from class_net.route_update import AtualizadorDeRotas
+from class_net.router_config import ConfiguracaoRoteador
+import topologias
+
+NAMESPACE = "bench_agregacao"
+
+def preparar_roteador(topology: str, router_count: int, router_index: int,
+                      mode: str) -> Tuple[AtualizadorDeRotas, Dict[str, str]]:
+    """
+    Build the route updater of one router of a synthetic topology.
+
+    Args:
+        topology: Key of topologias.TOPOLOGIAS
+        router_count: Number of routers
+        router_index: Zero-based index of the measured router
+        mode: Aggregation mode
+
+    Returns:
+        Tuple with (route updater, SPF routing table)
+    """
+    lsdb = topologias.gerar_lsdb(router_count, topologias.TOPOLOGIAS[topology](router_count))
+    router_id = topologias.nome_roteador(router_index)
+    config = ConfiguracaoRoteador(roteador_id=router_id, endereco_ip=lsdb[router_id]['ip'], vizinhos={}, agregacao=mode)
+    updater = AtualizadorDeRotas(GerenciadorDeRotas(lsdb), config)
+    with contextlib.redirect_stdout(io.StringIO()):
+        routing_table = updater.gerenciador_de_rotas.dijkstra(router_id)
+    return updater, routing_table
+
+def contar_prefixos(topology: str, router_count: int, router_index: int, mode: str) -> int:
+    """
+    Count the prefixes a router would install.
+
+    Args:
+        topology: Key of topologias.TOPOLOGIAS
+        router_count: Number of routers
+        router_index: Zero-based index of the measured router
+        mode: Aggregation mode
+
+    Returns:
+        int: Number of prefixes
+    """
+    updater, routing_table = preparar_roteador(topology, router_count, router_index, mode)
+    with contextlib.redirect_stdout(io.StringIO()):
+        updater._executar = lambda route_command: True
+        updater.atualizar_rota(routing_table)
+    return len(updater.rotas_instaladas)
+
+def instalar(topology: str, router_count: int, router_index: int, mode: str) -> Dict[str, Any]:
+    """
+    Install a router's routes in the current namespace and time it.
+
+    Must run inside the benchmark namespace. A veth pair makes every
+    neighbor gateway reachable.
+
+    Args:
+        topology: Key of topologias.TOPOLOGIAS
+        router_count: Number of routers
+        router_index: Zero-based index of the measured router
+        mode: Aggregation mode
+
+    Returns:
+        Dict with install time in seconds and number of kernel routes
+    """
+    updater, routing_table = preparar_roteador(topology, router_count, router_index, mode)
+    gateways = {updater.gerenciador_de_rotas.ip_de(next_hop) for next_hop in routing_table.values()}
+    commands = ["link add bench0 type veth peer name bench1", "link set bench1 up", "link set bench0 up"]
+    commands += [f"addr add {Manipulacao.extrair_numero_roteador_ip(gateway)}.1/24 dev bench0"
+                 for gateway in gateways]
+    subprocess.run(["ip", "-batch", "-"], input="\n".join(commands) + "\n", text=True, check=True)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        updater.atualizar_rota(routing_table)
+    elapsed = time.perf_counter() - start
+
+    kernel_routes = subprocess.run(["ip", "route", "show"], capture_output=True, text=True).stdout
+    return {"tempo": elapsed, "rotas": sum(" via " in line for line in kernel_routes.splitlines())}
+
+def medir_instalacao(topology: str, router_count: int, router_index: int, mode: str) -> Dict[str, Any]:
+    """
+    Run instalar in a fresh network namespace.
+
+    Args:
+        topology: Key of topologias.TOPOLOGIAS
+        router_count: Number of routers
+        router_index: Zero-based index of the measured router
+        mode: Aggregation mode
+
+    Returns:
+        Dict with install time in seconds and number of kernel routes
+    """
+    subprocess.run(["ip", "netns", "del", NAMESPACE], capture_output=True)
+    subprocess.run(["ip", "netns", "add", NAMESPACE], check=True)
+    try:
+        result = subprocess.run(
+            ["ip", "netns", "exec", NAMESPACE, sys.executable, os.path.abspath(__file__),
+             "--instalar", topology, str(router_count), str(router_index), mode],
+            capture_output=True, text=True, check=True
+        )
+        return json.loads(result.stdout)
+    finally:
+        subprocess.run(["ip", "netns", "del", NAMESPACE], capture_output=True)
+
+def main(router_count: int = 1000) -> None:
+    """
+    Run the benchmark and print a comparison table.
+
+    Args:
+        router_count: Number of routers per topology
+    """
+    install = os.geteuid() == 0
+    print(f"Roteadores por topologia: {router_count}")
+    if not install:
+        print("Sem privilégios de root: apenas a contagem de prefixos é medida.")
+    print(f"\n{'Topologia':<10} {'Roteador':<14} {'Modo':<10} {'Prefixos':>9} {'Rotas no kernel':>16} {'Instalação (s)':>15}")
+
+    for topology in ("linha", "tree"):
+        for router_index in (0, router_count // 2):
+            router_id = topologias.nome_roteador(router_index)
+            for mode in MODOS_AGREGACAO:
+                prefix_count = contar_prefixos(topology, router_count, router_index, mode)
+                kernel_routes, install_time = "-", "-"
+                if install:
+                    measured = medir_instalacao(topology, router_count, router_index, mode)
+                    kernel_routes, install_time = measured["rotas"], f"{measured['tempo']:.2f}"
+                print(f"{topology:<10} {router_id:<14} {mode:<10} {prefix_count:>9} "
+                      f"{kernel_routes:>16} {install_time:>15}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da agregação de rotas")
+    parser.add_argument("--roteadores", type=int, default=1000, help="Roteadores por topologia")
+    parser.add_argument("--instalar", nargs=4, metavar=("TOPOLOGIA", "N", "INDICE", "MODO"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.instalar:
+        topology, count, index, mode = args.instalar
+        print(json.dumps(instalar(topology, int(count), int(index), mode)))
+    else:
+        main(args.roteadores)
@@ -0,0 +1,151 @@
+"""
+Multi-Area Routing Benchmark Module
+
+This module compares LSDB size and SPF time per router with and without
+OSPF-like areas on a synthetic 1,000 router network. The area-scoped databases
+are obtained by emulating flooding scope and letting every area border router
+originate its summaries until they stop changing.
+"""
+
+import contextlib
+import copy
+import io
+import json
+import sys
+import os
+import time
+import tracemalloc
+from typing import Dict, List, Tuple, Any
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.route_manager import GerenciadorDeRotas
+import topologias
+
+def memoria_objeto(data: Any) -> int:
+    """
+    Measure the Python heap taken by a structure by rebuilding it under tracemalloc.
+
+    Args:
+        data: Structure to measure
+
+    Returns:
+        int: Bytes allocated
+    """
+    tracemalloc.start()
+    clone = copy.deepcopy(data)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del clone
+    return allocated
+
+def visao_da_area(lsdb: Dict[str, Any], summaries: Dict[str, Any],
+                  router_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Return the LSAs a router holds when flooding is scoped by area.
+
+    Args:
+        lsdb: Full network LSDB with area information
+        summaries: Every summary LSA in the network
+        router_id: Router whose view is built
+
+    Returns:
+        Tuple with (router LSAs, summary LSAs) received by the router
+    """
+    attached = set(lsdb[router_id]['areas'])
+    router_lsas = {key: lsa for key, lsa in lsdb.items() if attached & set(lsa['areas'])}
+    summary_lsas = {key: lsa for key, lsa in summaries.items() if lsa['area'] in attached}
+    return router_lsas, summary_lsas
+
+def convergir_resumos(lsdb: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Let every area border router originate summaries until they are stable.
+
+    Args:
+        lsdb: Full network LSDB with area information
+
+    Returns:
+        Dict with every summary LSA keyed like LSAManager does
+    """
+    border_routers = [router_id for router_id, lsa in lsdb.items() if len(lsa['areas']) > 1]
+    summaries: Dict[str, Any] = {}
+    changed = True
+    while changed:
+        changed = False
+        for router_id in border_routers:
+            router_lsas, summary_lsas = visao_da_area(lsdb, summaries, router_id)
+            manager = GerenciadorDeRotas(router_lsas, [], summary_lsas, lsdb[router_id]['area'])
+            for area, destinations in manager.gerar_resumos(router_id).items():
+                key = f"{router_id}:{area}"
+                if key not in summaries or summaries[key]['destinos'] != destinations:
+                    summaries[key] = {'tipo': 'resumo', 'id': key, 'origem': router_id,
+                                      'area': area, 'destinos': destinations, 'seq': 1}
+                    changed = True
+    return summaries
+
+def medir_spf(manager: GerenciadorDeRotas, router_id: str, repetitions: int) -> Tuple[float, int]:
+    """
+    Time route computation for one router.
+
+    Args:
+        manager: Route manager holding the router's view
+        router_id: Router ID
+        repetitions: Number of timed runs
+
+    Returns:
+        Tuple with (mean time in ms, number of routes)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        routes = manager.dijkstra(router_id)
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            manager.dijkstra(router_id)
+    return (time.perf_counter() - start) / repetitions * 1000, len(routes)
+
+def main(router_count: int = 1000, area_count: int = 10, sample: int = 20, repetitions: int = 5) -> None:
+    """
+    Run the benchmark and print a comparison table.
+
+    Args:
+        router_count: Number of routers
+        area_count: Number of areas, area 0 being the backbone
+        sample: Number of routers whose LSDB and SPF are measured
+        repetitions: SPF runs per measured router
+    """
+    edges, areas = topologias.hierarquica(router_count, area_count)
+    flat_lsdb = topologias.gerar_lsdb(router_count, edges)
+    area_lsdb = topologias.gerar_lsdb(router_count, edges, areas=areas)
+
+    start = time.perf_counter()
+    summaries = convergir_resumos(area_lsdb)
+    summary_time = time.perf_counter() - start
+
+    sampled = [topologias.nome_roteador(i) for i in range(0, router_count, max(1, router_count // sample))]
+    results: Dict[str, List[Tuple[int, int, int, float, int]]] = {"sem áreas": [], "com áreas": []}
+    for router_id in sampled:
+        flat_manager = GerenciadorDeRotas(flat_lsdb)
+        spf_ms, route_count = medir_spf(flat_manager, router_id, repetitions)
+        results["sem áreas"].append((len(flat_lsdb), len(json.dumps(flat_lsdb)),
+                                     memoria_objeto(flat_lsdb), spf_ms, route_count))
+
+        router_lsas, summary_lsas = visao_da_area(area_lsdb, summaries, router_id)
+        area_manager = GerenciadorDeRotas(router_lsas, [], summary_lsas, area_lsdb[router_id]['area'])
+        spf_ms, route_count = medir_spf(area_manager, router_id, repetitions)
+        view = {'lsdb': router_lsas, 'resumos': summary_lsas}
+        results["com áreas"].append((len(router_lsas) + len(summary_lsas), len(json.dumps(view)),
+                                     memoria_objeto(view), spf_ms, route_count))
+
+    print(f"Roteadores: {router_count} (backbone e áreas aleatórias), áreas: {area_count}, amostra: {len(sampled)} roteadores")
+    print(f"Roteadores de borda: {sum(len(lsa['areas']) > 1 for lsa in area_lsdb.values())}, "
+          f"LSAs de resumo: {len(summaries)} (convergência em {summary_time:.1f} s)\n")
+    print(f"{'Modo':<10} {'LSAs':>8} {'LSDB (KiB)':>12} {'Heap (KiB)':>12} {'SPF (ms)':>10} {'Rotas':>7}")
+    for mode, rows in results.items():
+        count = len(rows)
+        print(f"{mode:<10} "
+              f"{sum(row[0] for row in rows) / count:>8.0f} "
+              f"{sum(row[1] for row in rows) / count / 1024:>12.1f} "
+              f"{sum(row[2] for row in rows) / count / 1024:>12.1f} "
+              f"{sum(row[3] for row in rows) / count:>10.2f} "
+              f"{sum(row[4] for row in rows) / count:>7.0f}")
+
+if __name__ == "__main__":
+    main()
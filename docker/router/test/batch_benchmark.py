@@ -0,0 +1,57 @@
+"""
+Batch Benchmark Module
+
+This module measures how many LSAs per second one router accepts when it
+reads its socket one datagram per pass through the receive loop and when it
+drains it in batches, on the same namespace lab as netns_launcher, so it
+needs root. The measurement is the one of pipeline_benchmark: only the
+router with the most neighbors runs and a generator in a neighbor's
+namespace offers it increasing rates of synthetic LSAs.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+from class_net.batch_receiver import LOTE_PADRAO
+from pipeline_benchmark import ACEITACAO_MINIMA, medir_modo
+
+def main() -> None:
+    """Offer increasing LSA rates to one router in both modes and print what it accepts."""
+    parser = argparse.ArgumentParser(description="LSAs por segundo aceitos por um roteador, lendo um datagrama "
+                                                 "por vez ou em lotes")
+    parser.add_argument("config", help="Caminho para o config.yaml")
+    parser.add_argument("--taxas", type=float, nargs="+", default=[2000, 3000, 4000, 5000, 6000, 8000, 10000],
+                        help="LSAs por segundo oferecidos")
+    parser.add_argument("--lote", type=int, default=LOTE_PADRAO, help="Datagramas lidos por lote")
+    parser.add_argument("--duracao", type=float, default=3.0, help="Segundos por taxa")
+    parser.add_argument("--buffer", type=int, help="SO_RCVBUF em bytes dos roteadores")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Segundos máximos até o roteador responder")
+    args = parser.parse_args()
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    hub = max(network_config['routers'], key=lambda router: len(router['neighbors']))['id']
+    results = {}
+    for mode in ("um por vez", "em lote"):
+        configs = netns_launcher.configuracoes_roteadores(network_config)
+        for config in configs:
+            config.lote_recepcao = args.lote if mode == "em lote" else None
+            config.buffer_recepcao = args.buffer
+        results[mode] = medir_modo(network_config, configs, hub, args)
+
+    print(f"Roteador medido: {hub}, {args.duracao:.0f} s por taxa, lotes de até {args.lote} datagramas\n")
+    print(f"{'Modo':<12} {'Oferecidos (/s)':>16} {'Aceitos (/s)':>13} {'Descartados':>12}")
+    for mode, steps in results.items():
+        for step in steps:
+            print(f"{mode:<12} {step['oferecida']:>16.0f} {step['aceita']:>13.0f} {step['descartes']:>12}")
+    for mode, steps in results.items():
+        sustained = [step['oferecida'] for step in steps
+                     if step['aceita'] >= ACEITACAO_MINIMA * step['oferecida'] and not step['descartes']]
+        print(f"\nMáximo sustentado {mode}: {max(sustained, default=0):.0f} LSAs/s")
+    print(f"\nSustentado: nenhum datagrama descartado e ao menos {100 * ACEITACAO_MINIMA:.0f}% dos LSAs "
+          "oferecidos instalados")
+
+if __name__ == "__main__":
+    main()
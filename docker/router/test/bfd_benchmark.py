@@ -0,0 +1,163 @@
+"""
+BFD Benchmark Module
+
+This module measures how fast the BFD engine detects a failed neighbor and
+how much CPU it spends keeping sessions up, for a growing number of sessions.
+The measured engine runs in this process on 127.0.0.1; its neighbors run in a
+child process (this same script with --pares), each with its own engine on a
+127.0.1.x address. A neighbor is failed by stopping its engine, which then
+goes silent, and the child reports the instant it stopped on stderr (its
+stdout carries the session messages). Both processes use the system-wide
+monotonic clock, so the detection latency is the difference between that
+instant and the session-down callback.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.bfd import MotorBFD
+
+ENDERECO_LOCAL = "127.0.0.1"
+
+def endereco_par(index: int) -> str:
+    """
+    Return the loopback address of a neighbor engine.
+
+    Args:
+        index: Neighbor index
+
+    Returns:
+        str: Address in 127.0.1.0/16
+    """
+    return f"127.0.{1 + index // 250}.{1 + index % 250}"
+
+def executar_pares(count: int, interval: float, multiplier: int) -> None:
+    """
+    Run the neighbor engines and stop one per 'parar <index>' read from stdin.
+
+    Args:
+        count: Number of neighbor engines
+        interval: BFD interval in seconds
+        multiplier: Detect multiplier
+    """
+    engines = []
+    for index in range(count):
+        engine = MotorBFD(f"par{index}", interval, multiplier, endereco=endereco_par(index))
+        engine.adicionar_sessao("medido", ENDERECO_LOCAL)
+        engines.append(engine.iniciar())
+    print("pronto", file=sys.stderr, flush=True)
+
+    for line in sys.stdin:
+        command, index = line.split()
+        if command == "parar":
+            engines[int(index)].parar()
+            print(time.monotonic(), file=sys.stderr, flush=True)
+    for engine in engines:
+        engine.parar()
+
+def medir(count: int, interval: float, multiplier: int, failures: int, window: float) -> Dict[str, float]:
+    """
+    Bring up the sessions, measure the steady-state CPU and time failures.
+
+    Args:
+        count: Number of sessions
+        interval: BFD interval in seconds
+        multiplier: Detect multiplier
+        failures: Neighbors failed, one at a time
+        window: Seconds the CPU is measured over
+
+    Returns:
+        Dict with the CPU share, packet rate and detection latencies
+    """
+    events: Dict[str, float] = {}
+    changed = threading.Condition()
+
+    def on_change(neighbor: str, is_up: bool) -> None:
+        with changed:
+            events[neighbor] = time.monotonic() if not is_up else -1.0
+            changed.notify_all()
+
+    engine = MotorBFD("medido", interval, multiplier, endereco=ENDERECO_LOCAL, ao_mudar_estado=on_change)
+    for index in range(count):
+        engine.adicionar_sessao(f"par{index}", endereco_par(index))
+
+    peers = subprocess.Popen(
+        [sys.executable, __file__, "--pares", str(count), "--intervalo", str(interval),
+         "--multiplicador", str(multiplier)],
+        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    latencies: List[float] = []
+    try:
+        peers.stderr.readline()
+        engine.iniciar()
+        deadline = time.monotonic() + 10.0
+        while len(engine.sessoes_ativas()) < count and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if len(engine.sessoes_ativas()) < count:
+            raise RuntimeError(f"apenas {len(engine.sessoes_ativas())} de {count} sessões subiram")
+
+        sent = engine.pacotes_enviados
+        cpu = resource.getrusage(resource.RUSAGE_SELF)
+        start = time.monotonic()
+        time.sleep(window)
+        elapsed = time.monotonic() - start
+        cpu_end = resource.getrusage(resource.RUSAGE_SELF)
+        cpu_share = (cpu_end.ru_utime + cpu_end.ru_stime - cpu.ru_utime - cpu.ru_stime) / elapsed
+        rate = (engine.pacotes_enviados - sent) / elapsed
+
+        for index in range(min(failures, count)):
+            neighbor = f"par{index}"
+            peers.stdin.write(f"parar {index}\n")
+            peers.stdin.flush()
+            stopped = float(peers.stderr.readline())
+            with changed:
+                changed.wait_for(lambda: events.get(neighbor, -1.0) > 0, timeout=10 * multiplier * interval)
+            if events.get(neighbor, -1.0) > 0:
+                latencies.append(events[neighbor] - stopped)
+    finally:
+        engine.parar()
+        peers.stdin.close()
+        peers.wait()
+
+    return {"cpu": cpu_share, "pacotes": rate, "latencias": latencies}
+
+def main() -> None:
+    """Run the benchmark and print detection latency and CPU per session count."""
+    parser = argparse.ArgumentParser(description="Latência de detecção e custo de CPU do BFD")
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 10, 50, 100],
+                        help="Quantidades de sessões medidas")
+    parser.add_argument("--intervalo", type=float, default=0.03, help="Intervalo BFD em segundos")
+    parser.add_argument("--multiplicador", type=int, default=3, help="Multiplicador de detecção")
+    parser.add_argument("--falhas", type=int, default=10, help="Vizinhos derrubados por cenário")
+    parser.add_argument("--janela", type=float, default=5.0, help="Segundos de medição de CPU")
+    parser.add_argument("--pares", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.pares is not None:
+        executar_pares(args.pares, args.intervalo, args.multiplicador)
+        return
+
+    print(f"Intervalo: {args.intervalo * 1000:.0f} ms, multiplicador: {args.multiplicador}, "
+          f"tempo de detecção nominal: {args.intervalo * args.multiplicador * 1000:.0f} ms\n")
+    print(f"{'Sessões':>7} {'CPU (%)':>8} {'Pacotes/s':>10} {'Mediana (ms)':>13} {'Máximo (ms)':>12} {'Detectadas':>11}")
+    for count in args.sessoes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = medir(count, args.intervalo, args.multiplicador, args.falhas, args.janela)
+        latencies = [latency * 1000 for latency in result["latencias"]]
+        median = statistics.median(latencies) if latencies else float("nan")
+        worst = max(latencies) if latencies else float("nan")
+        print(f"{count:>7} {100 * result['cpu']:>8.1f} {result['pacotes']:>10.0f} {median:>13.1f} "
+              f"{worst:>12.1f} {len(latencies):>5}/{min(args.falhas, count):<5}", flush=True)
+
+if __name__ == "__main__":
+    main()
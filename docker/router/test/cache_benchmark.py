@@ -0,0 +1,117 @@
+"""
+SPF Cache Benchmark Module
+
+This module replays the route recalculations of one router on a simulated
+clock: the neighbor monitor every 0.5 s, the table check every 0.1 s while
+some router is down, every router re-originating its LSA with the same
+content every INTERVALO_LSA and an occasional real cost change. The real
+AtualizadorDeRotas and GerenciadorDeRotas run over a BancoLSA, which lets
+unchanged inputs hit the SPF cache, and over a plain dict, as before.
+Route commands are not executed.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.lsa_database import BancoLSA
+from class_net.route_manager import GerenciadorDeRotas
+from class_net.route_update import AtualizadorDeRotas
+from class_net.router_config import ConfiguracaoRoteador
+import topologias
+
+PASSO = 0.1
+PERIODO_MONITOR = 0.5
+INTERVALO_LSA = 0.5
+
+def simular(lsdb: Dict[str, Any], router_id: str, duration: float, change_interval: float,
+            failure_every: float, failure_duration: float, seed: int) -> Dict[str, float]:
+    """
+    Replay the recalculations of one router.
+
+    Args:
+        lsdb: LSDB of the topology, BancoLSA or dict
+        router_id: Measured router
+        duration: Simulated seconds
+        change_interval: Seconds between real cost changes
+        failure_every: Seconds between failures of a neighbor
+        failure_duration: Seconds each failure lasts
+        seed: Random seed
+
+    Returns:
+        Dict with recalculations, SPF runs, route updates, hit ratio and CPU seconds
+    """
+    generator = random.Random(seed)
+    config = ConfiguracaoRoteador(roteador_id=router_id, endereco_ip=lsdb[router_id]['ip'], vizinhos={})
+    updater = AtualizadorDeRotas(GerenciadorDeRotas(lsdb), config)
+    updater._executar = lambda route_command: True
+    updates = [0]
+    apply_routes = updater.atualizar_rota
+
+    def atualizar_rota(routing_table: Dict[str, str], switches: Optional[int] = None) -> bool:
+        updates[0] += 1
+        return apply_routes(routing_table, switches)
+
+    updater.atualizar_rota = atualizar_rota
+    neighbor = sorted(lsdb[router_id]['vizinhos'])[0]
+    routers = sorted(lsdb)
+    recalculations = 0
+    elapsed = 0.0
+    for step in range(int(duration / PASSO)):
+        now = step * PASSO
+        if step % int(INTERVALO_LSA / PASSO) == 0:
+            for origin in routers:
+                lsdb[origin] = dict(lsdb[origin], seq=lsdb[origin]['seq'] + 1)
+        if step and step % int(change_interval / PASSO) == 0:
+            origin = generator.choice(routers)
+            links = {target: dict(info) for target, info in lsdb[origin]['vizinhos'].items()}
+            links[generator.choice(sorted(links))]['custo'] = generator.choice([5, 10, 20])
+            lsdb[origin] = dict(lsdb[origin], vizinhos=links, seq=lsdb[origin]['seq'] + 1)
+
+        inactive = [neighbor] if now % failure_every >= failure_every - failure_duration else []
+        calls = (step % int(PERIODO_MONITOR / PASSO) == 0) + bool(inactive)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(calls):
+                updater.recalcular_rotas(inactive)
+        elapsed += time.perf_counter() - start
+        recalculations += calls
+
+    manager = updater.gerenciador_de_rotas
+    return {
+        "recalculos": recalculations,
+        "spfs": manager.falhas_cache,
+        "atualizacoes": updates[0],
+        "acertos": manager.taxa_de_acertos(),
+        "cpu": elapsed,
+    }
+
+def main() -> None:
+    """Print SPF runs, route updates and CPU time with and without the generation-keyed cache."""
+    parser = argparse.ArgumentParser(description="Cache de SPF por geração da LSDB")
+    parser.add_argument("--roteadores", type=int, nargs="+", default=[50, 200], help="Tamanhos da topologia aleatória")
+    parser.add_argument("--duracao", type=float, default=120.0, help="Segundos simulados")
+    parser.add_argument("--mudanca", type=float, default=20.0, help="Segundos entre mudanças reais de custo")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    print(f"{args.duracao:.0f} s simulados, LSAs reoriginados a cada {INTERVALO_LSA} s, "
+          f"mudança real de custo a cada {args.mudanca:.0f} s, vizinho caído 10 s a cada 40 s\n")
+    print(f"{'Roteadores':>10} {'LSDB':<9} {'Recálculos':>11} {'SPFs':>6} {'Atualizações':>13} "
+          f"{'Acertos (%)':>12} {'CPU (s)':>8}")
+    for size in args.roteadores:
+        edges = topologias.aleatoria(size, seed=args.seed)
+        for name, database in (("dict", dict), ("BancoLSA", BancoLSA)):
+            lsdb = database(topologias.gerar_lsdb(size, edges))
+            result = simular(lsdb, topologias.nome_roteador(0), args.duracao, args.mudanca, 40.0, 10.0, args.seed)
+            print(f"{size:>10} {name:<9} {result['recalculos']:>11} {result['spfs']:>6} {result['atualizacoes']:>13} "
+                  f"{100 * result['acertos']:>12.1f} {result['cpu']:>8.2f}", flush=True)
+
+if __name__ == "__main__":
+    main()
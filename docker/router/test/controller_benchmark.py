@@ -0,0 +1,199 @@
+"""
+Controller Benchmark Module
+
+This module compares the distributed mode, where every router runs SPF, with
+the centralised mode, where the route controller computes all tables and
+pushes them, on the same namespace lab as netns_launcher, so it needs root.
+For each mode it measures the time until every router forwards every subnet,
+the CPU spent by all routers and the controller together in steady state,
+and, failing one router several times, the time until no router still
+connected to the rest forwards through it and the CPU spent in the seconds after it. BFD detects
+the failure in both modes.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+from class_net.router_config import ConfiguracaoRoteador
+from restart_benchmark import encaminhamento, iniciar_roteador
+
+JANELA_FALHA = 3.0
+
+def tempo_de_cpu(processes: List[subprocess.Popen]) -> float:
+    """
+    Sum the user and system CPU seconds of some processes and their children.
+
+    Args:
+        processes: Started processes
+
+    Returns:
+        float: CPU seconds spent so far
+    """
+    total = 0.0
+    for process in processes:
+        try:
+            launcher = psutil.Process(process.pid)
+            for member in [launcher] + launcher.children(recursive=True):
+                times = member.cpu_times()
+                total += times.user + times.system
+        except psutil.NoSuchProcess:
+            continue
+    return total
+
+def componente(configs: List[ConfiguracaoRoteador], failed: str) -> List[str]:
+    """
+    Return the routers still connected to the first one after a router fails.
+
+    Args:
+        configs: Router configurations
+        failed: ID of the failed router
+
+    Returns:
+        List of router IDs in the same partition as the first surviving router
+    """
+    links = {config.roteador_id: [neighbor for neighbor in config.vizinhos if neighbor != failed]
+             for config in configs if config.roteador_id != failed}
+    start = next(iter(links))
+    seen, stack = {start}, [start]
+    while stack:
+        for neighbor in links[stack.pop()]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                stack.append(neighbor)
+    return [router for router in links if router in seen]
+
+def esperar(condition: Any, timeout: float) -> Optional[float]:
+    """
+    Poll a condition until it holds.
+
+    Args:
+        condition: Callable returning True once done
+        timeout: Seconds to give up after
+
+    Returns:
+        Seconds until the condition held, or None on timeout
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if condition():
+            return time.perf_counter() - start
+        time.sleep(0.02)
+    return None
+
+def medir_modo(network_config: Dict[str, Any], configs: List[ConfiguracaoRoteador], victim: ConfiguracaoRoteador,
+               args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Bring up the lab in one mode and measure convergence, CPU and failure recovery.
+
+    Args:
+        network_config: Parsed config.yaml
+        configs: Router configurations, with the mode already set
+        victim: Router failed during the measurement
+        args: Command line arguments
+
+    Returns:
+        Dict with 'subida', 'cpu', 'falhas' and 'cpu_falha'
+    """
+    subnets = [network['subnet'] for network in network_config['networks']]
+    victim_ips = {network['ip'] for router in network_config['routers']
+                  if router['id'] == victim.roteador_id for network in router['networks']}
+    survivors = componente(configs, victim.roteador_id)
+
+    def convergiu(routers: List[str]) -> bool:
+        return all(None not in encaminhamento(router, subnets).values() for router in routers)
+
+    def contornou() -> bool:
+        return all(gateway not in victim_ips
+                   for router in survivors for gateway in encaminhamento(router, subnets).values())
+
+    netns_launcher.remover_topologia(network_config)
+    netns_launcher.criar_topologia(network_config)
+    processes: Dict[str, subprocess.Popen] = {}
+    try:
+        if configs[0].controlador:
+            netns_launcher.criar_rede_gerencia(network_config)
+            processes["controlador"] = subprocess.Popen(
+                [sys.executable, "-m", "class_net.controller", "--processos", str(args.processos)],
+                cwd=os.path.dirname(netns_launcher.MAIN_SCRIPT),
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        start = time.perf_counter()
+        processes.update({config.roteador_id: iniciar_roteador(config) for config in configs})
+        if esperar(lambda: convergiu([config.roteador_id for config in configs]), args.timeout) is None:
+            raise RuntimeError("a rede não convergiu")
+        bring_up = time.perf_counter() - start
+
+        time.sleep(2.0)
+        cpu_start, start = tempo_de_cpu(list(processes.values())), time.perf_counter()
+        time.sleep(args.janela)
+        cpu = (tempo_de_cpu(list(processes.values())) - cpu_start) / (time.perf_counter() - start)
+
+        failures, failure_cpu = [], []
+        for _ in range(args.repeticoes):
+            others = [process for name, process in processes.items() if name != victim.roteador_id]
+            cpu_start = tempo_de_cpu(others)
+            processes[victim.roteador_id].kill()
+            processes[victim.roteador_id].wait()
+            killed = time.perf_counter()
+            elapsed = esperar(contornou, args.timeout)
+            failures.append(elapsed if elapsed is not None else float("nan"))
+            time.sleep(max(0.0, killed + JANELA_FALHA - time.perf_counter()))
+            failure_cpu.append(tempo_de_cpu(others) - cpu_start)
+
+            processes[victim.roteador_id] = iniciar_roteador(victim)
+            if esperar(lambda: convergiu([config.roteador_id for config in configs]), args.timeout) is None:
+                raise RuntimeError(f"{victim.roteador_id} não voltou à rede")
+            time.sleep(2.0)
+        return {"subida": bring_up, "cpu": cpu, "falhas": failures, "cpu_falha": failure_cpu}
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.wait()
+        netns_launcher.remover_topologia(network_config)
+
+def main() -> None:
+    """Run both modes on the same lab and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Modo distribuído versus controlador central")
+    parser.add_argument("config", help="Caminho para o config.yaml")
+    parser.add_argument("--roteador", help="Roteador derrubado; por padrão o de mais vizinhos cuja queda não particiona a rede")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Falhas por modo")
+    parser.add_argument("--janela", type=float, default=10.0, help="Segundos de medição da CPU em regime")
+    parser.add_argument("--bfd", type=float, default=0.1, help="Intervalo BFD em segundos")
+    parser.add_argument("--processos", type=int, default=1, help="Processos de cálculo do controlador")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Segundos máximos por convergência")
+    args = parser.parse_args()
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    results = {}
+    for mode in ("distribuído", "controlador"):
+        configs = netns_launcher.configuracoes_roteadores(network_config)
+        for config in configs:
+            config.bfd_intervalo = args.bfd
+            config.controlador = netns_launcher.ENDERECO_CONTROLADOR if mode == "controlador" else None
+        candidates = [config for config in configs if config.roteador_id == args.roteador] if args.roteador \
+            else [config for config in configs
+                  if len(componente(configs, config.roteador_id)) == len(configs) - 1] or configs
+        victim = max(candidates, key=lambda config: len(config.vizinhos))
+        results[mode] = medir_modo(network_config, configs, victim, args)
+
+    print(f"Roteadores: {len(network_config['routers'])}, derrubado: {victim.roteador_id}, "
+          f"BFD a cada {args.bfd} s, {args.repeticoes} falhas por modo\n")
+    print(f"{'Modo':<12} {'Subida (s)':>11} {'CPU regime (%)':>15} {'Contorno (s)':>13} {'CPU na falha (s)':>17}")
+    for mode, result in results.items():
+        print(f"{mode:<12} {result['subida']:>11.2f} {100 * result['cpu']:>15.1f} "
+              f"{statistics.median(result['falhas']):>13.2f} {statistics.median(result['cpu_falha']):>17.2f}")
+    print("\nCPU em regime somada de todos os roteadores (e do controlador), em % de um núcleo; "
+          f"contorno e CPU nos {JANELA_FALHA:.0f} s após a falha são medianas")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Dynamic Link Cost Benchmark Module
+
+This module feeds synthetic RTT traces, sampled at the neighbor probe period,
+to the link cost estimator and counts how many cost changes (each one an LSA
+origination, a network-wide flood and an SPF on every router) it announces,
+and how fast it follows a real change of the link. Raw per-sample costs, EWMA
+smoothing alone and EWMA with hysteresis and hold-down are compared.
+"""
+
+import argparse
+import os
+import random
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.link_cost import CustoDinamico
+
+PERIODO_SONDA = 0.5
+CUSTO_BASE = 10
+
+MODOS = {
+    "bruto": dict(peso_rtt=1.0, peso_perda=1.0, limiar_relativo=0.0, limiar_absoluto=0, retencao=0.0),
+    "EWMA": dict(limiar_relativo=0.0, limiar_absoluto=0, retencao=0.0),
+    "EWMA + histerese": dict(),
+}
+
+def cenarios(seed: int) -> Dict[str, Callable[[float], Optional[float]]]:
+    """
+    Build the RTT traces, each a function of time returning an RTT or None for a loss.
+
+    Args:
+        seed: Random seed
+
+    Returns:
+        Dict mapping scenario names to traces
+    """
+    generator = random.Random(seed)
+
+    def jitter(base: float) -> float:
+        return base * generator.lognormvariate(0, 0.5)
+
+    return {
+        "estável com jitter": lambda t: jitter(0.002),
+        "degrau 2→30 ms": lambda t: jitter(0.002 if t < 60 else 0.030),
+        "oscilação 2/25 ms (4 s)": lambda t: jitter(0.002 if int(t / 4) % 2 == 0 else 0.025),
+        "perda de 5%": lambda t: None if generator.random() < 0.05 else jitter(0.002),
+    }
+
+def simular(trace: Callable[[float], Optional[float]], parameters: dict,
+            duration: float) -> Tuple[int, List[Tuple[float, int]]]:
+    """
+    Run one trace through the estimator.
+
+    Args:
+        trace: RTT trace
+        parameters: CustoDinamico keyword arguments
+        duration: Simulated seconds
+
+    Returns:
+        Tuple with (number of cost changes, announced cost per sample as (time, cost))
+    """
+    estimator = CustoDinamico({"vizinho": CUSTO_BASE}, **parameters)
+    history = []
+    for step in range(int(duration / PERIODO_SONDA)):
+        now = step * PERIODO_SONDA
+        estimator.registrar("vizinho", trace(now), now)
+        history.append((now, estimator.custo("vizinho")))
+    return estimator.mudancas, history
+
+def tempo_de_reacao(history: List[Tuple[float, int]], change_time: float, target: int) -> float:
+    """
+    Seconds from a link change until the announced cost reaches 80% of the new level.
+
+    Args:
+        history: Announced cost per sample
+        change_time: When the link changed
+        target: Cost the new RTT level maps to
+
+    Returns:
+        float: Reaction time, infinity if never reached
+    """
+    for moment, cost in history:
+        if moment >= change_time and cost >= 0.8 * target:
+            return moment - change_time
+    return float("inf")
+
+def main() -> None:
+    """Print cost changes, network-wide SPFs and step reaction per scenario and mode."""
+    parser = argparse.ArgumentParser(description="Estabilidade do custo dinâmico dos enlaces")
+    parser.add_argument("--duracao", type=float, default=600.0, help="Segundos simulados por cenário")
+    parser.add_argument("--roteadores", type=int, default=100,
+                        help="Roteadores da rede, cada mudança de custo causa um SPF em cada um")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    step_target = CUSTO_BASE * (1 + 0.030 / CustoDinamico({}).rtt_referencia)
+    print(f"Sonda a cada {PERIODO_SONDA} s, {args.duracao:.0f} s simulados, custo base {CUSTO_BASE}\n")
+    print(f"{'Cenário':<24} {'Modo':<17} {'Mudanças':>9} {'SPFs na rede':>13} {'Custo mín-máx':>14} {'Reação (s)':>11}")
+    for name in cenarios(args.seed):
+        for mode, parameters in MODOS.items():
+            trace = cenarios(args.seed)[name]
+            changes, history = simular(trace, parameters, args.duracao)
+            costs = [cost for moment, cost in history if moment >= 10]
+            reaction = f"{tempo_de_reacao(history, 60, step_target):.1f}" if name.startswith("degrau") else "-"
+            print(f"{name:<24} {mode:<17} {changes:>9} {changes * args.roteadores:>13} "
+                  f"{min(costs):>6}-{max(costs):<7} {reaction:>11}")
+        print()
+
+if __name__ == "__main__":
+    main()
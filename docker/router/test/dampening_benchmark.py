@@ -0,0 +1,166 @@
+"""
+Flap Dampening Benchmark Module
+
+This module simulates a flapping link in a synthetic network and counts the
+LSAs whose content changes at its two ends, with and without dampening. Each
+such LSA is flooded to the whole network and makes every router run SPF, so
+the flood volume and the network-wide SPF runs follow from the topology. The
+neighbor state is fed to the real VizinhosManager of both ends, as the BFD
+engine would, on a simulated clock.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.lsa_manager import LSAManager
+from class_net.neighbor_manager import VizinhosManager
+from class_net.router_config import ConfiguracaoRoteador
+import topologias
+
+PERIODO = 0.5
+
+def mensagens_por_inundacao(router_count: int, edges: List[topologias.Aresta]) -> int:
+    """
+    Count the datagrams one LSA flood takes: the origin sends it on every
+    link and every other router forwards it on all links but the one it came from.
+
+    Args:
+        router_count: Number of routers
+        edges: Undirected edges
+
+    Returns:
+        int: Datagrams per flood
+    """
+    return 2 * len(edges) - (router_count - 1)
+
+def cenarios(seed: int) -> Dict[str, Callable[[float], bool]]:
+    """
+    Build the link state traces, each a function of time returning whether the link is up.
+
+    Args:
+        seed: Random seed
+
+    Returns:
+        Dict mapping scenario names to traces
+    """
+    generator = random.Random(seed)
+    toggles, moment = [], 30.0
+    while moment < 150.0:
+        toggles.append(moment)
+        moment += generator.uniform(1.0, 4.0)
+
+    def flapping(t: float) -> bool:
+        return sum(1 for toggle in toggles if toggle <= t) % 2 == 0
+
+    return {
+        "falha única de 10 s": lambda t: not 30.0 <= t < 40.0,
+        "oscilação por 120 s": flapping,
+    }
+
+def extremidade(lsdb: Dict[str, dict], router_id: str, half_life: Optional[float],
+                clock: List[float]) -> Tuple[VizinhosManager, LSAManager]:
+    """
+    Build the neighbor and LSA managers of one end of the flapping link.
+
+    Args:
+        lsdb: Converged LSDB of the topology
+        router_id: Router ID
+        half_life: Dampening half-life, None to disable
+        clock: One-element list holding the simulated time
+
+    Returns:
+        Tuple with (neighbor manager, LSA manager)
+    """
+    neighbors = {neighbor: [info['ip'], info['custo']] for neighbor, info in lsdb[router_id]['vizinhos'].items()}
+    config = ConfiguracaoRoteador(roteador_id=router_id, endereco_ip=lsdb[router_id]['ip'], vizinhos=neighbors,
+                                  amortecimento_meia_vida=half_life)
+    manager = VizinhosManager(config)
+    if manager.amortecedor:
+        manager.amortecedor.relogio = lambda: clock[0]
+    for neighbor in neighbors:
+        manager.definir_estado_vizinho(neighbor, True)
+    return manager, LSAManager(manager, config)
+
+def simular(lsdb: Dict[str, dict], edge: Tuple[str, str], trace: Callable[[float], bool],
+            half_life: Optional[float], duration: float) -> Dict[str, float]:
+    """
+    Run one trace on the two ends of a link.
+
+    Args:
+        lsdb: Converged LSDB of the topology
+        edge: Router IDs of the flapping link
+        trace: Link state trace
+        half_life: Dampening half-life, None to disable
+        duration: Simulated seconds
+
+    Returns:
+        Dict with LSA changes, suppressions and the time the link stayed unused after its last recovery
+    """
+    clock = [0.0]
+    ends = [(edge[0], edge[1], *extremidade(lsdb, edge[0], half_life, clock)),
+            (edge[1], edge[0], *extremidade(lsdb, edge[1], half_life, clock))]
+    last_lsa = {router: json.dumps(lsa_manager.criar_lsa()["vizinhos"], sort_keys=True)
+                for router, _, _, lsa_manager in ends}
+    changes = 0
+    last_recovery = None
+    usable_again = None
+    for step in range(int(duration / PERIODO)):
+        clock[0] = step * PERIODO
+        link_up = trace(clock[0])
+        if link_up and not trace(clock[0] - PERIODO):
+            last_recovery, usable_again = clock[0], None
+        for router, neighbor, manager, lsa_manager in ends:
+            manager.definir_estado_vizinho(neighbor, link_up)
+            manager.reavaliar_amortecimento()
+            content = json.dumps(lsa_manager.criar_lsa()["vizinhos"], sort_keys=True)
+            if content != last_lsa[router]:
+                last_lsa[router] = content
+                changes += 1
+        in_use = all(neighbor not in manager.vizinhos_inativos for _, neighbor, manager, _ in ends)
+        if link_up and in_use and usable_again is None and last_recovery is not None:
+            usable_again = clock[0]
+
+    suppressions = sum(manager.amortecedor.estados[neighbor].supressoes
+                       for _, neighbor, manager, _ in ends if manager.amortecedor)
+    return {
+        "lsas": changes,
+        "supressoes": suppressions,
+        "atraso": (usable_again - last_recovery) if usable_again is not None else float("inf"),
+    }
+
+def main() -> None:
+    """Print LSA changes, flood volume and SPF runs per scenario, with and without dampening."""
+    parser = argparse.ArgumentParser(description="Inundações e SPFs causados por um enlace oscilante")
+    parser.add_argument("--roteadores", type=int, default=50, help="Roteadores da topologia aleatória")
+    parser.add_argument("--meias-vidas", type=float, nargs="+", default=[10.0, 30.0],
+                        help="Meias-vidas do amortecimento comparadas, em segundos")
+    parser.add_argument("--duracao", type=float, default=300.0, help="Segundos simulados por cenário")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    edges = topologias.aleatoria(args.roteadores, seed=args.seed)
+    lsdb = topologias.gerar_lsdb(args.roteadores, edges)
+    edge = (topologias.nome_roteador(edges[0][0]), topologias.nome_roteador(edges[0][1]))
+    per_flood = mensagens_por_inundacao(args.roteadores, edges)
+    print(f"Topologia aleatória com {args.roteadores} roteadores e {len(edges)} enlaces, "
+          f"enlace oscilante {edge[0]}-{edge[1]}, {per_flood} datagramas por inundação\n")
+    print(f"{'Cenário':<22} {'Amortecimento':<14} {'LSAs novos':>10} {'Datagramas':>11} "
+          f"{'SPFs na rede':>13} {'Supressões':>11} {'Atraso (s)':>11}")
+    for name, trace in cenarios(args.seed).items():
+        for half_life in [None] + args.meias_vidas:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = simular(lsdb, edge, trace, half_life, args.duracao)
+            mode = f"meia-vida {half_life:.0f} s" if half_life else "desligado"
+            print(f"{name:<22} {mode:<14} {result['lsas']:>10} {result['lsas'] * per_flood:>11} "
+                  f"{result['lsas'] * args.roteadores:>13} {result['supressoes']:>11} {result['atraso']:>11.1f}")
+        print()
+
+if __name__ == "__main__":
+    main()
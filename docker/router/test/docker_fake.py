@@ -0,0 +1,196 @@
+"""
+Fake Docker Engine Module
+
+This module provides an in-process stand-in for the Docker Engine API served on
+a local Unix socket. It implements only the endpoints used by the inventory
+(container listing, inspection and exec) so that scripts and the inventory can
+be exercised without a running Docker daemon.
+"""
+
+import json
+import os
+import socketserver
+import struct
+import tempfile
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler
+from typing import Callable, Dict, List, Tuple, Any, Optional
+from urllib.parse import urlparse, parse_qs, unquote
+
+Executor = Callable[[str, List[str]], Tuple[int, str, str]]
+
+class _ServidorUnix(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server bound to a Unix socket."""
+    daemon_threads = True
+
+class MotorDockerFalso:
+    """
+    Fake Docker Engine serving a configurable set of containers.
+
+    Attributes:
+        socket_path (str): Unix socket the fake engine listens on
+        containers (Dict): Container name to its networks and environment
+        executor (Callable): Function answering execs as (container, cmd) -> (code, stdout, stderr)
+        requisicoes (int): Number of HTTP requests served
+        conexoes (int): Number of client connections accepted
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, executor: Optional[Executor] = None):
+        """
+        Initialize the fake engine.
+
+        Args:
+            socket_path: Socket path, a temporary one when omitted
+            executor: Exec handler, always succeeding with empty output when omitted
+        """
+        self.socket_path = socket_path or os.path.join(tempfile.mkdtemp(), "docker.sock")
+        self.containers: Dict[str, Dict[str, Any]] = {}
+        self.executor = executor or (lambda container, command: (0, "", ""))
+        self.requisicoes = 0
+        self.conexoes = 0
+        self._execs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[_ServidorUnix] = None
+
+    def adicionar_container(self, name: str, networks: Dict[str, Dict[str, str]],
+                            environment: Optional[Dict[str, str]] = None) -> None:
+        """
+        Register a running container.
+
+        Args:
+            name: Container name
+            networks: Network name to {'ip', 'gateway'}
+            environment: Container environment variables
+        """
+        self.containers[name] = {"redes": networks, "ambiente": environment or {}}
+
+    def remover_container(self, name: str) -> None:
+        """Remove a container, as if it had been stopped."""
+        self.containers.pop(name, None)
+
+    def _resumo(self, name: str) -> Dict[str, Any]:
+        """Build the /containers/json entry of a container."""
+        return {
+            "Id": name,
+            "Names": [f"/{name}"],
+            "State": "running",
+            "NetworkSettings": {"Networks": {
+                network: {"IPAddress": info["ip"], "Gateway": info.get("gateway", "")}
+                for network, info in self.containers[name]["redes"].items()
+            }},
+        }
+
+    def _tratar(self, method: str, raw_path: str, body: Dict[str, Any]) -> Tuple[int, Any]:
+        """
+        Answer one API call.
+
+        Args:
+            method: HTTP method
+            raw_path: Request path with query string
+            body: Decoded JSON body
+
+        Returns:
+            Tuple with (HTTP status, JSON-serialisable answer or raw bytes)
+        """
+        url = urlparse(raw_path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+
+        if method == "GET" and parts == ["containers", "json"]:
+            filters = json.loads(parse_qs(url.query).get("filters", ["{}"])[0])
+            names = [name for name in self.containers
+                     if all(pattern in name for pattern in filters.get("name", []))]
+            return 200, [self._resumo(name) for name in names]
+
+        if parts[0] == "containers" and len(parts) == 3 and parts[1] not in self.containers:
+            return 404, {"message": f"No such container: {parts[1]}"}
+
+        if method == "GET" and parts[0] == "containers" and parts[2:] == ["json"]:
+            summary = self._resumo(parts[1])
+            summary["Config"] = {"Env": [f"{key}={value}" for key, value
+                                         in self.containers[parts[1]]["ambiente"].items()]}
+            return 200, summary
+
+        if method == "POST" and parts[0] == "containers" and parts[2:] == ["exec"]:
+            exec_id = uuid.uuid4().hex
+            with self._lock:
+                self._execs[exec_id] = {"container": parts[1], "cmd": body["Cmd"], "codigo": None}
+            return 201, {"Id": exec_id}
+
+        if parts[0] == "exec" and len(parts) == 3 and parts[1] in self._execs:
+            exec_state = self._execs[parts[1]]
+            if method == "POST" and parts[2] == "start":
+                code, stdout, stderr = self.executor(exec_state["container"], exec_state["cmd"])
+                exec_state["codigo"] = code
+                stream = bytearray()
+                for stream_type, text in ((1, stdout), (2, stderr)):
+                    if text:
+                        data = text.encode()
+                        stream += struct.pack(">BxxxI", stream_type, len(data)) + data
+                return 200, bytes(stream)
+            if method == "GET" and parts[2] == "json":
+                return 200, {"ID": parts[1], "Running": False, "ExitCode": exec_state["codigo"]}
+
+        return 404, {"message": "page not found"}
+
+    def _handler(self) -> type:
+        """Build the request handler class bound to this engine."""
+        engine = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                with engine._lock:
+                    engine.conexoes += 1
+
+            def address_string(self) -> str:
+                return "unix"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _responder(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else {}
+                with engine._lock:
+                    engine.requisicoes += 1
+                status, answer = engine._tratar(self.command, self.path, body)
+                if isinstance(answer, bytes):
+                    payload, content_type = answer, "application/vnd.docker.raw-stream"
+                else:
+                    payload, content_type = json.dumps(answer).encode(), "application/json"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = _responder
+            do_POST = _responder
+
+        return Handler
+
+    def iniciar(self) -> "MotorDockerFalso":
+        """Start serving on the Unix socket in a background thread."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _ServidorUnix(self.socket_path, self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def parar(self) -> None:
+        """Stop the server and remove the socket file."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self) -> "MotorDockerFalso":
+        return self.iniciar()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.parar()
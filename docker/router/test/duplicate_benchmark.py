@@ -0,0 +1,115 @@
+"""
+Duplicate Benchmark Module
+
+This module measures the CPU a router spends per received LSA on a flood
+where most copies are stale duplicates, with and without the pre-filter
+that drops them from their header instead of decoding the JSON, on the same
+namespace lab as netns_launcher, so it needs root. As in pipeline_benchmark,
+only the router with the most neighbors runs and the generator of that
+module, in a neighbor's namespace, sends each synthetic LSA several times.
+The router's CPU while idle is discounted.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+from class_net.router_config import ConfiguracaoRoteador
+from controller_benchmark import esperar, tempo_de_cpu
+from flooding_benchmark import contadores_udp
+from pacing_benchmark import estatisticas
+from restart_benchmark import iniciar_roteador
+
+def medir_modo(network_config: Dict[str, Any], configs: List[ConfiguracaoRoteador], hub: str,
+               args: argparse.Namespace) -> Dict[str, float]:
+    """
+    Start the router in one mode and measure its CPU per received LSA.
+
+    Args:
+        network_config: Parsed config.yaml
+        configs: Router configurations, with the mode already set
+        hub: Router receiving the synthetic LSAs, the only one started
+        args: Command line arguments
+
+    Returns:
+        Dict with 'cpu_por_lsa' (µs), 'recebidos', 'instalados' and 'filtrados'
+    """
+    hub_config = next(router for router in network_config['routers'] if router['id'] == hub)
+    generator = hub_config['neighbors'][0]['id']
+    hub_ip = next(config.vizinhos[hub][0] for config in configs if config.roteador_id == generator)
+
+    netns_launcher.remover_topologia(network_config)
+    netns_launcher.criar_topologia(network_config)
+    processes = []
+    try:
+        processes = [iniciar_roteador(config) for config in configs if config.roteador_id == hub]
+        if esperar(lambda: estatisticas(hub) is not None, args.timeout) is None:
+            raise RuntimeError(f"{hub} não respondeu")
+        time.sleep(2.0)
+
+        cpu_start, start = tempo_de_cpu(processes), time.perf_counter()
+        time.sleep(args.duracao)
+        idle = (tempo_de_cpu(processes) - cpu_start) / (time.perf_counter() - start)
+
+        before = estatisticas(hub)
+        drops = contadores_udp(hub)["RcvbufErrors"]
+        cpu_start, start = tempo_de_cpu(processes), time.perf_counter()
+        output = subprocess.run(
+            ["ip", "netns", "exec", generator, sys.executable,
+             os.path.join(os.path.dirname(os.path.abspath(__file__)), "pipeline_benchmark.py"),
+             "--gerar", hub_ip, "--taxa-gerada", str(args.taxa), "--duracao", str(args.duracao),
+             "--seq", "1", "--repeticoes", str(args.repeticoes), "--enlaces", str(args.enlaces)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        time.sleep(1.0)
+        cpu = tempo_de_cpu(processes) - cpu_start - idle * (time.perf_counter() - start)
+        after = estatisticas(hub)
+        received = int(output.split()[-1]) - (contadores_udp(hub)["RcvbufErrors"] - drops)
+        return {
+            "cpu_por_lsa": 1e6 * cpu / received,
+            "recebidos": received,
+            "instalados": after["lsas_instalados"] - before["lsas_instalados"],
+            "filtrados": after["duplicados_filtrados"] - before["duplicados_filtrados"],
+        }
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        netns_launcher.remover_topologia(network_config)
+
+def main() -> None:
+    """Measure both modes on the same lab and print the CPU per received LSA."""
+    parser = argparse.ArgumentParser(description="CPU por LSA recebido numa inundação cheia de duplicatas")
+    parser.add_argument("config", help="Caminho para o config.yaml")
+    parser.add_argument("--taxa", type=float, default=2000.0, help="LSAs por segundo recebidos")
+    parser.add_argument("--repeticoes", type=int, default=10, help="Cópias de cada LSA, todas menos uma obsoletas")
+    parser.add_argument("--enlaces", type=int, default=16, help="Vizinhos listados em cada LSA")
+    parser.add_argument("--duracao", type=float, default=5.0, help="Segundos de envio")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Segundos máximos até o roteador responder")
+    args = parser.parse_args()
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    hub = max(network_config['routers'], key=lambda router: len(router['neighbors']))['id']
+    results = {}
+    for mode in ("decodificando", "pré-filtro"):
+        configs = netns_launcher.configuracoes_roteadores(network_config)
+        for config in configs:
+            config.pre_filtro = mode == "pré-filtro"
+        results[mode] = medir_modo(network_config, configs, hub, args)
+
+    print(f"Roteador medido: {hub}, {args.taxa:.0f} LSAs/s por {args.duracao:.0f} s, "
+          f"{args.repeticoes} cópias de cada LSA com {args.enlaces} vizinhos\n")
+    print(f"{'Modo':<14} {'CPU por LSA (µs)':>17} {'Recebidos':>10} {'Instalados':>11} {'Filtrados':>10}")
+    for mode, result in results.items():
+        print(f"{mode:<14} {result['cpu_por_lsa']:>17.1f} {result['recebidos']:>10} "
+              f"{result['instalados']:>11} {result['filtrados']:>10}")
+    print("\nCPU do roteador, sem a de repouso, dividida pelos LSAs recebidos")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Dynamic Flooding Benchmark Module
+
+This module compares flooding over every link with flooding over the
+leader's flooding subgraph on full-mesh and dense random topologies. The
+flooding decisions come from the real TopologiaDeInundacao of every router;
+the network is simulated on an event clock, where each router handles one
+datagram at a time (PROCESSAMENTO seconds to receive it, ENVIO seconds per
+copy it sends) and links add LATENCIA seconds. Duplicates cost receive time
+too, which is what delays convergence on dense graphs.
+
+For each topology it reports the copies of one LSA origination, the time
+until every router holds it, the time until every router holds the LSAs of
+a burst where all routers originate at once (as after a restart) and the
+copies of the LSA announcing a failed subgraph link.
+"""
+
+import argparse
+import heapq
+import os
+import random
+import statistics
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.flooding_topology import TopologiaDeInundacao
+from class_net.lsa_database import BancoLSA
+import topologias
+
+PROCESSAMENTO = 100e-6
+ENVIO = 30e-6
+LATENCIA = 100e-6
+
+def preparar(lsdb: BancoLSA, dynamic: bool) -> Dict[str, Optional[TopologiaDeInundacao]]:
+    """
+    Create the flooding state of every router and let the leader advertise its subgraph.
+
+    Args:
+        lsdb: Converged LSDB shared by the simulated routers
+        dynamic: Whether routers use dynamic flooding
+
+    Returns:
+        Dict mapping routers to their flooding state, None when flooding over every link
+    """
+    states = {router: TopologiaDeInundacao(router) if dynamic else None for router in lsdb}
+    if dynamic:
+        for router, state in states.items():
+            edges = state.anuncio(lsdb, [])
+            if edges:
+                lsdb[router] = dict(lsdb[router], inundacao=edges, seq=lsdb[router]['seq'] + 1)
+    return states
+
+def inundar(lsdb: BancoLSA, states: Dict[str, Optional[TopologiaDeInundacao]],
+            origins: List[str]) -> Tuple[int, float]:
+    """
+    Simulate the flooding of one LSA from each origin, all starting at once.
+
+    Args:
+        lsdb: Converged LSDB shared by the simulated routers
+        states: Flooding state per router
+        origins: Routers originating an LSA
+
+    Returns:
+        Tuple with the datagrams sent and the time until every router holds every LSA
+    """
+    def targets(router: str, sender: Optional[str]) -> List[str]:
+        allowed = states[router].vizinhos(lsdb, []) if states[router] else None
+        return [neighbor for neighbor in lsdb[router]['vizinhos']
+                if neighbor != sender and (allowed is None or neighbor in allowed)]
+
+    busy_until = {router: 0.0 for router in lsdb}
+    holding: Dict[str, Set[str]] = {router: set() for router in lsdb}
+    events: List[Tuple[float, int, str, str, Optional[str]]] = []
+    sequence = 0
+    copies = 0
+    finished = 0.0
+    for origin in origins:
+        holding[origin].add(origin)
+        for neighbor in targets(origin, None):
+            busy_until[origin] += ENVIO
+            sequence += 1
+            heapq.heappush(events, (busy_until[origin] + LATENCIA, sequence, neighbor, origin, origin))
+            copies += 1
+
+    while events:
+        arrival, _, router, lsa, sender = heapq.heappop(events)
+        start = max(arrival, busy_until[router])
+        busy_until[router] = start + PROCESSAMENTO
+        if lsa in holding[router]:
+            continue
+        holding[router].add(lsa)
+        finished = max(finished, busy_until[router])
+        for neighbor in targets(router, sender):
+            busy_until[router] += ENVIO
+            sequence += 1
+            heapq.heappush(events, (busy_until[router] + LATENCIA, sequence, neighbor, lsa, router))
+            copies += 1
+
+    if any(len(held) < len(origins) for held in holding.values()):
+        raise RuntimeError("a inundação não alcançou todos os roteadores")
+    return copies, finished
+
+def falhar_enlace(lsdb: BancoLSA, generator: random.Random) -> str:
+    """
+    Remove a random link of the advertised subgraph from both ends' LSAs.
+
+    Args:
+        lsdb: LSDB holding the leader's subgraph
+        generator: Random generator
+
+    Returns:
+        ID of one end of the failed link, which originates the LSA announcing it
+    """
+    leader = min(lsdb)
+    first, second = generator.choice(lsdb[leader]['inundacao'])
+    for origin, target in ((first, second), (second, first)):
+        links = {neighbor: info for neighbor, info in lsdb[origin]['vizinhos'].items() if neighbor != target}
+        lsdb[origin] = dict(lsdb[origin], vizinhos=links, seq=lsdb[origin]['seq'] + 1)
+    return first
+
+def medir(lsdb_base: Dict[str, Any], dynamic: bool, origins: List[str], seed: int) -> Dict[str, float]:
+    """
+    Measure one flooding mode on one topology.
+
+    Args:
+        lsdb_base: Converged LSDB of the topology
+        dynamic: Whether routers use dynamic flooding
+        origins: Routers whose single originations are averaged
+        seed: Seed choosing the failed link
+
+    Returns:
+        Dict with 'copias', 'tempo', 'rajada', 'falha' and 'arestas'
+    """
+    lsdb = BancoLSA(lsdb_base)
+    states = preparar(lsdb, dynamic)
+    singles = [inundar(lsdb, states, [origin]) for origin in origins]
+    _, burst = inundar(lsdb, states, list(lsdb))
+    flooding = lsdb[min(lsdb)].get('inundacao')
+
+    failure = BancoLSA(lsdb)
+    if dynamic:
+        origin = falhar_enlace(failure, random.Random(seed))
+    else:
+        origin = origins[0]
+    failure_copies, _ = inundar(failure, {router: TopologiaDeInundacao(router) if dynamic else None
+                                          for router in failure}, [origin])
+    return {
+        "copias": statistics.mean(copies for copies, _ in singles),
+        "tempo": statistics.mean(elapsed for _, elapsed in singles),
+        "rajada": burst,
+        "falha": failure_copies,
+        "arestas": len(flooding) if flooding else sum(len(lsa['vizinhos']) for lsa in lsdb.values()) // 2,
+    }
+
+def main() -> None:
+    """Print copies and convergence times of both flooding modes per topology."""
+    parser = argparse.ArgumentParser(description="Inundação por todos os enlaces versus subgrafo de inundação")
+    parser.add_argument("--roteadores", type=int, nargs="+", default=[20, 50, 100], help="Tamanhos das topologias")
+    parser.add_argument("--grau", type=float, default=16.0, help="Grau médio da topologia aleatória densa")
+    parser.add_argument("--origens", type=int, default=5, help="Originações isoladas medidas por topologia")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    print(f"{'Topologia':<10} {'Roteadores':>10} {'Modo':<10} {'Enlaces':>8} {'Cópias/LSA':>11} "
+          f"{'Conv. (ms)':>11} {'Rajada (ms)':>12} {'Cópias na falha':>16}")
+    for size in args.roteadores:
+        for name, edges in (("malha", topologias.malha_completa(size)),
+                            ("aleatoria", topologias.aleatoria(size, min(args.grau, size - 1), args.seed))):
+            lsdb = topologias.gerar_lsdb(size, edges)
+            origins = random.Random(args.seed).sample(sorted(lsdb), min(args.origens, size))
+            for mode, dynamic in (("completa", False), ("dinamica", True)):
+                result = medir(lsdb, dynamic, origins, args.seed)
+                print(f"{name:<10} {size:>10} {mode:<10} {result['arestas']:>8} {result['copias']:>11.0f} "
+                      f"{1000 * result['tempo']:>11.2f} {1000 * result['rajada']:>12.1f} "
+                      f"{result['falha']:>16}", flush=True)
+    print(f"\nProcessamento de {PROCESSAMENTO * 1e6:.0f} µs por datagrama recebido, {ENVIO * 1e6:.0f} µs por "
+          f"cópia enviada e {LATENCIA * 1e6:.0f} µs de latência por enlace")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Failure Analysis Benchmark Module
+
+This module times the what-if engine of GerenciadorDeRotas on synthetic
+topologies: the baseline trees, a sweep over every single router and link
+failure, a double-failure sweep over a sample of elements and Yen's k
+shortest paths. A few scenarios are also solved the naive way, running SPF
+from every router over the topology without the failed element, to estimate
+what the sweep would cost without reusing the trees and to check the
+unreachable pairs and worst stretch reported.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.failure_analysis import AnalisadorDeFalhas, Elemento
+from class_net.lsa_database import BancoLSA
+from class_net.route_manager import GerenciadorDeRotas
+from class_net.spf_graph import INFINITO
+import topologias
+
+def sem_elemento(lsdb: Dict[str, Any], element: Elemento) -> GerenciadorDeRotas:
+    """Return a route manager for the topology without a router or link."""
+    if isinstance(element, str):
+        return GerenciadorDeRotas(BancoLSA(lsdb), [element])
+    copy = BancoLSA(lsdb)
+    for origin, target in (element, element[::-1]):
+        links = {neighbor: info for neighbor, info in lsdb[origin]['vizinhos'].items() if neighbor != target}
+        copy[origin] = dict(lsdb[origin], vizinhos=links)
+    return GerenciadorDeRotas(copy)
+
+def ingenuo(baseline: AnalisadorDeFalhas, lsdb: Dict[str, Any], element: Elemento) -> Dict[str, Any]:
+    """
+    Solve one scenario with a full SPF from every router.
+
+    Args:
+        baseline: Analyser of the intact topology
+        lsdb: LSDB of the intact topology
+        element: Failed router or link
+
+    Returns:
+        Dict with 'pares_inalcancaveis' and 'estiramento_maximo'
+    """
+    failed = sem_elemento(lsdb, element).analisador_de_falhas()
+    size, failed_size = len(baseline.nomes), len(failed.nomes)
+    unreachable, worst = 0, 1.0
+    for source, source_name in enumerate(failed.nomes):
+        old_base = baseline.indices[source_name] * size
+        for target, target_name in enumerate(failed.nomes):
+            old = baseline.distancias[old_base + baseline.indices[target_name]]
+            new = failed.distancias[source * failed_size + target]
+            if source == target or old >= INFINITO or new == old:
+                continue
+            if new >= INFINITO:
+                unreachable += 1
+            else:
+                worst = max(worst, new / old)
+    return {'pares_inalcancaveis': unreachable, 'estiramento_maximo': worst}
+
+def main() -> None:
+    """Print the sweep times, the naive estimate and the worst scenarios per topology."""
+    parser = argparse.ArgumentParser(description="Análise de falhas (what-if) e k caminhos mais curtos")
+    parser.add_argument("--roteadores", type=int, nargs="+", default=[200, 1000], help="Tamanhos das topologias")
+    parser.add_argument("--topologias", nargs="+", default=["aleatoria", "grade"],
+                        choices=sorted(topologias.TOPOLOGIAS), help="Topologias medidas")
+    parser.add_argument("--duplas", type=int, default=40, help="Elementos sorteados para a varredura de falhas duplas")
+    parser.add_argument("--ingenuos", type=int, default=3, help="Cenários resolvidos com SPF completo")
+    parser.add_argument("--processos", type=int, default=1, help="Processos da varredura")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    print(f"{'Topologia':<10} {'Roteadores':>10} {'Base (s)':>9} {'Cenários':>9} {'Simples (s)':>12} "
+          f"{'Ingênuo (s)':>12} {'Duplas':>7} {'Duplas (s)':>11} {'Yen k=8 (ms)':>13} {'Conferidos':>11}")
+    for size in args.roteadores:
+        for name in args.topologias:
+            lsdb = topologias.gerar_lsdb(size, topologias.TOPOLOGIAS[name](size))
+            manager = GerenciadorDeRotas(BancoLSA(lsdb))
+
+            start = time.perf_counter()
+            analyser = manager.analisador_de_falhas()
+            baseline = time.perf_counter() - start
+
+            start = time.perf_counter()
+            singles = manager.analisar_falhas(processes=args.processos)
+            single_time = time.perf_counter() - start
+
+            sample = generator.sample(analyser.elementos(), args.duplas)
+            start = time.perf_counter()
+            doubles = manager.analisar_falhas(sample, double=True, processes=args.processos)
+            double_time = time.perf_counter() - start
+
+            yen = []
+            for _ in range(20):
+                source, destination = generator.sample(analyser.nomes, 2)
+                start = time.perf_counter()
+                manager.k_caminhos(source, destination, 8)
+                yen.append(time.perf_counter() - start)
+
+            checked = generator.sample(singles, args.ingenuos)
+            start = time.perf_counter()
+            naive = [ingenuo(analyser, lsdb, result['falhas'][0]) for result in checked]
+            naive_time = (time.perf_counter() - start) / len(checked) * len(singles)
+            agree = all(result['pares_inalcancaveis'] == reference['pares_inalcancaveis'] and
+                        abs(result['estiramento_maximo'] - reference['estiramento_maximo']) < 1e-9
+                        for result, reference in zip(checked, naive))
+
+            print(f"{name:<10} {size:>10} {baseline:>9.2f} {len(singles):>9} {single_time:>12.2f} "
+                  f"{naive_time:>12.0f} {len(doubles):>7} {double_time:>11.2f} "
+                  f"{1000 * statistics.median(yen):>13.2f} {'sim' if agree else 'NÃO':>11}", flush=True)
+            worst = max(singles, key=lambda result: (result['pares_inalcancaveis'], result['estiramento_maximo']))
+            print(f"{'':<10} pior falha simples: {worst['falhas'][0]} ({worst['pares_inalcancaveis']} pares "
+                  f"inalcançáveis, estiramento máximo {worst['estiramento_maximo']:.2f})", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Flooding Benchmark Module
+
+This module measures the UDP datagrams routers send with LSAs unicast to
+every neighbor, with multicast flooding, once per shared segment, and with
+dynamic flooding over the leader's flooding subgraph, on the same namespace
+lab as netns_launcher, so it needs root. The counters come
+from /proc/net/snmp of each namespace, read over a steady window after the
+network converges; the busiest router (the hub of an 'estrela' topology) is
+reported apart. Failures are detected by ping, so no other UDP traffic is
+counted.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+from class_net.router_config import ConfiguracaoRoteador
+from controller_benchmark import esperar
+from restart_benchmark import encaminhamento, iniciar_roteador
+
+MODOS = ("unicast", "multicast", "dinamica")
+
+def contadores_udp(namespace: str) -> Dict[str, int]:
+    """
+    Read the UDP counters of a namespace.
+
+    Args:
+        namespace: Router namespace
+
+    Returns:
+        Dict mapping counter names, such as 'OutDatagrams', to their values
+    """
+    output = subprocess.run(["ip", "netns", "exec", namespace, "cat", "/proc/net/snmp"],
+                            capture_output=True, text=True, check=True).stdout
+    names, values = [line.split()[1:] for line in output.splitlines() if line.startswith("Udp:")]
+    return dict(zip(names, map(int, values)))
+
+def medir_modo(network_config: Dict, configs: List[ConfiguracaoRoteador], hub: str,
+               args: argparse.Namespace) -> Dict[str, float]:
+    """
+    Bring up the lab in one flooding mode and measure its datagram rates.
+
+    Args:
+        network_config: Parsed config.yaml
+        configs: Router configurations, with the mode already set
+        hub: Router reported apart
+        args: Command line arguments
+
+    Returns:
+        Dict with 'convergencia' (s), 'saida_hub' and 'entrada_hub' (datagrams/s) and 'saida_total'
+    """
+    subnets = [network['subnet'] for network in network_config['networks']]
+    netns_launcher.remover_topologia(network_config)
+    netns_launcher.criar_topologia(network_config)
+    processes = []
+    try:
+        start = time.perf_counter()
+        processes = [iniciar_roteador(config) for config in configs]
+        converged = esperar(lambda: all(None not in encaminhamento(config.roteador_id, subnets).values()
+                                        for config in configs), args.timeout)
+        if converged is None:
+            raise RuntimeError("a rede não convergiu")
+        time.sleep(2.0)
+
+        before = {config.roteador_id: contadores_udp(config.roteador_id) for config in configs}
+        start = time.perf_counter()
+        time.sleep(args.janela)
+        after = {config.roteador_id: contadores_udp(config.roteador_id) for config in configs}
+        elapsed = time.perf_counter() - start
+        return {
+            "convergencia": converged,
+            "saida_hub": (after[hub]["OutDatagrams"] - before[hub]["OutDatagrams"]) / elapsed,
+            "entrada_hub": (after[hub]["InDatagrams"] - before[hub]["InDatagrams"]) / elapsed,
+            "saida_total": sum(after[router]["OutDatagrams"] - before[router]["OutDatagrams"]
+                               for router in after) / elapsed,
+        }
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        netns_launcher.remover_topologia(network_config)
+
+def main() -> None:
+    """Run the flooding modes on the same lab and print their datagram rates."""
+    parser = argparse.ArgumentParser(description="Datagramas de inundação por modo de inundação")
+    parser.add_argument("config", help="Caminho para o config.yaml")
+    parser.add_argument("--janela", type=float, default=10.0, help="Segundos de medição")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Segundos máximos até convergir")
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS), help="Modos de inundação medidos")
+    args = parser.parse_args()
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    hub = max(network_config['routers'], key=lambda router: len(router['neighbors']))['id']
+    results = {}
+    for mode in args.modos:
+        configs = netns_launcher.configuracoes_roteadores(network_config)
+        for config in configs:
+            config.multicast = mode == "multicast"
+            config.inundacao_dinamica = mode == "dinamica"
+        results[mode] = medir_modo(network_config, configs, hub, args)
+
+    print(f"Roteadores: {len(network_config['routers'])}, medido à parte: {hub}\n")
+    print(f"{'Modo':<10} {'Convergência (s)':>17} {'Saída hub (/s)':>15} {'Entrada hub (/s)':>17} "
+          f"{'Saída total (/s)':>17}")
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['convergencia']:>17.2f} {result['saida_hub']:>15.1f} "
+              f"{result['entrada_hub']:>17.1f} {result['saida_total']:>17.1f}")
+    print(f"\nDatagramas UDP por segundo em regime, janela de {args.janela:.0f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Docker Inventory Testing Module
+
+This module checks InventarioDocker against the fake Docker Engine of
+docker_fake, so it runs without a Docker daemon: container listing and
+addresses, the cache and its invalidation, and commands run in parallel
+with executar_em_lote over reused connections.
+"""
+
+import sys
+import os
+from typing import Callable, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.docker_inventory import ClienteDocker, InventarioDocker
+from class_net.message import Mensagem
+from docker_fake import MotorDockerFalso
+
+WORKERS = 4
+
+def executor_eco(container: str, command: List[str]) -> Tuple[int, str, str]:
+    """Answer execs with the container and command, failing 'false' as a shell would."""
+    if command[0] == "false":
+        return 1, "", f"{container}: falhou\n"
+    return 0, f"{container}: {' '.join(command)}\n", ""
+
+def preparar(engine: MotorDockerFalso) -> None:
+    """Register two routers, announcing ENDERECO_IP, and a host on its first network."""
+    for index in (1, 2):
+        engine.adicionar_container(
+            f"roteador{index}",
+            {
+                f"rede_roteador{index}": {"ip": f"172.21.{index - 1}.2", "gateway": f"172.21.{index - 1}.1"},
+                "rede_roteadores": {"ip": f"172.20.0.{index + 1}", "gateway": "172.20.0.1"},
+            },
+            {"ROTEADOR_ID": f"roteador{index}", "ENDERECO_IP": f"172.21.{index - 1}.2"},
+        )
+    engine.adicionar_container("host1a", {"rede_roteador1": {"ip": "172.21.0.10", "gateway": "172.21.0.1"}})
+
+def testar_containers(engine: MotorDockerFalso, inventory: InventarioDocker) -> None:
+    """Check names, addresses and gateways."""
+    assert inventory.containers() == ["host1a", "roteador1", "roteador2"], inventory.containers()
+    assert inventory.containers("roteador") == ["roteador1", "roteador2"]
+    assert inventory.redes("roteador2")["rede_roteadores"] == {"ip": "172.20.0.3", "gateway": "172.20.0.1"}
+    assert inventory.ip("roteador2") == "172.21.1.2"
+    assert inventory.gateway("roteador2") == "172.21.1.1"
+    assert inventory.ip("host1a") == "172.21.0.10"
+    assert inventory.gateway("host1a") == "172.21.0.1"
+
+def testar_cache(engine: MotorDockerFalso, inventory: InventarioDocker) -> None:
+    """Check that lookups are served from memory until the inventory is invalidated."""
+    inventory.invalidar()
+    inventory.ambiente("roteador1")
+    requests = engine.requisicoes
+    for _ in range(10):
+        inventory.containers("roteador")
+        inventory.ip("roteador1")
+        inventory.gateway("roteador1")
+    assert engine.requisicoes == requests, f"{engine.requisicoes - requests} requisições com o cache válido"
+
+    engine.remover_container("roteador2")
+    assert inventory.containers("roteador") == ["roteador1", "roteador2"]
+    inventory.invalidar()
+    assert inventory.containers("roteador") == ["roteador1"]
+    assert engine.requisicoes > requests
+    preparar(engine)
+    inventory.invalidar()
+
+def testar_lote(engine: MotorDockerFalso, inventory: InventarioDocker) -> None:
+    """Check that batched commands keep their order and reuse one connection per worker."""
+    connections = engine.conexoes
+    jobs = [(f"roteador{1 + index % 2}", ["ping", "-c", "1", f"10.0.0.{index}"]) for index in range(40)]
+    results = inventory.executar_em_lote(jobs)
+    assert [stdout for _, stdout, _ in results] == [f"{container}: {' '.join(command)}\n"
+                                                    for container, command in jobs]
+    assert all(code == 0 for code, _, _ in results)
+    assert inventory.executar_em_lote([("roteador1", ["false"])]) == [(1, "", "roteador1: falhou\n")]
+    inventory.executar_em_lote(jobs)
+    assert engine.conexoes - connections <= WORKERS, f"{engine.conexoes - connections} conexões abertas"
+
+    try:
+        inventory.executar("roteador9", ["true"])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("exec num container inexistente não falhou")
+
+TESTES: List[Tuple[str, Callable[[MotorDockerFalso, InventarioDocker], None]]] = [
+    ("containers, IPs e gateways", testar_containers),
+    ("cache e invalidação", testar_cache),
+    ("executar_em_lote", testar_lote),
+]
+
+def teste_de_inventario() -> bool:
+    """
+    Run every check against a fresh fake engine.
+
+    Returns:
+        bool: True if every check passed
+    """
+    failed = []
+    with MotorDockerFalso(executor=executor_eco) as engine:
+        preparar(engine)
+        inventory = InventarioDocker(ClienteDocker(engine.socket_path), ttl=3600.0, workers=WORKERS)
+        for name, test in TESTES:
+            try:
+                test(engine, inventory)
+            except AssertionError as error:
+                print(Mensagem.formatar_erro(f"{name}: {error}"))
+                failed.append(name)
+            else:
+                print(Mensagem.formatar_sucesso(name))
+    return not failed
+
+if __name__ == "__main__":
+    passed = teste_de_inventario()
+    print("Teste do inventário concluído.")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,263 @@
+"""
+Fast Reroute Benchmark Module
+
+This module reports how many destinations are protected by loop-free
+alternates (LFA) and remote LFAs on synthetic topologies, and how long
+computing them takes per router: LFAs are computed with every route
+calculation, remote LFAs only for this report. Given a config.yaml, it also measures in
+network namespaces (root required, as done by netns_launcher) how long a
+router takes to move a destination to its backup next hop after a neighbor
+dies, with the precomputed backups and with plain SPF after detection.
+"""
+
+import argparse
+import contextlib
+import io
+import ipaddress
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Any
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+import restart_benchmark
+from class_net.manipulation import Manipulacao
+from class_net.route_manager import GerenciadorDeRotas
+from class_net.router_config import ConfiguracaoRoteador, VARIAVEIS_AMBIENTE
+import topologias
+
+def cobertura(lsdb: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Compute the protection of every (router, destination) pair of a topology.
+
+    Destinations that are neighbors of the router are left out, since they
+    are reached over a directly connected network.
+
+    Args:
+        lsdb: Converged LSDB of the topology
+
+    Returns:
+        Dict with the number of pairs, the share per protection type and the
+        mean times per router of the LFAs and of the remote LFA report
+    """
+    manager = GerenciadorDeRotas(lsdb)
+    counts = {'lfa_no': 0, 'lfa_enlace': 0, 'rlfa': 0, None: 0}
+    elapsed = 0.0
+    elapsed_remote = 0.0
+    for router_id in lsdb:
+        start = time.perf_counter()
+        manager.calcular_alternativas(router_id)
+        elapsed += time.perf_counter() - start
+        start = time.perf_counter()
+        alternatives = manager.calcular_alternativas_remotas(router_id)
+        elapsed_remote += time.perf_counter() - start
+        for destination, alternative in alternatives.items():
+            if destination != alternative['primario']:
+                counts[alternative['tipo']] += 1
+    total = sum(counts.values())
+    result = {kind: count / max(total, 1) for kind, count in counts.items()}
+    result['pares'] = total
+    result['tempo'] = elapsed / len(lsdb)
+    result['tempo_rlfa'] = elapsed_remote / len(lsdb)
+    return result
+
+def relatorio_cobertura(router_count: int) -> None:
+    """
+    Print the LFA coverage of every synthetic topology.
+
+    Args:
+        router_count: Number of routers per topology
+    """
+    print(f"Cobertura por topologia ({router_count} roteadores, custos iguais)\n")
+    print(f"{'Topologia':<10} {'Pares':>6} {'LFA nó (%)':>11} {'LFA enlace (%)':>15} {'rLFA (%)':>9} "
+          f"{'Sem reserva (%)':>16} {'LFA (ms)':>9} {'rLFA (ms)':>10}")
+    for name, build in topologias.TOPOLOGIAS.items():
+        result = cobertura(topologias.gerar_lsdb(router_count, build(router_count)))
+        print(f"{name:<10} {result['pares']:>6} {100 * result['lfa_no']:>11.1f} {100 * result['lfa_enlace']:>15.1f} "
+              f"{100 * result['rlfa']:>9.1f} {100 * result[None]:>16.1f} {1000 * result['tempo']:>9.2f} "
+              f"{1000 * result['tempo_rlfa']:>10.2f}",
+              flush=True)
+
+def iniciar_roteador(config: ConfiguracaoRoteador, log: Optional[List]) -> subprocess.Popen:
+    """
+    Start one router, optionally timestamping each line it prints.
+
+    Args:
+        config: Router configuration
+        log: List receiving (monotonic time, line) tuples, None to discard the output
+
+    Returns:
+        subprocess.Popen: Started process
+    """
+    environment = {key: value for key, value in os.environ.items() if key not in VARIAVEIS_AMBIENTE}
+    environment["PYTHONUNBUFFERED"] = "1"
+    process = subprocess.Popen(
+        ["ip", "netns", "exec", config.roteador_id, sys.executable, netns_launcher.MAIN_SCRIPT]
+        + config.para_argumentos(),
+        stdout=subprocess.PIPE if log is not None else subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL, text=True, env=environment
+    )
+
+    def read() -> None:
+        for line in process.stdout:
+            log.append((time.monotonic(), line))
+
+    if log is not None:
+        threading.Thread(target=read, daemon=True).start()
+    return process
+
+def observar_rota(namespace: str, subnet: str, gateway: str, changes: List[float]) -> subprocess.Popen:
+    """
+    Timestamp every kernel route event installing a subnet via a gateway.
+
+    Args:
+        namespace: Router namespace
+        subnet: Destination prefix watched
+        gateway: Gateway the prefix must point to
+        changes: List receiving monotonic times of the matching events
+
+    Returns:
+        subprocess.Popen: 'ip monitor' process, to be terminated by the caller
+    """
+    monitor = subprocess.Popen(["ip", "-n", namespace, "monitor", "route"],
+                               stdout=subprocess.PIPE, text=True)
+
+    def read() -> None:
+        for line in monitor.stdout:
+            fields = line.split()
+            if fields and fields[0] != "Deleted" and f"via {gateway} " in line and \
+                    ipaddress.ip_address(subnet.split('/')[0]) in ipaddress.ip_network(fields[0], strict=False):
+                changes.append(time.monotonic())
+
+    threading.Thread(target=read, daemon=True).start()
+    return monitor
+
+def lsdb_da_configuracao(configs: List[ConfiguracaoRoteador]) -> Dict[str, Any]:
+    """
+    Build the converged LSDB of the routers of a config.yaml.
+
+    Args:
+        configs: Router configurations
+
+    Returns:
+        Dict in the format used by GerenciadorDeRotas
+    """
+    return {
+        config.roteador_id: {
+            'id': config.roteador_id,
+            'ip': config.endereco_ip,
+            'vizinhos': {neighbor: {'ip': data[0], 'custo': data[1]} for neighbor, data in config.vizinhos.items()},
+            'seq': 1
+        }
+        for config in configs
+    }
+
+def medir_comutacao(network_config: Dict[str, Any], source_id: str, use_lfa: bool, interval: float,
+                    repetitions: int, timeout: float) -> Dict[str, List[float]]:
+    """
+    Kill the primary next hop of a protected destination and time the switch.
+
+    Args:
+        network_config: Parsed config.yaml
+        source_id: Router whose FIB is observed
+        use_lfa: Whether backups are precomputed
+        interval: BFD interval in seconds
+        repetitions: Number of failures
+        timeout: Seconds to wait for convergence
+
+    Returns:
+        Dict with the times from the kill and from detection to the new route
+    """
+    configs = netns_launcher.configuracoes_roteadores(network_config)
+    for config in configs:
+        config.bfd_intervalo = interval
+        config.lfa = use_lfa
+    by_id = {config.roteador_id: config for config in configs}
+
+    lsdb = lsdb_da_configuracao(configs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        alternatives = GerenciadorDeRotas(lsdb).calcular_alternativas(source_id)
+    protected = [(destination, alternative) for destination, alternative in sorted(alternatives.items())
+                 if alternative['tipo'] in ('lfa_no', 'lfa_enlace') and destination != alternative['primario']]
+    if not protected:
+        raise RuntimeError(f"{source_id} não tem destinos protegidos por LFA")
+    destination, alternative = protected[0]
+    subnet = Manipulacao.extrair_subnet_roteador_ip(by_id[destination].endereco_ip)
+    backup_gateway = Manipulacao.extrair_ip_roteadores_ip(by_id[alternative['reserva']].endereco_ip)
+    failed = alternative['primario']
+
+    results = {'desde a falha': [], 'desde a detecção': []}
+    netns_launcher.remover_topologia(network_config)
+    netns_launcher.criar_topologia(network_config)
+    log: List = []
+    processes = {config.roteador_id: iniciar_roteador(config, log if config.roteador_id == source_id else None)
+                 for config in configs}
+    try:
+        for _ in range(repetitions):
+            start = time.monotonic()
+            while restart_benchmark.encaminhamento(source_id, [subnet])[subnet] in (None, backup_gateway):
+                if time.monotonic() - start > timeout:
+                    raise RuntimeError("a rede não convergiu")
+                time.sleep(0.2)
+            time.sleep(1.0)
+
+            changes: List[float] = []
+            monitor = observar_rota(source_id, subnet, backup_gateway, changes)
+            time.sleep(0.2)
+            log.clear()
+            killed_at = time.monotonic()
+            processes[failed].kill()
+            processes[failed].wait()
+            while not changes and time.monotonic() - killed_at < timeout:
+                time.sleep(0.005)
+            monitor.terminate()
+            detected = [moment for moment, line in list(log) if f"Sessão BFD com {failed}: Down" in line]
+            if changes:
+                results['desde a falha'].append(changes[0] - killed_at)
+                if detected:
+                    results['desde a detecção'].append(changes[0] - detected[0])
+            processes[failed] = iniciar_roteador(by_id[failed], None)
+    finally:
+        for process in processes.values():
+            process.kill()
+        netns_launcher.remover_topologia(network_config)
+    print(f"  {source_id} → {destination} ({subnet}): primário {failed}, reserva {alternative['reserva']}")
+    return results
+
+def main() -> None:
+    """Print LFA coverage and, with a config.yaml, failover latency with and without LFA."""
+    parser = argparse.ArgumentParser(description="Cobertura de LFA e latência da troca para a rota de reserva")
+    parser.add_argument("config", nargs="?", help="config.yaml para medir a comutação em namespaces")
+    parser.add_argument("--roteadores", type=int, default=50, help="Roteadores por topologia sintética")
+    parser.add_argument("--roteador", help="Roteador observado, o primeiro do arquivo por padrão")
+    parser.add_argument("--bfd", type=float, default=0.03, help="Intervalo BFD em segundos")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Falhas por modo")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Segundos máximos por etapa")
+    args = parser.parse_args()
+
+    relatorio_cobertura(args.roteadores)
+    if not args.config:
+        return
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    source_id = args.roteador or network_config['routers'][0]['id']
+    print(f"\nComutação após a falha do próximo salto (BFD {args.bfd * 1000:.0f} ms)\n")
+    for use_lfa in (False, True):
+        try:
+            results = medir_comutacao(network_config, source_id, use_lfa, args.bfd, args.repeticoes, args.timeout)
+        except RuntimeError as error:
+            print(f"  {error}")
+            return
+        mode = "LFA pré-calculado" if use_lfa else "SPF após detecção"
+        for phase, samples in results.items():
+            samples_ms = [1000 * sample for sample in samples]
+            median = statistics.median(samples_ms) if samples_ms else float("nan")
+            worst = max(samples_ms) if samples_ms else float("nan")
+            print(f"  {mode:<18} {phase:<17} mediana {median:>7.1f} ms  máximo {worst:>7.1f} ms", flush=True)
+
+if __name__ == "__main__":
+    main()
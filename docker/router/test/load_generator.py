@@ -0,0 +1,331 @@
+"""
+Load Generator Module
+
+This module stresses the LSA ingest of a single router by impersonating a
+network of thousands of virtual routers behind one attachment router,
+virtual0, which lists the measured router as its neighbor. Their LSAs have
+the same format and field order as the ones routers originate, and are sent
+to the router's LSA_PORT at a controlled rate: first the whole virtual
+network, as when it comes up, then churn following one of PADROES:
+
+- refresco: every virtual router re-originates its LSA in turn, unchanged
+- custos: a random link changes cost, updating the LSAs of both ends
+- oscilacao: random links go down and come back up, both ends each time
+
+Everything measured comes from the router's 'estatisticas' answer: the
+accepted rate (LSAs installed), the drop rate (datagrams sent and never
+read from the socket), the duplicates dropped by the pre-filter, the time
+until the LSDB holds the whole virtual network and routes were calculated
+for it (convergence), and the time from the last LSA sent until route
+calculation caught up with the LSDB generation (SPF lag).
+
+The router can be one already running, in a container or a lab namespace
+(--alvo), or one this module starts locally (--local) as a child process,
+at 127.0.0.1 with virtual0 as its only neighbor at 127.0.0.2, the address
+the LSAs are sent from, and route commands disabled. Only for a router that
+lists the sender as a neighbor, as the local one does, do the virtual
+routers get routes.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shlex
+import socket
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.flooding_pacer import consultar_estatisticas
+from class_net.lsa_manager import LSA_PORT
+import topologias
+
+PADROES = ("refresco", "custos", "oscilacao")
+CUSTO_PADRAO = 10
+ID_LOCAL = "alvo"
+IP_LOCAL = "127.0.0.1"
+IP_GERADOR_LOCAL = "127.0.0.2"
+INTERVALO_CONSULTA = 0.1
+
+def codificar_json(lsa: Dict[str, Any]) -> bytes:
+    """Encode an LSA as the routers do."""
+    return json.dumps(lsa).encode()
+
+FORMATOS: Dict[str, Callable[[Dict[str, Any]], bytes]] = {"json": codificar_json}
+
+def nome_virtual(index: int) -> str:
+    """Return the router ID of a zero-based virtual router index."""
+    return f"virtual{index}"
+
+def ip_virtual(index: int) -> str:
+    """Return the address of a zero-based virtual router index, one /24 per router."""
+    return f"10.{200 + index // 256}.{index % 256}.1"
+
+class RedeVirtual:
+    """
+    Random topology of virtual routers attached to the measured router.
+
+    Attributes:
+        roteadores (List[str]): Virtual router IDs
+        enderecos (Dict[str, str]): Address of every virtual router
+        enlaces (Dict[str, Dict[str, int]]): Cost of every link up, per router
+        sequencias (Dict[str, int]): Last sequence number of every virtual router
+        arestas (List[Tuple[str, str]]): Links between virtual routers
+        desligados (Dict[Tuple[str, str], int]): Links down, with their cost
+        alvo (Tuple[str, str]): ID and address of the measured router
+    """
+
+    def __init__(self, count: int, target: Tuple[str, str], attachment_ip: str, seed: int = 42):
+        """
+        Build the virtual network.
+
+        Args:
+            count: Number of virtual routers
+            target: ID and address of the measured router, neighbor of virtual0
+            attachment_ip: Address of virtual0, the one the LSAs are sent from
+            seed: Random seed for the topology and the churn
+        """
+        self.roteadores = [nome_virtual(index) for index in range(count)]
+        self.enderecos = {router_id: ip_virtual(index) for index, router_id in enumerate(self.roteadores)}
+        self.enderecos[self.roteadores[0]] = attachment_ip
+        self.enlaces: Dict[str, Dict[str, int]] = {router_id: {} for router_id in self.roteadores}
+        self.arestas = [(self.roteadores[a], self.roteadores[b]) for a, b in topologias.aleatoria(count, seed=seed)]
+        for a, b in self.arestas:
+            self.enlaces[a][b] = self.enlaces[b][a] = CUSTO_PADRAO
+        self.sequencias = {router_id: 1 for router_id in self.roteadores}
+        self.desligados: Dict[Tuple[str, str], int] = {}
+        self.alvo = target
+        self._gerador = random.Random(seed)
+        self._proximo = 0
+
+    def lsa(self, router_id: str) -> Dict[str, Any]:
+        """
+        Build the current LSA of a virtual router, in the format of LSAManager.criar_lsa.
+
+        Args:
+            router_id: Virtual router ID
+
+        Returns:
+            Dict with the LSA fields
+        """
+        neighbors = {neighbor: {"ip": self.enderecos[neighbor], "custo": cost}
+                     for neighbor, cost in self.enlaces[router_id].items()}
+        if router_id == self.roteadores[0]:
+            neighbors[self.alvo[0]] = {"ip": self.alvo[1], "custo": CUSTO_PADRAO}
+        return {"id": router_id, "seq": self.sequencias[router_id], "ip": self.enderecos[router_id],
+                "vizinhos": neighbors}
+
+    def alterar(self, pattern: str) -> List[str]:
+        """
+        Apply one churn event and return the routers whose LSA it changed.
+
+        Args:
+            pattern: One of PADROES
+
+        Returns:
+            IDs of the virtual routers to re-originate, with their sequence numbers raised
+        """
+        if pattern == "refresco":
+            changed = [self.roteadores[self._proximo]]
+            self._proximo = (self._proximo + 1) % len(self.roteadores)
+        elif pattern == "custos" or not self.desligados:
+            a, b = self._gerador.choice([edge for edge in self.arestas if edge not in self.desligados])
+            if pattern == "custos":
+                self.enlaces[a][b] = self.enlaces[b][a] = self._gerador.randint(1, 100)
+            else:
+                self.desligados[(a, b)] = self.enlaces[a].pop(b)
+                del self.enlaces[b][a]
+            changed = [a, b]
+        elif self._gerador.random() < 0.5:
+            edge = self._gerador.choice(list(self.desligados))
+            a, b = edge
+            self.enlaces[a][b] = self.enlaces[b][a] = self.desligados.pop(edge)
+            changed = [a, b]
+        else:
+            return self.alterar("custos" if len(self.desligados) == len(self.arestas) else pattern)
+        for router_id in changed:
+            self.sequencias[router_id] += 1
+        return changed
+
+    def inicial(self, encode: Callable[[Dict[str, Any]], bytes]) -> Iterator[bytes]:
+        """Yield the encoded LSA of every virtual router once."""
+        for router_id in self.roteadores:
+            yield encode(self.lsa(router_id))
+
+    def churn(self, pattern: str, encode: Callable[[Dict[str, Any]], bytes]) -> Iterator[bytes]:
+        """Yield encoded LSAs of churn events following a pattern, without end."""
+        while True:
+            for router_id in self.alterar(pattern):
+                yield encode(self.lsa(router_id))
+
+def enviar(sender: socket.socket, destination: Tuple[str, int], datagrams: Iterator[bytes], rate: float,
+           duration: Optional[float] = None) -> int:
+    """
+    Send datagrams at a steady rate until they end or the duration elapses.
+
+    Args:
+        sender: Socket the datagrams are sent from
+        destination: Router address and port
+        datagrams: Datagrams to send
+        rate: Datagrams per second
+        duration: Seconds to send for, None to send every datagram
+
+    Returns:
+        int: Datagrams sent
+    """
+    sent = 0
+    start = time.perf_counter()
+    while duration is None or time.perf_counter() - start < duration:
+        for _ in range(int((time.perf_counter() - start) * rate) - sent):
+            data = next(datagrams, None)
+            if data is None:
+                return sent
+            try:
+                sender.sendto(data, destination)
+            except OSError:
+                pass
+            sent += 1
+        time.sleep(0.001)
+    return sent
+
+def estatisticas(ip: str, timeout: float = 5.0) -> Dict[str, Any]:
+    """
+    Read the statistics of the measured router.
+
+    Raises:
+        RuntimeError: When it does not answer
+    """
+    statistics = consultar_estatisticas(ip, LSA_PORT, timeout)
+    if statistics is None:
+        raise RuntimeError(f"{ip} não respondeu")
+    if statistics.get("rotas") is None:
+        raise RuntimeError(f"{ip} não informa o estado das rotas")
+    return statistics
+
+def esperar_rotas(ip: str, lsdb_size: int, timeout: float) -> Optional[float]:
+    """
+    Wait until the router's LSDB holds some LSAs and routes were calculated for its current generation.
+
+    Args:
+        ip: Router address
+        lsdb_size: LSAs the LSDB must hold
+        timeout: Seconds to wait at most
+
+    Returns:
+        Seconds waited, or None on timeout
+    """
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < timeout:
+        routes = estatisticas(ip, timeout - elapsed)["rotas"]
+        if routes["lsdb"] >= lsdb_size and routes["geracao_calculada"] == routes["geracao"]:
+            return time.perf_counter() - start
+        time.sleep(INTERVALO_CONSULTA)
+    return None
+
+def roteador_local(arguments: List[str]) -> None:
+    """
+    Run the local router, with route commands disabled and its output discarded.
+
+    Args:
+        arguments: Extra router command line arguments
+    """
+    # Imported here so that only the child process loads the router
+    from class_net.router import RoteadorApp
+    from class_net.router_config import ConfiguracaoRoteador
+
+    sys.stdout = open(os.devnull, "w")
+    config = ConfiguracaoRoteador.de_argumentos([
+        "--id", ID_LOCAL, "--ip", IP_LOCAL, "--sem-troca-de-base",
+        "--vizinhos", json.dumps({nome_virtual(0): [IP_GERADOR_LOCAL, CUSTO_PADRAO]}),
+    ] + arguments)
+    application = RoteadorApp(config)
+    application.rota_manager._executar = lambda route_command: True
+    application.rota_manager._executar_lote = lambda commands: True
+    application.iniciar_threads()
+
+def endereco_de_origem(ip: str) -> str:
+    """Return the local address datagrams to a router leave from."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.connect((ip, LSA_PORT))
+        return probe.getsockname()[0]
+
+def main() -> None:
+    """Bring the virtual network up on the router, apply churn at every rate and print what it absorbed."""
+    parser = argparse.ArgumentParser(description="Gerador de carga de LSAs sintéticos para um roteador")
+    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument("--alvo", help="Endereço de um roteador já em execução")
+    target_group.add_argument("--local", action="store_true", help="Inicia um roteador local em 127.0.0.1")
+    parser.add_argument("--roteador", default="",
+                        help="Argumentos extras do roteador local, como --roteador='--spf-processo'")
+    parser.add_argument("--roteadores", type=int, default=1000, help="Roteadores virtuais")
+    parser.add_argument("--padrao", choices=PADROES, default="custos", help="Padrão de mudanças")
+    parser.add_argument("--formato", choices=sorted(FORMATOS), default="json", help="Codificação dos LSAs")
+    parser.add_argument("--taxa-inicial", type=float, default=2000.0, help="LSAs por segundo ao subir a rede virtual")
+    parser.add_argument("--taxas", type=float, nargs="+", default=[500, 1000, 2000, 4000],
+                        help="LSAs por segundo de mudanças")
+    parser.add_argument("--duracao", type=float, default=5.0, help="Segundos de mudanças por taxa")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Segundos máximos de espera pelas rotas")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    router_process = None
+    target_ip = args.alvo or IP_LOCAL
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        if args.local:
+            # Not a daemon, so that the router can start its own SPF worker process
+            router_process = multiprocessing.get_context("spawn").Process(
+                target=roteador_local, args=(shlex.split(args.roteador),)
+            )
+            router_process.start()
+            sender.bind((IP_GERADOR_LOCAL, 0))
+        source_ip = IP_GERADOR_LOCAL if args.local else endereco_de_origem(target_ip)
+        destination = (target_ip, LSA_PORT)
+        encode = FORMATOS[args.formato]
+
+        before = estatisticas(target_ip, args.timeout)
+        network = RedeVirtual(args.roteadores, (before["id"], target_ip), source_ip, args.seed)
+        start = time.perf_counter()
+        sent = enviar(sender, destination, network.inicial(encode), args.taxa_inicial)
+        sending = time.perf_counter() - start
+        convergence = esperar_rotas(target_ip, before["rotas"]["lsdb"] + args.roteadores, args.timeout)
+        after = estatisticas(target_ip)
+        print(f"Roteador {before['id']} em {target_ip}, {args.roteadores} roteadores virtuais, "
+              f"LSAs em {args.formato}\n")
+        if convergence is None:
+            print(f"A LSDB não convergiu em {args.timeout:.0f} s")
+            return
+        print(f"Subida: {sent} LSAs em {sending:.2f} s, LSDB e rotas completas {convergence:.2f} s após o "
+              f"último, {max(0, sent - (after['datagramas_recebidos'] - before['datagramas_recebidos']))} "
+              f"descartados\n")
+
+        churn = network.churn(args.padrao, encode)
+        print(f"Mudanças: {args.padrao}, {args.duracao:.0f} s por taxa\n")
+        print(f"{'Oferecidos (/s)':>16} {'Aceitos (/s)':>13} {'Descartados (%)':>16} {'Duplicados':>11} "
+              f"{'Atraso do SPF (s)':>18} {'Recálculos':>11}")
+        for rate in args.taxas:
+            before = estatisticas(target_ip)
+            sent = enviar(sender, destination, churn, rate, args.duracao)
+            lag = esperar_rotas(target_ip, 0, args.timeout)
+            after = estatisticas(target_ip)
+            received = after["datagramas_recebidos"] - before["datagramas_recebidos"]
+            elapsed = args.duracao + (lag if lag is not None else args.timeout)
+            print(f"{sent / args.duracao:>16.0f} "
+                  f"{(after['lsas_instalados'] - before['lsas_instalados']) / elapsed:>13.0f} "
+                  f"{100 * max(0, sent - received) / sent:>16.1f} "
+                  f"{after['duplicados_filtrados'] - before['duplicados_filtrados']:>11} "
+                  f"{lag if lag is not None else float('inf'):>18.2f} "
+                  f"{after['rotas']['recalculos'] - before['rotas']['recalculos']:>11}")
+        print("\nAceitos: LSAs instalados até as rotas alcançarem a LSDB; descartados: datagramas enviados "
+              "e não lidos do socket; atraso do SPF: do último LSA enviado até as rotas alcançarem a LSDB")
+    finally:
+        sender.close()
+        if router_process is not None:
+            router_process.terminate()
+            router_process.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Pacing Benchmark Module
+
+This module compares flooding each LSA at once with flooding through the
+pacer, which bundles the LSAs queued for a neighbor into packed updates and
+limits the datagrams per second each neighbor receives, on the same
+namespace lab as netns_launcher, so it needs root. For each mode it counts
+the UDP datagrams sent and the ones dropped for lack of receive buffer
+(/proc/net/snmp of every namespace) while all routers come up at once, which
+floods every LSA together, and over a steady window afterwards. The busiest
+router's pacer statistics are read from its statistics endpoint.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+from class_net.router_config import ConfiguracaoRoteador
+from controller_benchmark import esperar
+from flooding_benchmark import contadores_udp
+from restart_benchmark import encaminhamento, iniciar_roteador
+
+def somar(counters: Dict[str, Dict[str, int]], before: Dict[str, Dict[str, int]], name: str) -> int:
+    """
+    Sum the increase of one UDP counter over every router.
+
+    Args:
+        counters: Counters per router at the end
+        before: Counters per router at the start
+        name: Counter name, such as 'OutDatagrams'
+
+    Returns:
+        int: Total increase
+    """
+    return sum(counters[router][name] - before[router][name] for router in counters)
+
+def estatisticas(router_id: str, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    """
+    Read a router's flooding statistics from inside its namespace.
+
+    Args:
+        router_id: Router namespace
+        timeout: Seconds to wait for the answer
+
+    Returns:
+        Dict answered by the router, or None if it did not answer
+    """
+    result = subprocess.run(["ip", "netns", "exec", router_id, sys.executable, "-m", "class_net.flooding_pacer",
+                             "--timeout", str(timeout)],
+                            cwd=os.path.dirname(netns_launcher.MAIN_SCRIPT), capture_output=True, text=True)
+    return json.loads(result.stdout) if result.returncode == 0 else None
+
+def medir_modo(network_config: Dict[str, Any], configs: List[ConfiguracaoRoteador], hub: str,
+               args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Bring up the lab in one mode and measure its datagrams.
+
+    Args:
+        network_config: Parsed config.yaml
+        configs: Router configurations, with the mode already set
+        hub: Router whose pacer statistics are read
+        args: Command line arguments
+
+    Returns:
+        Dict with 'convergencia' (s), 'subida' and 'erros_subida' (datagrams sent and
+        dropped while coming up), 'regime' (datagrams/s) and 'ritmo' (hub statistics)
+    """
+    subnets = [network['subnet'] for network in network_config['networks']]
+    netns_launcher.remover_topologia(network_config)
+    netns_launcher.criar_topologia(network_config)
+    processes = []
+    try:
+        before = {config.roteador_id: contadores_udp(config.roteador_id) for config in configs}
+        processes = [iniciar_roteador(config) for config in configs]
+        converged = esperar(lambda: all(None not in encaminhamento(config.roteador_id, subnets).values()
+                                        for config in configs), args.timeout)
+        if converged is None:
+            raise RuntimeError("a rede não convergiu")
+        after = {config.roteador_id: contadores_udp(config.roteador_id) for config in configs}
+        time.sleep(2.0)
+
+        steady_before = {config.roteador_id: contadores_udp(config.roteador_id) for config in configs}
+        start = time.perf_counter()
+        time.sleep(args.janela)
+        steady_after = {config.roteador_id: contadores_udp(config.roteador_id) for config in configs}
+        elapsed = time.perf_counter() - start
+        return {
+            "convergencia": converged,
+            "subida": somar(after, before, "OutDatagrams"),
+            "erros_subida": somar(after, before, "RcvbufErrors"),
+            "regime": somar(steady_after, steady_before, "OutDatagrams") / elapsed,
+            "ritmo": estatisticas(hub),
+        }
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        netns_launcher.remover_topologia(network_config)
+
+def main() -> None:
+    """Run both modes on the same lab and print their datagram counts."""
+    parser = argparse.ArgumentParser(description="Inundação imediata versus ritmada e agrupada")
+    parser.add_argument("config", help="Caminho para o config.yaml")
+    parser.add_argument("--taxa", type=float, default=20.0, help="Datagramas por segundo para cada vizinho")
+    parser.add_argument("--rajada", type=float, default=10.0, help="Datagramas em sequência para cada vizinho")
+    parser.add_argument("--janela", type=float, default=10.0, help="Segundos de medição em regime")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Segundos máximos até convergir")
+    args = parser.parse_args()
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    hub = max(network_config['routers'], key=lambda router: len(router['neighbors']))['id']
+    results = {}
+    for mode in ("imediato", "ritmado"):
+        configs = netns_launcher.configuracoes_roteadores(network_config)
+        for config in configs:
+            config.taxa_inundacao = args.taxa if mode == "ritmado" else None
+            config.rajada_inundacao = args.rajada
+        results[mode] = medir_modo(network_config, configs, hub, args)
+
+    print(f"Roteadores: {len(network_config['routers'])}, ritmo de {args.taxa:.0f} datagramas/s "
+          f"com rajada de {args.rajada:.0f} por vizinho\n")
+    print(f"{'Modo':<10} {'Convergência (s)':>17} {'Datagramas na subida':>21} {'Descartados':>12} "
+          f"{'Regime (/s)':>12}")
+    for mode, result in results.items():
+        print(f"{mode:<10} {result['convergencia']:>17.2f} {result['subida']:>21} "
+              f"{result['erros_subida']:>12} {result['regime']:>12.1f}")
+
+    pacing = results["ritmado"]["ritmo"]
+    if pacing and pacing["ritmo"]:
+        stats = pacing["ritmo"]
+        print(f"\nRitmo em {hub}: {stats['lsas_enviados']} LSAs em {stats['datagramas']} datagramas "
+              f"({stats['lsas_enviados'] / max(stats['datagramas'], 1):.1f} por datagrama), "
+              f"fila máxima de {stats['profundidade_maxima']}, {stats['substituidos']} substituídos "
+              f"e {stats['descartes']} descartados")
+    print("\nDescartados: datagramas UDP perdidos por falta de buffer de recepção, somados de todos os roteadores")
+
+if __name__ == "__main__":
+    main()
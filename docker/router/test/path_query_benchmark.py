@@ -0,0 +1,108 @@
+"""
+Point-to-Point Query Benchmark Module
+
+This module measures the latency of source-destination path queries on
+synthetic topologies of up to tens of thousands of routers: a full SPF tree
+from the source (what calcular_caminho needs, after calcular_todas_rotas has
+run one per router), bidirectional Dijkstra and A* with ALT landmarks,
+whose precomputation is reported apart. Costs are checked to agree.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.lsa_database import BancoLSA
+from class_net.route_manager import GerenciadorDeRotas
+import topologias
+
+def custo_pela_arvore(manager: GerenciadorDeRotas, source: str, destination: str) -> int:
+    """
+    Answer a query with a full SPF tree from the source.
+
+    Args:
+        manager: Route manager holding the LSDB
+        source: Source router ID
+        destination: Destination router ID
+
+    Returns:
+        int: Path cost
+    """
+    manager._sincronizar_grafo()
+    manager.grafo.arvore_valida = False
+    manager.grafo.primeiros_saltos(source)
+    return manager.grafo._distancias[manager.grafo.indices[destination]]
+
+def latencias(query: Callable[[str, str], Any], pairs: List[Tuple[str, str]]) -> Tuple[List[float], List[Any]]:
+    """
+    Run a query over every pair, timing each call.
+
+    Args:
+        query: Function answering a (source, destination) query
+        pairs: Query pairs
+
+    Returns:
+        Tuple with (seconds per query, answers)
+    """
+    samples, answers = [], []
+    for source, destination in pairs:
+        start = time.perf_counter()
+        answers.append(query(source, destination))
+        samples.append(time.perf_counter() - start)
+    return samples, answers
+
+def percentil(samples: List[float], fraction: float) -> float:
+    """Return a percentile of some samples."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def main() -> None:
+    """Print query latency per method, topology and size."""
+    parser = argparse.ArgumentParser(description="Latência de consultas de caminho ponto a ponto")
+    parser.add_argument("--roteadores", type=int, nargs="+", default=[1000, 10000], help="Tamanhos das topologias")
+    parser.add_argument("--consultas", type=int, default=50, help="Consultas por medida")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    print(f"{'Topologia':<10} {'Roteadores':>10} {'Método':<15} {'Mediana (ms)':>13} {'p95 (ms)':>9} {'Preparo (ms)':>13}")
+    for size in args.roteadores:
+        for name in ("aleatoria", "grade"):
+            lsdb = topologias.gerar_lsdb(size, topologias.TOPOLOGIAS[name](size))
+            for router in lsdb.values():
+                for link in router['vizinhos'].values():
+                    link['custo'] = generator.randint(1, 20)
+            for router_id, router in lsdb.items():
+                for neighbor, link in router['vizinhos'].items():
+                    link['custo'] = lsdb[neighbor]['vizinhos'][router_id]['custo'] = max(
+                        link['custo'], lsdb[neighbor]['vizinhos'][router_id]['custo'])
+            manager = GerenciadorDeRotas(BancoLSA(lsdb))
+            routers = sorted(lsdb)
+            pairs = [(generator.choice(routers), generator.choice(routers)) for _ in range(args.consultas)]
+
+            manager.consultar_caminho(*pairs[0])
+            start = time.perf_counter()
+            manager.grafo.marcos()
+            preparation = time.perf_counter() - start
+
+            methods: Dict[str, Tuple[Callable[[str, str], Any], float]] = {
+                "árvore SPF": (lambda s, t: custo_pela_arvore(manager, s, t), 0.0),
+                "bidirecional": (lambda s, t: manager.consultar_caminho(s, t)[0], 0.0),
+                "A* com marcos": (lambda s, t: manager.consultar_caminho(s, t, landmarks=True)[0], preparation),
+            }
+            costs = None
+            for method, (query, setup) in methods.items():
+                samples, answers = latencias(query, pairs)
+                if costs is not None and answers != costs:
+                    print(f"Custos divergentes em {method}!")
+                costs = answers
+                print(f"{name:<10} {size:>10} {method:<15} {1000 * statistics.median(samples):>13.2f} "
+                      f"{1000 * percentil(samples, 0.95):>9.2f} {1000 * setup:>13.0f}", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""
+Network Path Verification Module
+
+This module collects the routing table of every router in the running lab and
+checks the resulting hop-by-hop forwarding against a shortest path computation
+made centrally from config.yaml. Loops, blackholes, suboptimal and asymmetric
+paths are detected for all router pairs at once using NumPy matrices.
+"""
+
+import ipaddress
+import sys
+import os
+import yaml
+import numpy as np
+from typing import Dict, List, Tuple, Any, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.docker_inventory import InventarioDocker
+from class_net.manipulation import Manipulacao
+from class_net.message import Mensagem
+from class_net.route_manager import GerenciadorDeRotas
+
+SEM_ROTA = -1
+
+STATUS_OK = 0
+STATUS_BURACO_NEGRO = 1
+STATUS_LACO = 2
+STATUS_SUBOTIMO = 3
+STATUS_INALCANCAVEL = 4
+
+DESCRICAO_STATUS = {
+    STATUS_BURACO_NEGRO: "buraco negro",
+    STATUS_LACO: "laço",
+    STATUS_SUBOTIMO: "caminho subótimo",
+    STATUS_INALCANCAVEL: "destino inalcançável na topologia",
+}
+
+def ler_configuracao(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read the network configuration generated by yaml_generator.
+
+    Args:
+        config_path: Optional path to config.yaml
+
+    Returns:
+        Dict containing the parsed configuration
+    """
+    if config_path is None:
+        config_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
+            'generate_compose',
+            'config.yaml'
+        )
+
+    with open(config_path, 'r') as config_file:
+        return yaml.safe_load(config_file)
+
+def construir_lsdb(network_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build an LSDB equivalent to the one the routers converge to.
+
+    Args:
+        network_config: Parsed config.yaml
+
+    Returns:
+        Dict in the same format used by GerenciadorDeRotas
+    """
+    router_ips = {router['id']: router['ip'] for router in network_config['routers']}
+    return {
+        router['id']: {
+            'id': router['id'],
+            'ip': router['ip'],
+            'vizinhos': {
+                neighbor['id']: {'ip': router_ips[neighbor['id']], 'custo': neighbor['cost']}
+                for neighbor in router['neighbors']
+            },
+            'seq': 0
+        }
+        for router in network_config['routers']
+    }
+
+def mapear_enderecos(network_config: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Map interface addresses and announced subnets to router IDs.
+
+    Args:
+        network_config: Parsed config.yaml
+
+    Returns:
+        Tuple with (interface IP -> router ID, subnet -> router ID)
+    """
+    interface_owner = {}
+    subnet_owner = {}
+    for router in network_config['routers']:
+        for network in router['networks']:
+            interface_owner[network['ip']] = router['id']
+        subnet_owner[Manipulacao.extrair_subnet_roteador_ip(router['ip'])] = router['id']
+    return interface_owner, subnet_owner
+
+def interpretar_tabela(source_router: str, ip_route_output: str,
+                       interface_owner: Dict[str, str],
+                       subnet_owner: Dict[str, str]) -> Dict[str, str]:
+    """
+    Convert 'ip route' output into a tabela_de_rotas style entry.
+
+    Directly connected subnets map the destination to itself as next hop.
+
+    Args:
+        source_router: Router the table was collected from
+        ip_route_output: Raw output of 'ip route'
+        interface_owner: Interface IP to router ID mapping
+        subnet_owner: Subnet to router ID mapping
+
+    Returns:
+        Dict mapping destination routers to next hop routers
+    """
+    routing_table = {}
+    matched_prefix = {}
+    for line in Manipulacao.extrair_linhas(ip_route_output):
+        fields = line.split()
+        if not fields or fields[0] == 'default':
+            continue
+        try:
+            network = ipaddress.ip_network(fields[0], strict=False)
+        except ValueError:
+            continue
+
+        if 'via' in fields:
+            next_hop = interface_owner.get(fields[fields.index('via') + 1])
+            if next_hop is None:
+                continue
+        else:
+            next_hop = None
+
+        if str(network) in subnet_owner:
+            covered = [subnet_owner[str(network)]]
+        else:
+            covered = [owner for prefix, owner in subnet_owner.items()
+                       if ipaddress.ip_network(prefix).subnet_of(network)]
+
+        for destination in covered:
+            # Longest prefix match: a more specific route always wins
+            if destination == source_router or matched_prefix.get(destination, -1) > network.prefixlen:
+                continue
+            matched_prefix[destination] = network.prefixlen
+            routing_table[destination] = next_hop or destination
+    return routing_table
+
+def coletar_tabelas(router_list: List[str], interface_owner: Dict[str, str],
+                    subnet_owner: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """
+    Collect the kernel routing table of every router container.
+
+    Args:
+        router_list: Router container names
+        interface_owner: Interface IP to router ID mapping
+        subnet_owner: Subnet to router ID mapping
+
+    Returns:
+        Dict in tabela_de_rotas format for the whole network
+    """
+    routing_tables = {}
+    command_results = InventarioDocker.compartilhado().executar_em_lote(
+        [(source_router, ["ip", "route"]) for source_router in router_list]
+    )
+    for source_router, (exit_code, stdout, _) in zip(router_list, command_results):
+        if exit_code != 0:
+            print(Mensagem.formatar_erro(f"{source_router} falhou."))
+            routing_tables[source_router] = {}
+            continue
+        routing_tables[source_router] = interpretar_tabela(
+            source_router, stdout, interface_owner, subnet_owner
+        )
+    return routing_tables
+
+def matriz_de_custos(router_ids: List[str], lsdb: Dict[str, Any]) -> np.ndarray:
+    """
+    Build the link cost matrix, with infinity where no link exists.
+
+    Args:
+        router_ids: Ordered router IDs defining matrix indexes
+        lsdb: Link State Database built from the configuration
+
+    Returns:
+        np.ndarray: Square matrix of link costs
+    """
+    index = {router_id: i for i, router_id in enumerate(router_ids)}
+    cost_matrix = np.full((len(router_ids), len(router_ids)), np.inf)
+    np.fill_diagonal(cost_matrix, 0.0)
+    for router_id, router_data in lsdb.items():
+        for neighbor_id, info in router_data['vizinhos'].items():
+            if neighbor_id in index:
+                cost_matrix[index[router_id], index[neighbor_id]] = info['custo']
+    return cost_matrix
+
+def menores_distancias(cost_matrix: np.ndarray) -> np.ndarray:
+    """
+    Compute all-pairs shortest path costs with a vectorised Floyd-Warshall.
+
+    Args:
+        cost_matrix: Link cost matrix
+
+    Returns:
+        np.ndarray: Matrix of shortest path costs
+    """
+    distances = cost_matrix.copy()
+    for k in range(len(distances)):
+        np.minimum(distances, distances[:, k, None] + distances[None, k, :], out=distances)
+    return distances
+
+def matriz_de_proximos_saltos(router_ids: List[str],
+                              routing_tables: Dict[str, Dict[str, str]]) -> np.ndarray:
+    """
+    Convert tabela_de_rotas data into a next hop index matrix.
+
+    Args:
+        router_ids: Ordered router IDs defining matrix indexes
+        routing_tables: Collected tables in tabela_de_rotas format
+
+    Returns:
+        np.ndarray: Matrix where [i, j] is the next hop index from i towards j
+    """
+    index = {router_id: i for i, router_id in enumerate(router_ids)}
+    next_hops = np.full((len(router_ids), len(router_ids)), SEM_ROTA, dtype=np.int32)
+    np.fill_diagonal(next_hops, np.arange(len(router_ids)))
+    for source, table in routing_tables.items():
+        if source not in index:
+            continue
+        for destination, next_hop in table.items():
+            if destination in index and next_hop in index:
+                next_hops[index[source], index[destination]] = index[next_hop]
+    return next_hops
+
+def percorrer_caminhos(next_hops: np.ndarray,
+                       cost_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Walk every source/destination pair through the forwarding tables at once.
+
+    Args:
+        next_hops: Next hop index matrix
+        cost_matrix: Link cost matrix
+
+    Returns:
+        Tuple with (delivered mask, blackhole mask, path cost, hop count)
+    """
+    node_count = len(next_hops)
+    destination = np.broadcast_to(np.arange(node_count), (node_count, node_count))
+    current = np.broadcast_to(np.arange(node_count)[:, None], (node_count, node_count)).copy()
+    path_cost = np.zeros((node_count, node_count))
+    hop_count = np.zeros((node_count, node_count), dtype=np.int32)
+    blackhole = np.zeros((node_count, node_count), dtype=bool)
+    active = current != destination
+
+    for _ in range(node_count):
+        if not active.any():
+            break
+        following = next_hops[current, destination]
+        missing = active & (following == SEM_ROTA)
+        blackhole |= missing
+        moving = active & ~missing
+        path_cost[moving] += cost_matrix[current[moving], following[moving]]
+        hop_count[moving] += 1
+        current[moving] = following[moving]
+        active = moving & (current != destination)
+
+    delivered = (current == destination) & ~blackhole
+    return delivered, blackhole, path_cost, hop_count
+
+def verificar_tabelas(network_config: Dict[str, Any],
+                      routing_tables: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    """
+    Compare collected forwarding tables against the central SPF result.
+
+    Args:
+        network_config: Parsed config.yaml
+        routing_tables: Collected tables in tabela_de_rotas format
+
+    Returns:
+        Dict with router IDs, status matrix, asymmetry mask and cost matrices
+    """
+    lsdb = construir_lsdb(network_config)
+    router_ids = sorted(lsdb, key=lambda router_id: int(router_id.split('roteador')[-1]))
+    cost_matrix = matriz_de_custos(router_ids, lsdb)
+    expected_cost = menores_distancias(cost_matrix)
+    next_hops = matriz_de_proximos_saltos(router_ids, routing_tables)
+    delivered, blackhole, path_cost, hop_count = percorrer_caminhos(next_hops, cost_matrix)
+
+    status = np.full(delivered.shape, STATUS_OK, dtype=np.int8)
+    status[~delivered & ~blackhole] = STATUS_LACO
+    status[blackhole] = STATUS_BURACO_NEGRO
+    status[delivered & (path_cost > expected_cost + 1e-9)] = STATUS_SUBOTIMO
+    status[np.isinf(expected_cost)] = STATUS_INALCANCAVEL
+
+    both_delivered = delivered & delivered.T
+    asymmetric = both_delivered & ((hop_count != hop_count.T) | (path_cost != path_cost.T))
+
+    return {
+        'roteadores': router_ids,
+        'status': status,
+        'assimetricos': asymmetric,
+        'custo_real': path_cost,
+        'custo_esperado': expected_cost,
+        'proximos_saltos': next_hops,
+    }
+
+def caminho_percorrido(router_ids: List[str], next_hops: np.ndarray,
+                       source: int, destination: int) -> List[str]:
+    """
+    Materialise the forwarding path of a single pair for display.
+
+    Args:
+        router_ids: Ordered router IDs
+        next_hops: Next hop index matrix
+        source: Source router index
+        destination: Destination router index
+
+    Returns:
+        List of router IDs visited, stopping at a blackhole or a repeated router
+    """
+    path = [source]
+    while path[-1] != destination:
+        following = int(next_hops[path[-1], destination])
+        if following == SEM_ROTA:
+            break
+        if following in path:
+            path.append(following)
+            break
+        path.append(following)
+    return [router_ids[i] for i in path]
+
+def exibir_relatorio(network_config: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """
+    Display the verification result, listing each problematic pair.
+
+    Args:
+        network_config: Parsed config.yaml
+        result: Output of verificar_tabelas
+    """
+    router_ids = result['roteadores']
+    status = result['status']
+    expected_routes = GerenciadorDeRotas(construir_lsdb(network_config))
+    expected_routes.calcular_todas_rotas()
+
+    for source, destination in zip(*np.nonzero(status)):
+        source_id, destination_id = router_ids[source], router_ids[destination]
+        path = caminho_percorrido(router_ids, result['proximos_saltos'], source, destination)
+        expected_path = expected_routes.calcular_caminho(source_id, destination_id) or [source_id, destination_id]
+        print(Mensagem.formatar_erro(
+            f"{source_id} -> {destination_id}: {DESCRICAO_STATUS[int(status[source, destination])]}"
+        ))
+        print(f"\tReal: {' ➜ '.join(path)} (custo {result['custo_real'][source, destination]:.0f})")
+        print(f"\tEsperado: {' ➜ '.join(expected_path)} "
+              f"(custo {result['custo_esperado'][source, destination]:.0f})")
+
+    asymmetric_pairs = [(i, j) for i, j in zip(*np.nonzero(result['assimetricos'])) if i < j]
+    for source, destination in asymmetric_pairs:
+        print(Mensagem.formatar_mensagem(
+            f"{router_ids[source]} <-> {router_ids[destination]}: caminho assimétrico",
+            (255, 255, 0)
+        ))
+
+    total_pairs = len(router_ids) * (len(router_ids) - 1)
+    print(f"\nPares verificados: {total_pairs}")
+    for code, description in DESCRICAO_STATUS.items():
+        print(f"{description.capitalize()}: {int(np.count_nonzero(status == code))}")
+    print(f"Pares assimétricos: {len(asymmetric_pairs)}")
+    print(Mensagem.formatar_sucesso(f"Corretos: {int(np.count_nonzero(status == STATUS_OK)) - len(router_ids)}"))
+
+def main() -> None:
+    """Collect every routing table from the lab and verify all paths."""
+    network_config = ler_configuracao()
+    interface_owner, subnet_owner = mapear_enderecos(network_config)
+    routing_tables = coletar_tabelas(Manipulacao.roteadores_encontrados(), interface_owner, subnet_owner)
+    exibir_relatorio(network_config, verificar_tabelas(network_config, routing_tables))
+
+if __name__ == "__main__":
+    main()
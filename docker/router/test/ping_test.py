@@ -5,12 +5,12 @@ This module provides functionality to test and verify network connectivity
 between routers in a Docker network environment using ICMP ping.
 """
 
-import subprocess
 import sys
 import os
 from typing import List, Tuple
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.docker_inventory import InventarioDocker
 from class_net.manipulation import Manipulacao
 from class_net.message import Mensagem
 
@@ -22,26 +22,21 @@ def teste_de_ping_roteadores() -> None:
     and reports success or failure for each connection attempt.
     """
     failed_connections: List[Tuple[str, str]] = []
+    inventory = InventarioDocker.compartilhado()
     router_list = Manipulacao.roteadores_encontrados()
     
     for source_router in router_list:
         print(f"Testando {source_router}...")
-        for target_router in router_list:
-            try:
-                target_ip = Manipulacao.extrair_ip_roteadores(target_router)
-                ping_command = f"docker exec {source_router} ping -c 1 -W 0.1 {target_ip}"
-                command_result = subprocess.run(
-                    ping_command, 
-                    shell=True, 
-                    check=True, 
-                    text=True, 
-                    capture_output=True
-                )
-                if command_result.returncode == 0:
-                    print(Mensagem.formatar_sucesso(
-                        f"{source_router} -> {target_router} sucesso."
-                    ))
-            except subprocess.CalledProcessError:
+        ping_jobs = [
+            (source_router, ["ping", "-c", "1", "-W", "0.1", Manipulacao.ip_roteador(target_router)])
+            for target_router in router_list
+        ]
+        for target_router, (exit_code, _, _) in zip(router_list, inventory.executar_em_lote(ping_jobs)):
+            if exit_code == 0:
+                print(Mensagem.formatar_sucesso(
+                    f"{source_router} -> {target_router} sucesso."
+                ))
+            else:
                 print(Mensagem.formatar_erro(
                     f"{source_router} -> {target_router} falhou."
                 ))
@@ -0,0 +1,183 @@
+"""
+Pipeline Benchmark Module
+
+This module measures how many LSAs per second one router accepts when
+receiving, installing and flooding run in a single loop and when they run as
+stages joined by bounded queues, on the same namespace lab as
+netns_launcher, so it needs root. Only the router with the most neighbors
+runs, so the others do not compete with it for the CPU; their namespaces
+still answer ping, so it floods to them as usual. A generator in a
+neighbor's namespace (this module run with --gerar) sends it synthetic
+LSAs, each one newer than the last of its ID. For each offered rate the
+router's installed LSA counter, read from its statistics endpoint, gives
+the accepted rate, and /proc/net/snmp the datagrams the kernel dropped for lack of receive
+buffer.
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+from class_net.lsa_manager import LSA_PORT
+from class_net.router_config import ConfiguracaoRoteador
+from controller_benchmark import esperar
+from flooding_benchmark import contadores_udp
+from pacing_benchmark import estatisticas
+from restart_benchmark import iniciar_roteador
+
+ORIGENS_SINTETICAS = 100
+ACEITACAO_MINIMA = 0.9
+ESPERA_ESTATISTICAS = 30.0
+
+def gerar_lsas(destination: str, rate: float, duration: float, first_sequence: int, repetitions: int = 1,
+               links: int = 0) -> int:
+    """
+    Send synthetic LSAs to a router at a steady rate.
+
+    Args:
+        destination: Router address
+        rate: LSAs per second
+        duration: Seconds to send for
+        first_sequence: Sequence number of the first LSA, above any sent before
+        repetitions: Copies sent of each LSA, all but the first stale
+        links: Neighbors listed in each LSA, shaped as in criar_lsa
+
+    Returns:
+        int: LSAs sent
+    """
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    neighbors = json.dumps({f"sintetico{index}": {"ip": f"10.253.{index}.1", "custo": 1} for index in range(links)})
+    template = ('{{"id": "sintetico{origem}", "seq": {seq}, "ip": "10.254.0.{endereco}", "vizinhos": '
+                + neighbors.replace("{", "{{").replace("}", "}}") + '}}')
+    sent = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < duration:
+        for _ in range(int(elapsed * rate) - sent):
+            instance = sent // repetitions
+            origin = instance % ORIGENS_SINTETICAS
+            lsa = template.format(origem=origin, endereco=origin + 1, seq=first_sequence + instance)
+            try:
+                sender.sendto(lsa.encode(), (destination, LSA_PORT))
+            except OSError:
+                pass
+            sent += 1
+        time.sleep(0.001)
+    return sent
+
+def medir_modo(network_config: Dict[str, Any], configs: List[ConfiguracaoRoteador], hub: str,
+               args: argparse.Namespace) -> List[Dict[str, float]]:
+    """
+    Bring up the lab in one mode and offer it every rate in turn.
+
+    Args:
+        network_config: Parsed config.yaml
+        configs: Router configurations, with the mode already set
+        hub: Router receiving the synthetic LSAs, the only one started
+        args: Command line arguments
+
+    Returns:
+        List of dicts with 'oferecida' and 'aceita' (LSAs/s) and 'descartes' (datagrams), per rate
+    """
+    hub_config = next(router for router in network_config['routers'] if router['id'] == hub)
+    generator = hub_config['neighbors'][0]['id']
+    hub_ip = next(config.vizinhos[hub][0] for config in configs if config.roteador_id == generator)
+
+    netns_launcher.remover_topologia(network_config)
+    netns_launcher.criar_topologia(network_config)
+    processes = []
+    try:
+        processes = [iniciar_roteador(config) for config in configs if config.roteador_id == hub]
+        if esperar(lambda: estatisticas(hub) is not None, args.timeout) is None:
+            raise RuntimeError(f"{hub} não respondeu")
+        time.sleep(2.0)
+
+        # LSAs installed without the generator are discounted, and so is the
+        # time an idle query takes
+        installed = estatisticas(hub)["lsas_instalados"]
+        time.sleep(args.duracao)
+        start = time.perf_counter()
+        baseline = (estatisticas(hub)["lsas_instalados"] - installed) / args.duracao
+        query_time = time.perf_counter() - start
+
+        results = []
+        sequence = 1
+        for rate in args.taxas:
+            installed = estatisticas(hub)["lsas_instalados"]
+            drops = contadores_udp(hub)["RcvbufErrors"]
+            output = subprocess.run(
+                ["ip", "netns", "exec", generator, sys.executable, os.path.abspath(__file__), "--gerar", hub_ip,
+                 "--taxa-gerada", str(rate), "--duracao", str(args.duracao), "--seq", str(sequence)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            sent = int(output.split()[-1])
+            sequence += sent
+            # The answer waits for the LSAs still queued, which count as time taken
+            finished = time.perf_counter()
+            installed = estatisticas(hub, ESPERA_ESTATISTICAS)["lsas_instalados"] - installed
+            elapsed = args.duracao + max(0.0, time.perf_counter() - finished - query_time)
+            results.append({
+                "oferecida": sent / args.duracao,
+                "aceita": installed / elapsed - baseline,
+                "descartes": contadores_udp(hub)["RcvbufErrors"] - drops,
+            })
+        return results
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        netns_launcher.remover_topologia(network_config)
+
+def main() -> None:
+    """Offer increasing LSA rates to one router in both modes and print what it accepts."""
+    parser = argparse.ArgumentParser(description="LSAs por segundo aceitos por um roteador, em laço único ou em estágios")
+    parser.add_argument("config", nargs="?", help="Caminho para o config.yaml")
+    parser.add_argument("--taxas", type=float, nargs="+", default=[1000, 2000, 3000, 4000, 5000, 6000, 8000],
+                        help="LSAs por segundo oferecidos")
+    parser.add_argument("--duracao", type=float, default=3.0, help="Segundos por taxa")
+    parser.add_argument("--buffer", type=int, help="SO_RCVBUF em bytes dos roteadores")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Segundos máximos até convergir")
+    parser.add_argument("--gerar", help=argparse.SUPPRESS)
+    parser.add_argument("--taxa-gerada", type=float, help=argparse.SUPPRESS)
+    parser.add_argument("--seq", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--repeticoes", type=int, default=1, help=argparse.SUPPRESS)
+    parser.add_argument("--enlaces", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.gerar:
+        print(gerar_lsas(args.gerar, args.taxa_gerada, args.duracao, args.seq, args.repeticoes, args.enlaces))
+        return
+    if not args.config:
+        parser.error("o config.yaml é obrigatório")
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    hub = max(network_config['routers'], key=lambda router: len(router['neighbors']))['id']
+    results = {}
+    for mode in ("laço único", "estágios"):
+        configs = netns_launcher.configuracoes_roteadores(network_config)
+        for config in configs:
+            config.estagios = mode == "estágios"
+            config.buffer_recepcao = args.buffer
+        results[mode] = medir_modo(network_config, configs, hub, args)
+
+    print(f"Roteador medido: {hub}, {args.duracao:.0f} s por taxa\n")
+    print(f"{'Modo':<12} {'Oferecidos (/s)':>16} {'Aceitos (/s)':>13} {'Descartados':>12}")
+    for mode, steps in results.items():
+        for step in steps:
+            print(f"{mode:<12} {step['oferecida']:>16.0f} {step['aceita']:>13.0f} {step['descartes']:>12}")
+    for mode, steps in results.items():
+        sustained = [step['oferecida'] for step in steps
+                     if step['aceita'] >= ACEITACAO_MINIMA * step['oferecida'] and not step['descartes']]
+        print(f"\nMáximo sustentado em {mode}: {max(sustained, default=0):.0f} LSAs/s")
+    print(f"\nSustentado: nenhum datagrama descartado e ao menos {100 * ACEITACAO_MINIMA:.0f}% dos LSAs "
+          "oferecidos instalados")
+
+if __name__ == "__main__":
+    main()
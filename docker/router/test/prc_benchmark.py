@@ -0,0 +1,154 @@
+"""
+Partial Route Calculation Benchmark Module
+
+This module applies typical churn to synthetic topologies (cost changes and
+flaps of random links, renumbering of routers) and recalculates the routes
+of several routers after every event, counting how many calculations run a
+full SPF and how many reuse the previous SPF tree, untouched or with a few
+leaves recomputed. Every table is checked against a full dict-based SPF.
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.lsa_database import BancoLSA
+from class_net.route_manager import GerenciadorDeRotas
+import topologias
+
+EVENTOS = (("custo", 0.5), ("oscilacao", 0.4), ("prefixo", 0.1))
+
+def substituir(lsdb: Dict[str, Any], router_id: str, **changes: Any) -> None:
+    """Install a newer copy of a router's LSA with some fields changed."""
+    lsdb[router_id] = dict(lsdb[router_id], seq=lsdb[router_id]['seq'] + 1, **changes)
+
+def aplicar_evento(lsdb: Dict[str, Any], edges: List[topologias.Aresta], down: set,
+                   generator: random.Random) -> str:
+    """
+    Apply one churn event to the LSDB, as the LSAs of the routers involved would.
+
+    Args:
+        lsdb: LSDB to change
+        edges: Undirected edges of the topology
+        down: Edges currently down, updated in place
+        generator: Random source
+
+    Returns:
+        str: Kind of event
+    """
+    kind = generator.choices([name for name, _ in EVENTOS], [weight for _, weight in EVENTOS])[0]
+    a, b = generator.choice(edges)
+    ends = ((topologias.nome_roteador(a), topologias.nome_roteador(b)),
+            (topologias.nome_roteador(b), topologias.nome_roteador(a)))
+    if kind == "prefixo":
+        router_id = ends[0][0]
+        substituir(lsdb, router_id, ip=f"192.168.{a % 256}.2")
+    elif kind == "custo" and (a, b) not in down:
+        cost = generator.choice([5, 10, 20, 40])
+        for origin, target in ends:
+            links = {neighbor: dict(info) for neighbor, info in lsdb[origin]['vizinhos'].items()}
+            links[target]['custo'] = cost
+            substituir(lsdb, origin, vizinhos=links)
+    else:
+        kind = "oscilacao"
+        for origin, target in ends:
+            links = {neighbor: dict(info) for neighbor, info in lsdb[origin]['vizinhos'].items()}
+            if (a, b) in down:
+                links[target] = {'ip': lsdb[target]['ip'], 'custo': 10}
+            else:
+                del links[target]
+            substituir(lsdb, origin, vizinhos=links)
+        down.symmetric_difference_update({(a, b)})
+    return kind
+
+def referencia(lsdb: Dict[str, Any], source: str) -> Dict[str, str]:
+    """Compute a routing table with a full dict-based SPF."""
+    manager = GerenciadorDeRotas(dict(lsdb))
+    _, first_hops = manager._spf(manager._gerar_grafo(), source)
+    return {destination: hop for destination, hop in first_hops.items() if hop != destination}
+
+def medir(topology: str, router_count: int, events: int, sources: int, seed: int) -> Dict[str, Any]:
+    """
+    Run the churn on one topology.
+
+    Args:
+        topology: Key of topologias.TOPOLOGIAS
+        router_count: Number of routers
+        events: Churn events applied
+        sources: Routers whose routes are recalculated after each event
+        seed: Random seed
+
+    Returns:
+        Dict with SPF avoidance, leaves recomputed, times and correctness
+    """
+    generator = random.Random(seed)
+    edges = topologias.TOPOLOGIAS[topology](router_count)
+    lsdb = BancoLSA(topologias.gerar_lsdb(router_count, edges))
+    measured = [topologias.nome_roteador(0)] + [
+        topologias.nome_roteador(index) for index in generator.sample(range(1, router_count), sources - 1)
+    ]
+    managers = {source: GerenciadorDeRotas(lsdb) for source in measured}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for source, manager in managers.items():
+            manager.dijkstra(source)
+    for manager in managers.values():
+        manager.grafo.spfs_completos = manager.grafo.spfs_evitados = manager.grafo.folhas_remendadas = 0
+
+    down: set = set()
+    times = {"completo": [], "parcial": []}
+    correct = True
+    for _ in range(events):
+        aplicar_evento(lsdb, edges, down, generator)
+        for source, manager in managers.items():
+            full_before = manager.grafo.spfs_completos
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                table = manager.dijkstra(source)
+            elapsed = time.perf_counter() - start
+            times["completo" if manager.grafo.spfs_completos > full_before else "parcial"].append(elapsed)
+            correct = correct and table == referencia(lsdb, source)
+
+    full = sum(manager.grafo.spfs_completos for manager in managers.values())
+    avoided = sum(manager.grafo.spfs_evitados for manager in managers.values())
+    return {
+        "calculos": full + avoided,
+        "evitados": avoided / max(1, full + avoided),
+        "folhas": sum(manager.grafo.folhas_remendadas for manager in managers.values()),
+        "completo": statistics.median(times["completo"]) if times["completo"] else float("nan"),
+        "parcial": statistics.median(times["parcial"]) if times["parcial"] else float("nan"),
+        "mudancas": dict(lsdb.mudancas),
+        "corretas": correct,
+    }
+
+def main() -> None:
+    """Print the SPF avoidance rate and calculation times per topology."""
+    parser = argparse.ArgumentParser(description="Cálculo parcial de rotas sob mudanças típicas")
+    parser.add_argument("--roteadores", type=int, default=500, help="Roteadores por topologia")
+    parser.add_argument("--eventos", type=int, default=200, help="Eventos de mudança aplicados")
+    parser.add_argument("--origens", type=int, default=10, help="Roteadores que recalculam as rotas")
+    parser.add_argument("--topologias", nargs="+", default=["estrela", "tree", "aleatoria"],
+                        choices=sorted(topologias.TOPOLOGIAS), help="Topologias medidas")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    print(f"{args.eventos} eventos (custo 50%, oscilação de enlace 40%, renumeração 10%), "
+          f"{args.origens} origens, {args.roteadores} roteadores\n")
+    print(f"{'Topologia':<10} {'Cálculos':>9} {'SPF evitado (%)':>16} {'Folhas':>7} "
+          f"{'SPF completo (ms)':>18} {'Parcial (ms)':>13} {'LSAs enlaces/prefixo':>21} {'Corretas':>9}")
+    for topology in args.topologias:
+        result = medir(topology, args.roteadores, args.eventos, args.origens, args.seed)
+        changes = result["mudancas"]
+        print(f"{topology:<10} {result['calculos']:>9} {100 * result['evitados']:>16.1f} {result['folhas']:>7} "
+              f"{1000 * result['completo']:>18.2f} {1000 * result['parcial']:>13.2f} "
+              f"{changes['enlaces']:>13}/{changes['prefixo']:<7} {'sim' if result['corretas'] else 'NÃO':>9}",
+              flush=True)
+
+if __name__ == "__main__":
+    main()
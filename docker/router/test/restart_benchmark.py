@@ -0,0 +1,155 @@
+"""
+Warm Restart Benchmark Module
+
+This module measures the time a restarted router takes to have a valid FIB,
+with and without its LSDB snapshot. The whole topology runs in network
+namespaces, as done by netns_launcher, so it needs root. One router is
+repeatedly stopped, has its kernel routes flushed (as a fresh container would)
+and is started again; its FIB is valid once every destination is forwarded as
+it was before the restart.
+"""
+
+import argparse
+import ipaddress
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+from class_net.router import INTERVALO_SNAPSHOT
+from class_net.router_config import ConfiguracaoRoteador, VARIAVEIS_AMBIENTE
+
+def iniciar_roteador(config: ConfiguracaoRoteador) -> subprocess.Popen:
+    """
+    Start one router process in its namespace with its output discarded.
+
+    Args:
+        config: Router configuration
+
+    Returns:
+        subprocess.Popen: Started process
+    """
+    return subprocess.Popen(
+        ["ip", "netns", "exec", config.roteador_id, sys.executable, netns_launcher.MAIN_SCRIPT]
+        + config.para_argumentos(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env={key: value for key, value in os.environ.items()
+             if key not in VARIAVEIS_AMBIENTE}
+    )
+
+def encaminhamento(namespace: str, subnets: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Resolve how a router forwards each destination subnet.
+
+    Args:
+        namespace: Router namespace
+        subnets: Destination subnets
+
+    Returns:
+        Dict mapping each subnet to its gateway, 'direto' if connected, or None
+    """
+    output = subprocess.run(["ip", "-n", namespace, "route", "show"],
+                            capture_output=True, text=True).stdout
+    table = []
+    for line in output.splitlines():
+        fields = line.split()
+        if not fields or fields[0] == "default":
+            continue
+        gateway = fields[fields.index("via") + 1] if "via" in fields else "direto"
+        table.append((ipaddress.ip_network(fields[0], strict=False), gateway))
+
+    forwarding = {}
+    for subnet in subnets:
+        address = ipaddress.ip_network(subnet).network_address + 1
+        matches = [(network.prefixlen, gateway) for network, gateway in table if address in network]
+        forwarding[subnet] = max(matches)[1] if matches else None
+    return forwarding
+
+def esperar_fib(namespace: str, expected: Dict[str, Optional[str]], timeout: float) -> Optional[float]:
+    """
+    Poll a router's FIB until it forwards every subnet as expected.
+
+    Args:
+        namespace: Router namespace
+        expected: Forwarding the FIB must reach
+        timeout: Seconds to give up after
+
+    Returns:
+        Seconds until the FIB was valid, or None on timeout
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if encaminhamento(namespace, list(expected)) == expected:
+            return time.perf_counter() - start
+        time.sleep(0.01)
+    return None
+
+def main() -> None:
+    """Run the benchmark and print time-to-first-valid-FIB per mode."""
+    parser = argparse.ArgumentParser(description="Tempo até a primeira FIB válida após reinício")
+    parser.add_argument("config", help="Caminho para o config.yaml")
+    parser.add_argument("--roteador", help="Roteador reiniciado, o último do arquivo por padrão")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Reinícios por modo")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Segundos máximos por reinício")
+    args = parser.parse_args()
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    snapshot_dir = tempfile.mkdtemp(prefix="snapshots_")
+    configs = netns_launcher.configuracoes_roteadores(network_config, snapshot_dir=snapshot_dir)
+    target = next(config for config in configs if config.roteador_id == (args.roteador or configs[-1].roteador_id))
+    subnets = [str(ipaddress.ip_network(f"{config.endereco_ip}/24", strict=False))
+               for config in configs if config is not target]
+
+    netns_launcher.remover_topologia(network_config)
+    netns_launcher.criar_topologia(network_config)
+    processes = {}
+    try:
+        processes = {config.roteador_id: iniciar_roteador(config) for config in configs}
+
+        converged = {subnet: None for subnet in subnets}
+        start = time.perf_counter()
+        while None in converged.values() and time.perf_counter() - start < args.timeout:
+            time.sleep(0.2)
+            converged = encaminhamento(target.roteador_id, subnets)
+        if None in converged.values():
+            print("A rede não convergiu.")
+            return
+        time.sleep(2 * INTERVALO_SNAPSHOT)
+        print(f"Roteadores: {len(configs)}, reiniciado: {target.roteador_id}, "
+              f"convergência inicial em {time.perf_counter() - start:.1f} s\n")
+
+        results = {"sem snapshot": [], "com snapshot": []}
+        for _ in range(args.repeticoes):
+            for mode, samples in results.items():
+                processes[target.roteador_id].terminate()
+                processes[target.roteador_id].wait()
+                subprocess.run(["ip", "-n", target.roteador_id, "route", "flush", "proto", "boot"], check=True)
+
+                snapshot = target.snapshot
+                if mode == "sem snapshot":
+                    target.snapshot = None
+                processes[target.roteador_id] = iniciar_roteador(target)
+                elapsed = esperar_fib(target.roteador_id, converged, args.timeout)
+                target.snapshot = snapshot
+                samples.append(elapsed if elapsed is not None else float("nan"))
+                time.sleep(2 * INTERVALO_SNAPSHOT)
+
+        print(f"{'Modo':<14} {'Mediana (s)':>12} {'Mínimo (s)':>11} {'Máximo (s)':>11}")
+        for mode, samples in results.items():
+            print(f"{mode:<14} {statistics.median(samples):>12.2f} {min(samples):>11.2f} {max(samples):>11.2f}")
+        print(f"\nTempo de restart até FIB válida (desde o início do processo, {args.repeticoes} repetições)")
+    finally:
+        for process in processes.values():
+            process.terminate()
+        netns_launcher.remover_topologia(network_config)
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
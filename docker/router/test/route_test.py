@@ -5,12 +5,12 @@ This module provides functionality for testing and verifying routing paths
 between routers in a Docker network environment using traceroute.
 """
 
-import subprocess
 import sys
 import os
 from typing import List, Tuple
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.docker_inventory import InventarioDocker
 from class_net.manipulation import Manipulacao
 from class_net.message import Mensagem
 
@@ -22,38 +22,33 @@ def teste_de_rotas() -> None:
     information using color-coded output.
     """
     failed_routes: List[Tuple[str, str]] = []
+    inventory = InventarioDocker.compartilhado()
     router_list = Manipulacao.roteadores_encontrados()
     
     for source_router in router_list:
         print(f"Testando {source_router}...")
-        for target_router in router_list:
-            if source_router != target_router:
-                try:
-                    target_gateway = Manipulacao.extrair_ip_gateway(target_router)
-                    trace_command = f"docker exec {source_router} traceroute {target_gateway}"
-                    command_result = subprocess.run(
-                        trace_command, 
-                        shell=True, 
-                        check=True, 
-                        text=True, 
-                        capture_output=True
-                    )
-                    if command_result.returncode == 0:
-                        path = Manipulacao.traduzir_caminho(
-                            source_router,
-                            command_result.stdout,
-                            len(router_list)
-                        )
-                        print(
-                            Mensagem.formatar_mensagem(target_router, (255, 255, 0)),
-                            ':',
-                            Mensagem.formatar_sucesso(path)
-                        )
-                except subprocess.CalledProcessError:
-                    print(Mensagem.formatar_erro(
-                        f"{source_router} -> {target_router} falhou."
-                    ))
-                    failed_routes.append([source_router, target_router])
+        target_list = [target for target in router_list if target != source_router]
+        trace_jobs = [
+            (source_router, ["traceroute", Manipulacao.ip_gateway_roteador(target_router)])
+            for target_router in target_list
+        ]
+        for target_router, (exit_code, stdout, _) in zip(target_list, inventory.executar_em_lote(trace_jobs)):
+            if exit_code == 0:
+                path = Manipulacao.traduzir_caminho(
+                    source_router,
+                    stdout,
+                    len(router_list)
+                )
+                print(
+                    Mensagem.formatar_mensagem(target_router, (255, 255, 0)),
+                    ':',
+                    Mensagem.formatar_sucesso(path)
+                )
+            else:
+                print(Mensagem.formatar_erro(
+                    f"{source_router} -> {target_router} falhou."
+                ))
+                failed_routes.append([source_router, target_router])
                     
     if failed_routes:
         print("Roteadores com falha:")
@@ -63,25 +58,20 @@ def teste_de_rotas() -> None:
 
 def teste() -> None:
     """Test a specific routing path for debugging purposes."""
-    try:
-        trace_command = "docker exec roteador5 traceroute 172.21.0.1"
-        command_result = subprocess.run(
-            trace_command, 
-            shell=True, 
-            check=True, 
-            text=True, 
-            capture_output=True
+    target_ip = Manipulacao.ip_gateway_roteador('roteador1')
+    exit_code, stdout, _ = InventarioDocker.compartilhado().executar(
+        'roteador5', ["traceroute", target_ip]
+    )
+    if exit_code == 0:
+        router_count = len(Manipulacao.roteadores_encontrados())
+        path = Manipulacao.traduzir_caminho(
+            'roteador5',
+            stdout,
+            router_count
         )
-        if command_result.returncode == 0:
-            router_count = len(Manipulacao.roteadores_encontrados())
-            path = Manipulacao.traduzir_caminho(
-                'roteador5',
-                command_result.stdout,
-                router_count
-            )
-            print(Mensagem.formatar_sucesso(path))
-    except subprocess.CalledProcessError:
-        print(Mensagem.formatar_erro("roteador2 -> 172.21.7.1 falhou."))
+        print(Mensagem.formatar_sucesso(path))
+    else:
+        print(Mensagem.formatar_erro(f"roteador5 -> {target_ip} falhou."))
 
 if __name__ == "__main__":
     teste_de_rotas()
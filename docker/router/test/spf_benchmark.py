@@ -0,0 +1,173 @@
+"""
+SPF Graph Benchmark Module
+
+This module compares the array-backed CSR graph used by flat SPF with the
+dict-of-dicts graph GerenciadorDeRotas builds from the LSDB, on synthetic
+topologies of up to tens of thousands of routers. It reports the memory
+held by each graph, the time of one SPF (graph update included) in steady
+state and after an LSA change, and checks that both give the same routing
+table, ties and inactive routers included.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.route_manager import GerenciadorDeRotas
+from class_net.spf_graph import GrafoCSR
+import topologias
+
+def spf_dicionario(manager: GerenciadorDeRotas, source: str) -> Dict[str, str]:
+    """
+    Compute a routing table the way dijkstra did before the CSR graph.
+
+    Args:
+        manager: Route manager holding the LSDB
+        source: Source router ID
+
+    Returns:
+        Dict mapping destinations to next hops
+    """
+    _, first_hops = manager._spf(manager._gerar_grafo(), source)
+    return {destination: hop for destination, hop in first_hops.items() if hop != destination}
+
+def spf_csr(manager: GerenciadorDeRotas, source: str) -> Dict[str, str]:
+    """
+    Compute a routing table through dijkstra, which now uses the CSR graph.
+
+    The SPF tree kept from the previous call is discarded, so a full SPF
+    always runs, as with the dict graph.
+
+    Args:
+        manager: Route manager holding the LSDB
+        source: Source router ID
+
+    Returns:
+        Dict mapping destinations to next hops
+    """
+    manager.grafo.arvore_valida = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        return manager.dijkstra(source)
+
+def memoria(build: Callable[[], Any]) -> int:
+    """
+    Measure the memory still held by the object a function builds.
+
+    Args:
+        build: Function building the object
+
+    Returns:
+        int: Bytes allocated and kept alive
+    """
+    tracemalloc.start()
+    built = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return size
+
+def grafo_csr(lsdb: Dict[str, Any]) -> GrafoCSR:
+    """Build a CSR graph holding a whole LSDB."""
+    graph = GrafoCSR()
+    for router_id, router_data in lsdb.items():
+        graph.atualizar_roteador(router_id, {neighbor: info['custo'] for neighbor, info in router_data['vizinhos'].items()})
+    return graph
+
+def cronometrar(function: Callable[[], Any], repetitions: int) -> float:
+    """Return the median seconds of a function over some repetitions."""
+    samples = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def alterar_lsa(lsdb: Dict[str, Any], router_id: str, generator: random.Random) -> None:
+    """
+    Replace the LSA of a router by a newer one with a changed cost and an extra link.
+
+    Args:
+        lsdb: LSDB to update
+        router_id: Router whose LSA changes
+        generator: Random source
+    """
+    old = lsdb[router_id]
+    neighbors = {neighbor: dict(info) for neighbor, info in old['vizinhos'].items()}
+    changed = generator.choice(sorted(neighbors))
+    neighbors[changed]['custo'] += generator.randint(1, 20)
+    extra = generator.choice(sorted(lsdb))
+    if extra != router_id:
+        neighbors[extra] = {'ip': lsdb[extra]['ip'], 'custo': 10}
+    lsdb[router_id] = dict(old, vizinhos=neighbors, seq=old['seq'] + 1)
+
+def verificar(lsdb: Dict[str, Any], sources: List[str], generator: random.Random) -> bool:
+    """
+    Check that both graphs give the same tables, also with inactive routers and after LSA changes.
+
+    Args:
+        lsdb: LSDB of the topology, changed in place
+        sources: Routers to compute tables for
+        generator: Random source
+
+    Returns:
+        bool: True if every table matched
+    """
+    manager = GerenciadorDeRotas(lsdb)
+    for round_number in range(4):
+        if round_number:
+            for router_id in generator.sample(sorted(lsdb), 5):
+                alterar_lsa(lsdb, router_id, generator)
+            manager.set_inativos(generator.sample(sorted(lsdb), round_number))
+        for source in sources:
+            if source in manager.inativos:
+                continue
+            if spf_csr(manager, source) != spf_dicionario(manager, source):
+                return False
+    return True
+
+def main() -> None:
+    """Print graph memory and SPF times of both representations per topology and size."""
+    parser = argparse.ArgumentParser(description="Grafo CSR contra dicionário de dicionários no SPF")
+    parser.add_argument("--roteadores", type=int, nargs="+", default=[1000, 10000], help="Tamanhos das topologias")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções de SPF por medida")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+    print(f"{'Topologia':<10} {'Roteadores':>10} {'Grafo dict (KiB)':>17} {'Grafo CSR (KiB)':>16} "
+          f"{'SPF dict (ms)':>14} {'SPF CSR (ms)':>13} {'Após LSA dict (ms)':>19} {'Após LSA CSR (ms)':>18} {'Iguais':>7}")
+    for size in args.roteadores:
+        for name in ("aleatoria", "grade"):
+            lsdb = topologias.gerar_lsdb(size, topologias.TOPOLOGIAS[name](size))
+            source = topologias.nome_roteador(generator.randrange(size))
+            manager = GerenciadorDeRotas(lsdb)
+
+            dict_memory = memoria(manager._gerar_grafo)
+            csr_memory = memoria(lambda: grafo_csr(lsdb))
+            spf_csr(manager, source)
+            dict_time = cronometrar(lambda: spf_dicionario(manager, source), args.repeticoes)
+            csr_time = cronometrar(lambda: spf_csr(manager, source), args.repeticoes)
+
+            def depois_de_lsa(compute: Callable[[GerenciadorDeRotas, str], Dict[str, str]]) -> None:
+                alterar_lsa(lsdb, topologias.nome_roteador(generator.randrange(size)), generator)
+                compute(manager, source)
+
+            dict_change = cronometrar(lambda: depois_de_lsa(spf_dicionario), args.repeticoes)
+            csr_change = cronometrar(lambda: depois_de_lsa(spf_csr), args.repeticoes)
+
+            sources = [topologias.nome_roteador(generator.randrange(size)) for _ in range(3)]
+            equal = verificar(lsdb, sources, generator)
+            print(f"{name:<10} {size:>10} {dict_memory / 1024:>17.0f} {csr_memory / 1024:>16.0f} "
+                  f"{1000 * dict_time:>14.1f} {1000 * csr_time:>13.1f} {1000 * dict_change:>19.1f} "
+                  f"{1000 * csr_change:>18.1f} {'sim' if equal else 'NÃO':>7}", flush=True)
+
+if __name__ == "__main__":
+    main()
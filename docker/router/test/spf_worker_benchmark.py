@@ -0,0 +1,166 @@
+"""
+SPF Worker Benchmark Module
+
+This module measures how long datagrams wait to be handled by a receive
+loop while routes are recalculated over and over in another thread of the
+same process, with SPF in that thread and in the SPF worker process, and
+with no recalculation at all as a reference. A sender process stamps every
+datagram with the time it was sent; the receiving thread decodes it as the
+router decodes an LSA and records the delay. Meanwhile one LSA of a large
+synthetic LSDB changes before every recalculation, so SPF (and the backup
+next hops, as with fast reroute on) always has work to do.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.lsa_database import BancoLSA
+from class_net.route_manager import GerenciadorDeRotas
+from class_net.spf_worker import TrabalhadorSPF
+from spf_benchmark import alterar_lsa
+import topologias
+
+MODOS = ("sem SPF", "no processo", "processo separado")
+
+def enviar(address: Tuple[str, int], rate: float, duration: float) -> None:
+    """
+    Send datagrams stamped with their send time at a steady rate.
+
+    Args:
+        address: Receiver address
+        rate: Datagrams per second
+        duration: Seconds to send for
+    """
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    padding = {f"vizinho{index}": {"ip": f"10.0.{index}.1", "custo": 10} for index in range(8)}
+    sent = 0
+    start = time.monotonic()
+    while (elapsed := time.monotonic() - start) < duration:
+        for _ in range(int(elapsed * rate) - sent):
+            message = {"id": "sintetico", "seq": sent, "vizinhos": padding, "t": time.monotonic()}
+            sender.sendto(json.dumps(message).encode(), address)
+            sent += 1
+        time.sleep(0.001)
+
+def receber(receiver: socket.socket, delays: List[float], stop_event: threading.Event) -> None:
+    """
+    Decode datagrams until stopped, recording how long after sending each one was handled.
+
+    Args:
+        receiver: Bound socket
+        delays: Seconds of delay, appended to
+        stop_event: Threading event to control the loop
+    """
+    receiver.settimeout(0.2)
+    while not stop_event.is_set():
+        try:
+            data = receiver.recv(65535)
+        except socket.timeout:
+            continue
+        message = json.loads(data.decode())
+        delays.append(time.monotonic() - message["t"])
+
+def medir(mode: str, args: argparse.Namespace) -> Dict[str, float]:
+    """
+    Receive datagrams while routes are recalculated in one mode.
+
+    Args:
+        mode: One of MODOS
+        args: Command line arguments
+
+    Returns:
+        Dict with the delay percentiles (ms), the recalculations run and their mean time (ms)
+    """
+    edges = topologias.TOPOLOGIAS[args.topologia](args.roteadores)
+    lsdb = BancoLSA(topologias.gerar_lsdb(args.roteadores, edges))
+    manager = GerenciadorDeRotas(lsdb)
+    source = topologias.nome_roteador(0)
+    if mode == "processo separado":
+        manager.trabalhador = TrabalhadorSPF()
+    generator = random.Random(args.seed)
+    routers = sorted(lsdb)
+
+    def recalcular() -> None:
+        alterar_lsa(lsdb, generator.choice(routers), generator)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.dijkstra(source)
+            if args.lfa:
+                manager.calcular_alternativas(source)
+
+    # The first call builds the graph and, with the worker, sends it the whole LSDB
+    recalcular()
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    delays: List[float] = []
+    stop_event = threading.Event()
+    receiving = threading.Thread(target=receber, args=(receiver, delays, stop_event), daemon=True)
+    receiving.start()
+    sender = multiprocessing.get_context("spawn").Process(
+        target=enviar, args=(receiver.getsockname(), args.taxa, args.duracao)
+    )
+    sender.start()
+
+    durations = []
+    while sender.is_alive():
+        if mode == "sem SPF":
+            time.sleep(0.05)
+            continue
+        start = time.perf_counter()
+        recalcular()
+        durations.append(time.perf_counter() - start)
+    time.sleep(0.5)
+    stop_event.set()
+    receiving.join()
+    receiver.close()
+    if manager.trabalhador:
+        manager.trabalhador.parar()
+
+    percentiles = statistics.quantiles(delays, n=100)
+    return {
+        "recebidos": len(delays),
+        "p50": 1000 * percentiles[49],
+        "p90": 1000 * percentiles[89],
+        "p99": 1000 * percentiles[98],
+        "maximo": 1000 * max(delays),
+        "recalculos": len(durations),
+        "tempo_recalculo": 1000 * statistics.mean(durations) if durations else 0.0,
+    }
+
+def main() -> None:
+    """Measure the receive delays in every mode and print their percentiles."""
+    parser = argparse.ArgumentParser(description="Atraso da recepção durante o SPF, no processo ou num processo separado")
+    parser.add_argument("--topologia", choices=sorted(topologias.TOPOLOGIAS), default="aleatoria",
+                        help="Topologia sintética")
+    parser.add_argument("--roteadores", type=int, default=1000, help="Número de roteadores")
+    parser.add_argument("--taxa", type=float, default=1000.0, help="Datagramas por segundo recebidos")
+    parser.add_argument("--duracao", type=float, default=5.0, help="Segundos de medição por modo")
+    parser.add_argument("--sem-lfa", dest="lfa", action="store_false", help="Não calcula as rotas de reserva")
+    parser.add_argument("--seed", type=int, default=42, help="Semente aleatória")
+    args = parser.parse_args()
+
+    results = {mode: medir(mode, args) for mode in MODOS}
+
+    print(f"Topologia {args.topologia} com {args.roteadores} roteadores, {args.taxa:.0f} datagramas/s, "
+          f"{'com' if args.lfa else 'sem'} rotas de reserva\n")
+    print(f"{'Modo':<18} {'Recebidos':>10} {'p50 (ms)':>9} {'p90 (ms)':>9} {'p99 (ms)':>9} {'Máximo (ms)':>12} "
+          f"{'Recálculos':>11} {'Recálculo (ms)':>15}")
+    for mode, result in results.items():
+        print(f"{mode:<18} {result['recebidos']:>10} {result['p50']:>9.2f} {result['p90']:>9.2f} {result['p99']:>9.2f} "
+              f"{result['maximo']:>12.1f} {result['recalculos']:>11} {result['tempo_recalculo']:>15.1f}")
+    print("\nAtraso: do envio até o datagrama ser decodificado pelo laço de recepção")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Summary LSA Testing Module
+
+This module checks the inter-area rules of GerenciadorDeRotas on a small
+network with two border routers of the same area, where summaries could
+otherwise be fed back from one to the other. Route managers share one LSDB
+and one summary database, and every round each border router replaces its
+summary LSAs with the ones it would originate now, as flooding would. The
+checks are that no border router announces a destination back into the
+backbone through its own area, and that a destination that fails is
+withdrawn from every summary instead of being announced with growing costs.
+
+    R0 (area 0) ── A, B (areas 0 and 1, linked in area 1)
+    R0 (area 0) ── C (areas 0 and 2) ── D (area 2)
+"""
+
+import sys
+import os
+import contextlib
+import io
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.lsa_database import BancoLSA
+from class_net.message import Mensagem
+from class_net.route_manager import GerenciadorDeRotas
+
+AREAS = {"R0": 0, "A": 1, "B": 1, "C": 2, "D": 2}
+ENLACES = [("R0", "A"), ("R0", "B"), ("A", "B"), ("R0", "C"), ("C", "D")]
+CUSTO = 10
+BORDAS = ("A", "B", "C")
+RODADAS = 30
+
+class Rede:
+    """
+    Routers of the test network sharing their databases.
+
+    Attributes:
+        lsdb (BancoLSA): Router LSAs of every router
+        resumos (BancoLSA): Summary LSAs of every border router
+        gerenciadores (Dict[str, GerenciadorDeRotas]): Route manager of every router
+    """
+
+    def __init__(self):
+        """Build the LSAs of every router and their route managers."""
+        self.lsdb = BancoLSA()
+        self.resumos = BancoLSA()
+        self._seq = 0
+        for router_id in AREAS:
+            self.lsdb[router_id] = self._lsa(router_id)
+        self.gerenciadores = {router_id: GerenciadorDeRotas(self.lsdb, summary_db=self.resumos, area=area)
+                              for router_id, area in AREAS.items()}
+
+    def _lsa(self, router_id: str, removed: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """Build the LSA of a router, leaving out links to some neighbors."""
+        self._seq += 1
+        neighbors = {}
+        for a, b in ENLACES:
+            if router_id in (a, b):
+                neighbor = b if router_id == a else a
+                if neighbor not in removed:
+                    neighbors[neighbor] = {"ip": f"10.0.{list(AREAS).index(neighbor)}.1", "custo": CUSTO,
+                                           "area": min(AREAS[router_id], AREAS[neighbor])}
+        return {"id": router_id, "seq": self._seq, "ip": f"10.0.{list(AREAS).index(router_id)}.1",
+                "areas": sorted({AREAS[router_id]} | {info["area"] for info in neighbors.values()}),
+                "vizinhos": neighbors}
+
+    def rodada(self) -> None:
+        """Let every border router originate its summaries, all at once."""
+        summaries = {router_id: self.gerenciadores[router_id].gerar_resumos(router_id) for router_id in BORDAS}
+        for router_id, by_area in summaries.items():
+            for area, destinations in by_area.items():
+                self._seq += 1
+                self.resumos[f"{router_id}:{area}"] = {
+                    "id": f"{router_id}:{area}", "seq": self._seq, "tipo": "resumo",
+                    "origem": router_id, "area": area, "destinos": destinations,
+                }
+
+    def derrubar(self, router_id: str) -> None:
+        """Remove a router, as its neighbors would after detecting its failure."""
+        del self.lsdb[router_id]
+        for neighbor in list(self.lsdb):
+            if router_id in self.lsdb[neighbor]["vizinhos"]:
+                self.lsdb[neighbor] = self._lsa(neighbor, removed=(router_id,))
+
+    def custos_anunciados(self, destination: str) -> Dict[str, int]:
+        """Return the cost each summary LSA announces for a destination."""
+        return {summary_id: summary["destinos"][destination]["custo"]
+                for summary_id, summary in self.resumos.items() if destination in summary["destinos"]}
+
+def testar_sem_eco() -> None:
+    """Check that D reaches the backbone only through C and that area 1 reaches it through the backbone."""
+    network = Rede()
+    for _ in range(5):
+        network.rodada()
+    announced = network.custos_anunciados("D")
+    assert announced == {"C:0": CUSTO, "A:1": 3 * CUSTO, "B:1": 3 * CUSTO}, announced
+    routes = network.gerenciadores["R0"].dijkstra("R0")
+    assert routes.get("D") == "C", routes
+
+def testar_retirada() -> None:
+    """Check that the summaries of a failed router are withdrawn, never counted up."""
+    network = Rede()
+    for _ in range(5):
+        network.rodada()
+    network.derrubar("D")
+    history = []
+    for _ in range(RODADAS):
+        network.rodada()
+        history.append(network.custos_anunciados("D"))
+    # The first round still sees the summaries originated before the failure
+    assert not history[1], f"ainda anunciado após 2 rodadas: {history[1]}"
+    assert not any(history[1:]), f"anunciado de novo: {[costs for costs in history[1:] if costs]}"
+    for router_id in ("R0", "A", "B", "C"):
+        routes = network.gerenciadores[router_id].dijkstra(router_id)
+        assert "D" not in routes, f"{router_id} ainda roteia para D via {routes['D']}"
+
+TESTES: List[Tuple[str, Callable[[], None]]] = [
+    ("resumos sem eco entre bordas da mesma área", testar_sem_eco),
+    ("retirada dos resumos de um roteador que falhou", testar_retirada),
+]
+
+def teste_de_resumos() -> bool:
+    """
+    Run every check.
+
+    Returns:
+        bool: True if every check passed
+    """
+    failed = []
+    for name, test in TESTES:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                test()
+        except AssertionError as error:
+            print(Mensagem.formatar_erro(f"{name}: {error}"))
+            failed.append(name)
+        else:
+            print(Mensagem.formatar_sucesso(name))
+    return not failed
+
+if __name__ == "__main__":
+    passed = teste_de_resumos()
+    print("Teste de resumos concluído.")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,96 @@
+"""
+Database Synchronisation Benchmark Module
+
+This module measures how long a router that joins the network (restarted with
+an empty LSDB and no snapshot) takes to learn the whole topology, with and
+without the database exchange on adjacency up, for several LSA origination
+intervals. The topology runs in network namespaces, as done by
+netns_launcher, so it needs root. The LSDB is considered synchronised once
+the router's FIB forwards every destination as before the restart.
+"""
+
+import argparse
+import ipaddress
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import netns_launcher
+import restart_benchmark
+
+def medir(network_config: dict, interval: float, exchange: bool, target_id: str,
+          repetitions: int, timeout: float) -> List[float]:
+    """
+    Bring up the topology and time the synchronisation of restarted routers.
+
+    Args:
+        network_config: Parsed config.yaml
+        interval: LSA origination interval of every router
+        exchange: Whether the database exchange is enabled
+        target_id: Router restarted
+        repetitions: Number of restarts
+        timeout: Seconds to give up after
+
+    Returns:
+        List of synchronisation times in seconds (NaN on timeout)
+    """
+    configs = netns_launcher.configuracoes_roteadores(network_config)
+    for config in configs:
+        config.intervalo_lsa = interval
+        config.troca_de_base = exchange
+    target = next(config for config in configs if config.roteador_id == target_id)
+    subnets = [str(ipaddress.ip_network(f"{config.endereco_ip}/24", strict=False))
+               for config in configs if config is not target]
+
+    netns_launcher.remover_topologia(network_config)
+    netns_launcher.criar_topologia(network_config)
+    processes = {config.roteador_id: restart_benchmark.iniciar_roteador(config) for config in configs}
+    samples = []
+    try:
+        start = time.perf_counter()
+        converged = {subnet: None for subnet in subnets}
+        while None in converged.values() and time.perf_counter() - start < timeout:
+            time.sleep(0.2)
+            converged = restart_benchmark.encaminhamento(target.roteador_id, subnets)
+
+        for _ in range(repetitions):
+            processes[target.roteador_id].terminate()
+            processes[target.roteador_id].wait()
+            subprocess.run(["ip", "-n", target.roteador_id, "route", "flush", "proto", "boot"], check=True)
+            processes[target.roteador_id] = restart_benchmark.iniciar_roteador(target)
+            elapsed = restart_benchmark.esperar_fib(target.roteador_id, converged, timeout)
+            samples.append(elapsed if elapsed is not None else float("nan"))
+            time.sleep(1.0)
+    finally:
+        for process in processes.values():
+            process.terminate()
+        netns_launcher.remover_topologia(network_config)
+    return samples
+
+def main() -> None:
+    """Run the benchmark and print synchronisation time per interval and mode."""
+    parser = argparse.ArgumentParser(description="Tempo de sincronização da LSDB de um roteador que entra na rede")
+    parser.add_argument("config", help="Caminho para o config.yaml")
+    parser.add_argument("--roteador", help="Roteador reiniciado, o último do arquivo por padrão")
+    parser.add_argument("--intervalos", type=float, nargs="+", default=[0.5, 2.0, 5.0],
+                        help="Intervalos de originação de LSA medidos")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Reinícios por cenário")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Segundos máximos por reinício")
+    args = parser.parse_args()
+
+    network_config = netns_launcher.ler_configuracao(args.config)
+    target_id = args.roteador or network_config['routers'][-1]['id']
+    print(f"Roteadores: {len(network_config['routers'])}, reiniciado: {target_id}\n")
+    print(f"{'Intervalo (s)':>13} {'Troca de base':>14} {'Mediana (s)':>12} {'Máximo (s)':>11}")
+    for interval in args.intervalos:
+        for exchange in (False, True):
+            samples = medir(network_config, interval, exchange, target_id, args.repeticoes, args.timeout)
+            print(f"{interval:>13.1f} {'sim' if exchange else 'não':>14} "
+                  f"{statistics.median(samples):>12.2f} {max(samples):>11.2f}", flush=True)
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@ This module provides functionality for testing and visualizing network performan
 including response times, connectivity success rates, and connection matrices between routers.
 """
 
-import subprocess
 import sys
 import os
 import re
@@ -15,6 +14,7 @@ import seaborn as sns
 from typing import List, Tuple, Any, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from class_net.docker_inventory import InventarioDocker
 from class_net.manipulation import Manipulacao
 from class_net.message import Mensagem
 
@@ -72,22 +72,22 @@ def executar_teste_ping() -> Tuple[List[str], np.ndarray, np.ndarray, List[List[
     
     print("Executando testes de ping entre roteadores...")
     
+    inventario = InventarioDocker.compartilhado()
     for i, r_origem in enumerate(router_list):
         print(f"Testando {r_origem}...")
-        for j, r_destino in enumerate(router_list):
-            try:
-                ip = Manipulacao.extrair_ip_roteadores(r_destino)
-                comando = f"docker exec {r_origem} ping -c 1 -W 0.1 {ip}"
-                result = subprocess.run(comando, shell=True, check=True, text=True, capture_output=True)
-                if result.returncode == 0:
-                    output = result.stdout
-                    tempo_ms = extrair_tempo_ping(output)
-                    
-                    print(Mensagem.formatar_sucesso(f"{r_origem} -> {r_destino} sucesso. Tempo: {tempo_ms:.2f}ms"))
-                    successful_tests.append([r_origem, r_destino, tempo_ms])
-                    results_matrix[i][j] = 1
-                    time_matrix[i][j] = tempo_ms
-            except subprocess.CalledProcessError as e:
+        comandos = [
+            (r_origem, ["ping", "-c", "1", "-W", "0.1", Manipulacao.ip_roteador(r_destino)])
+            for r_destino in router_list
+        ]
+        for j, (r_destino, (codigo, output, _)) in enumerate(zip(router_list, inventario.executar_em_lote(comandos))):
+            if codigo == 0:
+                tempo_ms = extrair_tempo_ping(output)
+                
+                print(Mensagem.formatar_sucesso(f"{r_origem} -> {r_destino} sucesso. Tempo: {tempo_ms:.2f}ms"))
+                successful_tests.append([r_origem, r_destino, tempo_ms])
+                results_matrix[i][j] = 1
+                time_matrix[i][j] = tempo_ms
+            else:
                 print(Mensagem.formatar_erro(f"{r_origem} -> {r_destino} falhou."))
                 failed_tests.append([r_origem, r_destino])
                 results_matrix[i][j] = 0
@@ -0,0 +1,145 @@
+"""
+Synthetic Topology Module
+
+This module builds Link State Databases for synthetic topologies of arbitrary
+size, in the same format the routers exchange. It is shared by the offline
+benchmarks, which need networks far larger than the Docker lab can hold.
+"""
+
+import random
+from typing import Dict, List, Tuple, Any, Optional
+
+Aresta = Tuple[int, int]
+
+def nome_roteador(index: int) -> str:
+    """Return the router ID of a zero-based index."""
+    return f"roteador{index + 1}"
+
+def ip_roteador(index: int) -> str:
+    """Return the main address of a zero-based router index, one /24 per router."""
+    return f"10.{index // 256}.{index % 256}.2"
+
+def linha(router_count: int) -> List[Aresta]:
+    """Edges of a line topology."""
+    return [(i, i + 1) for i in range(router_count - 1)]
+
+def anel(router_count: int) -> List[Aresta]:
+    """Edges of a ring topology."""
+    return linha(router_count) + [(router_count - 1, 0)]
+
+def estrela(router_count: int) -> List[Aresta]:
+    """Edges of a star topology centred on the first router."""
+    return [(0, i) for i in range(1, router_count)]
+
+def arvore(router_count: int) -> List[Aresta]:
+    """Edges of a binary tree numbered like yaml_generator's 'tree' topology."""
+    return [((i - 1) // 2, i) for i in range(1, router_count)]
+
+def malha_completa(router_count: int) -> List[Aresta]:
+    """Edges of a full mesh."""
+    return [(i, j) for i in range(router_count) for j in range(i + 1, router_count)]
+
+def grade(router_count: int) -> List[Aresta]:
+    """Edges of a square grid holding router_count routers (row-major order)."""
+    side = max(1, int(round(router_count ** 0.5)))
+    edges = []
+    for i in range(router_count):
+        if (i + 1) % side and i + 1 < router_count:
+            edges.append((i, i + 1))
+        if i + side < router_count:
+            edges.append((i, i + side))
+    return edges
+
+def aleatoria(router_count: int, mean_degree: float = 4.0, seed: int = 42) -> List[Aresta]:
+    """
+    Edges of a connected random topology.
+
+    A random spanning tree guarantees connectivity and extra random edges
+    bring the mean degree up to the requested value.
+
+    Args:
+        router_count: Number of routers
+        mean_degree: Target mean degree
+        seed: Random seed
+
+    Returns:
+        List of undirected edges
+    """
+    generator = random.Random(seed)
+    edges = {(generator.randrange(i), i) for i in range(1, router_count)}
+    target = int(router_count * mean_degree / 2)
+    while len(edges) < min(target, router_count * (router_count - 1) // 2):
+        a, b = generator.sample(range(router_count), 2)
+        edges.add((min(a, b), max(a, b)))
+    return sorted(edges)
+
+def hierarquica(router_count: int, area_count: int = 10, links_per_area: int = 2,
+                seed: int = 42) -> Tuple[List[Aresta], List[int]]:
+    """
+    Edges of a network made of random areas hanging off a backbone.
+
+    Routers are split into consecutive blocks, one per area. Area 0 is the
+    backbone and every other area reaches it through a few links.
+
+    Args:
+        router_count: Number of routers
+        area_count: Number of areas
+        links_per_area: Links between each area and the backbone
+        seed: Random seed
+
+    Returns:
+        Tuple with (edges, area ID per router)
+    """
+    generator = random.Random(seed)
+    areas = [i * area_count // router_count for i in range(router_count)]
+    members = [[i for i in range(router_count) if areas[i] == area] for area in range(area_count)]
+    edges = []
+    for area, routers in enumerate(members):
+        for a, b in aleatoria(len(routers), seed=seed + area):
+            edges.append((routers[a], routers[b]))
+        if area:
+            for border, backbone in zip(generator.sample(routers, links_per_area),
+                                        generator.sample(members[0], links_per_area)):
+                edges.append((min(border, backbone), max(border, backbone)))
+    return edges, areas
+
+TOPOLOGIAS = {
+    "linha": linha,
+    "anel": anel,
+    "estrela": estrela,
+    "tree": arvore,
+    "malha": malha_completa,
+    "grade": grade,
+    "aleatoria": aleatoria,
+}
+
+def gerar_lsdb(router_count: int, edges: List[Aresta], cost: int = 10,
+               areas: Optional[List[int]] = None) -> Dict[str, Any]:
+    """
+    Build the converged LSDB of a topology.
+
+    Args:
+        router_count: Number of routers
+        edges: Undirected edges between zero-based router indexes
+        cost: Cost of every link
+        areas: Optional area ID per router; links take the lower area of their ends
+
+    Returns:
+        Dict in the format used by GerenciadorDeRotas
+    """
+    lsdb = {
+        nome_roteador(i): {'id': nome_roteador(i), 'ip': ip_roteador(i), 'vizinhos': {}, 'seq': 1}
+        for i in range(router_count)
+    }
+    for a, b in edges:
+        for origin, target in ((a, b), (b, a)):
+            link = {'ip': ip_roteador(target), 'custo': cost}
+            if areas is not None:
+                link['area'] = min(areas[a], areas[b])
+            lsdb[nome_roteador(origin)]['vizinhos'][nome_roteador(target)] = link
+    if areas is not None:
+        for i in range(router_count):
+            router_data = lsdb[nome_roteador(i)]
+            router_data['area'] = areas[i]
+            router_data['areas'] = sorted({areas[i]} | {info['area'] for info in router_data['vizinhos'].values()})
+    return lsdb
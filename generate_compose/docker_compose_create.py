@@ -26,7 +26,10 @@ def process_router_neighbors(router: Dict[str, Any], all_routers: List[Dict[str,
     for neighbor in router['neighbors']:
         neighbor_config = next(r for r in all_routers if r['id'] == neighbor['id'])
         neighbor_ip = neighbor_config['networks'][0]['ip']
-        connection_str = f'"{neighbor["id"]}":["{neighbor_ip}",{neighbor["cost"]}]'
+        if 'area' in neighbor_config:
+            connection_str = f'"{neighbor["id"]}":["{neighbor_ip}",{neighbor["cost"]},{neighbor_config["area"]}]'
+        else:
+            connection_str = f'"{neighbor["id"]}":["{neighbor_ip}",{neighbor["cost"]}]'
         neighbor_connections.append(connection_str)
     return neighbor_connections
 
@@ -11,7 +11,8 @@ import yaml
 import ipaddress
 from typing import Dict, List, Any, Union
 
-def gerar_yaml(num_roteadores: int, hosts_por_rede: int, topologia: str = "estrela") -> None:
+def gerar_yaml(num_roteadores: int, hosts_por_rede: int, topologia: str = "estrela",
+               num_areas: int = 1) -> None:
     """
     Generate YAML configuration for a network topology.
 
@@ -19,6 +20,9 @@ def gerar_yaml(num_roteadores: int, hosts_por_rede: int, topologia: str = "estre
         num_roteadores: Number of routers in the network
         hosts_por_rede: Number of hosts per network segment
         topologia: Network topology type ("anel", "estrela", "totalmente_conectada", "tree", "linha")
+        num_areas: Number of routing areas; routers are split into consecutive blocks,
+            and with a single one no area is written. Areas with no link to area 0
+            are reported, as they cannot be reached
 
     Raises:
         ValueError: If invalid parameters are provided
@@ -27,6 +31,8 @@ def gerar_yaml(num_roteadores: int, hosts_por_rede: int, topologia: str = "estre
         raise ValueError("Número de roteadores deve ser pelo menos 3.")
     if hosts_por_rede < 1 or hosts_por_rede > 254:
         raise ValueError("Número de hosts por rede deve ser entre 1 e 254.")
+    if num_areas < 1 or num_areas > num_roteadores:
+        raise ValueError("Número de áreas deve ser entre 1 e o número de roteadores.")
 
     redes = []
     roteadores = []
@@ -60,12 +66,16 @@ def gerar_yaml(num_roteadores: int, hosts_por_rede: int, topologia: str = "estre
     for i in range(num_roteadores):
         id_roteador = f"roteador{i+1}"
         network_config = setup_network_topology(i, {'networks': redes}, num_roteadores, topologia)
-        roteadores.append({
+        roteador = {
             'id': id_roteador,
             'ip': str(network_config['networks'][0]['ip']),
             'networks': network_config['networks'],
             'neighbors': network_config['neighbors']
-        })
+        }
+        # A single area is written as no area at all, which keeps the routers on the flat SPF
+        if num_areas > 1:
+            roteador['area'] = i * num_areas // num_roteadores
+        roteadores.append(roteador)
 
     dados = {
         'networks': redes,
@@ -84,6 +94,29 @@ def gerar_yaml(num_roteadores: int, hosts_por_rede: int, topologia: str = "estre
         yaml.dump(dados, file, sort_keys=False, default_flow_style=False)
 
     print(f"\n✅ Arquivo '{config_path}' gerado com sucesso para topologia '{topologia}'!\n")
+    for area in areas_sem_backbone(roteadores):
+        print(f"⚠️  A área {area} não tem enlace com a área 0 (backbone) e não será alcançada pelas outras.\n")
+
+def areas_sem_backbone(roteadores: List[Dict[str, Any]]) -> List[int]:
+    """
+    List the areas with no link to the backbone.
+
+    As in OSPF, areas other than 0 only reach each other through area 0, and
+    a link between two areas belongs to the lower one, so an area must have a
+    router with a neighbor in area 0.
+
+    Args:
+        roteadores: Routers of the generated configuration
+
+    Returns:
+        List[int]: Area IDs, empty when areas are not used
+    """
+    areas = {roteador['id']: roteador['area'] for roteador in roteadores if 'area' in roteador}
+    attached = {0} | {
+        areas[roteador['id']] for roteador in roteadores if roteador['id'] in areas
+        for neighbor in roteador['neighbors'] if areas.get(neighbor['id']) == 0
+    }
+    return sorted(set(areas.values()) - attached)
 
 def setup_network_topology(router_index: int, network_config: Dict[str, Any], 
                          num_routers: int, topology: str) -> Dict[str, Any]:
@@ -217,5 +250,6 @@ def exibir_menu_topologias() -> str:
 
 if __name__ == "__main__":
     selected_topology = exibir_menu_topologias()
+    selected_areas = input("\nNúmero de áreas de roteamento (ENTER para 1): ").strip()
     input("\nPressione ENTER para continuar ou CTRL+C para cancelar...")
-    gerar_yaml(10, 2, topologia=selected_topology)
+    gerar_yaml(10, 2, topologia=selected_topology, num_areas=int(selected_areas or 1))